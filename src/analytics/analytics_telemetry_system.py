@@ -14,15 +14,16 @@ import json
 import uuid
 import logging
 import threading
-import queue
 import random
 import hashlib
 import socket
 import platform
+import weakref
 import psutil
 import requests
 import numpy as np
 import pandas as pd
+from collections import deque
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, TypeVar, cast, Set
 from dataclasses import dataclass, field
@@ -96,6 +97,12 @@ class PrivacyLevel(Enum):
     SENSITIVE = "sensitive"     # Sensitive data
     CONFIDENTIAL = "confidential"  # Confidential data
 
+class OverflowPolicy(Enum):
+    """Enumeration of ingest buffer overflow policies."""
+    DROP_NEWEST = "drop_newest"  # Reject the incoming item
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest queued item
+    BLOCK = "block"              # Wait for space, then drop on timeout
+
 @dataclass
 class Event:
     """Event data structure."""
@@ -234,6 +241,10 @@ class AnalyticsConfig:
     anonymize_user_data: bool = True
     max_event_age: int = 30  # days
     max_storage_size: int = 1024  # MB
+    event_sampling_rates: Dict[str, float] = field(default_factory=dict)  # event type -> rate
+    ingest_capacity: int = 10000  # items per producer thread
+    ingest_overflow_policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST
+    ingest_block_timeout: float = 0.05  # seconds
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the configuration to a dictionary."""
@@ -250,7 +261,11 @@ class AnalyticsConfig:
             "include_performance_metrics": self.include_performance_metrics,
             "anonymize_user_data": self.anonymize_user_data,
             "max_event_age": self.max_event_age,
-            "max_storage_size": self.max_storage_size
+            "max_storage_size": self.max_storage_size,
+            "event_sampling_rates": self.event_sampling_rates,
+            "ingest_capacity": self.ingest_capacity,
+            "ingest_overflow_policy": self.ingest_overflow_policy.value,
+            "ingest_block_timeout": self.ingest_block_timeout
         }
     
     @classmethod
@@ -270,9 +285,207 @@ class AnalyticsConfig:
             include_performance_metrics=data.get("include_performance_metrics", True),
             anonymize_user_data=data.get("anonymize_user_data", True),
             max_event_age=data.get("max_event_age", 30),
-            max_storage_size=data.get("max_storage_size", 1024)
+            max_storage_size=data.get("max_storage_size", 1024),
+            event_sampling_rates=data.get("event_sampling_rates", {}),
+            ingest_capacity=data.get("ingest_capacity", 10000),
+            ingest_overflow_policy=OverflowPolicy(data.get("ingest_overflow_policy", "drop_newest")),
+            ingest_block_timeout=data.get("ingest_block_timeout", 0.05)
         )
 
+class _IngestShard:
+    """Ring buffer owned by a single producer thread."""
+    
+    __slots__ = ("items", "owner", "enqueued", "dropped", "sampled_out")
+    
+    def __init__(self, owner: threading.Thread):
+        self.items: deque = deque()
+        self.owner = weakref.ref(owner)
+        self.enqueued = 0
+        self.dropped = 0
+        self.sampled_out = 0
+
+class IngestBuffer:
+    """
+    Bounded multi-producer ingest buffer.
+    
+    Each producer thread appends to its own shard, so the hot ``put`` path
+    never takes a lock: deque appends and pops are atomic, and every
+    counter on a shard is only written by its owning thread. A single
+    consumer drains all shards in batches, starting each drain at the next
+    shard so that a busy producer cannot starve the others.
+    """
+    
+    def __init__(self, capacity: int = 10000,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+                 block_timeout: float = 0.05, high_watermark: Optional[int] = None,
+                 wake_event: Optional[threading.Event] = None):
+        """
+        Initialize the ingest buffer.
+        
+        Args:
+            capacity: Maximum number of queued items per producer thread
+            overflow_policy: What to do when a producer's shard is full
+            block_timeout: Maximum time to wait for space with the BLOCK policy
+            high_watermark: Shard depth at which the consumer is woken early
+            wake_event: Optional event shared with other buffers to wake the consumer
+        """
+        self.capacity = max(1, capacity)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.high_watermark = high_watermark or self.capacity
+        self.wake_event = wake_event or threading.Event()
+        self._local = threading.local()
+        self._shards: List[_IngestShard] = []
+        self._retired = {"enqueued": 0, "dropped": 0, "sampled_out": 0}
+        self._register_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._drain_start = 0
+        self._drained = 0
+    
+    def put(self, item: Any) -> bool:
+        """
+        Add an item to the calling thread's shard.
+        
+        Args:
+            item: The item
+            
+        Returns:
+            bool: True if the item was queued, False if it was dropped
+        """
+        shard = self._get_shard()
+        items = shard.items
+        
+        if len(items) >= self.capacity:
+            self.wake_event.set()
+            
+            if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                try:
+                    items.popleft()
+                except IndexError:
+                    pass
+                shard.dropped += 1
+            elif self.overflow_policy == OverflowPolicy.BLOCK:
+                deadline = time.monotonic() + self.block_timeout
+                while len(items) >= self.capacity and time.monotonic() < deadline:
+                    time.sleep(0.001)
+                if len(items) >= self.capacity:
+                    shard.dropped += 1
+                    return False
+            else:
+                shard.dropped += 1
+                return False
+        
+        items.append(item)
+        shard.enqueued += 1
+        
+        if len(items) >= self.high_watermark and not self.wake_event.is_set():
+            self.wake_event.set()
+        
+        return True
+    
+    def record_sampled_out(self) -> None:
+        """Count an item that was discarded by sampling before being queued."""
+        self._get_shard().sampled_out += 1
+    
+    def drain(self, max_items: Optional[int] = None) -> List[Any]:
+        """
+        Remove queued items from all shards.
+        
+        Args:
+            max_items: Optional maximum number of items to remove
+            
+        Returns:
+            List[Any]: The removed items, oldest first within each shard
+        """
+        drained: List[Any] = []
+        
+        with self._drain_lock:
+            shards = self._shards
+            start = self._drain_start % len(shards) if shards else 0
+            self._drain_start = start + 1
+            
+            for shard in shards[start:] + shards[:start]:
+                items = shard.items
+                while items and (max_items is None or len(drained) < max_items):
+                    try:
+                        drained.append(items.popleft())
+                    except IndexError:
+                        break
+                
+                if max_items is not None and len(drained) >= max_items:
+                    break
+            
+            self._drained += len(drained)
+            self._prune_dead_shards()
+        
+        return drained
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a producer signals that items are ready.
+        
+        Args:
+            timeout: Optional maximum time to wait in seconds
+            
+        Returns:
+            bool: True if woken by a producer, False on timeout
+        """
+        woken = self.wake_event.wait(timeout)
+        self.wake_event.clear()
+        return woken
+    
+    def __len__(self) -> int:
+        return sum(len(shard.items) for shard in self._shards)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get buffer counters.
+        
+        Returns:
+            Dict[str, Any]: Queued, enqueued, dropped, sampled-out and drained counts
+        """
+        shards = self._shards
+        return {
+            "queued": sum(len(shard.items) for shard in shards),
+            "enqueued": self._retired["enqueued"] + sum(shard.enqueued for shard in shards),
+            "dropped": self._retired["dropped"] + sum(shard.dropped for shard in shards),
+            "sampled_out": self._retired["sampled_out"] + sum(shard.sampled_out for shard in shards),
+            "drained": self._drained,
+            "shards": len(shards),
+            "capacity_per_shard": self.capacity,
+            "overflow_policy": self.overflow_policy.value
+        }
+    
+    def _get_shard(self) -> _IngestShard:
+        """
+        Get the calling thread's shard, registering it on first use.
+        
+        Returns:
+            _IngestShard: The shard
+        """
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _IngestShard(threading.current_thread())
+            self._local.shard = shard
+            with self._register_lock:
+                # Copy-on-write so readers can iterate without locking
+                self._shards = self._shards + [shard]
+        return shard
+    
+    def _prune_dead_shards(self) -> None:
+        """Drop empty shards whose producer thread has exited."""
+        dead = [shard for shard in self._shards
+                if not shard.items and (shard.owner() is None or not shard.owner().is_alive())]
+        if not dead:
+            return
+        
+        with self._register_lock:
+            for shard in dead:
+                self._retired["enqueued"] += shard.enqueued
+                self._retired["dropped"] += shard.dropped
+                self._retired["sampled_out"] += shard.sampled_out
+            self._shards = [shard for shard in self._shards if shard not in dead]
+
 class EventCollector:
     """
     Event collector for collecting and processing events.
@@ -291,7 +504,12 @@ class EventCollector:
         self.config = config
         self.session_id = str(uuid.uuid4())
         self.session_start_time = datetime.now()
-        self.event_queue = queue.Queue()
+        self.event_buffer = IngestBuffer(
+            capacity=config.ingest_capacity,
+            overflow_policy=config.ingest_overflow_policy,
+            block_timeout=config.ingest_block_timeout,
+            high_watermark=config.batch_size
+        )
         self.event_processors: List[Callable[[Event], Optional[Event]]] = []
         self.event_filters: List[Callable[[Event], bool]] = []
         self._running = False
@@ -331,6 +549,7 @@ class EventCollector:
             )
             
             self._running = False
+            self.event_buffer.wake_event.set()
             if self._thread:
                 self._thread.join(timeout=5.0)
                 self._thread = None
@@ -361,8 +580,10 @@ class EventCollector:
         if not self.config.enabled:
             return ""
         
-        # Apply sampling
-        if self.config.sampling_rate < 1.0 and random.random() > self.config.sampling_rate:
+        # Apply sampling, with per-type rates for high-volume event types
+        sampling_rate = self.config.event_sampling_rates.get(event_type.value, self.config.sampling_rate)
+        if sampling_rate < 1.0 and random.random() > sampling_rate:
+            self.event_buffer.record_sampled_out()
             return ""
         
         # Create event
@@ -384,8 +605,9 @@ class EventCollector:
         # Apply privacy filter
         event = self._apply_privacy_filter(event)
         
-        # Add to queue
-        self.event_queue.put(event)
+        # Add to the calling thread's ingest shard
+        if not self.event_buffer.put(event):
+            return ""
         
         return event_id
     
@@ -409,35 +631,49 @@ class EventCollector:
         with self._lock:
             self.event_filters.append(filter_func)
     
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        """
+        Get ingest buffer counters.
+        
+        Returns:
+            Dict[str, Any]: Ingest counters
+        """
+        return self.event_buffer.get_stats()
+    
     def _process_events(self) -> None:
-        """Process events from the queue."""
-        while self._running:
-            try:
-                # Get event from queue with timeout
-                try:
-                    event = self.event_queue.get(timeout=0.1)
-                except queue.Empty:
-                    continue
-                
-                # Apply filters
-                if not self._apply_filters(event):
-                    self.event_queue.task_done()
-                    continue
-                
-                # Apply processors
-                processed_event = self._apply_processors(event)
-                if not processed_event:
-                    self.event_queue.task_done()
-                    continue
-                
-                # Pass to storage manager
-                # In a real implementation, this would pass the event to a storage manager
-                # For this example, we'll just log it
-                logger.debug(f"Processed event: {processed_event.event_id}")
-                
-                self.event_queue.task_done()
-            except Exception as e:
-                logger.error(f"Error processing event: {str(e)}")
+        """Process events from the ingest buffer."""
+        while True:
+            running = self._running
+            if running and not len(self.event_buffer):
+                self.event_buffer.wait(timeout=0.1)
+            
+            for event in self.event_buffer.drain(max_items=self.config.batch_size):
+                self._process_event(event)
+            
+            # Drain whatever is left before exiting
+            if not running and not len(self.event_buffer):
+                break
+    
+    def _process_event(self, event: Event) -> None:
+        """
+        Filter and process a single event.
+        
+        Args:
+            event: The event
+        """
+        try:
+            # Apply filters
+            if not self._apply_filters(event):
+                return
+            
+            # Apply processors
+            processed_event = self._apply_processors(event)
+            if not processed_event:
+                return
+            
+            logger.debug(f"Processed event: {processed_event.event_id}")
+        except Exception as e:
+            logger.error(f"Error processing event: {str(e)}")
     
     def _apply_filters(self, event: Event) -> bool:
         """
@@ -568,7 +804,12 @@ class MetricCollector:
             config: Analytics configuration
         """
         self.config = config
-        self.metric_queue = queue.Queue()
+        self.metric_buffer = IngestBuffer(
+            capacity=config.ingest_capacity,
+            overflow_policy=config.ingest_overflow_policy,
+            block_timeout=config.ingest_block_timeout,
+            high_watermark=config.batch_size
+        )
         self.metric_processors: List[Callable[[Metric], Optional[Metric]]] = []
         self._running = False
         self._thread: Optional[threading.Thread] = None
@@ -599,6 +840,7 @@ class MetricCollector:
                 return
             
             self._running = False
+            self.metric_buffer.wake_event.set()
             if self._thread:
                 self._thread.join(timeout=5.0)
                 self._thread = None
@@ -640,8 +882,9 @@ class MetricCollector:
             dimensions=dimensions or {}
         )
         
-        # Add to queue
-        self.metric_queue.put(metric)
+        # Add to the calling thread's ingest shard
+        if not self.metric_buffer.put(metric):
+            return ""
         
         return metric_id
     
@@ -655,30 +898,34 @@ class MetricCollector:
         with self._lock:
             self.metric_processors.append(processor)
     
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        """
+        Get ingest buffer counters.
+        
+        Returns:
+            Dict[str, Any]: Ingest counters
+        """
+        return self.metric_buffer.get_stats()
+    
     def _process_metrics(self) -> None:
-        """Process metrics from the queue."""
-        while self._running:
-            try:
-                # Get metric from queue with timeout
+        """Process metrics from the ingest buffer."""
+        while True:
+            running = self._running
+            if running and not len(self.metric_buffer):
+                self.metric_buffer.wait(timeout=0.1)
+            
+            for metric in self.metric_buffer.drain(max_items=self.config.batch_size):
                 try:
-                    metric = self.metric_queue.get(timeout=0.1)
-                except queue.Empty:
-                    continue
-                
-                # Apply processors
-                processed_metric = self._apply_processors(metric)
-                if not processed_metric:
-                    self.metric_queue.task_done()
-                    continue
-                
-                # Pass to storage manager
-                # In a real implementation, this would pass the metric to a storage manager
-                # For this example, we'll just log it
-                logger.debug(f"Processed metric: {processed_metric.metric_id}")
-                
-                self.metric_queue.task_done()
-            except Exception as e:
-                logger.error(f"Error processing metric: {str(e)}")
+                    # Apply processors
+                    processed_metric = self._apply_processors(metric)
+                    if processed_metric:
+                        logger.debug(f"Processed metric: {processed_metric.metric_id}")
+                except Exception as e:
+                    logger.error(f"Error processing metric: {str(e)}")
+            
+            # Drain whatever is left before exiting
+            if not running and not len(self.metric_buffer):
+                break
     
     def _apply_processors(self, metric: Metric) -> Optional[Metric]:
         """
@@ -772,6 +1019,25 @@ class StorageManager:
         self.config = config
         self.event_batch: List[Event] = []
         self.metric_batch: List[Metric] = []
+        self._wake = threading.Event()
+        self.event_buffer = IngestBuffer(
+            capacity=config.ingest_capacity,
+            overflow_policy=config.ingest_overflow_policy,
+            block_timeout=config.ingest_block_timeout,
+            high_watermark=config.batch_size,
+            wake_event=self._wake
+        )
+        self.metric_buffer = IngestBuffer(
+            capacity=config.ingest_capacity,
+            overflow_policy=config.ingest_overflow_policy,
+            block_timeout=config.ingest_block_timeout,
+            high_watermark=config.batch_size,
+            wake_event=self._wake
+        )
+        self.flushed_events = 0
+        self.flushed_metrics = 0
+        self.flush_errors = 0
+        self.dropped_on_retry = 0
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._lock = threading.RLock()
@@ -800,6 +1066,7 @@ class StorageManager:
                 return
             
             self._running = False
+            self._wake.set()
             if self._thread:
                 self._thread.join(timeout=5.0)
                 self._thread = None
@@ -816,12 +1083,8 @@ class StorageManager:
         Args:
             event: The event
         """
-        with self._lock:
-            self.event_batch.append(event)
-            
-            # Flush if batch size reached
-            if len(self.event_batch) >= self.config.batch_size:
-                self._flush_events()
+        # Lock-free append; the flush loop is woken once a batch is ready
+        self.event_buffer.put(event)
     
     def store_metric(self, metric: Metric) -> None:
         """
@@ -830,25 +1093,43 @@ class StorageManager:
         Args:
             metric: The metric
         """
-        with self._lock:
-            self.metric_batch.append(metric)
-            
-            # Flush if batch size reached
-            if len(self.metric_batch) >= self.config.batch_size:
-                self._flush_metrics()
+        # Lock-free append; the flush loop is woken once a batch is ready
+        self.metric_buffer.put(metric)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage ingest and flush counters.
+        
+        Returns:
+            Dict[str, Any]: Storage counters
+        """
+        return {
+            "events": self.event_buffer.get_stats(),
+            "metrics": self.metric_buffer.get_stats(),
+            "pending_events": len(self.event_batch),
+            "pending_metrics": len(self.metric_batch),
+            "flushed_events": self.flushed_events,
+            "flushed_metrics": self.flushed_metrics,
+            "flush_errors": self.flush_errors,
+            "dropped_on_retry": self.dropped_on_retry
+        }
     
     def _flush_loop(self) -> None:
-        """Flush data periodically."""
+        """Flush data when a batch is ready or the flush interval elapses."""
         while self._running:
             try:
-                # Check if flush interval reached
+                # Wait for a producer to fill a batch, or for the interval to elapse
+                elapsed = (datetime.now() - self._last_flush_time).total_seconds()
+                batch_ready = self._wake.wait(timeout=max(0.0, self.config.flush_interval - elapsed))
+                self._wake.clear()
+                
+                if not self._running:
+                    break
+                
                 now = datetime.now()
-                if (now - self._last_flush_time).total_seconds() >= self.config.flush_interval:
+                if batch_ready or (now - self._last_flush_time).total_seconds() >= self.config.flush_interval:
                     self._flush()
                     self._last_flush_time = now
-                
-                # Sleep for a while
-                time.sleep(1.0)
             except Exception as e:
                 logger.error(f"Error in flush loop: {str(e)}")
     
@@ -860,6 +1141,7 @@ class StorageManager:
     
     def _flush_events(self) -> None:
         """Flush events."""
+        self.event_batch.extend(self.event_buffer.drain())
         if not self.event_batch:
             return
         
@@ -873,14 +1155,18 @@ class StorageManager:
                 self._store_events_remotely(self.event_batch)
             
             # Clear batch
+            self.flushed_events += len(self.event_batch)
             self.event_batch = []
             
             logger.debug(f"Flushed events")
         except Exception as e:
             logger.error(f"Error flushing events: {str(e)}")
+            self.flush_errors += 1
+            self.event_batch = self._trim_retry_batch(self.event_batch)
     
     def _flush_metrics(self) -> None:
         """Flush metrics."""
+        self.metric_batch.extend(self.metric_buffer.drain())
         if not self.metric_batch:
             return
         
@@ -894,11 +1180,32 @@ class StorageManager:
                 self._store_metrics_remotely(self.metric_batch)
             
             # Clear batch
+            self.flushed_metrics += len(self.metric_batch)
             self.metric_batch = []
             
             logger.debug(f"Flushed metrics")
         except Exception as e:
             logger.error(f"Error flushing metrics: {str(e)}")
+            self.flush_errors += 1
+            self.metric_batch = self._trim_retry_batch(self.metric_batch)
+    
+    def _trim_retry_batch(self, batch: List[Any]) -> List[Any]:
+        """
+        Bound a batch kept for retry after a failed flush.
+        
+        Args:
+            batch: The batch
+            
+        Returns:
+            List[Any]: The newest items that fit within the ingest capacity
+        """
+        overflow = len(batch) - self.config.ingest_capacity
+        if overflow <= 0:
+            return batch
+        
+        self.dropped_on_retry += overflow
+        logger.warning(f"Dropping {overflow} items that could not be flushed")
+        return batch[overflow:]
     
     def _store_events_locally(self, events: List[Event]) -> None:
         """
@@ -1991,6 +2298,19 @@ class Analytics:
         
         return self.query.aggregate_metrics(metrics, aggregation, group_by)
     
+    def get_ingest_stats(self) -> Dict[str, Any]:
+        """
+        Get ingest counters for events and metrics.
+        
+        Returns:
+            Dict[str, Any]: Queued, dropped, sampled-out and flushed counts
+        """
+        return {
+            "events": self.event_collector.get_ingest_stats(),
+            "metrics": self.metric_collector.get_ingest_stats(),
+            "storage": self.storage_manager.get_stats()
+        }
+    
     def cleanup_old_data(self) -> None:
         """Clean up old data."""
         if not self._initialized:
@@ -2362,6 +2682,16 @@ def aggregate_metrics(metrics: Optional[List[Metric]] = None,
     )
 
 
+def get_ingest_stats() -> Dict[str, Any]:
+    """
+    Get ingest counters for events and metrics.
+    
+    Returns:
+        Dict[str, Any]: Queued, dropped, sampled-out and flushed counts
+    """
+    return analytics.get_ingest_stats()
+
+
 def cleanup_old_data() -> None:
     """Clean up old data."""
     analytics.cleanup_old_data()
@@ -0,0 +1,387 @@
+"""
+Online anomaly detection for the Advanced Analytics system.
+
+This module provides incremental baselines for metric series so that
+anomalies can be scored as values arrive instead of by re-reading raw
+metric history from storage.
+"""
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from src.core.streaming_stats import RunningMoments
+
+logger = logging.getLogger(__name__)
+
+
+def _moments_to_dict(moments: RunningMoments) -> Dict[str, Any]:
+    """
+    Convert running moments to dictionary.
+
+    Args:
+        moments: Running moments to convert
+
+    Returns:
+        Dictionary with the count, mean and standard deviation
+    """
+    return {
+        "count": moments.count,
+        "mean": moments.mean,
+        "std_dev": moments.stdev
+    }
+
+
+class SeriesBaseline:
+    """
+    Incremental baseline for a single metric series.
+
+    A series is a metric name combined with one set of dimensions. The
+    baseline combines overall running moments, which also track an EWMA of
+    recent values, and one set of running moments per seasonal bucket.
+    """
+
+    def __init__(self, metric_name: str, dimensions: Dict[str, str],
+                 ewma_alpha: float, seasonality: Optional[str],
+                 max_anomalies: int):
+        """
+        Initialize the series baseline.
+
+        Args:
+            metric_name: Name of the metric
+            dimensions: Dimensions of the series
+            ewma_alpha: Smoothing factor for the EWMA moments
+            seasonality: Seasonal bucketing (hour_of_day, hour_of_week or None)
+            max_anomalies: Maximum number of anomalies retained for queries
+        """
+        self.metric_name = metric_name
+        self.dimensions = dict(dimensions)
+        self.seasonality = seasonality
+        self.overall = RunningMoments(alpha=ewma_alpha)
+        self.seasonal: Dict[int, RunningMoments] = {}
+        self.anomalies = deque(maxlen=max_anomalies)
+        self.last_value: Optional[float] = None
+        self.last_timestamp: Optional[int] = None
+
+    def expected(self, timestamp: datetime,
+                 min_samples: int) -> Optional[Tuple[float, float, str]]:
+        """
+        Get the expected value and spread for a timestamp.
+
+        The seasonal bucket is preferred once it has enough samples, then the
+        EWMA level, which keeps reacting to drift.
+
+        Args:
+            timestamp: Timestamp of the value being scored
+            min_samples: Minimum samples before a baseline is trusted
+
+        Returns:
+            Tuple of (mean, standard deviation, baseline source) or None
+            if the series is still warming up
+        """
+        bucket = self._bucket(timestamp)
+        if bucket is not None:
+            seasonal = self.seasonal.get(bucket)
+            if seasonal is not None and seasonal.count >= min_samples:
+                return seasonal.mean, seasonal.stdev, "seasonal"
+
+        if self.overall.count >= min_samples:
+            return self.overall.ewma_mean, self.overall.ewma_stdev, "ewma"
+
+        return None
+
+    def update(self, value: float, timestamp: datetime) -> None:
+        """
+        Add a value to the overall and seasonal moments of the baseline.
+
+        Args:
+            value: Value to add
+            timestamp: Timestamp of the value
+        """
+        self.overall.update(value)
+
+        bucket = self._bucket(timestamp)
+        if bucket is not None:
+            if bucket not in self.seasonal:
+                self.seasonal[bucket] = RunningMoments()
+            self.seasonal[bucket].update(value)
+
+        self.last_value = value
+        self.last_timestamp = int(timestamp.timestamp() * 1000)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert baseline state to dictionary.
+
+        Returns:
+            Dictionary representation of the baseline
+        """
+        return {
+            "metric_name": self.metric_name,
+            "dimensions": self.dimensions,
+            "overall": _moments_to_dict(self.overall),
+            "ewma": {
+                "alpha": self.overall.alpha,
+                "mean": self.overall.ewma_mean,
+                "std_dev": self.overall.ewma_stdev
+            },
+            "seasonality": self.seasonality,
+            "seasonal": {
+                bucket: _moments_to_dict(moments) for bucket, moments in sorted(self.seasonal.items())
+            },
+            "anomaly_count": len(self.anomalies),
+            "last_value": self.last_value,
+            "last_timestamp": self.last_timestamp
+        }
+
+    def _bucket(self, timestamp: datetime) -> Optional[int]:
+        """
+        Get the seasonal bucket for a timestamp.
+
+        Args:
+            timestamp: Timestamp to bucket
+
+        Returns:
+            Bucket index or None if seasonality is disabled
+        """
+        if self.seasonality == "hour_of_day":
+            return timestamp.hour
+        if self.seasonality == "hour_of_week":
+            return timestamp.weekday() * 24 + timestamp.hour
+        return None
+
+
+class OnlineAnomalyDetector:
+    """
+    Streaming anomaly detector for metric series.
+
+    Each observed value is scored against the baseline of its series before
+    being folded into it, so detection happens in constant time per value
+    and queries are served from the retained anomalies without touching
+    metric storage. After a restart, baselines are rebuilt by replaying
+    stored values through rebuild().
+    """
+
+    SEASONALITIES = ("hour_of_day", "hour_of_week")
+
+    def __init__(self, sensitivity: float = 2.0, ewma_alpha: float = 0.1,
+                 seasonality: Optional[str] = "hour_of_day",
+                 min_samples: int = 10, max_anomalies_per_series: int = 1000,
+                 retain_sensitivity: Optional[float] = None):
+        """
+        Initialize the detector.
+
+        Args:
+            sensitivity: Minimum deviation (standard deviations) reported as an anomaly
+            ewma_alpha: Smoothing factor for the EWMA baselines
+            seasonality: Seasonal bucketing (hour_of_day, hour_of_week or None)
+            min_samples: Minimum samples before a baseline is used for scoring
+            max_anomalies_per_series: Maximum anomalies retained per series
+            retain_sensitivity: Minimum deviation retained for queries (defaults
+                to sensitivity); lower it to answer queries below sensitivity
+        """
+        if seasonality is not None and seasonality not in self.SEASONALITIES:
+            raise ValueError(f"Invalid seasonality: {seasonality}")
+
+        self.sensitivity = sensitivity
+        self.ewma_alpha = ewma_alpha
+        self.seasonality = seasonality
+        self.min_samples = max(2, min_samples)
+        self.max_anomalies_per_series = max_anomalies_per_series
+        self.retain_sensitivity = min(
+            sensitivity, retain_sensitivity if retain_sensitivity is not None else sensitivity
+        )
+
+        # metric name -> dimension key -> baseline
+        self._series: Dict[str, Dict[str, SeriesBaseline]] = {}
+        self._lock = threading.Lock()
+        self._observed_count = 0
+        self._anomaly_count = 0
+
+    def observe(self, metric_name: str, value: float, dimension_key: str,
+                dimensions: Dict[str, str] = None,
+                timestamp: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """
+        Score a value against its series baseline and update the baseline.
+
+        Args:
+            metric_name: Name of the metric
+            value: Value of the metric
+            dimension_key: Canonical key for the dimensions
+            dimensions: Dimensions for the metric
+            timestamp: Timestamp for the value (defaults to current time)
+
+        Returns:
+            Anomaly dictionary if the value deviates by at least the
+            detector's sensitivity, None otherwise
+        """
+        if timestamp is None:
+            timestamp = datetime.now()
+
+        with self._lock:
+            anomaly = self._observe(metric_name, float(value), dimension_key, dimensions, timestamp)
+
+        if anomaly is None or anomaly["deviation"] < self.sensitivity:
+            return None
+        return anomaly
+
+    def rebuild(self, observations: Iterable[Tuple[str, float, str, Dict[str, str], datetime]]) -> int:
+        """
+        Replay stored values into the baselines.
+
+        Values are replayed in timestamp order, so baselines and retained
+        anomalies end up as if the values had been observed live.
+
+        Args:
+            observations: Tuples of (metric name, value, dimension key,
+                dimensions, timestamp)
+
+        Returns:
+            Number of values replayed
+        """
+        ordered = sorted(observations, key=lambda observation: observation[4])
+        with self._lock:
+            for metric_name, value, dimension_key, dimensions, timestamp in ordered:
+                self._observe(metric_name, float(value), dimension_key, dimensions, timestamp)
+        return len(ordered)
+
+    def get_anomalies(self, metric_name: str, start_time: datetime, end_time: datetime,
+                      dimensions: Dict[str, str] = None,
+                      sensitivity: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get retained anomalies for a metric.
+
+        Only anomalies at or above the detector's retain_sensitivity are
+        retained, so lower sensitivities return no more than those.
+
+        Args:
+            metric_name: Name of the metric
+            start_time: Start time for the query
+            end_time: End time for the query
+            dimensions: Optional dimensions to filter by (subset match)
+            sensitivity: Optional minimum deviation to return (defaults to
+                the detector's sensitivity)
+
+        Returns:
+            List of anomalies sorted by timestamp
+        """
+        start_timestamp = int(start_time.timestamp() * 1000)
+        end_timestamp = int(end_time.timestamp() * 1000)
+        min_deviation = sensitivity if sensitivity is not None else self.sensitivity
+
+        with self._lock:
+            series = list(self._series.get(metric_name, {}).values())
+            result = []
+            for baseline in series:
+                if dimensions and any(baseline.dimensions.get(k) != v for k, v in dimensions.items()):
+                    continue
+
+                for anomaly in baseline.anomalies:
+                    if (start_timestamp <= anomaly["timestamp"] <= end_timestamp
+                            and anomaly["deviation"] >= min_deviation):
+                        result.append(dict(anomaly))
+
+        result.sort(key=lambda a: a["timestamp"])
+        return result
+
+    def get_baseline(self, metric_name: str, dimension_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the current baseline state for a series.
+
+        Args:
+            metric_name: Name of the metric
+            dimension_key: Canonical key for the dimensions
+
+        Returns:
+            Dictionary representation of the baseline or None if unknown
+        """
+        with self._lock:
+            baseline = self._series.get(metric_name, {}).get(dimension_key)
+            return baseline.to_dict() if baseline else None
+
+    def reset(self, metric_name: Optional[str] = None) -> None:
+        """
+        Discard baselines.
+
+        Args:
+            metric_name: Optional metric to reset (defaults to all metrics)
+        """
+        with self._lock:
+            if metric_name is None:
+                self._series = {}
+            else:
+                self._series.pop(metric_name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get detector statistics.
+
+        Returns:
+            Dictionary containing detector statistics
+        """
+        with self._lock:
+            return {
+                "series_count": sum(len(s) for s in self._series.values()),
+                "observed_count": self._observed_count,
+                "anomaly_count": self._anomaly_count,
+                "sensitivity": self.sensitivity,
+                "retain_sensitivity": self.retain_sensitivity,
+                "seasonality": self.seasonality
+            }
+
+    def _observe(self, metric_name: str, value: float, dimension_key: str,
+                 dimensions: Optional[Dict[str, str]],
+                 timestamp: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Score a value and fold it into its baseline. Requires the lock.
+
+        Args:
+            metric_name: Name of the metric
+            value: Value of the metric
+            dimension_key: Canonical key for the dimensions
+            dimensions: Dimensions for the metric
+            timestamp: Timestamp for the value
+
+        Returns:
+            Anomaly dictionary if the value deviates by at least the
+            retain sensitivity, None otherwise
+        """
+        series_by_dimension = self._series.setdefault(metric_name, {})
+        baseline = series_by_dimension.get(dimension_key)
+        if baseline is None:
+            baseline = SeriesBaseline(
+                metric_name=metric_name,
+                dimensions=dimensions or {},
+                ewma_alpha=self.ewma_alpha,
+                seasonality=self.seasonality,
+                max_anomalies=self.max_anomalies_per_series
+            )
+            series_by_dimension[dimension_key] = baseline
+
+        anomaly = None
+        expected = baseline.expected(timestamp, self.min_samples)
+        if expected is not None:
+            mean, std_dev, source = expected
+            deviation = abs(value - mean) / std_dev if std_dev > 0 else 0
+
+            if deviation >= self.retain_sensitivity:
+                anomaly = {
+                    "metric_name": metric_name,
+                    "dimensions": dict(baseline.dimensions),
+                    "timestamp": int(timestamp.timestamp() * 1000),
+                    "value": value,
+                    "baseline_avg": mean,
+                    "baseline_std": std_dev,
+                    "baseline_source": source,
+                    "deviation": deviation,
+                    "direction": "above" if value > mean else "below"
+                }
+                baseline.anomalies.append(anomaly)
+                if deviation >= self.sensitivity:
+                    self._anomaly_count += 1
+
+        baseline.update(value, timestamp)
+        self._observed_count += 1
+        return anomaly
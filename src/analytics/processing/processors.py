@@ -14,6 +14,7 @@ from typing import Dict, Any, List, Optional, Union, Tuple
 from ..core.core import (AnalyticsComponent, AnalyticsContext, DataCategory,
                         Event, MetricRegistry, MetricType, MetricValue,
                         SecurityClassification, metric_registry)
+from .online_anomaly import OnlineAnomalyDetector
 
 logger = logging.getLogger(__name__)
 
@@ -920,6 +921,8 @@ class MetricProcessor(AnalyticsComponent):
         self.metric_handlers = {}
         self.metric_thresholds = {}
         self.metric_aggregations = {}
+        self.anomaly_handlers = []
+        self.anomaly_detector = OnlineAnomalyDetector()
         self.retention_period_days = 30
         self._logger = logging.getLogger(f"{__name__}.{name}")
         self._logger.info(f"Initialized MetricProcessor: {name}")
@@ -960,6 +963,21 @@ class MetricProcessor(AnalyticsComponent):
                     dimensions=agg_config.get("dimensions")
                 )
         
+        # Configure online anomaly detection
+        anomaly_config = config.get("anomaly_detection", {})
+        self.anomaly_detector = OnlineAnomalyDetector(
+            sensitivity=anomaly_config.get("sensitivity", 2.0),
+            ewma_alpha=anomaly_config.get("ewma_alpha", 0.1),
+            seasonality=anomaly_config.get("seasonality", "hour_of_day"),
+            min_samples=anomaly_config.get("min_samples", 10),
+            max_anomalies_per_series=anomaly_config.get("max_anomalies_per_series", 1000),
+            retain_sensitivity=anomaly_config.get("retain_sensitivity")
+        )
+        
+        # Baselines live in memory, so rebuild them from stored values after a restart
+        if anomaly_config.get("rebuild_on_start", True):
+            self.rebuild_anomaly_baselines()
+        
         self._logger.info(f"Configured MetricProcessor with retention period {self.retention_period_days} days")
     
     def shutdown(self) -> None:
@@ -967,6 +985,8 @@ class MetricProcessor(AnalyticsComponent):
         self.metric_handlers = {}
         self.metric_thresholds = {}
         self.metric_aggregations = {}
+        self.anomaly_handlers = []
+        self.anomaly_detector.reset()
         self._logger.info(f"Shutdown MetricProcessor: {self.name}")
         super().shutdown()
     
@@ -983,7 +1003,8 @@ class MetricProcessor(AnalyticsComponent):
             "status": "healthy" if self.enabled else "disabled",
             "handler_count": len(self.metric_handlers),
             "threshold_count": len(self.metric_thresholds),
-            "aggregation_count": len(self.metric_aggregations)
+            "aggregation_count": len(self.metric_aggregations),
+            "anomaly_detection": self.anomaly_detector.get_stats()
         }
     
     def process_metric(self, metric_name: str, value: Union[int, float, bool],
@@ -1018,6 +1039,9 @@ class MetricProcessor(AnalyticsComponent):
             if isinstance(value, bool):
                 value = 1 if value else 0
             
+            # Score against the streaming baseline and fold the value into it
+            self._detect_anomaly(metric_name, value, dimensions, timestamp)
+            
             # Create metric value object
             metric_value = MetricValue(
                 name=metric_name,
@@ -1135,6 +1159,23 @@ class MetricProcessor(AnalyticsComponent):
         
         self._logger.debug(f"Registered aggregation for {metric_name}: {aggregation_type} every {interval_seconds}s")
     
+    def register_anomaly_handler(self, handler_func: callable) -> None:
+        """
+        Register a handler function for anomaly events.
+        
+        The handler is called with an ``Event`` of type ``metric_anomaly`` as
+        soon as a processed value deviates from its baseline.
+        
+        Args:
+            handler_func: Function to call when an anomaly is detected
+        """
+        if not self.enabled:
+            self._logger.debug("MetricProcessor is disabled, skipping register_anomaly_handler")
+            return
+        
+        self.anomaly_handlers.append(handler_func)
+        self._logger.debug("Registered anomaly handler")
+    
     def query_metrics(self, metric_name: str, start_time: datetime, end_time: datetime,
                     dimensions: Dict[str, str] = None, aggregation: str = None,
                     interval: str = None) -> List[Dict[str, Any]]:
@@ -1263,53 +1304,57 @@ class MetricProcessor(AnalyticsComponent):
             self._logger.debug(f"MetricProcessor is disabled, returning empty list for detect_anomalies")
             return []
         
-        # Get statistics for baseline period (before start_time)
-        baseline_end = start_time
-        baseline_start = baseline_end - (end_time - start_time) * 2  # Use twice the query period for baseline
-        
-        baseline_stats = self.get_metric_statistics(
-            metric_name=metric_name,
-            start_time=baseline_start,
-            end_time=baseline_end,
-            dimensions=dimensions
-        )
-        
-        if baseline_stats["count"] < 2:
-            self._logger.debug(f"Not enough baseline data for anomaly detection: {metric_name}")
-            return []
-        
-        # Query metrics for the target period
-        metrics = self.query_metrics(
+        # Serve from the maintained baselines instead of re-reading storage
+        anomalies = self.anomaly_detector.get_anomalies(
             metric_name=metric_name,
             start_time=start_time,
             end_time=end_time,
-            dimensions=dimensions
+            dimensions=dimensions,
+            sensitivity=sensitivity
         )
         
-        # Detect anomalies
-        anomalies = []
-        baseline_avg = baseline_stats["avg"]
-        baseline_std = baseline_stats["std_dev"]
+        self._logger.debug(f"Detected {len(anomalies)} anomalies in {metric_name}")
+        return anomalies
+    
+    def rebuild_anomaly_baselines(self, since: Optional[datetime] = None) -> int:
+        """
+        Rebuild the streaming anomaly baselines from stored metric values.
         
-        for metric in metrics:
-            value = metric["value"]
-            deviation = abs(value - baseline_avg) / baseline_std if baseline_std > 0 else 0
+        Anomaly handlers are not called for replayed values.
+        
+        Args:
+            since: Oldest value to replay (defaults to the retention period)
             
-            if deviation >= sensitivity:
-                # This is an anomaly
-                anomalies.append({
-                    "metric_name": metric_name,
-                    "dimensions": dimensions or {},
-                    "timestamp": metric["timestamp"],
-                    "value": value,
-                    "baseline_avg": baseline_avg,
-                    "baseline_std": baseline_std,
-                    "deviation": deviation,
-                    "direction": "above" if value > baseline_avg else "below"
-                })
+        Returns:
+            Number of values replayed
+        """
+        if since is None:
+            since = datetime.now() - timedelta(days=self.retention_period_days)
         
-        self._logger.debug(f"Detected {len(anomalies)} anomalies in {metric_name}")
-        return anomalies
+        values = metric_registry.get_values(start_time=since)
+        self.anomaly_detector.reset()
+        replayed = self.anomaly_detector.rebuild(
+            (value.metric_name, value.value, self._create_dimension_key(value.dimensions),
+             value.dimensions, value.timestamp)
+            for value in values
+        )
+        
+        self._logger.info(f"Rebuilt anomaly baselines from {replayed} stored metric values")
+        return replayed
+    
+    def get_anomaly_baseline(self, metric_name: str,
+                           dimensions: Dict[str, str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the streaming anomaly baseline for a metric series.
+        
+        Args:
+            metric_name: Name of the metric
+            dimensions: Dimensions of the series
+            
+        Returns:
+            Dictionary containing the baseline state or None if unknown
+        """
+        return self.anomaly_detector.get_baseline(metric_name, self._create_dimension_key(dimensions))
     
     def _apply_handlers(self, metric_value: MetricValue) -> None:
         """
@@ -1331,6 +1376,48 @@ class MetricProcessor(AnalyticsComponent):
             except Exception as e:
                 self._logger.error(f"Error in metric handler: {e}")
     
+    def _detect_anomaly(self, metric_name: str, value: Union[int, float],
+                      dimensions: Optional[Dict[str, str]],
+                      timestamp: datetime) -> None:
+        """
+        Update the streaming baseline for a metric and emit any anomaly.
+        
+        Args:
+            metric_name: Name of the metric
+            value: Value of the metric
+            dimensions: Dimensions for the metric
+            timestamp: Timestamp for the metric
+        """
+        anomaly = self.anomaly_detector.observe(
+            metric_name=metric_name,
+            value=value,
+            dimension_key=self._create_dimension_key(dimensions),
+            dimensions=dimensions,
+            timestamp=timestamp
+        )
+        
+        if anomaly is None:
+            return
+        
+        self._logger.info(
+            f"Anomaly detected: {metric_name}={value} is {anomaly['deviation']:.2f} std devs "
+            f"{anomaly['direction']} baseline {anomaly['baseline_avg']:.2f}"
+        )
+        
+        event = Event(
+            event_type="metric_anomaly",
+            data=anomaly,
+            source=self.name,
+            timestamp=timestamp,
+            category=DataCategory.SYSTEM
+        )
+        
+        for handler in self.anomaly_handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                self._logger.error(f"Error in anomaly handler: {e}")
+    
     def _check_thresholds(self, metric_value: MetricValue) -> None:
         """
         Check if a metric crosses any registered thresholds.
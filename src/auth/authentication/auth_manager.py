@@ -8,11 +8,14 @@ including user management, password handling, and session management.
 import os
 import time
 import uuid
+import asyncio
 import hashlib
 import secrets
 import logging
+import threading
+import concurrent.futures
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Any, Tuple
+from typing import Dict, Optional, List, Any, Tuple, Callable
 
 # Try to import argon2, but fall back to bcrypt if not available
 try:
@@ -24,6 +27,7 @@ except ImportError:
 
 from src.core.error_handling.errors import AuthenticationError, ConfigurationError
 from src.core.event_system.event_manager import EventManager
+from src.auth.authentication.session_store import SessionStore, LoginAttemptLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -130,12 +134,96 @@ class User:
         return f"User(id={self.user_id}, username={self.username}, email={self.email})"
 
 
+def _hash_password(algorithm: str, password: str) -> str:
+    """
+    Hash a password with an algorithm.
+    
+    Defined at module level so it can run in a worker process.
+    
+    Args:
+        algorithm: Hashing algorithm to use
+        password: Plain text password to hash
+        
+    Returns:
+        Hashed password
+    """
+    if algorithm == "argon2":
+        ph = argon2.PasswordHasher(
+            time_cost=3,  # Number of iterations
+            memory_cost=65536,  # 64MB
+            parallelism=4,  # Number of parallel threads
+            hash_len=32,  # Length of the hash in bytes
+            salt_len=16  # Length of the salt in bytes
+        )
+        return ph.hash(password)
+    elif algorithm == "bcrypt":
+        salt = bcrypt.gensalt(rounds=12)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+    else:
+        raise ConfigurationError(f"Unsupported password hashing algorithm: {algorithm}")
+
+
+def _verify_password(algorithm: str, password: str, password_hash: str) -> bool:
+    """
+    Verify a password against a hash with an algorithm.
+    
+    Defined at module level so it can run in a worker process.
+    
+    Args:
+        algorithm: Hashing algorithm to use
+        password: Plain text password to verify
+        password_hash: Hashed password to verify against
+        
+    Returns:
+        True if password matches hash, False otherwise
+    """
+    if algorithm == "argon2":
+        try:
+            ph = argon2.PasswordHasher()
+            ph.verify(password_hash, password)
+            return True
+        except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHash, ValueError):
+            return False
+    elif algorithm == "bcrypt":
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            return False
+    else:
+        raise ConfigurationError(f"Unsupported password hashing algorithm: {algorithm}")
+
+
 class PasswordManager:
     """
     Handles secure password operations including hashing and verification.
+    
+    hash_password and verify_password run on the calling thread. The
+    submit_* and *_async variants run on a bounded worker pool so callers
+    such as an event loop are not blocked while a hash is computed. Both
+    argon2 and bcrypt release the GIL, so a thread pool scales with cores;
+    a process pool can be used instead with use_processes.
     """
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int = None,
+        max_pending: int = 256,
+        use_processes: bool = False
+    ):
         self.algorithm = HASH_ALGORITHM
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.use_processes = use_processes
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_pending": 0,
+            "total_seconds": 0.0
+        }
         
     def hash_password(self, password: str) -> str:
         """
@@ -147,20 +235,7 @@ class PasswordManager:
         Returns:
             Hashed password
         """
-        if self.algorithm == "argon2":
-            ph = argon2.PasswordHasher(
-                time_cost=3,  # Number of iterations
-                memory_cost=65536,  # 64MB
-                parallelism=4,  # Number of parallel threads
-                hash_len=32,  # Length of the hash in bytes
-                salt_len=16  # Length of the salt in bytes
-            )
-            return ph.hash(password)
-        elif self.algorithm == "bcrypt":
-            salt = bcrypt.gensalt(rounds=12)
-            return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
-        else:
-            raise ConfigurationError(f"Unsupported password hashing algorithm: {self.algorithm}")
+        return _hash_password(self.algorithm, password)
     
     def verify_password(self, password: str, password_hash: str) -> bool:
         """
@@ -173,17 +248,149 @@ class PasswordManager:
         Returns:
             True if password matches hash, False otherwise
         """
+        return _verify_password(self.algorithm, password, password_hash)
+    
+    def submit_hash_password(self, password: str) -> concurrent.futures.Future:
+        """
+        Hash a password on the worker pool.
+        
+        Args:
+            password: Plain text password to hash
+            
+        Returns:
+            Future resolving to the hashed password
+            
+        Raises:
+            AuthenticationError: If the pool already has max_pending operations
+        """
+        return self._submit(_hash_password, self.algorithm, password)
+    
+    def submit_verify_password(self, password: str, password_hash: str) -> concurrent.futures.Future:
+        """
+        Verify a password against a hash on the worker pool.
+        
+        Args:
+            password: Plain text password to verify
+            password_hash: Hashed password to verify against
+            
+        Returns:
+            Future resolving to True if password matches hash, False otherwise
+            
+        Raises:
+            AuthenticationError: If the pool already has max_pending operations
+        """
+        return self._submit(_verify_password, self.algorithm, password, password_hash)
+    
+    async def hash_password_async(self, password: str) -> str:
+        """
+        Hash a password without blocking the event loop.
+        
+        Args:
+            password: Plain text password to hash
+            
+        Returns:
+            Hashed password
+        """
+        return await asyncio.wrap_future(self.submit_hash_password(password))
+    
+    async def verify_password_async(self, password: str, password_hash: str) -> bool:
+        """
+        Verify a password against a hash without blocking the event loop.
+        
+        Args:
+            password: Plain text password to verify
+            password_hash: Hashed password to verify against
+            
+        Returns:
+            True if password matches hash, False otherwise
+        """
+        return await asyncio.wrap_future(self.submit_verify_password(password, password_hash))
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get worker pool statistics.
+        
+        Returns:
+            Dictionary with queue depth, in-flight operations and totals
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            pending = self._pending
+            
+        finished = stats["completed"] + stats["failed"]
+        stats.update({
+            "pending": pending,
+            "in_flight": min(pending, self.max_workers),
+            "queue_depth": max(0, pending - self.max_workers),
+            "max_workers": self.max_workers,
+            "max_queue": self.max_pending,
+            "executor": "process" if self.use_processes else "thread",
+            "average_seconds": stats["total_seconds"] / finished if finished else 0.0
+        })
+        return stats
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the worker pool.
+        
+        Args:
+            wait: Whether to wait for pending operations to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+    
+    def _submit(self, fn: Callable, *args) -> concurrent.futures.Future:
+        """
+        Submit an operation to the worker pool.
+        
+        Args:
+            fn: Module-level function to run
+            *args: Arguments for the function
+            
+        Returns:
+            Future for the operation
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise AuthenticationError("Password hashing queue is full", auth_method="password")
+            
+            if self._executor is None:
+                if self.use_processes:
+                    self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hash"
+                    )
+                    
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_pending"] = max(self._stats["max_pending"], self._pending)
+            executor = self._executor
+            
+        submitted_at = time.monotonic()
         try:
-            if self.algorithm == "argon2":
-                ph = argon2.PasswordHasher()
-                ph.verify(password_hash, password)
-                return True
-            elif self.algorithm == "bcrypt":
-                return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
-            else:
-                raise ConfigurationError(f"Unsupported password hashing algorithm: {self.algorithm}")
-        except (argon2.exceptions.VerifyMismatchError, ValueError):
-            return False
+            future = executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._stats["failed"] += 1
+            raise
+            
+        def on_done(done: concurrent.futures.Future) -> None:
+            with self._lock:
+                self._pending -= 1
+                self._stats["total_seconds"] += time.monotonic() - submitted_at
+                if done.cancelled() or done.exception() is not None:
+                    self._stats["failed"] += 1
+                else:
+                    self._stats["completed"] += 1
+                    
+        future.add_done_callback(on_done)
+        return future
     
     def needs_rehash(self, password_hash: str) -> bool:
         """
@@ -302,19 +509,39 @@ class AuthenticationManager:
     """
     Manages user authentication, including registration, login, and session management.
     """
-    def __init__(self, event_manager: EventManager = None):
+    def __init__(self, event_manager: EventManager = None, password_manager: PasswordManager = None):
         self.users: Dict[str, User] = {}  # user_id -> User
         self.username_index: Dict[str, str] = {}  # username -> user_id
         self.email_index: Dict[str, str] = {}  # email -> user_id
-        self.sessions: Dict[str, Session] = {}  # session_id -> Session
-        self.user_sessions: Dict[str, List[str]] = {}  # user_id -> [session_id]
-        self.password_manager = PasswordManager()
+        self.session_store = SessionStore()
+        self.sessions: Dict[str, Session] = self.session_store.sessions  # session_id -> Session
+        self.user_sessions: Dict[str, List[str]] = self.session_store.user_sessions  # user_id -> [session_id]
+        self.password_manager = password_manager or PasswordManager()
         self.event_manager = event_manager or EventManager()
         
-        # Rate limiting for login attempts
-        self.login_attempts: Dict[str, List[float]] = {}  # username/ip -> [timestamp]
-        self.max_login_attempts = 5  # Maximum number of failed login attempts
-        self.login_lockout_time = 300  # Lockout time in seconds (5 minutes)
+        # Rate limiting for login attempts (username/ip -> sliding window counter)
+        self.login_attempts = LoginAttemptLimiter(
+            window_seconds=300,  # Lockout time in seconds (5 minutes)
+            max_attempts=5  # Maximum number of failed login attempts
+        )
+    
+    @property
+    def max_login_attempts(self) -> int:
+        """Maximum number of failed login attempts."""
+        return self.login_attempts.max_attempts
+    
+    @max_login_attempts.setter
+    def max_login_attempts(self, value: int) -> None:
+        self.login_attempts.max_attempts = value
+    
+    @property
+    def login_lockout_time(self) -> float:
+        """Lockout time in seconds."""
+        return self.login_attempts.window_seconds
+    
+    @login_lockout_time.setter
+    def login_lockout_time(self, value: float) -> None:
+        self.login_attempts.window_seconds = value
         
     def register_user(
         self,
@@ -396,24 +623,51 @@ class AuthenticationManager:
         Returns:
             Tuple of (success, user, error_message)
         """
-        # Check rate limiting
-        rate_limit_key = f"{username_or_email.lower()}:{ip_address or 'unknown'}"
-        if self._is_rate_limited(rate_limit_key):
-            return False, None, "Too many failed login attempts. Please try again later."
+        rate_limit_key, user, error_message = self._begin_authentication(username_or_email, ip_address)
+        if error_message:
+            return False, None, error_message
         
-        # Find the user
-        user = self._find_user_by_username_or_email(username_or_email)
-        if not user:
+        # Verify password
+        if not self.password_manager.verify_password(password, user.password_hash):
             # Record failed attempt
             self._record_login_attempt(rate_limit_key, success=False)
             return False, None, "Invalid username or password"
         
-        # Check if user is active
-        if not user.is_active:
-            return False, None, "Account is disabled"
+        # Check if password needs rehashing
+        if self.password_manager.needs_rehash(user.password_hash):
+            # Update password hash with new algorithm/parameters
+            user.password_hash = self.password_manager.hash_password(password)
+        
+        return self._complete_authentication(user, rate_limit_key, ip_address, user_agent)
+    
+    async def authenticate_user_async(
+        self,
+        username_or_email: str,
+        password: str,
+        ip_address: str = None,
+        user_agent: str = None
+    ) -> Tuple[bool, Optional[User], Optional[str]]:
+        """
+        Authenticate a user without blocking the event loop.
+        
+        Password verification and rehashing run on the password manager's
+        worker pool.
+        
+        Args:
+            username_or_email: Username or email to authenticate
+            password: Plain text password
+            ip_address: IP address of the client
+            user_agent: User agent of the client
+            
+        Returns:
+            Tuple of (success, user, error_message)
+        """
+        rate_limit_key, user, error_message = self._begin_authentication(username_or_email, ip_address)
+        if error_message:
+            return False, None, error_message
         
         # Verify password
-        if not self.password_manager.verify_password(password, user.password_hash):
+        if not await self.password_manager.verify_password_async(password, user.password_hash):
             # Record failed attempt
             self._record_login_attempt(rate_limit_key, success=False)
             return False, None, "Invalid username or password"
@@ -421,8 +675,62 @@ class AuthenticationManager:
         # Check if password needs rehashing
         if self.password_manager.needs_rehash(user.password_hash):
             # Update password hash with new algorithm/parameters
-            user.password_hash = self.password_manager.hash_password(password)
+            user.password_hash = await self.password_manager.hash_password_async(password)
+        
+        return self._complete_authentication(user, rate_limit_key, ip_address, user_agent)
+    
+    def _begin_authentication(
+        self,
+        username_or_email: str,
+        ip_address: str = None
+    ) -> Tuple[str, Optional[User], Optional[str]]:
+        """
+        Run the checks that precede password verification.
+        
+        Args:
+            username_or_email: Username or email to authenticate
+            ip_address: IP address of the client
+            
+        Returns:
+            Tuple of (rate_limit_key, user, error_message)
+        """
+        # Check rate limiting
+        rate_limit_key = f"{username_or_email.lower()}:{ip_address or 'unknown'}"
+        if self._is_rate_limited(rate_limit_key):
+            return rate_limit_key, None, "Too many failed login attempts. Please try again later."
+        
+        # Find the user
+        user = self._find_user_by_username_or_email(username_or_email)
+        if not user:
+            # Record failed attempt
+            self._record_login_attempt(rate_limit_key, success=False)
+            return rate_limit_key, None, "Invalid username or password"
+        
+        # Check if user is active
+        if not user.is_active:
+            return rate_limit_key, None, "Account is disabled"
         
+        return rate_limit_key, user, None
+    
+    def _complete_authentication(
+        self,
+        user: User,
+        rate_limit_key: str,
+        ip_address: str = None,
+        user_agent: str = None
+    ) -> Tuple[bool, Optional[User], Optional[str]]:
+        """
+        Record a successful authentication.
+        
+        Args:
+            user: Authenticated user
+            rate_limit_key: Rate limiting key of the attempt
+            ip_address: IP address of the client
+            user_agent: User agent of the client
+            
+        Returns:
+            Tuple of (success, user, error_message)
+        """
         # Update last login time
         user.last_login = datetime.now()
         
@@ -470,13 +778,8 @@ class AuthenticationManager:
             metadata=metadata
         )
         
-        # Store the session
-        self.sessions[session.session_id] = session
-        
-        # Add to user sessions
-        if user.user_id not in self.user_sessions:
-            self.user_sessions[user.user_id] = []
-        self.user_sessions[user.user_id].append(session.session_id)
+        # Store the session and index it by user and expiration time
+        self.session_store.add(session)
         
         # Emit session created event
         self.event_manager.emit_event("session.created", {
@@ -566,11 +869,8 @@ class AuthenticationManager:
         Returns:
             Number of sessions invalidated
         """
-        if user_id not in self.user_sessions:
-            return 0
-        
         count = 0
-        for session_id in self.user_sessions[user_id]:
+        for session_id in self.session_store.get_user_session_ids(user_id):
             if self.invalidate_session(session_id):
                 count += 1
         
@@ -825,22 +1125,27 @@ class AuthenticationManager:
         return [self.sessions[session_id] for session_id in self.user_sessions[user_id]
                 if session_id in self.sessions]
     
-    def cleanup_expired_sessions(self) -> int:
+    def cleanup_expired_sessions(self, max_sessions: int = None, purge: bool = True) -> int:
         """
         Clean up expired sessions.
         
+        Only sessions that expired since the previous cleanup are visited, so
+        this can be called frequently with a max_sessions budget to spread
+        the work out.
+        
+        Args:
+            max_sessions: Maximum number of sessions to clean up in this call
+            purge: Whether to remove the sessions expired by this call; pass False to only deactivate them
+            
         Returns:
             Number of sessions cleaned up
         """
-        count = 0
-        current_time = datetime.now()
+        expired = self.session_store.expire_sessions(max_sessions=max_sessions, purge=purge)
         
-        for session_id, session in list(self.sessions.items()):
-            if session.expires_at < current_time:
-                session.is_active = False
-                count += 1
+        # Drop rate limiting state for keys with no recent failures
+        self.login_attempts.prune()
         
-        return count
+        return len(expired)
     
     def _find_user_by_username_or_email(self, username_or_email: str) -> Optional[User]:
         """
@@ -870,19 +1175,7 @@ class AuthenticationManager:
         Returns:
             True if rate limited, False otherwise
         """
-        if key not in self.login_attempts:
-            return False
-        
-        # Get attempts within the lockout window
-        current_time = time.time()
-        recent_attempts = [t for t in self.login_attempts[key]
-                          if current_time - t < self.login_lockout_time]
-        
-        # Update attempts list
-        self.login_attempts[key] = recent_attempts
-        
-        # Check if too many attempts
-        return len(recent_attempts) >= self.max_login_attempts
+        return self.login_attempts.is_limited(key)
     
     def _record_login_attempt(self, key: str, success: bool) -> None:
         """
@@ -894,12 +1187,8 @@ class AuthenticationManager:
         """
         if success:
             # Clear attempts on success
-            if key in self.login_attempts:
-                del self.login_attempts[key]
+            self.login_attempts.reset(key)
             return
         
         # Record failed attempt
-        if key not in self.login_attempts:
-            self.login_attempts[key] = []
-        
-        self.login_attempts[key].append(time.time())
+        self.login_attempts.record_failure(key)
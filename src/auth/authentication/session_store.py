@@ -0,0 +1,278 @@
+"""
+Session storage for ApexAgent authentication.
+
+This module provides the in-memory session store used by the
+AuthenticationManager, with an expiry index so that housekeeping only
+touches sessions that have actually expired, and sliding-window counters
+for login attempt rate limiting.
+"""
+
+import heapq
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from src.auth.authentication.auth_manager import Session
+
+
+class SessionStore:
+    """
+    In-memory session store with a min-heap expiry index.
+
+    Sessions are indexed by ID and by user. Each stored session also has an
+    entry in a heap ordered by expiration time, so expired sessions are found
+    by popping the heap rather than scanning every session. Heap entries are
+    deleted lazily: an entry whose session was removed or whose expiration
+    time changed is skipped when popped.
+    """
+    def __init__(self):
+        self.sessions: Dict[str, "Session"] = {}  # session_id -> Session
+        self.user_sessions: Dict[str, List[str]] = {}  # user_id -> [session_id]
+        self._expiry_heap: List[Tuple[float, str]] = []  # (expires_at timestamp, session_id)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+    def add(self, session: "Session") -> None:
+        """
+        Add a session to the store.
+
+        Args:
+            session: Session to add
+        """
+        with self._lock:
+            self.sessions[session.session_id] = session
+            self.user_sessions.setdefault(session.user_id, []).append(session.session_id)
+            heapq.heappush(self._expiry_heap, (session.expires_at.timestamp(), session.session_id))
+
+    def get(self, session_id: str) -> Optional["Session"]:
+        """
+        Get a session by ID.
+
+        Args:
+            session_id: Session ID to get
+
+        Returns:
+            Session object or None if not found
+        """
+        return self.sessions.get(session_id)
+
+    def get_user_session_ids(self, user_id: str) -> List[str]:
+        """
+        Get the IDs of all sessions for a user.
+
+        Args:
+            user_id: User ID to get sessions for
+
+        Returns:
+            List of session IDs
+        """
+        with self._lock:
+            return list(self.user_sessions.get(user_id, []))
+
+    def reschedule(self, session: "Session") -> None:
+        """
+        Update the expiry index after a session's expiration time changed.
+
+        Args:
+            session: Session whose expires_at was changed
+        """
+        with self._lock:
+            if session.session_id in self.sessions:
+                heapq.heappush(self._expiry_heap, (session.expires_at.timestamp(), session.session_id))
+
+    def remove(self, session_id: str) -> Optional["Session"]:
+        """
+        Remove a session from the store.
+
+        Args:
+            session_id: Session ID to remove
+
+        Returns:
+            Removed Session object or None if not found
+        """
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+            if session is None:
+                return None
+
+            session_ids = self.user_sessions.get(session.user_id)
+            if session_ids is not None:
+                session_ids.remove(session_id)
+                if not session_ids:
+                    del self.user_sessions[session.user_id]
+
+            return session
+
+    def expire_sessions(
+        self,
+        now: datetime = None,
+        max_sessions: int = None,
+        purge: bool = True
+    ) -> List["Session"]:
+        """
+        Deactivate sessions whose expiration time has passed and remove them.
+
+        Args:
+            now: Current time (defaults to now)
+            max_sessions: Maximum number of sessions to expire in this call
+            purge: Whether to remove expired sessions from the store; without
+                purging they stay in the store, deactivated, until removed
+
+        Returns:
+            List of sessions expired by this call
+        """
+        current_time = (now or datetime.now()).timestamp()
+        expired = []
+
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < current_time:
+                if max_sessions is not None and len(expired) >= max_sessions:
+                    break
+
+                expires_at, session_id = heapq.heappop(self._expiry_heap)
+                session = self.sessions.get(session_id)
+
+                # Skip entries for removed sessions or superseded expiration times
+                if session is None or session.expires_at.timestamp() != expires_at:
+                    continue
+
+                session.is_active = False
+                expired.append(session)
+
+                if purge:
+                    self.remove(session_id)
+
+        return expired
+
+    def next_expiration(self) -> Optional[float]:
+        """
+        Get the earliest pending expiration time.
+
+        Returns:
+            Timestamp of the earliest expiration or None if no sessions are pending
+        """
+        with self._lock:
+            return self._expiry_heap[0][0] if self._expiry_heap else None
+
+
+class LoginAttemptLimiter:
+    """
+    Sliding-window counters for failed login attempts.
+
+    Each key keeps only the timestamps of its last max_attempts failures in
+    a bounded ring, which is all that is needed to tell whether max_attempts
+    failures fall inside the window. Checks and updates are therefore O(1)
+    per key regardless of the number of attempts. Keys are kept in order of
+    last failure so idle keys can be pruned from the front.
+    """
+    def __init__(self, window_seconds: float = 300, max_attempts: int = 5):
+        self.window_seconds = window_seconds
+        self.max_attempts = max_attempts
+        self._attempts: "OrderedDict[str, deque]" = OrderedDict()  # key -> recent failure timestamps
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._attempts)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._attempts
+
+    def get_count(self, key: str, now: float = None) -> int:
+        """
+        Get the number of recent failed attempts in the window.
+
+        Counts at most max_attempts failures.
+
+        Args:
+            key: Key to check
+            now: Current time in seconds (defaults to now)
+
+        Returns:
+            Number of attempts in the window ending now
+        """
+        current_time = time.time() if now is None else now
+
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if not attempts:
+                return 0
+            return sum(1 for t in attempts if current_time - t < self.window_seconds)
+
+    def is_limited(self, key: str, now: float = None) -> bool:
+        """
+        Check if a key is rate limited.
+
+        Args:
+            key: Key to check
+            now: Current time in seconds (defaults to now)
+
+        Returns:
+            True if rate limited, False otherwise
+        """
+        current_time = time.time() if now is None else now
+
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None or len(attempts) < self.max_attempts:
+                return False
+            # Limited when the oldest of the last max_attempts failures is still in the window
+            return current_time - attempts[-self.max_attempts] < self.window_seconds
+
+    def record_failure(self, key: str, now: float = None) -> None:
+        """
+        Record a failed attempt.
+
+        Args:
+            key: Key to record attempt for
+            now: Current time in seconds (defaults to now)
+        """
+        current_time = time.time() if now is None else now
+
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None or attempts.maxlen != self.max_attempts:
+                attempts = self._attempts[key] = deque(attempts or (), maxlen=self.max_attempts)
+            self._attempts.move_to_end(key)
+            attempts.append(current_time)
+
+    def reset(self, key: str) -> None:
+        """
+        Clear the attempts for a key.
+
+        Args:
+            key: Key to clear
+        """
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def prune(self, now: float = None) -> int:
+        """
+        Remove keys with no attempts in the window.
+
+        Args:
+            now: Current time in seconds (defaults to now)
+
+        Returns:
+            Number of keys removed
+        """
+        current_time = time.time() if now is None else now
+        count = 0
+
+        with self._lock:
+            # Keys are ordered by last failure, so stop at the first recent one
+            while self._attempts:
+                key, attempts = next(iter(self._attempts.items()))
+                if current_time - attempts[-1] < self.window_seconds:
+                    break
+                del self._attempts[key]
+                count += 1
+
+        return count
@@ -7,8 +7,9 @@ including role-based access control, permission management, and access enforceme
 
 import uuid
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List, Set, Optional, Any, Tuple
+from typing import Dict, FrozenSet, List, Set, Optional, Any, Tuple
 
 from src.core.error_handling.errors import AuthorizationError
 from src.core.event_system.event_manager import EventManager
@@ -252,6 +253,13 @@ class AuthorizationManager:
         self.role_name_index: Dict[str, str] = {}  # role_name -> role_id
         self.user_roles_index: Dict[str, List[str]] = {}  # user_id -> [assignment_id]
         
+        # Effective permission caches, invalidated by authorization events
+        self._role_closure: Dict[str, FrozenSet[str]] = {}  # role_id -> role and all ancestor role IDs
+        self._role_permissions: Dict[str, FrozenSet[str]] = {}  # role_id -> flattened permission IDs
+        self._user_cache: Dict[str, Tuple[FrozenSet[str], FrozenSet[str], Optional[datetime]]] = {}  # user_id -> (role IDs, permission IDs, valid until)
+        self._cache_lock = threading.RLock()
+        self._cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        
         self.event_manager = event_manager or EventManager()
         
         # Initialize system roles and permissions
@@ -371,6 +379,174 @@ class AuthorizationManager:
         self.register_role(user_manager_role)
         self.register_role(user_role)
     
+    def _emit_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Apply an authorization event to the permission caches and emit it.
+        
+        Args:
+            event_type: Event type
+            data: Event data
+        """
+        self.handle_authorization_event(event_type, data)
+        self.event_manager.emit_event(event_type, data)
+    
+    def handle_authorization_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """
+        Invalidate cached effective permissions affected by an authorization event.
+        
+        Assignment events only affect the assigned user; role and permission
+        events can change any user's effective permissions.
+        
+        Args:
+            event_type: Event type (e.g. "role.assigned", "role.updated")
+            data: Event data
+        """
+        if event_type in ("role.assigned", "role.revoked"):
+            self.invalidate_permission_cache(data.get("user_id"))
+        elif event_type.startswith("role.") or event_type.startswith("permission."):
+            self.invalidate_permission_cache()
+    
+    def invalidate_permission_cache(self, user_id: str = None) -> None:
+        """
+        Invalidate cached effective permissions.
+        
+        Args:
+            user_id: User ID to invalidate, or None to invalidate all users and role closures
+        """
+        with self._cache_lock:
+            self._cache_stats["invalidations"] += 1
+            if user_id is None:
+                self._role_closure = {}
+                self._role_permissions = {}
+                self._user_cache = {}
+            else:
+                self._user_cache.pop(user_id, None)
+    
+    def _get_role_closure(self, role_id: str) -> FrozenSet[str]:
+        """
+        Get a role and all of its ancestor roles. Caller holds the cache lock.
+        
+        Args:
+            role_id: Role ID
+            
+        Returns:
+            Frozen set of role IDs
+        """
+        closure = self._role_closure.get(role_id)
+        if closure is not None:
+            return closure
+        
+        # Iterative walk; tolerates cycles and missing parents
+        visited = set()
+        stack = [role_id]
+        while stack:
+            current_role_id = stack.pop()
+            if current_role_id in visited:
+                continue
+            role = self.roles.get(current_role_id)
+            if not role:
+                continue
+            visited.add(current_role_id)
+            stack.extend(role.parent_roles)
+        
+        closure = frozenset(visited)
+        self._role_closure[role_id] = closure
+        return closure
+    
+    def _get_role_permissions(self, role_id: str) -> FrozenSet[str]:
+        """
+        Get the flattened permission IDs of a role and its ancestors. Caller holds the cache lock.
+        
+        Args:
+            role_id: Role ID
+            
+        Returns:
+            Frozen set of permission IDs
+        """
+        permission_ids = self._role_permissions.get(role_id)
+        if permission_ids is None:
+            permission_ids = frozenset(
+                permission_id
+                for closure_role_id in self._get_role_closure(role_id)
+                for permission_id in self.roles[closure_role_id].permissions
+                if permission_id in self.permissions
+            )
+            self._role_permissions[role_id] = permission_ids
+        return permission_ids
+    
+    def _get_effective_access(self, user_id: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Get a user's active role IDs and effective permission IDs.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Tuple of (directly assigned active role IDs, effective permission IDs)
+        """
+        now = datetime.now()
+        with self._cache_lock:
+            entry = self._user_cache.get(user_id)
+            if entry is not None and (entry[2] is None or now <= entry[2]):
+                self._cache_stats["hits"] += 1
+                return entry[0], entry[1]
+            
+            self._cache_stats["misses"] += 1
+            
+            role_ids = set()
+            valid_until = None
+            for assignment_id in self.user_roles_index.get(user_id, ()):
+                assignment = self.user_role_assignments.get(assignment_id)
+                if assignment and assignment.is_active and not assignment.is_expired() and assignment.role_id in self.roles:
+                    role_ids.add(assignment.role_id)
+                    # Recompute once the earliest assignment expires
+                    if assignment.expires_at and (valid_until is None or assignment.expires_at < valid_until):
+                        valid_until = assignment.expires_at
+            
+            permission_ids = frozenset().union(*(self._get_role_permissions(role_id) for role_id in role_ids))
+            role_ids = frozenset(role_ids)
+            self._user_cache[user_id] = (role_ids, permission_ids, valid_until)
+            return role_ids, permission_ids
+    
+    def get_effective_permission_ids(self, user_id: str) -> FrozenSet[str]:
+        """
+        Get the IDs of all permissions granted to a user through their roles.
+        
+        Args:
+            user_id: User ID to get permissions for
+            
+        Returns:
+            Frozen set of permission IDs
+        """
+        return self._get_effective_access(user_id)[1]
+    
+    def has_permission_id(self, user_id: str, permission_id: str) -> bool:
+        """
+        Check if a user has a permission, by permission ID.
+        
+        Args:
+            user_id: User ID to check
+            permission_id: Permission ID to check
+            
+        Returns:
+            True if user has the permission, False otherwise
+        """
+        return permission_id in self._get_effective_access(user_id)[1]
+    
+    def get_permission_cache_stats(self) -> Dict[str, int]:
+        """
+        Get effective permission cache statistics.
+        
+        Returns:
+            Dictionary with hit, miss and invalidation counts and cache sizes
+        """
+        with self._cache_lock:
+            return {
+                **self._cache_stats,
+                "cached_users": len(self._user_cache),
+                "cached_roles": len(self._role_permissions)
+            }
+    
     def register_permission(self, permission: Permission) -> Permission:
         """
         Register a new permission.
@@ -393,7 +569,7 @@ class AuthorizationManager:
         self.permission_name_index[permission.name] = permission.permission_id
         
         # Emit permission registered event
-        self.event_manager.emit_event("permission.registered", {
+        self._emit_event("permission.registered", {
             "permission_id": permission.permission_id,
             "name": permission.name,
             "timestamp": datetime.now().isoformat()
@@ -433,7 +609,7 @@ class AuthorizationManager:
         self.role_name_index[role.name] = role.role_id
         
         # Emit role registered event
-        self.event_manager.emit_event("role.registered", {
+        self._emit_event("role.registered", {
             "role_id": role.role_id,
             "name": role.name,
             "timestamp": datetime.now().isoformat()
@@ -487,7 +663,7 @@ class AuthorizationManager:
         self.user_roles_index[user_id].append(assignment.assignment_id)
         
         # Emit role assigned event
-        self.event_manager.emit_event("role.assigned", {
+        self._emit_event("role.assigned", {
             "assignment_id": assignment.assignment_id,
             "user_id": user_id,
             "role_id": role_id,
@@ -526,7 +702,7 @@ class AuthorizationManager:
                 revoked = True
                 
                 # Emit role revoked event
-                self.event_manager.emit_event("role.revoked", {
+                self._emit_event("role.revoked", {
                     "assignment_id": assignment_id,
                     "user_id": user_id,
                     "role_id": role_id,
@@ -568,34 +744,7 @@ class AuthorizationManager:
         Returns:
             List of Permission objects
         """
-        # Get all roles assigned to the user
-        roles = self.get_user_roles(user_id)
-        
-        # Get all permissions from roles and their parent roles
-        permission_ids = set()
-        processed_roles = set()
-        
-        def collect_role_permissions(role_id: str) -> None:
-            """Recursively collect permissions from a role and its parent roles."""
-            if role_id in processed_roles:
-                return
-            
-            processed_roles.add(role_id)
-            role = self.roles.get(role_id)
-            if not role:
-                return
-            
-            # Add direct permissions
-            for permission_id in role.permissions:
-                permission_ids.add(permission_id)
-            
-            # Add parent role permissions
-            for parent_role_id in role.parent_roles:
-                collect_role_permissions(parent_role_id)
-        
-        # Collect permissions from all roles
-        for role in roles:
-            collect_role_permissions(role.role_id)
+        permission_ids = self.get_effective_permission_ids(user_id)
         
         # Convert permission IDs to Permission objects
         return [self.permissions[pid] for pid in permission_ids if pid in self.permissions]
@@ -616,11 +765,8 @@ class AuthorizationManager:
         if not permission_id:
             return False
         
-        # Get all user permissions
-        user_permissions = self.get_user_permissions(user_id)
-        
-        # Check if the permission is in the user's permissions
-        return any(p.permission_id == permission_id for p in user_permissions)
+        # Check the user's cached effective permissions
+        return self.has_permission_id(user_id, permission_id)
     
     def has_role(self, user_id: str, role_name: str) -> bool:
         """
@@ -638,11 +784,8 @@ class AuthorizationManager:
         if not role_id:
             return False
         
-        # Get all user roles
-        user_roles = self.get_user_roles(user_id)
-        
-        # Check if the role is in the user's roles
-        return any(r.role_id == role_id for r in user_roles)
+        # Check the user's cached active roles
+        return role_id in self._get_effective_access(user_id)[0]
     
     def check_permission(self, user_id: str, permission_name: str) -> None:
         """
@@ -717,7 +860,7 @@ class AuthorizationManager:
             permission.metadata.update(metadata)
         
         # Emit permission updated event
-        self.event_manager.emit_event("permission.updated", {
+        self._emit_event("permission.updated", {
             "permission_id": permission_id,
             "timestamp": datetime.now().isoformat()
         })
@@ -804,7 +947,7 @@ class AuthorizationManager:
             role.metadata.update(metadata)
         
         # Emit role updated event
-        self.event_manager.emit_event("role.updated", {
+        self._emit_event("role.updated", {
             "role_id": role_id,
             "timestamp": datetime.now().isoformat()
         })
@@ -843,7 +986,7 @@ class AuthorizationManager:
         del self.permissions[permission_id]
         
         # Emit permission deleted event
-        self.event_manager.emit_event("permission.deleted", {
+        self._emit_event("permission.deleted", {
             "permission_id": permission_id,
             "timestamp": datetime.now().isoformat()
         })
@@ -886,7 +1029,7 @@ class AuthorizationManager:
         del self.roles[role_id]
         
         # Emit role deleted event
-        self.event_manager.emit_event("role.deleted", {
+        self._emit_event("role.deleted", {
             "role_id": role_id,
             "timestamp": datetime.now().isoformat()
         })
@@ -10,6 +10,8 @@ import json
 import uuid
 import logging
 import secrets
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Set, Callable
 
@@ -263,7 +265,8 @@ class DynamicPermissionRule:
         description: str = None,
         priority: int = 0,
         is_active: bool = True,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        context_keys: List[str] = None
     ):
         self.rule_id = rule_id or str(uuid.uuid4())
         self.permission_id = permission_id
@@ -273,6 +276,8 @@ class DynamicPermissionRule:
         self.priority = priority
         self.is_active = is_active
         self.metadata = metadata or {}
+        # Context attributes the condition depends on; None means the result is not cacheable
+        self.context_keys = tuple(context_keys) if context_keys is not None else None
         
     def evaluate(self, context: Dict[str, Any]) -> bool:
         """
@@ -301,7 +306,8 @@ class EnhancedRBACManager:
     def __init__(
         self,
         base_rbac_manager: AuthorizationManager = None,
-        event_manager: EventManager = None
+        event_manager: EventManager = None,
+        decision_cache_size: int = 0
     ):
         self.base_rbac_manager = base_rbac_manager or AuthorizationManager()
         self.event_manager = event_manager or EventManager()
@@ -322,6 +328,13 @@ class EnhancedRBACManager:
         self.dynamic_rules: Dict[str, DynamicPermissionRule] = {}  # rule_id -> DynamicPermissionRule
         self.permission_rules: Dict[str, List[str]] = {}  # permission_id -> [rule_id]
         self.resource_type_rules: Dict[str, List[str]] = {}  # resource_type -> [rule_id]
+        self.rule_index: Dict[Tuple[str, str], List[DynamicPermissionRule]] = {}  # (permission_id, resource_type) -> rules by priority
+        
+        # Optional rule decision cache: (permission_id, resource_type, context values) -> decision
+        self.decision_cache_size = decision_cache_size
+        self._decision_cache: "OrderedDict[Tuple, bool]" = OrderedDict()
+        self._decision_cache_lock = threading.Lock()
+        self._decision_cache_stats = {"hits": 0, "misses": 0}
         
     def register_resource_ownership(
         self,
@@ -482,7 +495,7 @@ class EnhancedRBACManager:
         """
         # Verify delegator has the permissions
         for permission_id in permissions:
-            if not self.base_rbac_manager.has_permission(delegator_id, permission_id):
+            if not self.base_rbac_manager.has_permission_id(delegator_id, permission_id):
                 raise AuthorizationError(f"Delegator does not have permission: {permission_id}")
         
         # Calculate expiration time if provided
@@ -816,7 +829,8 @@ class EnhancedRBACManager:
         condition: Callable[[Dict[str, Any]], bool],
         description: str = None,
         priority: int = 0,
-        metadata: Dict[str, Any] = None
+        metadata: Dict[str, Any] = None,
+        context_keys: List[str] = None
     ) -> DynamicPermissionRule:
         """
         Register a dynamic permission rule.
@@ -828,6 +842,8 @@ class EnhancedRBACManager:
             description: Optional description of the rule
             priority: Priority of the rule (higher values take precedence)
             metadata: Additional metadata
+            context_keys: Context attributes the condition reads; declaring them lets
+                decisions be cached when the decision cache is enabled
             
         Returns:
             DynamicPermissionRule object
@@ -839,12 +855,21 @@ class EnhancedRBACManager:
             condition=condition,
             description=description,
             priority=priority,
-            metadata=metadata
+            metadata=metadata,
+            context_keys=context_keys
         )
         
         # Store rule
         self.dynamic_rules[rule.rule_id] = rule
         
+        # Keep the rules for this permission and resource type sorted by priority (stable for ties)
+        index_key = (permission_id, resource_type)
+        rules = list(self.rule_index.get(index_key, ()))
+        rules.append(rule)
+        rules.sort(key=lambda r: r.priority, reverse=True)
+        self.rule_index[index_key] = rules
+        self.invalidate_decision_cache(permission_id, resource_type)
+        
         # Update indexes
         if permission_id not in self.permission_rules:
             self.permission_rules[permission_id] = []
@@ -864,6 +889,47 @@ class EnhancedRBACManager:
         
         return rule
     
+    def remove_dynamic_rule(self, rule_id: str) -> bool:
+        """
+        Remove a dynamic permission rule.
+        
+        Args:
+            rule_id: Rule ID to remove
+            
+        Returns:
+            True if the rule was removed, False if it doesn't exist
+        """
+        rule = self.dynamic_rules.pop(rule_id, None)
+        if not rule:
+            return False
+        
+        # Drop the rule from the sorted index, and the index entry once it is empty
+        index_key = (rule.permission_id, rule.resource_type)
+        rules = [r for r in self.rule_index.get(index_key, ()) if r.rule_id != rule_id]
+        if rules:
+            self.rule_index[index_key] = rules
+        else:
+            self.rule_index.pop(index_key, None)
+        self.invalidate_decision_cache(rule.permission_id, rule.resource_type)
+        
+        # Update indexes
+        for index, key in ((self.permission_rules, rule.permission_id), (self.resource_type_rules, rule.resource_type)):
+            rule_ids = [r for r in index.get(key, ()) if r != rule_id]
+            if rule_ids:
+                index[key] = rule_ids
+            else:
+                index.pop(key, None)
+        
+        # Emit event
+        self.event_manager.emit_event("rbac.dynamic_rule_removed", {
+            "rule_id": rule_id,
+            "permission_id": rule.permission_id,
+            "resource_type": rule.resource_type,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+        return True
+    
     def evaluate_permission(
         self,
         user_id: str,
@@ -901,7 +967,7 @@ class EnhancedRBACManager:
             return True
             
         # Check base RBAC permissions
-        has_base_permission = self.base_rbac_manager.has_permission(user_id, permission_id)
+        has_base_permission = self.base_rbac_manager.has_permission_id(user_id, permission_id)
         
         # Check delegated permissions
         delegated_permissions = self.get_delegated_permissions(user_id, resource_type, resource_id)
@@ -909,45 +975,96 @@ class EnhancedRBACManager:
         
         # If user has the permission through base RBAC or delegation, apply dynamic rules
         if has_base_permission or has_delegated_permission:
-            # Get applicable rules
-            applicable_rules = []
-            
-            # Add permission-specific rules
-            if permission_id in self.permission_rules:
-                for rule_id in self.permission_rules[permission_id]:
-                    if rule_id in self.dynamic_rules:
-                        rule = self.dynamic_rules[rule_id]
-                        if rule.is_active and rule.resource_type == resource_type:
-                            applicable_rules.append(rule)
-            
-            # Add resource type rules
-            if resource_type in self.resource_type_rules:
-                for rule_id in self.resource_type_rules[resource_type]:
-                    if rule_id in self.dynamic_rules:
-                        rule = self.dynamic_rules[rule_id]
-                        if rule.is_active and rule.permission_id == permission_id:
-                            # Avoid duplicates
-                            if not any(r.rule_id == rule.rule_id for r in applicable_rules):
-                                applicable_rules.append(rule)
+            # Evaluate the pre-sorted rules for this permission and resource type
+            rules_result = self._evaluate_rules(permission_id, resource_type, eval_context)
             
             # If no rules apply, return the base permission
-            if not applicable_rules:
+            if rules_result is None:
                 return has_base_permission or has_delegated_permission
             
-            # Sort rules by priority (descending)
-            applicable_rules.sort(key=lambda r: r.priority, reverse=True)
-            
-            # Evaluate rules
-            for rule in applicable_rules:
-                if rule.evaluate(eval_context):
-                    return True
-            
-            # If no rules match, deny access
-            return False
+            return rules_result
         
         # User doesn't have the permission through base RBAC or delegation
         return False
     
+    def _evaluate_rules(
+        self,
+        permission_id: str,
+        resource_type: str,
+        context: Dict[str, Any]
+    ) -> Optional[bool]:
+        """
+        Evaluate the dynamic rules for a permission and resource type.
+        
+        Args:
+            permission_id: Permission ID
+            resource_type: Resource type
+            context: Context for rule evaluation
+            
+        Returns:
+            True if any active rule matches, False if none match, or None if no active rules apply
+        """
+        rules = [rule for rule in self.rule_index.get((permission_id, resource_type), ()) if rule.is_active]
+        if not rules:
+            return None
+        
+        # Decisions are cacheable only when every rule declares the context it reads
+        cache_key = None
+        if self.decision_cache_size > 0 and all(rule.context_keys is not None for rule in rules):
+            keys = sorted({key for rule in rules for key in rule.context_keys})
+            cache_key = (permission_id, resource_type, tuple(rule.rule_id for rule in rules),
+                         tuple((key, context.get(key)) for key in keys))
+            try:
+                hash(cache_key)
+            except TypeError:
+                cache_key = None
+        
+        if cache_key is not None:
+            with self._decision_cache_lock:
+                decision = self._decision_cache.get(cache_key)
+                if decision is not None:
+                    self._decision_cache.move_to_end(cache_key)
+                    self._decision_cache_stats["hits"] += 1
+                    return decision
+                self._decision_cache_stats["misses"] += 1
+        
+        # Rules are sorted by priority (descending); the first match grants access
+        decision = any(rule.evaluate(context) for rule in rules)
+        
+        if cache_key is not None:
+            with self._decision_cache_lock:
+                self._decision_cache[cache_key] = decision
+                while len(self._decision_cache) > self.decision_cache_size:
+                    self._decision_cache.popitem(last=False)
+        
+        return decision
+    
+    def invalidate_decision_cache(self, permission_id: str = None, resource_type: str = None) -> None:
+        """
+        Invalidate cached rule decisions.
+        
+        Args:
+            permission_id: Optional permission ID to invalidate
+            resource_type: Optional resource type to invalidate (with permission_id)
+        """
+        with self._decision_cache_lock:
+            if permission_id is None:
+                self._decision_cache.clear()
+                return
+            
+            for key in [k for k in self._decision_cache if k[0] == permission_id and (resource_type is None or k[1] == resource_type)]:
+                del self._decision_cache[key]
+    
+    def get_decision_cache_stats(self) -> Dict[str, int]:
+        """
+        Get rule decision cache statistics.
+        
+        Returns:
+            Dictionary with hit and miss counts and the cache size
+        """
+        with self._decision_cache_lock:
+            return {**self._decision_cache_stats, "size": len(self._decision_cache)}
+    
     def check_permission(
         self,
         user_id: str,
@@ -993,7 +1110,7 @@ class EnhancedRBACManager:
             List of permission IDs
         """
         # Get base permissions
-        base_permissions = [p.permission_id for p in self.base_rbac_manager.get_user_permissions(user_id)]
+        base_permissions = list(self.base_rbac_manager.get_effective_permission_ids(user_id))
         
         # Get delegated permissions
         delegated_permissions = self.get_delegated_permissions(user_id, resource_type, resource_id)
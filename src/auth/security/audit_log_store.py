@@ -0,0 +1,548 @@
+"""
+Audit Log Store module for ApexAgent.
+
+This module provides storage for security audit logs. The persistent store
+appends entries to day-partitioned JSON Lines segments and keeps per-segment
+postings on actor, resource and action so that queries read only matching
+entries, newest first, and stop as soon as the limit is reached.
+"""
+
+import os
+import json
+import logging
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Fields with secondary indexes, in the order they are intersected
+INDEXED_FIELDS = ("actor_id", "resource_id", "action")
+
+# Fields compared by equality when filtering
+FILTER_FIELDS = ("action", "actor_id", "actor_type", "resource_type", "resource_id", "result")
+
+
+def _matches(
+    log_dict: Dict[str, Any],
+    filters: Dict[str, Any],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime]
+) -> bool:
+    """
+    Check whether a serialized audit log matches query filters.
+
+    Args:
+        log_dict: Serialized audit log
+        filters: Field values to match
+        start_time: Optional start time (inclusive)
+        end_time: Optional end time (inclusive)
+
+    Returns:
+        True if the entry matches, False otherwise
+    """
+    for field, value in filters.items():
+        if log_dict.get(field) != value:
+            return False
+
+    if start_time or end_time:
+        timestamp = datetime.fromisoformat(log_dict["timestamp"])
+        if start_time and timestamp < start_time:
+            return False
+        if end_time and timestamp > end_time:
+            return False
+
+    return True
+
+
+class InMemoryAuditLogStore:
+    """
+    Bounded in-memory audit log store.
+
+    Used when no storage path is configured; the oldest entries are
+    discarded once the store is full.
+    """
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def append(self, log_dict: Dict[str, Any]) -> None:
+        """
+        Append a serialized audit log.
+
+        Args:
+            log_dict: Serialized audit log
+        """
+        with self._lock:
+            self._entries.append(log_dict)
+
+    def query(
+        self,
+        filters: Dict[str, Any],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Get matching audit logs, newest first.
+
+        Args:
+            filters: Field values to match
+            start_time: Optional start time (inclusive)
+            end_time: Optional end time (inclusive)
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of serialized audit logs
+        """
+        with self._lock:
+            entries = list(self._entries)
+
+        results = []
+        for log_dict in reversed(entries):
+            if len(results) >= limit:
+                break
+            if _matches(log_dict, filters, start_time, end_time):
+                results.append(log_dict)
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary of statistics
+        """
+        return {"backend": "memory", "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class AuditLogStore:
+    """
+    Persistent, append-only audit log store.
+
+    Entries are written once to a JSON Lines segment per day. Each segment
+    has postings (byte offsets per actor, resource and action value) that are
+    maintained on append for the active segment, persisted to a sidecar file
+    when a segment is sealed, and loaded on demand into a bounded LRU for
+    older segments. Late entries for an earlier day are appended to that
+    day's segment without sealing the active one, so segments stay ordered
+    by date. The store assumes a single writing process.
+    """
+    SEGMENT_PREFIX = "audit_"
+    SEGMENT_SUFFIX = ".jsonl"
+    INDEX_SUFFIX = ".idx.json"
+    READ_BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, storage_path: str, max_resident_segments: int = 8, fsync: bool = False):
+        """
+        Initialize the audit log store.
+
+        Args:
+            storage_path: Directory holding the audit segments
+            max_resident_segments: Maximum number of sealed segment indexes kept in memory
+            fsync: Whether to fsync each append
+        """
+        self.storage_path = storage_path
+        self.max_resident_segments = max(1, max_resident_segments)
+        self.fsync = fsync
+        os.makedirs(storage_path, exist_ok=True)
+
+        self._lock = threading.RLock()
+
+        # Active segment state
+        self._active_date: Optional[str] = None
+        self._active_fd: Optional[int] = None
+        self._active_size = 0
+        self._active_postings: Dict[str, Dict[str, List[int]]] = {}
+
+        # Sealed segment postings, least recently used first
+        self._resident: "OrderedDict[str, Dict[str, Dict[str, List[int]]]]" = OrderedDict()
+        # Sealed segments whose resident postings include late entries not yet in the sidecar
+        self._dirty: Set[str] = set()
+
+        self._stats = {"appended": 0, "late_appends": 0, "index_loads": 0, "index_builds": 0, "entries_read": 0}
+
+    def _segment_file(self, date_str: str) -> str:
+        """Get the path of a segment."""
+        return os.path.join(self.storage_path, f"{self.SEGMENT_PREFIX}{date_str}{self.SEGMENT_SUFFIX}")
+
+    def _index_file(self, date_str: str) -> str:
+        """Get the path of a segment's sidecar index."""
+        return os.path.join(self.storage_path, f"{self.SEGMENT_PREFIX}{date_str}{self.INDEX_SUFFIX}")
+
+    def get_segment_dates(self) -> List[str]:
+        """
+        Get the dates of all segments.
+
+        Returns:
+            Sorted list of segment dates in YYYY-MM-DD format
+        """
+        dates = []
+        for name in os.listdir(self.storage_path):
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                dates.append(name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)])
+        return sorted(dates)
+
+    def append(self, log_dict: Dict[str, Any]) -> None:
+        """
+        Append a serialized audit log.
+
+        Args:
+            log_dict: Serialized audit log with an ISO-format "timestamp"
+        """
+        date_str = log_dict["timestamp"][:10]
+        data = (json.dumps(log_dict, separators=(",", ":")) + "\n").encode("utf-8")
+
+        with self._lock:
+            if self._active_date is not None and date_str < self._active_date:
+                self._append_late(date_str, log_dict, data)
+                return
+
+            if date_str != self._active_date:
+                self._activate(date_str)
+
+            offset = self._active_size
+            self._write_all(self._active_fd, data)
+            self._active_size += len(data)
+
+            self._add_postings(self._active_postings, log_dict, offset)
+            self._stats["appended"] += 1
+
+    def _write_all(self, fd: int, data: bytes) -> None:
+        """Write all bytes to a file descriptor, fsyncing if configured."""
+        written = os.write(fd, data)
+        while written < len(data):
+            written += os.write(fd, data[written:])
+        if self.fsync:
+            os.fsync(fd)
+
+    def _append_late(self, date_str: str, log_dict: Dict[str, Any], data: bytes) -> None:
+        """
+        Append an entry for a day before the active segment. Caller holds the lock.
+
+        The entry goes to its own day's segment. Resident postings are updated
+        and written back when evicted or on close; otherwise the sidecar no
+        longer matches the segment size and is rebuilt on next load.
+
+        Args:
+            date_str: Segment date of the entry
+            log_dict: Serialized audit log
+            data: Encoded entry
+        """
+        fd = os.open(self._segment_file(date_str), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            offset = os.fstat(fd).st_size
+            self._write_all(fd, data)
+        finally:
+            os.close(fd)
+
+        postings = self._resident.get(date_str)
+        if postings is not None:
+            self._add_postings(postings, log_dict, offset)
+            self._dirty.add(date_str)
+
+        self._stats["appended"] += 1
+        self._stats["late_appends"] += 1
+
+    def _activate(self, date_str: str) -> None:
+        """
+        Make a segment the active segment, sealing the previous one. Caller holds the lock.
+
+        Args:
+            date_str: Segment date
+        """
+        self._seal()
+
+        self._active_fd = os.open(self._segment_file(date_str), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._active_size = os.fstat(self._active_fd).st_size
+        self._active_date = date_str
+        # Resident postings are current, including any late entries
+        self._dirty.discard(date_str)
+        postings = self._resident.pop(date_str, None)
+        if postings is None:
+            postings = self._load_postings(date_str) if self._active_size else {}
+        self._active_postings = postings
+
+    def _seal(self) -> None:
+        """Close the active segment and persist its index. Caller holds the lock."""
+        if self._active_fd is None:
+            return
+
+        os.close(self._active_fd)
+        self._write_index(self._active_date, self._active_size, self._active_postings)
+        self._cache_postings(self._active_date, self._active_postings)
+        self._active_fd = None
+        self._active_date = None
+        self._active_postings = {}
+
+    def close(self) -> None:
+        """Seal the active segment and persist indexes updated by late entries."""
+        with self._lock:
+            self._seal()
+            for date_str in list(self._dirty):
+                self._flush_dirty(date_str)
+
+    def _flush_dirty(self, date_str: str) -> None:
+        """Persist the resident postings of a segment that received late entries. Caller holds the lock."""
+        self._dirty.discard(date_str)
+        postings = self._resident.get(date_str)
+        if postings is not None:
+            self._write_index(date_str, os.path.getsize(self._segment_file(date_str)), postings)
+
+    def _add_postings(self, postings: Dict[str, Dict[str, List[int]]], log_dict: Dict[str, Any], offset: int) -> None:
+        """
+        Add an entry's offset to segment postings.
+
+        Args:
+            postings: Segment postings to update
+            log_dict: Serialized audit log
+            offset: Byte offset of the entry in the segment
+        """
+        for field in INDEXED_FIELDS:
+            value = log_dict.get(field)
+            if value is not None:
+                postings.setdefault(field, {}).setdefault(str(value), []).append(offset)
+
+    def _write_index(self, date_str: str, size: int, postings: Dict[str, Dict[str, List[int]]]) -> None:
+        """
+        Persist segment postings to the sidecar index.
+
+        Args:
+            date_str: Segment date
+            size: Segment size the postings cover
+            postings: Segment postings
+        """
+        index_file = self._index_file(date_str)
+        try:
+            with open(index_file + ".tmp", "w") as f:
+                json.dump({"size": size, "postings": postings}, f, separators=(",", ":"))
+            os.replace(index_file + ".tmp", index_file)
+        except Exception as e:
+            logger.error(f"Failed to write audit index for {date_str}: {e}")
+
+    def _cache_postings(self, date_str: str, postings: Dict[str, Dict[str, List[int]]]) -> None:
+        """Keep sealed segment postings resident, evicting the least recently used. Caller holds the lock."""
+        self._resident[date_str] = postings
+        self._resident.move_to_end(date_str)
+        while len(self._resident) > self.max_resident_segments:
+            evicted = next(iter(self._resident))
+            if evicted in self._dirty:
+                self._flush_dirty(evicted)
+            del self._resident[evicted]
+
+    def _load_postings(self, date_str: str) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Load segment postings from the sidecar index, rebuilding it if stale. Caller holds the lock.
+
+        Args:
+            date_str: Segment date
+
+        Returns:
+            Segment postings
+        """
+        segment_file = self._segment_file(date_str)
+        size = os.path.getsize(segment_file) if os.path.exists(segment_file) else 0
+
+        try:
+            with open(self._index_file(date_str), "r") as f:
+                index = json.load(f)
+            if index.get("size") == size:
+                self._stats["index_loads"] += 1
+                return index["postings"]
+        except (OSError, ValueError):
+            pass
+
+        # Missing or stale sidecar: rebuild with one pass over the segment
+        postings: Dict[str, Dict[str, List[int]]] = {}
+        offset = 0
+        if size:
+            with open(segment_file, "rb") as f:
+                for line in f:
+                    if line.endswith(b"\n"):
+                        try:
+                            self._add_postings(postings, json.loads(line), offset)
+                        except ValueError:
+                            pass
+                    offset += len(line)
+
+        self._stats["index_builds"] += 1
+        if date_str != self._active_date:
+            self._write_index(date_str, size, postings)
+        return postings
+
+    def _get_postings(self, date_str: str) -> Dict[str, Dict[str, List[int]]]:
+        """
+        Get postings for a segment. Caller holds the lock.
+
+        Args:
+            date_str: Segment date
+
+        Returns:
+            Segment postings
+        """
+        if date_str == self._active_date:
+            return self._active_postings
+
+        postings = self._resident.get(date_str)
+        if postings is None:
+            postings = self._load_postings(date_str)
+            self._cache_postings(date_str, postings)
+        else:
+            self._resident.move_to_end(date_str)
+        return postings
+
+    def _read_at(self, segment_file: str, offsets: List[int]) -> Iterator[Dict[str, Any]]:
+        """
+        Read entries at byte offsets, in the given order.
+
+        Args:
+            segment_file: Segment path
+            offsets: Byte offsets of entries
+
+        Yields:
+            Serialized audit logs
+        """
+        with open(segment_file, "rb") as f:
+            for offset in offsets:
+                f.seek(offset)
+                line = f.readline()
+                if line.endswith(b"\n"):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def _read_reversed(self, segment_file: str, end: int) -> Iterator[Dict[str, Any]]:
+        """
+        Read a segment backwards, newest entry first.
+
+        Args:
+            segment_file: Segment path
+            end: Number of bytes of the segment to read
+
+        Yields:
+            Serialized audit logs
+        """
+        with open(segment_file, "rb") as f:
+            position = end
+            remainder = b""
+            while position > 0:
+                read_size = min(self.READ_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                block = f.read(read_size) + remainder
+                lines = block.split(b"\n")
+                # The first piece may be the tail of an earlier line
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+            if remainder:
+                try:
+                    yield json.loads(remainder)
+                except ValueError:
+                    pass
+
+    def _iter_segment(self, date_str: str, filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over a segment's candidate entries, newest first.
+
+        Args:
+            date_str: Segment date
+            filters: Field values to match
+
+        Yields:
+            Serialized audit logs that may match the filters
+        """
+        segment_file = self._segment_file(date_str)
+        indexed = [(field, str(filters[field])) for field in INDEXED_FIELDS if filters.get(field) is not None]
+
+        with self._lock:
+            if not os.path.exists(segment_file):
+                return
+
+            # Only complete writes are visible to the query
+            end = self._active_size if date_str == self._active_date else os.path.getsize(segment_file)
+
+            offsets = None
+            if indexed:
+                postings = self._get_postings(date_str)
+                for field, value in indexed:
+                    field_offsets = postings.get(field, {}).get(value, ())
+                    offsets = set(field_offsets) if offsets is None else offsets.intersection(field_offsets)
+                    if not offsets:
+                        return
+                offsets = sorted((o for o in offsets if o < end), reverse=True)
+
+        if offsets is not None:
+            yield from self._read_at(segment_file, offsets)
+        else:
+            yield from self._read_reversed(segment_file, end)
+
+    def query(
+        self,
+        filters: Dict[str, Any],
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Get matching audit logs, newest first.
+
+        Only segments within the time range are visited, indexed filters
+        narrow each segment to its matching entries, and reading stops
+        once the limit is reached. Days are returned newest first; within a
+        day, late entries are ordered by when they were recorded.
+
+        Args:
+            filters: Field values to match
+            start_time: Optional start time (inclusive)
+            end_time: Optional end time (inclusive)
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of serialized audit logs
+        """
+        start_date = start_time.strftime("%Y-%m-%d") if start_time else None
+        end_date = end_time.strftime("%Y-%m-%d") if end_time else None
+
+        results = []
+        if limit <= 0:
+            return results
+
+        for date_str in reversed(self.get_segment_dates()):
+            if end_date and date_str > end_date:
+                continue
+            if start_date and date_str < start_date:
+                break
+
+            for log_dict in self._iter_segment(date_str, filters):
+                self._stats["entries_read"] += 1
+                if _matches(log_dict, filters, start_time, end_time):
+                    results.append(log_dict)
+                    if len(results) >= limit:
+                        return results
+
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            Dictionary of statistics
+        """
+        with self._lock:
+            return {
+                "backend": "segments",
+                "segments": len(self.get_segment_dates()),
+                "resident_indexes": len(self._resident),
+                "active_segment": self._active_date,
+                **self._stats
+            }
@@ -12,11 +12,16 @@ import logging
 import hashlib
 import secrets
 import statistics
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Set, Callable, Union
 
 from src.core.error_handling.errors import SecurityError, ConfigurationError
 from src.core.event_system.event_manager import EventManager
+from src.auth.security.audit_log_store import AuditLogStore, InMemoryAuditLogStore
+from src.core.streaming_stats import (
+    DecayedHistogram, DecayedTopK, RunningMoments
+)
 
 logger = logging.getLogger(__name__)
 
@@ -733,18 +738,418 @@ class BehavioralAnomalyDetector(AnomalyDetector):
         }
 
 
+class StreamingStatisticalDetector(AnomalyDetector):
+    """
+    Statistical anomaly detector using z-scores over running moments.
+
+    Keeps a constant-size summary of the baseline instead of the raw data
+    points, so updates and detection are O(1).
+    """
+    def __init__(
+        self,
+        detector_id: str,
+        name: str,
+        description: str,
+        data_source: str,
+        threshold: float = 3.0,
+        sensitivity: float = 1.0,
+        ewma_alpha: Optional[float] = None,
+        moments: Optional[RunningMoments] = None,
+        is_active: bool = True,
+        metadata: Dict[str, Any] = None
+    ):
+        super().__init__(
+            detector_id=detector_id,
+            name=name,
+            description=description,
+            data_source=data_source,
+            sensitivity=sensitivity,
+            is_active=is_active,
+            metadata=metadata
+        )
+        self.threshold = threshold
+        self.ewma_alpha = ewma_alpha
+        self.moments = moments or RunningMoments(alpha=ewma_alpha)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert detector to dictionary representation.
+        
+        Returns:
+            Dictionary representation of the detector
+        """
+        base_dict = super().to_dict()
+        base_dict.update({
+            "threshold": self.threshold,
+            "ewma_alpha": self.ewma_alpha,
+            "moments": self.moments.to_list()
+        })
+        return base_dict
+    
+    @classmethod
+    def from_dict(cls, detector_dict: Dict[str, Any]) -> 'StreamingStatisticalDetector':
+        """
+        Create a detector from dictionary representation.
+        
+        Also accepts the representation of a StatisticalAnomalyDetector, in
+        which case the baseline data is folded into the running moments.
+        
+        Args:
+            detector_dict: Dictionary representation of the detector
+            
+        Returns:
+            StreamingStatisticalDetector object
+        """
+        moments = detector_dict.get("moments")
+        detector = cls(
+            detector_id=detector_dict.get("detector_id"),
+            name=detector_dict["name"],
+            description=detector_dict["description"],
+            data_source=detector_dict["data_source"],
+            threshold=detector_dict.get("threshold", 3.0),
+            sensitivity=detector_dict.get("sensitivity", 1.0),
+            ewma_alpha=detector_dict.get("ewma_alpha"),
+            moments=RunningMoments.from_list(moments) if moments else None,
+            is_active=detector_dict.get("is_active", True),
+            metadata=detector_dict.get("metadata", {})
+        )
+        if not moments and detector_dict.get("baseline_data"):
+            detector.add_baseline_data(detector_dict["baseline_data"])
+        return detector
+    
+    def add_baseline_data(self, data: Union[float, List[float]]) -> None:
+        """
+        Add data to the baseline.
+        
+        Args:
+            data: Data point or list of data points to add
+        """
+        if isinstance(data, list):
+            for value in data:
+                self.moments.update(value)
+        else:
+            self.moments.update(data)
+    
+    def detect(self, data: float) -> Tuple[bool, float, Dict[str, Any]]:
+        """
+        Detect anomalies using z-score.
+        
+        When an EWMA alpha is configured, the score is measured against the
+        exponentially weighted moments so that the baseline follows drift.
+        
+        Args:
+            data: Data point to analyze
+            
+        Returns:
+            Tuple of (is_anomaly, anomaly_score, details)
+        """
+        if not self.moments.count:
+            return False, 0.0, {"error": "No baseline data available"}
+            
+        try:
+            # Calculate z-score
+            if self.moments.count == 1:
+                mean, stdev = self.moments.mean, 1.0
+            elif self.ewma_alpha is not None:
+                mean, stdev = self.moments.ewma_mean, self.moments.ewma_stdev
+            else:
+                mean, stdev = self.moments.mean, self.moments.stdev
+            
+            if stdev == 0:
+                z_score = 0.0 if data == mean else float('inf')
+            else:
+                z_score = abs(data - mean) / stdev
+                
+            # Apply sensitivity
+            adjusted_score = z_score * self.sensitivity
+            
+            # Determine if anomaly
+            is_anomaly = adjusted_score > self.threshold
+            
+            return is_anomaly, adjusted_score, {
+                "mean": mean,
+                "stdev": stdev,
+                "z_score": z_score,
+                "adjusted_score": adjusted_score,
+                "threshold": self.threshold,
+                "samples": self.moments.count
+            }
+            
+        except Exception as e:
+            logger.error(f"Error detecting anomaly: {e}")
+            return False, 0.0, {"error": str(e)}
+
+
+class StreamingBehavioralDetector(AnomalyDetector):
+    """
+    Behavioral anomaly detector for user actions using streaming summaries.
+    
+    Numeric behaviors keep running moments per user. Categorical behaviors
+    keep a bounded, time-decayed map of each user's heaviest values, so
+    memory does not grow with the number of distinct values and one user's
+    frequencies are never inflated by other users' traffic. Behaviors listed
+    in histogram_keys (such as login hour) use a decayed histogram per user.
+    """
+    def __init__(
+        self,
+        detector_id: str,
+        name: str,
+        description: str,
+        data_source: str,
+        sensitivity: float = 1.0,
+        histogram_keys: Optional[Dict[str, int]] = None,
+        half_life_seconds: Optional[float] = None,
+        ewma_alpha: Optional[float] = None,
+        top_k: int = DecayedTopK.DEFAULT_CAPACITY,
+        is_active: bool = True,
+        metadata: Dict[str, Any] = None
+    ):
+        super().__init__(
+            detector_id=detector_id,
+            name=name,
+            description=description,
+            data_source=data_source,
+            sensitivity=sensitivity,
+            is_active=is_active,
+            metadata=metadata
+        )
+        self.histogram_keys = histogram_keys or {}
+        self.half_life_seconds = half_life_seconds
+        self.ewma_alpha = ewma_alpha
+        self.top_k = top_k
+        
+        # user_id -> behavior key -> summary
+        self.numeric_profiles: Dict[str, Dict[str, RunningMoments]] = {}
+        self.categorical_values: Dict[str, Dict[str, DecayedTopK]] = {}
+        self.histograms: Dict[str, Dict[str, DecayedHistogram]] = {}
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert detector to dictionary representation.
+        
+        Returns:
+            Dictionary representation of the detector
+        """
+        base_dict = super().to_dict()
+        base_dict.update({
+            "histogram_keys": self.histogram_keys,
+            "half_life_seconds": self.half_life_seconds,
+            "ewma_alpha": self.ewma_alpha,
+            "top_k": self.top_k,
+            "numeric_profiles": {
+                user_id: {key: moments.to_list() for key, moments in profile.items()}
+                for user_id, profile in self.numeric_profiles.items()
+            },
+            "categorical_values": {
+                user_id: {key: values.to_list() for key, values in profile.items()}
+                for user_id, profile in self.categorical_values.items()
+            },
+            "histograms": {
+                user_id: {key: histogram.to_list() for key, histogram in histograms.items()}
+                for user_id, histograms in self.histograms.items()
+            }
+        })
+        return base_dict
+    
+    @classmethod
+    def from_dict(cls, detector_dict: Dict[str, Any]) -> 'StreamingBehavioralDetector':
+        """
+        Create a detector from dictionary representation.
+        
+        Args:
+            detector_dict: Dictionary representation of the detector
+            
+        Returns:
+            StreamingBehavioralDetector object
+        """
+        detector = cls(
+            detector_id=detector_dict.get("detector_id"),
+            name=detector_dict["name"],
+            description=detector_dict["description"],
+            data_source=detector_dict["data_source"],
+            sensitivity=detector_dict.get("sensitivity", 1.0),
+            histogram_keys=detector_dict.get("histogram_keys", {}),
+            half_life_seconds=detector_dict.get("half_life_seconds"),
+            ewma_alpha=detector_dict.get("ewma_alpha"),
+            top_k=detector_dict.get("top_k", DecayedTopK.DEFAULT_CAPACITY),
+            is_active=detector_dict.get("is_active", True),
+            metadata=detector_dict.get("metadata", {})
+        )
+        
+        detector.numeric_profiles = {
+            user_id: {key: RunningMoments.from_list(state) for key, state in profile.items()}
+            for user_id, profile in detector_dict.get("numeric_profiles", {}).items()
+        }
+        detector.categorical_values = {
+            user_id: {key: DecayedTopK.from_list(state) for key, state in profile.items()}
+            for user_id, profile in detector_dict.get("categorical_values", {}).items()
+        }
+        detector.histograms = {
+            user_id: {key: DecayedHistogram.from_list(state) for key, state in histograms.items()}
+            for user_id, histograms in detector_dict.get("histograms", {}).items()
+        }
+            
+        return detector
+    
+    def update_user_profile(
+        self,
+        user_id: str,
+        behavior_data: Dict[str, Any],
+        timestamp: Optional[float] = None
+    ) -> None:
+        """
+        Update a user's behavioral profile.
+        
+        Args:
+            user_id: User ID to update
+            behavior_data: Behavioral data to update
+            timestamp: Optional observation time in seconds since the epoch (defaults to now)
+        """
+        now = time.time() if timestamp is None else timestamp
+        
+        for key, value in behavior_data.items():
+            if key in self.histogram_keys:
+                histograms = self.histograms.setdefault(user_id, {})
+                histogram = histograms.get(key)
+                if histogram is None:
+                    histogram = histograms[key] = DecayedHistogram(self.histogram_keys[key], updated_at=now)
+                histogram.add(int(value), now, self.half_life_seconds)
+                
+            elif isinstance(value, (int, float)):
+                profile = self.numeric_profiles.setdefault(user_id, {})
+                moments = profile.get(key)
+                if moments is None:
+                    moments = profile[key] = RunningMoments(alpha=self.ewma_alpha)
+                moments.update(value)
+                
+            else:
+                profile = self.categorical_values.setdefault(user_id, {})
+                values = profile.get(key)
+                if values is None:
+                    values = profile[key] = DecayedTopK(self.top_k, updated_at=now)
+                values.add(str(value), now, self.half_life_seconds)
+    
+    def detect(
+        self,
+        user_id: str,
+        behavior_data: Dict[str, Any],
+        timestamp: Optional[float] = None
+    ) -> Tuple[bool, float, Dict[str, Any]]:
+        """
+        Detect behavioral anomalies.
+        
+        Args:
+            user_id: User ID to check
+            behavior_data: Behavioral data to analyze
+            timestamp: Optional observation time; decay scales a user's frequencies
+                equally, so scores do not depend on it
+            
+        Returns:
+            Tuple of (is_anomaly, anomaly_score, details)
+        """
+        numeric_profile = self.numeric_profiles.get(user_id)
+        categorical_values = self.categorical_values.get(user_id)
+        histograms = self.histograms.get(user_id)
+        
+        if numeric_profile is None and categorical_values is None and histograms is None:
+            # No profile yet, not enough data to detect anomalies
+            return False, 0.0, {"error": "No user profile available"}
+            
+        anomaly_scores = []
+        anomaly_details = {}
+        
+        for key, value in behavior_data.items():
+            if histograms and key in histograms:
+                # Bounded categorical value, use histogram frequency
+                frequency = histograms[key].frequency(int(value))
+                rarity_score = 1.0 - frequency
+                adjusted_score = rarity_score * self.sensitivity
+                
+                anomaly_scores.append(adjusted_score)
+                anomaly_details[key] = {
+                    "type": "histogram",
+                    "value": value,
+                    "frequency": frequency,
+                    "rarity_score": rarity_score,
+                    "adjusted_score": adjusted_score
+                }
+                
+            elif numeric_profile and key in numeric_profile and isinstance(value, (int, float)):
+                # Numeric value, use z-score
+                moments = numeric_profile[key]
+                if self.ewma_alpha is not None:
+                    mean, stdev = moments.ewma_mean, moments.ewma_stdev
+                else:
+                    mean, stdev = moments.mean, moments.stdev
+                
+                if stdev == 0:
+                    z_score = 0.0 if value == mean else float('inf')
+                else:
+                    z_score = abs(value - mean) / stdev
+                    
+                # Apply sensitivity
+                adjusted_score = z_score * self.sensitivity
+                
+                anomaly_scores.append(adjusted_score)
+                anomaly_details[key] = {
+                    "type": "numeric",
+                    "value": value,
+                    "mean": mean,
+                    "stdev": stdev,
+                    "z_score": z_score,
+                    "adjusted_score": adjusted_score
+                }
+                
+            elif categorical_values and key in categorical_values:
+                # Categorical value, use its share of this user's history
+                frequency = categorical_values[key].frequency(str(value))
+                rarity_score = 1.0 - frequency
+                
+                # Apply sensitivity
+                adjusted_score = rarity_score * self.sensitivity
+                
+                anomaly_scores.append(adjusted_score)
+                anomaly_details[key] = {
+                    "type": "categorical",
+                    "value": value,
+                    "frequency": frequency,
+                    "rarity_score": rarity_score,
+                    "adjusted_score": adjusted_score
+                }
+        
+        if not anomaly_scores:
+            return False, 0.0, {"error": "No matching behavior data for analysis"}
+            
+        # Calculate overall anomaly score
+        overall_score = max(anomaly_scores)
+        
+        # Determine if anomaly (threshold of 0.8)
+        is_anomaly = overall_score > 0.8
+        
+        return is_anomaly, overall_score, {
+            "scores": anomaly_scores,
+            "overall_score": overall_score,
+            "details": anomaly_details
+        }
+
+
 class SecurityMonitoringManager:
     """
     Manages security monitoring and compliance.
     """
     def __init__(
         self,
-        event_manager: EventManager = None
+        event_manager: EventManager = None,
+        audit_log_path: Optional[str] = None,
+        max_in_memory_audit_logs: int = 100000
     ):
         self.event_manager = event_manager or EventManager()
         
-        # Audit logs
-        self.audit_logs: List[AuditLog] = []
+        # Audit logs: persistent segment store if a path is configured, bounded memory otherwise
+        if audit_log_path:
+            self.audit_log_store = AuditLogStore(audit_log_path)
+        else:
+            self.audit_log_store = InMemoryAuditLogStore(max_in_memory_audit_logs)
         
         # Compliance requirements
         self.compliance_requirements: Dict[str, ComplianceRequirement] = {}
@@ -843,7 +1248,7 @@ class SecurityMonitoringManager:
         Register default anomaly detectors.
         """
         # Login frequency detector
-        self.register_anomaly_detector(StatisticalAnomalyDetector(
+        self.register_anomaly_detector(StreamingStatisticalDetector(
             detector_id="login-frequency",
             name="Login Frequency",
             description="Detect unusual login frequency",
@@ -853,7 +1258,7 @@ class SecurityMonitoringManager:
         ))
         
         # Failed login detector
-        self.register_anomaly_detector(StatisticalAnomalyDetector(
+        self.register_anomaly_detector(StreamingStatisticalDetector(
             detector_id="failed-login",
             name="Failed Login Attempts",
             description="Detect unusual number of failed login attempts",
@@ -863,12 +1268,14 @@ class SecurityMonitoringManager:
         ))
         
         # User behavior detector
-        self.register_anomaly_detector(BehavioralAnomalyDetector(
+        self.register_anomaly_detector(StreamingBehavioralDetector(
             detector_id="user-behavior",
             name="User Behavior",
             description="Detect unusual user behavior patterns",
             data_source="user_actions",
-            sensitivity=1.0
+            sensitivity=1.0,
+            histogram_keys={"login_hour": 24},
+            half_life_seconds=30 * 24 * 3600
         ))
     
     def record_audit_log(
@@ -922,7 +1329,7 @@ class SecurityMonitoringManager:
         )
         
         # Store log entry
-        self.audit_logs.append(log_entry)
+        self.audit_log_store.append(log_entry.to_dict())
         
         # Emit event
         self.event_manager.emit_event("security.audit_log_recorded", {
@@ -965,38 +1372,25 @@ class SecurityMonitoringManager:
         Returns:
             List of AuditLog instances
         """
-        # Apply filters
-        filtered_logs = self.audit_logs
-        
-        if action:
-            filtered_logs = [log for log in filtered_logs if log.action == action]
-            
-        if actor_id:
-            filtered_logs = [log for log in filtered_logs if log.actor_id == actor_id]
-            
-        if actor_type:
-            filtered_logs = [log for log in filtered_logs if log.actor_type == actor_type]
-            
-        if resource_type:
-            filtered_logs = [log for log in filtered_logs if log.resource_type == resource_type]
-            
-        if resource_id:
-            filtered_logs = [log for log in filtered_logs if log.resource_id == resource_id]
-            
-        if result:
-            filtered_logs = [log for log in filtered_logs if log.result == result]
-            
-        if start_time:
-            filtered_logs = [log for log in filtered_logs if log.timestamp >= start_time]
-            
-        if end_time:
-            filtered_logs = [log for log in filtered_logs if log.timestamp <= end_time]
-            
-        # Sort by timestamp (newest first)
-        filtered_logs.sort(key=lambda log: log.timestamp, reverse=True)
+        filters = {
+            "action": action,
+            "actor_id": actor_id,
+            "actor_type": actor_type,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "result": result
+        }
+        filters = {field: value for field, value in filters.items() if value}
+        
+        # Newest first, stopping once the limit is reached
+        log_dicts = self.audit_log_store.query(
+            filters,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit
+        )
         
-        # Apply limit
-        return filtered_logs[:limit]
+        return [AuditLog.from_dict(log_dict) for log_dict in log_dicts]
     
     def register_compliance_requirement(
         self,
@@ -1366,7 +1760,7 @@ class SecurityMonitoringManager:
                 
             try:
                 # Run detector
-                if isinstance(detector, BehavioralAnomalyDetector) and user_id:
+                if isinstance(detector, (BehavioralAnomalyDetector, StreamingBehavioralDetector)) and user_id:
                     # For behavioral detectors, we need user ID
                     is_anomaly, score, details = detector.detect(user_id, data)
                 else:
@@ -1415,7 +1809,7 @@ class SecurityMonitoringManager:
         """
         # Get behavioral detectors for this data source
         detectors = [d for d in self.get_detectors_by_data_source(data_source)
-                    if isinstance(d, BehavioralAnomalyDetector)]
+                    if isinstance(d, (BehavioralAnomalyDetector, StreamingBehavioralDetector))]
         
         # Update profiles
         for detector in detectors:
@@ -319,6 +319,23 @@ class BasePlugin(ABC):
             async for item in stream:
                 yield item
 
+    def get_transform_lookahead(self, transform_type: str, transform_params: Optional[dict] = None) -> Optional[int]:
+        """
+        Declares how many input chunks a stream transformation may hold back before emitting output.
+        The PluginManager's stream pipeline fuses chunk-local transformations (0) with their neighbours
+        and runs the others as separate stages behind bounded queues.
+
+        Args:
+            transform_type (str): The type of transformation.
+            transform_params (Optional[dict]): Parameters for the transformation. Defaults to None.
+
+        Returns:
+            Optional[int]: 0 if each input chunk's output is emitted before the next chunk is read,
+                           the maximum number of chunks held back otherwise, or None if the
+                           transformation may need the whole stream (the default).
+        """
+        return None
+
     async def compose_streams(self, 
                              streams: List[AsyncIterator[Any]], 
                              composition_type: str,
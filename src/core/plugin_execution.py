@@ -0,0 +1,309 @@
+"""
+Plugin Action Execution Module for ApexAgent
+
+This module provides the async execution engine for plugin actions. It
+resolves action callables once and caches them, limits how many actions of
+one plugin run at the same time, runs synchronous actions on a bounded
+thread pool so they never block the event loop, enforces per-action
+timeouts, and connects actions to the CancellationToken and ProgressUpdate
+primitives from async_utils.
+"""
+
+import os
+import asyncio
+import inspect
+import logging
+import threading
+import contextvars
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Tuple
+
+from .async_utils import CancellationToken, ProgressUpdate, PluginActionTimeoutError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[ProgressUpdate], None]
+
+
+@dataclass
+class PluginExecutionConfig:
+    """Configuration for plugin action execution."""
+    default_timeout: Optional[float] = None  # seconds, for actions without their own timeout
+    max_concurrent_per_plugin: int = 8  # actions of one plugin running at the same time
+    max_workers: int = min(32, (os.cpu_count() or 1) + 4)  # threads for synchronous actions
+    action_timeouts: Dict[str, float] = field(default_factory=dict)  # "plugin_id.action" or "plugin_id" to seconds
+
+
+class ResolvedAction:
+    """An action callable with what it accepts, resolved once per plugin instance."""
+
+    def __init__(self, plugin: Any, func: Callable):
+        self.plugin = plugin
+        self.func = func
+        self.is_coroutine = inspect.iscoroutinefunction(func)
+        try:
+            parameters = inspect.signature(func).parameters
+        except (TypeError, ValueError):
+            parameters = {}
+        self.accepts_progress = "progress_callback" in parameters
+        self.accepts_cancellation = "cancellation_token" in parameters
+
+
+class PluginActionExecutor:
+    """
+    Runs plugin actions with timeouts, per-plugin concurrency limits,
+    cancellation and progress reporting.
+
+    Actions may be coroutine functions or regular functions; regular
+    functions run on the executor's thread pool. An action that declares a
+    ``progress_callback`` or ``cancellation_token`` parameter receives them.
+    Cancellation is cooperative for synchronous actions: when the caller is
+    cancelled or the action times out, its token is cancelled, and the action
+    keeps its concurrency slot until it returns.
+    """
+
+    def __init__(self, config: Optional[PluginExecutionConfig] = None):
+        """
+        Initialize the executor.
+
+        Args:
+            config: Execution configuration
+        """
+        self.config = config or PluginExecutionConfig()
+        self._lock = threading.Lock()
+        self._actions: Dict[Tuple[str, str], ResolvedAction] = {}
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        # Semaphores belong to one event loop, so keep a set per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats = {
+            "executed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "cache_hits": 0,
+            "cache_misses": 0
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def resolve(self, plugin_id: str, plugin: Any, action: str) -> ResolvedAction:
+        """
+        Get the callable for an action, from the cache when possible.
+
+        Args:
+            plugin_id: ID of the plugin
+            plugin: Plugin instance
+            action: Name of the action
+
+        Returns:
+            The resolved action
+
+        Raises:
+            AttributeError: If the plugin has no such action
+        """
+        key = (plugin_id, action)
+        resolved = self._actions.get(key)
+        if resolved is not None and resolved.plugin is plugin:
+            self._count("cache_hits")
+            return resolved
+
+        func = getattr(plugin, action, None)
+        if func is None or not callable(func):
+            raise AttributeError(f"Action {action} not found in plugin {plugin_id}")
+
+        resolved = ResolvedAction(plugin, func)
+        with self._lock:
+            self._actions[key] = resolved
+            self._stats["cache_misses"] += 1
+        return resolved
+
+    def invalidate(self, plugin_id: str) -> None:
+        """
+        Drop the cached actions of a plugin.
+
+        Args:
+            plugin_id: ID of the plugin
+        """
+        with self._lock:
+            for key in [key for key in self._actions if key[0] == plugin_id]:
+                del self._actions[key]
+
+    def get_timeout(self, plugin_id: str, action: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """
+        Get the timeout for an action.
+
+        The configured timeout for the action wins over the one in the
+        action's metadata, which wins over the plugin's configured timeout and
+        the default.
+
+        Args:
+            plugin_id: ID of the plugin
+            action: Name of the action
+            metadata: Metadata of the action, if any
+
+        Returns:
+            Timeout in seconds, or None for no timeout
+        """
+        timeouts = self.config.action_timeouts
+        if f"{plugin_id}.{action}" in timeouts:
+            return timeouts[f"{plugin_id}.{action}"]
+        if metadata and metadata.get("timeout") is not None:
+            return float(metadata["timeout"])
+        return timeouts.get(plugin_id, self.config.default_timeout)
+
+    def _get_semaphore(self, plugin_id: str, limit: Optional[int]) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(plugin_id)
+            if semaphore is None:
+                semaphore = semaphores[plugin_id] = asyncio.Semaphore(
+                    limit or self.config.max_concurrent_per_plugin
+                )
+        return semaphore
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers, thread_name_prefix="plugin-action"
+                )
+            return self._thread_pool
+
+    async def execute(
+        self,
+        plugin_id: str,
+        resolved: ResolvedAction,
+        args: tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        progress_callback: Optional[ProgressCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        max_concurrent: Optional[int] = None
+    ) -> Any:
+        """
+        Run a resolved action.
+
+        Args:
+            plugin_id: ID of the plugin
+            resolved: The action to run
+            args: Positional arguments to pass to the action
+            kwargs: Keyword arguments to pass to the action
+            timeout: Timeout in seconds, or None for no timeout
+            progress_callback: Function called with each valid progress update
+            cancellation_token: Token cancelled when the action is cancelled or times out
+            max_concurrent: Concurrency limit for the plugin, used when its semaphore is first created
+
+        Returns:
+            Result of the action
+
+        Raises:
+            PluginActionTimeoutError: If the action does not finish in time
+            asyncio.CancelledError: If the caller is cancelled
+        """
+        kwargs = dict(kwargs or {})
+        token = cancellation_token or CancellationToken()
+        name = getattr(resolved.func, "__name__", "action")
+        if resolved.accepts_cancellation:
+            kwargs["cancellation_token"] = token
+        if resolved.accepts_progress:
+            kwargs["progress_callback"] = self._progress_relay(plugin_id, name, progress_callback)
+
+        semaphore = self._get_semaphore(plugin_id, max_concurrent)
+        await semaphore.acquire()
+        release_on_exit = True
+        try:
+            if resolved.is_coroutine:
+                awaitable = resolved.func(*args, **kwargs)
+            else:
+                context = contextvars.copy_context()
+                future = self._get_thread_pool().submit(context.run, resolved.func, *args, **kwargs)
+                awaitable = asyncio.wrap_future(future)
+
+            try:
+                result = await asyncio.wait_for(awaitable, timeout)
+            except asyncio.TimeoutError:
+                token.cancel()
+                self._count("timed_out")
+                raise PluginActionTimeoutError(
+                    f"Action {name} of plugin {plugin_id} timed out after {timeout} seconds", timeout
+                )
+            except asyncio.CancelledError:
+                token.cancel()
+                self._count("cancelled")
+                raise
+            except Exception:
+                self._count("failed")
+                raise
+            finally:
+                if not resolved.is_coroutine and not future.done():
+                    # The thread cannot be stopped; hold the slot until the action returns
+                    release_on_exit = False
+                    loop = asyncio.get_running_loop()
+                    future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+
+            self._count("executed")
+            return result
+        finally:
+            if release_on_exit:
+                semaphore.release()
+
+    def _progress_relay(
+        self,
+        plugin_id: str,
+        action: str,
+        progress_callback: Optional[ProgressCallback]
+    ) -> ProgressCallback:
+        """Create the progress callback passed to an action, safe to call from any thread."""
+        loop = asyncio.get_running_loop()
+        loop_thread = threading.get_ident()
+
+        def deliver(update: ProgressUpdate) -> None:
+            if not isinstance(update, ProgressUpdate) or not update.validate():
+                logger.warning(f"Ignoring invalid progress update from plugin {plugin_id}, action {action}")
+                return
+            logger.debug(
+                f"PROGRESS - Plugin: {plugin_id}, Action: {action}, Status: {update.status}, "
+                f"Percentage: {update.percentage:.1f}%, Message: {update.message}"
+            )
+            if progress_callback is not None:
+                progress_callback(update)
+
+        def relay(update: ProgressUpdate) -> None:
+            if threading.get_ident() == loop_thread:
+                deliver(update)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(deliver, update)
+
+        return relay
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get execution statistics.
+
+        Returns:
+            Action outcome counters and action cache statistics
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_actions"] = len(self._actions)
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the thread pool for synchronous actions.
+
+        Args:
+            wait: Whether to wait for running actions to finish
+        """
+        with self._lock:
+            thread_pool, self._thread_pool = self._thread_pool, None
+        if thread_pool is not None:
+            thread_pool.shutdown(wait=wait)
@@ -3,11 +3,19 @@ Plugin Lifecycle Management Module for ApexAgent
 
 This module provides functionality for managing the lifecycle of plugins in the ApexAgent system.
 It handles plugin state transitions, dependency management, and lifecycle events.
+
+Plugins can be started in parallel: every plugin whose dependencies are
+active is started as soon as a worker is free, and a StartupTimeline records
+how long each plugin spent in its import, init, and start phases.
 """
 
+import time
 import logging
+import threading
 from enum import Enum
-from typing import Dict, List, Any, Optional, Set, Tuple, Callable
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple, Callable
 
 from src.core.plugin_exceptions import (
     PluginError,
@@ -30,6 +38,133 @@ class PluginState(Enum):
     UNLOADED = "unloaded"
 
 
+class StartupTimeline:
+    """
+    Thread-safe record of the time each plugin spends starting up.
+    
+    Times are in seconds relative to the first recorded phase, so the
+    timelines of two boots can be compared directly. A phase recorded more
+    than once for a plugin accumulates its duration.
+    """
+    
+    PHASES = ("import_wait", "import", "init", "start")
+    
+    def __init__(self):
+        """Initialize an empty timeline."""
+        self._lock = threading.Lock()
+        self._origin = None
+        self._records = {}
+    
+    def reset(self) -> None:
+        """Clear the timeline, so the next recorded phase starts a new boot."""
+        with self._lock:
+            self._origin = None
+            self._records = {}
+    
+    @contextmanager
+    def phase(self, plugin_id: str, name: str) -> Iterator[None]:
+        """
+        Record the time spent in a block as a startup phase of a plugin.
+        
+        Args:
+            plugin_id: ID of the plugin
+            name: Name of the phase (import_wait, import, init, or start)
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if self._origin is None:
+                self._origin = start
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                record = self._records.setdefault(plugin_id, {"phases": {}, "thread": None})
+                record["thread"] = threading.current_thread().name
+                entry = record["phases"].get(name)
+                if entry is None:
+                    record["phases"][name] = {
+                        "start": start - self._origin,
+                        "end": end - self._origin,
+                        "duration": end - start
+                    }
+                else:
+                    entry["end"] = end - self._origin
+                    entry["duration"] += end - start
+    
+    def get_timeline(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the recorded phases of each plugin.
+        
+        Returns:
+            Dictionary mapping plugin IDs, in the order they began starting, to records
+            with 'phases' (phase name to 'start', 'end', and 'duration'), 'start',
+            'end', 'duration' (total of the phases), and 'thread'
+        """
+        with self._lock:
+            timeline = {}
+            for plugin_id, record in self._records.items():
+                phases = {name: dict(entry) for name, entry in record["phases"].items()}
+                timeline[plugin_id] = {
+                    "phases": phases,
+                    "start": min(entry["start"] for entry in phases.values()),
+                    "end": max(entry["end"] for entry in phases.values()),
+                    "duration": sum(entry["duration"] for entry in phases.values()),
+                    "thread": record["thread"]
+                }
+        return dict(sorted(timeline.items(), key=lambda item: item[1]["start"]))
+    
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        Summarize the timeline.
+        
+        Returns:
+            Dictionary with 'plugins', 'wall_time' (first phase start to last phase end),
+            'busy_time' (total of all phases), 'parallelism' (busy time over wall time),
+            'phases' (total time per phase), and 'slowest' (up to five plugin IDs by duration)
+        """
+        timeline = self.get_timeline()
+        if not timeline:
+            return {"plugins": 0, "wall_time": 0.0, "busy_time": 0.0, "parallelism": 0.0, "phases": {}, "slowest": []}
+        
+        wall_time = max(record["end"] for record in timeline.values()) - min(
+            record["start"] for record in timeline.values()
+        )
+        busy_time = sum(record["duration"] for record in timeline.values())
+        phases = {}
+        for record in timeline.values():
+            for name, entry in record["phases"].items():
+                phases[name] = phases.get(name, 0.0) + entry["duration"]
+        slowest = sorted(timeline, key=lambda plugin_id: timeline[plugin_id]["duration"], reverse=True)[:5]
+        
+        return {
+            "plugins": len(timeline),
+            "wall_time": wall_time,
+            "busy_time": busy_time,
+            "parallelism": busy_time / wall_time if wall_time else 1.0,
+            "phases": phases,
+            "slowest": slowest
+        }
+    
+    def format(self) -> str:
+        """
+        Format the timeline as one line per plugin, for logs.
+        
+        Returns:
+            The formatted timeline
+        """
+        lines = []
+        for plugin_id, record in self.get_timeline().items():
+            phases = " ".join(
+                f"{name}={record['phases'][name]['duration'] * 1e3:.1f}ms"
+                for name in self.PHASES if name in record["phases"]
+            )
+            lines.append(
+                f"{plugin_id}: {record['start'] * 1e3:.1f}-{record['end'] * 1e3:.1f}ms {phases} [{record['thread']}]"
+            )
+        return "\n".join(lines)
+
+
 class PluginLifecycleManager:
     """
     Manages the lifecycle of plugins in the ApexAgent system.
@@ -41,17 +176,21 @@ class PluginLifecycleManager:
     4. Providing lifecycle event notifications
     """
     
-    def __init__(self, plugin_registry, plugin_discovery):
+    def __init__(self, plugin_registry, plugin_discovery, startup_timeline: Optional[StartupTimeline] = None):
         """
         Initialize the PluginLifecycleManager.
         
         Args:
             plugin_registry: Registry for accessing plugin instances
             plugin_discovery: Discovery system for plugin metadata
+            startup_timeline: Timeline to record plugin start times in (a new one by default)
         """
         self.registry = plugin_registry
         self.discovery = plugin_discovery
+        self.startup_timeline = startup_timeline or StartupTimeline()
         self.plugin_states = {}  # Maps plugin_id to PluginState
+        self._start_locks = {}  # Maps plugin_id to the lock serializing its starts
+        self._start_locks_lock = threading.Lock()
         self.lifecycle_hooks = {
             "pre_start": {},
             "post_start": {},
@@ -175,41 +314,59 @@ class PluginLifecycleManager:
         except PluginNotFoundError:
             raise PluginNotFoundError(f"Plugin {plugin_id} not found or not loaded")
         
-        # Check current state
-        current_state = self.get_plugin_state(plugin_id)
-        if current_state == PluginState.ACTIVE:
-            logger.debug(f"Plugin {plugin_id} is already active")
-            return
-        
-        if current_state not in [PluginState.REGISTERED, PluginState.INITIALIZED, PluginState.INACTIVE]:
-            raise PluginStateError(
-                f"Cannot start plugin {plugin_id} in state {current_state}"
-            )
-        
-        # Check dependencies if not forcing
-        if not force:
-            self._check_start_dependencies(plugin_id)
-        
-        try:
-            # Execute pre-start hooks
-            self._execute_hooks("pre_start", plugin_id)
-            
-            # Call start method if available
-            if hasattr(plugin, 'start') and callable(getattr(plugin, 'start')):
-                plugin.start()
+        # Plugins may be started from several threads; only one starts a given plugin
+        with self._get_start_lock(plugin_id):
+            # Check current state
+            current_state = self.get_plugin_state(plugin_id)
+            if current_state == PluginState.ACTIVE:
+                logger.debug(f"Plugin {plugin_id} is already active")
+                return
             
-            # Update state
-            self.set_plugin_state(plugin_id, PluginState.ACTIVE)
+            if current_state not in [PluginState.REGISTERED, PluginState.INITIALIZED, PluginState.INACTIVE]:
+                raise PluginStateError(
+                    f"Cannot start plugin {plugin_id} in state {current_state}"
+                )
             
-            # Execute post-start hooks
-            self._execute_hooks("post_start", plugin_id)
+            # Check dependencies if not forcing
+            if not force:
+                self._check_start_dependencies(plugin_id)
             
-            logger.info(f"Started plugin: {plugin_id}")
+            try:
+                # Execute pre-start hooks
+                self._execute_hooks("pre_start", plugin_id)
+                
+                # Call start method if available
+                if hasattr(plugin, 'start') and callable(getattr(plugin, 'start')):
+                    with self.startup_timeline.phase(plugin_id, "start"):
+                        plugin.start()
+                
+                # Update state
+                self.set_plugin_state(plugin_id, PluginState.ACTIVE)
+                
+                # Execute post-start hooks
+                self._execute_hooks("post_start", plugin_id)
+                
+                logger.info(f"Started plugin: {plugin_id}")
+                
+            except Exception as e:
+                self.set_plugin_state(plugin_id, PluginState.FAILED)
+                logger.error(f"Failed to start plugin {plugin_id}: {e}")
+                raise PluginStateError(f"Failed to start plugin {plugin_id}: {e}")
+    
+    def _get_start_lock(self, plugin_id: str) -> threading.Lock:
+        """
+        Get the lock serializing starts of a plugin.
+        
+        Args:
+            plugin_id: ID of the plugin
             
-        except Exception as e:
-            self.set_plugin_state(plugin_id, PluginState.FAILED)
-            logger.error(f"Failed to start plugin {plugin_id}: {e}")
-            raise PluginStateError(f"Failed to start plugin {plugin_id}: {e}")
+        Returns:
+            The plugin's start lock
+        """
+        with self._start_locks_lock:
+            if plugin_id not in self._start_locks:
+                self._start_locks[plugin_id] = threading.Lock()
+            return self._start_locks[plugin_id]
     
     def stop_plugin(self, plugin_id: str, force: bool = False) -> None:
         """
@@ -539,8 +696,8 @@ class PluginLifecycleManager:
             if plugin_id not in visited:
                 visit(plugin_id)
         
-        # Reverse to get correct order
-        return list(reversed(order))
+        # Dependencies are appended before their dependents
+        return order
     
     def get_plugin_shutdown_order(self) -> List[str]:
         """
@@ -587,6 +744,146 @@ class PluginLifecycleManager:
             'failed': failed
         }
     
+    def start_plugins_parallel(
+        self,
+        plugin_ids: Optional[Iterable[str]] = None,
+        max_concurrency: int = 4,
+        ignore_failures: bool = False,
+        load_plugin: Optional[Callable[[str], Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Start plugins concurrently, each as soon as its dependencies are active.
+        
+        Up to max_concurrency plugins load or start at once, so independent
+        plugins do not wait for each other. Dependencies of the given plugins
+        are started too. A plugin whose dependency fails is not started and is
+        reported as failed, as are plugins on a dependency cycle.
+        
+        Args:
+            plugin_ids: IDs of the plugins to start (all registered plugins by default)
+            max_concurrency: Maximum number of plugins loading or starting at once
+            ignore_failures: If True, continue starting plugins even if some fail
+            load_plugin: Function called with the ID of a plugin that is not registered yet
+                to import and initialize it before it is started
+            
+        Returns:
+            Dictionary with 'success' and 'failed' lists, and the startup 'timeline'
+        """
+        dependency_graph = self.get_plugin_dependency_graph()
+        if plugin_ids is None:
+            plugin_ids = self.registry.get_all_plugins().keys()
+        
+        # Collect the plugins to start with the dependencies each still waits for
+        waiting: Dict[str, Set[str]] = {}
+        dependents: Dict[str, List[str]] = {}
+        stack = list(plugin_ids)
+        while stack:
+            plugin_id = stack.pop()
+            if plugin_id in waiting:
+                continue
+            waiting[plugin_id] = set()
+            for dep_id in dependency_graph.get(plugin_id, []):
+                if self.plugin_states.get(dep_id) == PluginState.ACTIVE:
+                    continue
+                waiting[plugin_id].add(dep_id)
+                dependents.setdefault(dep_id, []).append(plugin_id)
+                stack.append(dep_id)
+        
+        success = []
+        failed = {}
+        ready = [plugin_id for plugin_id, deps in waiting.items() if not deps]
+        running = {}
+        stopped = False
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="plugin-start") as executor:
+            while True:
+                if not stopped:
+                    for plugin_id in ready:
+                        running[executor.submit(self._start_plugin_task, plugin_id, load_plugin)] = plugin_id
+                ready = []
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plugin_id = running.pop(future)
+                    del waiting[plugin_id]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.warning(f"Plugin {plugin_id} not started: {e}")
+                        failed[plugin_id] = str(e)
+                        self._fail_dependents(plugin_id, dependents, waiting, failed)
+                        stopped = stopped or not ignore_failures
+                        continue
+                    
+                    success.append(plugin_id)
+                    for dependent in dependents.get(plugin_id, []):
+                        deps = waiting.get(dependent)
+                        if deps is None:
+                            continue
+                        deps.discard(plugin_id)
+                        if not deps:
+                            ready.append(dependent)
+        
+        # Anything still waiting after a clean run is on, or depends on, a dependency cycle
+        if not stopped:
+            for plugin_id in waiting:
+                failed[plugin_id] = f"Cannot start plugin {plugin_id}: it waits on a circular dependency"
+        
+        summary = self.startup_timeline.get_summary()
+        logger.info(
+            f"Started {len(success)} plugins ({len(failed)} failed) in {summary['wall_time']:.3f}s "
+            f"with {max_concurrency} workers (parallelism {summary['parallelism']:.1f})"
+        )
+        logger.debug(f"Plugin startup timeline:\n{self.startup_timeline.format()}")
+        
+        return {
+            'success': success,
+            'failed': failed,
+            'timeline': self.startup_timeline.get_timeline()
+        }
+    
+    def _start_plugin_task(self, plugin_id: str, load_plugin: Optional[Callable[[str], Any]]) -> None:
+        """
+        Load a plugin if needed and start it, on a startup worker thread.
+        
+        Args:
+            plugin_id: ID of the plugin
+            load_plugin: Function that imports and initializes a plugin, if any
+        """
+        if load_plugin is not None:
+            try:
+                self.registry.get_plugin(plugin_id)
+            except PluginNotFoundError:
+                load_plugin(plugin_id)
+        
+        self.start_plugin(plugin_id)
+    
+    def _fail_dependents(
+        self,
+        plugin_id: str,
+        dependents: Dict[str, List[str]],
+        waiting: Dict[str, Set[str]],
+        failed: Dict[str, str]
+    ) -> None:
+        """
+        Mark the plugins waiting on a failed plugin, directly or not, as failed.
+        
+        Args:
+            plugin_id: ID of the failed plugin
+            dependents: Map of plugin IDs to the plugins waiting on them
+            waiting: Map of plugins not started yet to the dependencies they wait for
+            failed: Map of failed plugin IDs to errors, updated in place
+        """
+        for dependent in dependents.get(plugin_id, []):
+            if dependent not in waiting:
+                continue
+            del waiting[dependent]
+            failed[dependent] = f"Cannot start plugin {dependent}: dependency {plugin_id} failed"
+            self._fail_dependents(dependent, dependents, waiting, failed)
+    
     def stop_plugins_in_order(self, ignore_failures: bool = False) -> Dict[str, Any]:
         """
         Stop plugins in the correct dependency order.
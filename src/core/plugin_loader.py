@@ -12,6 +12,8 @@ import importlib
 import importlib.util
 import inspect
 import logging
+import threading
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, List, Tuple, Type, Union
 
 from src.core.plugin_exceptions import (
@@ -24,6 +26,12 @@ from src.core.plugin_exceptions import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Plugins may be loaded from several threads at once. Each import puts its
+# plugin directory on sys.path while the module executes; the lock guards only
+# the sys.path edits and the count of imports using each directory.
+_import_lock = threading.Lock()
+_plugin_path_users: Dict[str, Tuple[int, bool]] = {}  # directory -> (imports using it, added by them)
+
 class PluginLoader:
     """
     Handles the loading and registration of plugins.
@@ -35,16 +43,24 @@ class PluginLoader:
     4. Registering plugins with the plugin registry
     """
     
-    def __init__(self, plugin_registry):
+    def __init__(self, plugin_registry, startup_timeline=None):
         """
         Initialize the PluginLoader.
         
         Args:
             plugin_registry: The registry where plugins will be registered
+            startup_timeline: StartupTimeline to record import and init times in (optional)
         """
         self.plugin_registry = plugin_registry
+        self.startup_timeline = startup_timeline
         self.loaded_modules = {}
     
+    def _phase(self, plugin_id: Optional[str], name: str):
+        """Get a context manager recording a startup phase, if a timeline and plugin ID are set."""
+        if self.startup_timeline is None or plugin_id is None:
+            return nullcontext()
+        return self.startup_timeline.phase(plugin_id, name)
+    
     def load_plugin_from_path(self, plugin_path: str, manifest_path: str) -> Dict[str, Any]:
         """
         Load a plugin from a specified path using its manifest file.
@@ -84,7 +100,7 @@ class PluginLoader:
             class_name = manifest['class_name']
             
             # Load the plugin module
-            plugin_module = self._load_module(plugin_path, main_module)
+            plugin_module = self._load_module(plugin_path, main_module, plugin_id)
             
             # Get the plugin class
             if not hasattr(plugin_module, class_name):
@@ -95,14 +111,15 @@ class PluginLoader:
             plugin_class = getattr(plugin_module, class_name)
             
             # Create plugin instance
-            plugin_instance = self._instantiate_plugin(
-                plugin_class,
-                plugin_id,
-                plugin_name,
-                version,
-                description,
-                manifest.get('config', {})
-            )
+            with self._phase(plugin_id, "init"):
+                plugin_instance = self._instantiate_plugin(
+                    plugin_class,
+                    plugin_id,
+                    plugin_name,
+                    version,
+                    description,
+                    manifest.get('config', {})
+                )
             
             # Register the plugin
             self.plugin_registry.register_plugin(plugin_id, plugin_instance, manifest)
@@ -121,13 +138,18 @@ class PluginLoader:
                 raise
             raise PluginInitializationError(f"Failed to load plugin: {e}")
     
-    def _load_module(self, plugin_path: str, module_name: str) -> Any:
+    def _load_module(self, plugin_path: str, module_name: str, plugin_id: Optional[str] = None) -> Any:
         """
         Load a Python module dynamically.
         
+        Modules of different plugins execute concurrently; only adding the
+        plugin directory to sys.path is serialized, and the time spent waiting
+        for that is recorded as the import_wait phase.
+        
         Args:
             plugin_path: Path to the plugin directory
             module_name: Name of the module to load
+            plugin_id: ID of the plugin, to record the import in the startup timeline (optional)
             
         Returns:
             Loaded module object
@@ -153,20 +175,20 @@ class PluginLoader:
         if not os.path.exists(module_path):
             raise PluginNotFoundError(f"Plugin module file not found: {module_path}")
         
-        # Add plugin directory to sys.path temporarily
-        original_sys_path = sys.path.copy()
-        if plugin_path not in sys.path:
-            sys.path.insert(0, plugin_path)
+        # Add plugin directory to sys.path while the module executes
+        with self._phase(plugin_id, "import_wait"):
+            self._add_plugin_path(plugin_path)
         
         try:
-            # Try to import using importlib.util for better control
-            spec = importlib.util.spec_from_file_location(module_name, module_path)
-            if spec is None:
-                raise ImportError(f"Failed to create module spec for {module_path}")
-            
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
+            with self._phase(plugin_id, "import"):
+                # Try to import using importlib.util for better control
+                spec = importlib.util.spec_from_file_location(module_name, module_path)
+                if spec is None:
+                    raise ImportError(f"Failed to create module spec for {module_path}")
+                
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
             
             # Cache the loaded module
             self.loaded_modules[cache_key] = module
@@ -179,8 +201,27 @@ class PluginLoader:
             raise ImportError(f"Failed to import plugin module: {e}")
         
         finally:
-            # Restore original sys.path
-            sys.path = original_sys_path
+            self._remove_plugin_path(plugin_path)
+    
+    @staticmethod
+    def _add_plugin_path(plugin_path: str) -> None:
+        """Put a plugin directory on sys.path for an import."""
+        with _import_lock:
+            users, added = _plugin_path_users.get(plugin_path, (0, False))
+            if users == 0 and plugin_path not in sys.path:
+                sys.path.insert(0, plugin_path)
+                added = True
+            _plugin_path_users[plugin_path] = (users + 1, added)
+    
+    @staticmethod
+    def _remove_plugin_path(plugin_path: str) -> None:
+        """Take a plugin directory off sys.path once no import uses it, unless it was there before."""
+        with _import_lock:
+            users, added = _plugin_path_users.pop(plugin_path)
+            if users > 1:
+                _plugin_path_users[plugin_path] = (users - 1, added)
+            elif added and plugin_path in sys.path:
+                sys.path.remove(plugin_path)
     
     def _instantiate_plugin(
         self,
@@ -5,7 +5,8 @@ import importlib
 import logging
 import sys
 import inspect
-from typing import Dict, List, Tuple, Any, Optional, Set, Union
+import asyncio
+from typing import Dict, List, Tuple, Any, Optional, Set, Union, AsyncIterator
 from packaging.version import Version
 import packaging.version
 from packaging.specifiers import SpecifierSet
@@ -19,8 +20,12 @@ from core.plugin_exceptions import (
     PluginMissingDependencyError,
     PluginIncompatibleDependencyError,
     PluginInvalidDependencySpecificationError,
-    PluginCircularDependencyError
+    PluginCircularDependencyError,
+    StreamTransformationError
 )
+from core.async_utils import CancellationToken, ProgressUpdate
+from core.plugin_execution import PluginActionExecutor, PluginExecutionConfig
+from core.stream_pipeline import StreamPipeline, StreamTransform
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -38,13 +43,19 @@ class PluginManager:
     6. Providing access to plugin functionality
     """
     
-    def __init__(self, plugin_dir: str, schema_path: Optional[str] = None):
+    def __init__(
+        self,
+        plugin_dir: str,
+        schema_path: Optional[str] = None,
+        execution_config: Optional[PluginExecutionConfig] = None
+    ):
         """
         Initialize the PluginManager.
         
         Args:
             plugin_dir: Directory containing plugins
             schema_path: Path to the JSON schema for plugin metadata validation
+            execution_config: Configuration for running plugin actions
         """
         self.plugin_dir = os.path.abspath(plugin_dir)
         self.plugins = {}  # Stores loaded plugin instances
@@ -54,6 +65,7 @@ class PluginManager:
         self.plugin_enabled = {}  # Stores enabled/disabled state of plugins
         self.plugin_dependencies = {}  # Stores plugin dependencies
         self.streaming_actions = {}  # Stores streaming-capable actions metadata
+        self.action_executor = PluginActionExecutor(execution_config)  # Runs actions and caches their callables
         
         # Load schema for plugin metadata validation
         if schema_path:
@@ -428,6 +440,7 @@ class PluginManager:
         # Remove plugin instance
         if plugin_id in self.plugins:
             del self.plugins[plugin_id]
+        self.action_executor.invalidate(plugin_id)
         
         # Remove plugin module
         if plugin_id in self.plugin_modules:
@@ -535,6 +548,133 @@ class PluginManager:
         Returns:
             Result of the action
         
+        Raises:
+            PluginNotFoundError: If the plugin is not found
+            AttributeError: If the action is not found
+        """
+        resolved = self._resolve_action(plugin_id, action)
+        return resolved.func(*args, **kwargs)
+    
+    async def execute_action_async(
+        self,
+        plugin_id: str,
+        action: str,
+        *args,
+        timeout: Optional[float] = None,
+        progress_callback=None,
+        cancellation_token: Optional[CancellationToken] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Execute an action on a plugin without blocking the event loop.
+        
+        Coroutine actions are awaited and synchronous actions run on the
+        executor's thread pool, with at most the plugin's concurrency limit
+        running at once. Actions that declare ``progress_callback`` or
+        ``cancellation_token`` parameters receive them.
+        
+        Args:
+            plugin_id: ID of the plugin
+            action: Name of the action to execute
+            *args: Positional arguments to pass to the action
+            timeout: Timeout in seconds (defaults to the action's configured or metadata timeout)
+            progress_callback: Function called with each ProgressUpdate from the action
+            cancellation_token: Token to request cancellation; cancelled on timeout or task cancellation
+            **kwargs: Keyword arguments to pass to the action
+        
+        Returns:
+            Result of the action
+        
+        Raises:
+            PluginNotFoundError: If the plugin is not found
+            AttributeError: If the action is not found
+            PluginActionTimeoutError: If the action does not finish in time
+        """
+        resolved = self._resolve_action(plugin_id, action)
+        metadata = self.plugin_metadata[plugin_id]
+        action_metadata = metadata.get('actions', {})
+        action_metadata = action_metadata.get(action) if isinstance(action_metadata, dict) else None
+        if timeout is None:
+            timeout = self.action_executor.get_timeout(plugin_id, action, action_metadata)
+        
+        return await self.action_executor.execute(
+            plugin_id,
+            resolved,
+            args,
+            kwargs,
+            timeout=timeout,
+            progress_callback=progress_callback,
+            cancellation_token=cancellation_token or CancellationToken(),
+            max_concurrent=metadata.get('max_concurrent_actions')
+        )
+    
+    async def stream_action_progress(
+        self,
+        plugin_id: str,
+        action: str,
+        *args,
+        timeout: Optional[float] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        **kwargs
+    ) -> AsyncIterator[ProgressUpdate]:
+        """
+        Execute an action and yield its progress updates as they are reported.
+        
+        The last update has status "completed" and the action's result in
+        ``details["result"]``. Closing the iterator early cancels the action.
+        
+        Args:
+            plugin_id: ID of the plugin
+            action: Name of the action to execute
+            *args: Positional arguments to pass to the action
+            timeout: Timeout in seconds (defaults to the action's configured or metadata timeout)
+            cancellation_token: Token to request cancellation
+            **kwargs: Keyword arguments to pass to the action
+        
+        Yields:
+            Progress updates from the action, then the completion update
+        
+        Raises:
+            PluginNotFoundError: If the plugin is not found
+            AttributeError: If the action is not found
+            PluginActionTimeoutError: If the action does not finish in time
+        """
+        updates: asyncio.Queue = asyncio.Queue()
+        task = asyncio.ensure_future(self.execute_action_async(
+            plugin_id,
+            action,
+            *args,
+            timeout=timeout,
+            progress_callback=updates.put_nowait,
+            cancellation_token=cancellation_token,
+            **kwargs
+        ))
+        task.add_done_callback(lambda _: updates.put_nowait(None))
+        
+        try:
+            while True:
+                update = await updates.get()
+                if update is None:
+                    break
+                yield update
+            
+            result = task.result()
+            yield ProgressUpdate(percentage=100.0, message="Completed", status="completed", details={"result": result})
+        finally:
+            if not task.done():
+                task.cancel()
+    
+    def _resolve_action(self, plugin_id: str, action: str):
+        """
+        Get a plugin's action callable, loading the plugin if needed.
+        
+        Args:
+            plugin_id: ID of the plugin
+            action: Name of the action
+        
+        Returns:
+            The resolved action
+        
         Raises:
             PluginNotFoundError: If the plugin is not found
             AttributeError: If the action is not found
@@ -543,18 +683,27 @@ class PluginManager:
             raise PluginNotFoundError(f"Plugin {plugin_id} not found")
         
         # Check if plugin is loaded
-        plugin = self.get_plugin(plugin_id)
+        plugin = self.plugins.get(plugin_id)
         if not plugin:
             # Try to load the plugin
             plugin = self.load_plugin(plugin_id)
         
-        # Check if action exists
-        if not hasattr(plugin, action):
-            raise AttributeError(f"Action {action} not found in plugin {plugin_id}")
+        return self.action_executor.resolve(plugin_id, plugin, action)
+    
+    def get_execution_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about plugin action execution.
         
-        # Execute the action
-        action_method = getattr(plugin, action)
-        return action_method(*args, **kwargs)
+        Returns:
+            Action outcome counters and action cache statistics
+        """
+        return self.action_executor.get_stats()
+    
+    def shutdown(self) -> None:
+        """
+        Stop the threads used to run synchronous actions.
+        """
+        self.action_executor.shutdown()
     
     def check_plugin_dependencies(self, plugin_id: str) -> Tuple[bool, Dict[str, Any], Dict[str, Any]]:
         """
@@ -852,20 +1001,89 @@ class PluginManager:
         
         return result
     
-    def transform_stream(self, stream, transformation, **kwargs):
+    def transform_stream(self, stream, transformation, **kwargs) -> AsyncIterator[Any]:
         """
         Apply a transformation to a stream.
         
+        The stream is processed chunk by chunk, so the first transformed
+        chunk is available as soon as the first input chunk has passed
+        through all transformations. The transformation is a StreamTransform,
+        a chunk function (applied to each chunk; returning None drops the
+        chunk), a plugin transform given as a dictionary with "plugin_id",
+        "transform_type" and optionally "params" and "lookahead", or a list
+        of these applied in order.
+        
         Args:
-            stream: The stream to transform
+            stream: The stream to transform (async iterator or iterable)
             transformation: The transformation to apply
-            **kwargs: Additional parameters for the transformation
+            **kwargs: Additional parameters: queue_size (chunks buffered between pipeline stages),
+                cancellation_token and progress_callback (passed to plugin transforms)
         
         Returns:
-            Transformed stream
+            Async iterator of transformed chunks
         
         Raises:
-            NotImplementedError: This method is not yet implemented
+            PluginNotFoundError: If the plugin of a plugin transform is not found
+            StreamTransformationError: If a transformation is invalid, or (while iterating) fails
         """
-        # This is a placeholder for future implementation
-        raise NotImplementedError("Stream transformation is not yet implemented")
+        cancellation_token = kwargs.get('cancellation_token')
+        progress_callback = kwargs.get('progress_callback')
+        
+        specs = transformation if isinstance(transformation, (list, tuple)) else [transformation]
+        transforms = []
+        for spec in specs:
+            if isinstance(spec, StreamTransform):
+                transforms.append(spec)
+            elif isinstance(spec, dict):
+                transforms.append(self._get_plugin_stream_transform(spec, progress_callback, cancellation_token))
+            elif callable(spec):
+                transforms.append(StreamTransform.map(spec))
+            else:
+                raise StreamTransformationError(f"Invalid stream transformation: {spec!r}")
+        
+        pipeline = StreamPipeline(
+            transforms,
+            queue_size=kwargs.get('queue_size', 16),
+            cancellation_token=cancellation_token
+        )
+        return pipeline.run(stream)
+    
+    def _get_plugin_stream_transform(self, spec: Dict[str, Any], progress_callback=None,
+                                     cancellation_token: Optional[CancellationToken] = None) -> StreamTransform:
+        """
+        Create a pipeline transform that calls a plugin's transform_stream.
+        
+        Args:
+            spec: Dictionary with "plugin_id", "transform_type" and optionally "params" and "lookahead"
+            progress_callback: Callback passed to the plugin for progress updates
+            cancellation_token: Token passed to the plugin for cancellation checks
+        
+        Returns:
+            The transform
+        
+        Raises:
+            PluginNotFoundError: If the plugin is not found
+            StreamTransformationError: If the plugin does not support stream transformation
+        """
+        plugin_id = spec.get('plugin_id')
+        transform_type = spec.get('transform_type')
+        params = spec.get('params')
+        if plugin_id not in self.plugin_metadata:
+            raise PluginNotFoundError(f"Plugin {plugin_id} not found")
+        
+        plugin = self.plugins.get(plugin_id) or self.load_plugin(plugin_id)
+        if not hasattr(plugin, 'transform_stream'):
+            raise StreamTransformationError(f"Plugin {plugin_id} does not support stream transformation")
+        
+        # Plugins declare how many chunks a transform holds back; unknown means it may need the whole stream
+        if 'lookahead' in spec:
+            lookahead = spec['lookahead']
+        elif hasattr(plugin, 'get_transform_lookahead'):
+            lookahead = plugin.get_transform_lookahead(transform_type, params)
+        else:
+            lookahead = None
+        
+        def transform(chunks):
+            return plugin.transform_stream(chunks, transform_type, params, progress_callback, cancellation_token)
+        
+        return StreamTransform(transform, name=f"{plugin_id}:{transform_type}", lookahead=lookahead)
@@ -10,12 +10,11 @@ import sys
 import logging
 import importlib
 import threading
-import multiprocessing
-import resource
 import json
 import time
 import pickle
-import tempfile
+import inspect
+import builtins
 from enum import Enum
 from typing import Dict, List, Any, Optional, Set, Tuple, Callable, Union
 from functools import wraps
@@ -26,10 +25,40 @@ from src.core.plugin_exceptions import (
     PluginPermissionError,
     PluginResourceError
 )
+from src.core.plugin_worker_pool import PluginWorkerPool, PluginWorkerPoolConfig
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Builtins removed from the namespaces plugin code runs in
+UNSAFE_BUILTINS = [
+    "open",
+    "exec",
+    "eval",
+    "compile",
+    "__import__",
+    "globals",
+    "locals",
+    "vars",
+    "input",
+    "memoryview",
+    "breakpoint",
+    "classmethod",
+    "staticmethod",
+    "property",
+    "dir",
+    "getattr",
+    "setattr",
+    "delattr",
+    "hasattr",
+    "type",
+    "id",
+    "help",
+    "copyright",
+    "credits",
+    "license"
+]
+
 class PluginPermission(Enum):
     """Enum representing the possible permissions for plugins."""
     # File system permissions
@@ -61,57 +90,6 @@ class PluginPermission(Enum):
     RESOURCE_UNLIMITED = "resource.unlimited"
 
 
-# Function to run in a separate process for sandbox execution
-def _execute_in_process(func_pickle, args_pickle, kwargs_pickle, result_file, error_file, resource_limits):
-    """
-    Execute a function in a separate process with resource limits.
-    
-    Args:
-        func_pickle: Pickled function to execute
-        args_pickle: Pickled positional arguments
-        kwargs_pickle: Pickled keyword arguments
-        result_file: File to write result to
-        error_file: File to write error to
-        resource_limits: Resource limits to apply
-    """
-    try:
-        # Set resource limits
-        if "cpu_time" in resource_limits:
-            resource.setrlimit(
-                resource.RLIMIT_CPU,
-                (int(resource_limits["cpu_time"]), int(resource_limits["cpu_time"]))
-            )
-        
-        if "memory" in resource_limits:
-            resource.setrlimit(
-                resource.RLIMIT_AS,
-                (int(resource_limits["memory"]), int(resource_limits["memory"]))
-            )
-        
-        if "file_size" in resource_limits:
-            resource.setrlimit(
-                resource.RLIMIT_FSIZE,
-                (int(resource_limits["file_size"]), int(resource_limits["file_size"]))
-            )
-        
-        # Unpickle function and arguments
-        func = pickle.loads(func_pickle)
-        args = pickle.loads(args_pickle)
-        kwargs = pickle.loads(kwargs_pickle)
-        
-        # Execute function
-        result = func(*args, **kwargs)
-        
-        # Write result to file
-        with open(result_file, 'wb') as f:
-            pickle.dump(result, f)
-            
-    except Exception as e:
-        # Write error to file
-        with open(error_file, 'wb') as f:
-            pickle.dump(e, f)
-
-
 class PluginSecurityManager:
     """
     Manages security and isolation for plugins in the ApexAgent system.
@@ -138,6 +116,8 @@ class PluginSecurityManager:
         self.plugin_sandboxes = {}  # Maps plugin_id to sandbox information
         self.resource_limits = {}  # Maps plugin_id to resource limits
         self.trusted_plugins = set()  # Set of trusted plugin IDs
+        self._worker_pool = None  # Worker processes for sandboxed execution, started on first use
+        self._worker_pool_lock = threading.Lock()
         
         # Default resource limits - reduced to prevent memory errors
         self.default_resource_limits = {
@@ -457,73 +437,63 @@ class PluginSecurityManager:
             # Use a simpler approach to avoid multiprocessing complexity in tests
             return func(*args, **kwargs)
         
-        # For non-trusted plugins, use multiprocessing for true isolation
+        # For non-trusted plugins, run in a pooled worker process for true isolation
+        limits = dict(resource_limits)
+        limits.setdefault("wall_time", min(resource_limits.get("cpu_time", 10.0) * 1.5, 15.0))
+        start_time = time.time()
         try:
-            # Create temporary files for result and error
-            with tempfile.NamedTemporaryFile(delete=False) as result_file, \
-                 tempfile.NamedTemporaryFile(delete=False) as error_file:
-                result_path = result_file.name
-                error_path = error_file.name
-            
-            # Pickle function and arguments
-            func_pickle = pickle.dumps(func)
-            args_pickle = pickle.dumps(args)
-            kwargs_pickle = pickle.dumps(kwargs)
-            
-            # Create and start process
-            process = multiprocessing.Process(
-                target=_execute_in_process,
-                args=(func_pickle, args_pickle, kwargs_pickle, result_path, error_path, resource_limits)
-            )
+            result = self._get_worker_pool().run(plugin_id, func, *args, limits=limits, **kwargs)
+            
+        except (PluginResourceError, PluginSecurityError):
+            raise
             
-            start_time = time.time()
-            process.start()
-            
-            # Wait for process to complete or timeout
-            timeout = min(resource_limits.get("cpu_time", 10.0) * 1.5, 15.0)
-            process.join(timeout)
-            
-            # Check if process is still alive (timeout)
-            if process.is_alive():
-                process.terminate()
-                process.join(1.0)  # Give it a second to terminate
-                
-                if process.is_alive():
-                    process.kill()  # Force kill if still alive
-                
-                raise PluginResourceError(f"Plugin {plugin_id} execution timed out")
-            
-            # Check for errors
-            if os.path.getsize(error_path) > 0:
-                with open(error_path, 'rb') as f:
-                    error = pickle.load(f)
-                
-                if isinstance(error, PluginResourceError):
-                    raise error
-                raise PluginSecurityError(f"Error executing plugin {plugin_id} in sandbox: {error}")
-            
-            # Get result
-            with open(result_path, 'rb') as f:
-                result = pickle.load(f)
-            
-            # Log execution time
-            execution_time = time.time() - start_time
-            logger.debug(f"Plugin {plugin_id} executed in {execution_time:.2f} seconds")
-            
-            return result
-            
-        except (pickle.PickleError, OSError) as e:
-            # Handle errors related to pickling or file operations
+        except pickle.PickleError as e:
+            # The function or its arguments cannot be sent to a worker process
             raise PluginSecurityError(f"Error setting up sandbox execution: {e}")
             
-        finally:
-            # Clean up temporary files
-            for path in [result_path, error_path]:
-                try:
-                    if os.path.exists(path):
-                        os.unlink(path)
-                except Exception:
-                    pass
+        except Exception as e:
+            raise PluginSecurityError(f"Error executing plugin {plugin_id} in sandbox: {e}")
+        
+        # Log execution time
+        execution_time = time.time() - start_time
+        logger.debug(f"Plugin {plugin_id} executed in {execution_time:.2f} seconds")
+        
+        return result
+    
+    def _get_worker_pool(self) -> PluginWorkerPool:
+        """
+        Get the worker pool for sandboxed execution, starting it on first use.
+        
+        Returns:
+            The plugin worker pool
+        """
+        with self._worker_pool_lock:
+            if self._worker_pool is None:
+                self._worker_pool = PluginWorkerPool(
+                    PluginWorkerPoolConfig(**self.config.get("worker_pool", {}))
+                )
+                self._worker_pool.start()
+            return self._worker_pool
+    
+    def get_worker_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the sandbox worker pool.
+        
+        Returns:
+            Worker pool statistics, or an empty dictionary if the pool has not been started
+        """
+        if self._worker_pool is None:
+            return {}
+        return self._worker_pool.get_stats()
+    
+    def shutdown(self) -> None:
+        """
+        Stop the sandbox worker processes.
+        """
+        with self._worker_pool_lock:
+            if self._worker_pool is not None:
+                self._worker_pool.shutdown()
+                self._worker_pool = None
     
     def _approve_permissions(
         self,
@@ -801,35 +771,7 @@ class PluginIsolationManager:
             safe_builtins = dict(__builtins__.__dict__)
         
         # Remove unsafe builtins
-        unsafe_builtins = [
-            "open",
-            "exec",
-            "eval",
-            "compile",
-            "__import__",
-            "globals",
-            "locals",
-            "vars",
-            "input",
-            "memoryview",
-            "breakpoint",
-            "classmethod",
-            "staticmethod",
-            "property",
-            "dir",
-            "getattr",
-            "setattr",
-            "delattr",
-            "hasattr",
-            "type",
-            "id",
-            "help",
-            "copyright",
-            "credits",
-            "license"
-        ]
-        
-        for builtin in unsafe_builtins:
+        for builtin in UNSAFE_BUILTINS:
             if builtin in safe_builtins:
                 del safe_builtins[builtin]
         
@@ -858,24 +800,29 @@ class PluginIsolationManager:
             
             # Get sandbox directory
             sandbox_info = self.security_manager.get_sandbox(plugin_id)
-            sandbox_dir = sandbox_info["directory"]
-            
-            # Resolve path to ensure it's within the sandbox
-            if not os.path.isabs(file):
-                # Relative path, resolve within sandbox
-                file = os.path.join(sandbox_dir, file)
-            else:
-                # Absolute path, check if it's within sandbox
-                if not file.startswith(sandbox_dir):
-                    raise PluginPermissionError(
-                        f"Plugin {plugin_id} attempted to access file outside sandbox: {file}"
-                    )
-            
-            # Open the file
-            return open(file, mode, *args, **kwargs)
+            return _open_in_sandbox(plugin_id, sandbox_info["directory"], file, mode, *args, **kwargs)
         
         return safe_open
     
+    def _get_namespace_spec(self, plugin_id: str) -> Dict[str, Any]:
+        """
+        Describe a plugin's isolated namespace as plain data, so it can be rebuilt in a worker.
+        
+        Args:
+            plugin_id: ID of the plugin
+            
+        Returns:
+            Namespace name, plugin ID, file permissions and sandbox directory
+        """
+        namespace = self.create_isolated_namespace(plugin_id)
+        return {
+            "name": namespace["__name__"],
+            "plugin_id": plugin_id,
+            "file_read": self.security_manager.has_permission(plugin_id, PluginPermission.FILE_READ),
+            "file_write": self.security_manager.has_permission(plugin_id, PluginPermission.FILE_WRITE),
+            "sandbox_dir": self.security_manager.get_sandbox(plugin_id)["directory"]
+        }
+    
     def execute_in_isolated_namespace(
         self,
         plugin_id: str,
@@ -899,20 +846,96 @@ class PluginIsolationManager:
         # Check permission
         self.security_manager.check_permission(plugin_id, PluginPermission.SYSTEM_EXECUTE)
         
-        # Get or create isolated namespace
-        namespace = self.create_isolated_namespace(plugin_id)
+        # Describe the isolated namespace so the sandbox worker can rebuild it
+        namespace_spec = self._get_namespace_spec(plugin_id)
         
         # Create local variables
         locals_dict = local_vars.copy() if local_vars else {}
         
         # Execute code in sandbox
         try:
-            def execute():
-                exec(code, namespace, locals_dict)
-            
-            self.security_manager.execute_in_sandbox(plugin_id, execute)
-            
-            return locals_dict
+            return self.security_manager.execute_in_sandbox(
+                plugin_id, execute_isolated_code, code, namespace_spec, locals_dict
+            )
             
         except Exception as e:
             raise PluginSecurityError(f"Error executing code in isolated namespace: {e}")
+
+
+def _open_in_sandbox(plugin_id: str, sandbox_dir: str, file: str, mode: str = "r", *args, **kwargs):
+    """
+    Open a file, resolving relative paths within a sandbox and refusing paths outside it.
+    
+    Args:
+        plugin_id: ID of the plugin opening the file
+        sandbox_dir: Sandbox directory of the plugin
+        file: Path of the file
+        mode: Mode to open the file in
+        *args: Further arguments to open()
+        **kwargs: Further keyword arguments to open()
+        
+    Returns:
+        The open file
+        
+    Raises:
+        PluginPermissionError: If the path is outside the sandbox
+    """
+    if not os.path.isabs(file):
+        # Relative path, resolve within sandbox
+        file = os.path.join(sandbox_dir, file)
+    else:
+        # Absolute path, check if it's within sandbox
+        if not file.startswith(sandbox_dir):
+            raise PluginPermissionError(
+                f"Plugin {plugin_id} attempted to access file outside sandbox: {file}"
+            )
+    
+    return open(file, mode, *args, **kwargs)
+
+
+def execute_isolated_code(code: str, namespace_spec: Dict[str, Any], local_vars: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute code in an isolated namespace rebuilt from its description.
+    
+    This is a module-level function so it can be sent to sandbox workers.
+    Modules, functions and classes the code defines are left out of the
+    returned variables, since they cannot be sent back from a worker.
+    
+    Args:
+        code: Python code to execute
+        namespace_spec: Namespace description from PluginIsolationManager
+        local_vars: Local variables to execute the code with
+        
+    Returns:
+        Local variables after execution
+    """
+    plugin_id = namespace_spec["plugin_id"]
+    safe_builtins = {
+        name: value for name, value in vars(builtins).items() if name not in UNSAFE_BUILTINS
+    }
+    
+    if namespace_spec.get("file_read"):
+        sandbox_dir = namespace_spec["sandbox_dir"]
+        can_write = namespace_spec.get("file_write", False)
+        
+        def safe_open(file, mode="r", *args, **kwargs):
+            if ("w" in mode or "a" in mode or "+" in mode) and not can_write:
+                raise PluginPermissionError(
+                    f"Plugin {plugin_id} does not have permission: {PluginPermission.FILE_WRITE.value}"
+                )
+            return _open_in_sandbox(plugin_id, sandbox_dir, file, mode, *args, **kwargs)
+        
+        safe_builtins["open"] = safe_open
+    
+    namespace = {
+        "__name__": namespace_spec["name"],
+        "__plugin_id__": plugin_id,
+        "__builtins__": safe_builtins
+    }
+    locals_dict = dict(local_vars)
+    exec(code, namespace, locals_dict)
+    
+    return {
+        name: value for name, value in locals_dict.items()
+        if not (inspect.ismodule(value) or inspect.isroutine(value) or inspect.isclass(value))
+    }
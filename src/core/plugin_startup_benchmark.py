@@ -0,0 +1,249 @@
+"""
+Plugin Startup Benchmark for ApexAgent
+
+This script generates a set of plugins with a layered dependency graph, where
+importing, initializing, and starting each plugin takes a fixed time like a
+plugin that reads its configuration or connects to a service, and reports the
+cold start time of the plugin system:
+1. Sequential: every plugin loaded, then started one at a time in dependency
+   order (how the plugin system started before parallel startup)
+2. Parallel: plugins loaded and started as soon as their dependencies are
+   active, on a bounded number of threads
+3. Parallel with lazy plugins: as above, with the leaf plugins marked lazy so
+   they are not imported until first use
+
+For each mode it also reports the time spent per phase from the startup
+timeline; import_wait is the time plugins spent waiting for another plugin's
+import, which stays near zero because plugin modules import concurrently.
+
+Usage:
+    python -m src.core.plugin_startup_benchmark --plugins 24 --concurrency 8
+
+    # Import-heavy plugins, where startup time is dominated by module imports
+    # (same as --import-delay 0.05 --init-delay 0.001 --start-delay 0.001)
+    python -m src.core.plugin_startup_benchmark --import-heavy
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Any, Dict, List
+
+from src.core.plugin_system import PluginSystem
+
+logger = logging.getLogger(__name__)
+
+# Import, init, and start delays of the import-heavy case
+IMPORT_HEAVY_DELAYS = (0.05, 0.001, 0.001)
+
+PLUGIN_CODE = '''
+import time
+
+time.sleep({import_delay})
+
+
+class BenchmarkPlugin:
+    def __init__(self, plugin_id, config=None):
+        self.plugin_id = plugin_id
+
+    def initialize(self):
+        time.sleep({init_delay})
+
+    def start(self):
+        time.sleep({start_delay})
+
+    def get_metadata(self):
+        return {{"id": self.plugin_id}}
+
+    def get_actions(self):
+        return []
+
+    def execute_action(self, action, *args, **kwargs):
+        return None
+
+    def shutdown(self):
+        pass
+'''
+
+
+def create_plugins(
+    plugin_dir: str,
+    count: int,
+    layers: int,
+    import_delay: float,
+    init_delay: float,
+    start_delay: float,
+    lazy_leaves: bool
+) -> List[str]:
+    """
+    Write benchmark plugins to a directory.
+
+    Plugins are split into layers; each plugin depends on one plugin of the
+    layer before it.
+
+    Args:
+        plugin_dir: Directory to write the plugins to
+        count: Number of plugins
+        layers: Number of dependency layers
+        import_delay: Seconds spent importing each plugin's module
+        init_delay: Seconds spent in each plugin's initialize()
+        start_delay: Seconds spent in each plugin's start()
+        lazy_leaves: Whether to mark plugins of the last layer as lazy
+
+    Returns:
+        IDs of the plugins
+    """
+    per_layer = max(1, count // layers)
+    plugin_ids = []
+    for i in range(count):
+        layer = min(i // per_layer, layers - 1)
+        plugin_id = f"startup_bench_{i}"
+        manifest = {
+            "id": plugin_id,
+            "name": f"Startup Benchmark {i}",
+            "version": "1.0.0",
+            "description": "Plugin for the startup benchmark",
+            "main_module": f"{plugin_id}_plugin",
+            "class_name": "BenchmarkPlugin"
+        }
+        if layer > 0:
+            dependency = f"startup_bench_{(layer - 1) * per_layer + i % per_layer}"
+            manifest["dependencies"] = {"plugins": {dependency: ">=1.0.0"}}
+        if lazy_leaves and layer == layers - 1:
+            manifest["lazy"] = True
+
+        path = os.path.join(plugin_dir, plugin_id)
+        os.makedirs(path)
+        with open(os.path.join(path, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        with open(os.path.join(path, f"{plugin_id}_plugin.py"), "w") as f:
+            f.write(PLUGIN_CODE.format(import_delay=import_delay, init_delay=init_delay, start_delay=start_delay))
+        plugin_ids.append(plugin_id)
+    return plugin_ids
+
+
+class PluginStartupBenchmark:
+    """Benchmark for plugin system cold start."""
+
+    def __init__(
+        self,
+        plugins: int = 24,
+        layers: int = 3,
+        concurrency: int = 8,
+        import_delay: float = 0.005,
+        init_delay: float = 0.02,
+        start_delay: float = 0.03
+    ):
+        """
+        Initialize the benchmark.
+
+        Args:
+            plugins: Number of plugins
+            layers: Number of dependency layers
+            concurrency: Maximum plugins loading or starting at once in parallel modes
+            import_delay: Seconds spent importing each plugin's module
+            init_delay: Seconds spent initializing each plugin
+            start_delay: Seconds spent starting each plugin
+        """
+        self.plugins = plugins
+        self.layers = layers
+        self.concurrency = concurrency
+        self.delays = (import_delay, init_delay, start_delay)
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def _run_mode(self, name: str, lazy_leaves: bool, start) -> Dict[str, Any]:
+        plugin_dir = tempfile.mkdtemp(prefix="plugin_startup_bench_")
+        try:
+            create_plugins(plugin_dir, self.plugins, self.layers, *self.delays, lazy_leaves)
+            system = PluginSystem([plugin_dir])
+            system.discover_plugins()
+            system.startup_timeline.reset()
+
+            begin = time.perf_counter()
+            result = start(system)
+            elapsed = time.perf_counter() - begin
+
+            summary = system.startup_timeline.get_summary()
+            measured = {
+                "cold_start_ms": elapsed * 1e3,
+                "started": len(result["success"]),
+                "failed": len(result["failed"]),
+                "parallelism": summary["parallelism"],
+                "phase_ms": {phase: total * 1e3 for phase, total in summary["phases"].items()}
+            }
+            system.shutdown()
+        finally:
+            shutil.rmtree(plugin_dir, ignore_errors=True)
+
+        self.results[name] = measured
+        logger.info(
+            f"{name}: {measured['cold_start_ms']:.0f}ms for {measured['started']} plugins "
+            f"(parallelism {measured['parallelism']:.1f})"
+        )
+        return measured
+
+    def benchmark_sequential(self) -> Dict[str, Any]:
+        """
+        Measure loading all plugins, then starting them one at a time.
+
+        Returns:
+            Cold start time, plugins started, and time per phase
+        """
+        def start(system):
+            system.load_all_plugins()
+            return system.lifecycle.start_plugins_in_order()
+
+        return self._run_mode("sequential", False, start)
+
+    def benchmark_parallel(self, lazy_leaves: bool = False) -> Dict[str, Any]:
+        """
+        Measure parallel dependency-aware startup.
+
+        Args:
+            lazy_leaves: Whether plugins of the last layer are lazy
+
+        Returns:
+            Cold start time, plugins started, and time per phase
+        """
+        name = "parallel_lazy" if lazy_leaves else "parallel"
+        return self._run_mode(
+            name, lazy_leaves, lambda system: system.start_all_plugins(max_concurrency=self.concurrency)
+        )
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all benchmarks.
+
+        Returns:
+            Results by mode
+        """
+        self.benchmark_sequential()
+        self.benchmark_parallel()
+        self.benchmark_parallel(lazy_leaves=True)
+        return self.results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Benchmark plugin system cold start")
+    parser.add_argument("--plugins", type=int, default=24, help="Number of plugins")
+    parser.add_argument("--layers", type=int, default=3, help="Number of dependency layers")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum plugins starting at once")
+    parser.add_argument("--import-delay", type=float, default=0.005, help="Seconds to import each plugin")
+    parser.add_argument("--init-delay", type=float, default=0.02, help="Seconds to initialize each plugin")
+    parser.add_argument("--start-delay", type=float, default=0.03, help="Seconds to start each plugin")
+    parser.add_argument("--import-heavy", action="store_true", help="Use the delays of the import-heavy case")
+    args = parser.parse_args()
+    if args.import_heavy:
+        args.import_delay, args.init_delay, args.start_delay = IMPORT_HEAVY_DELAYS
+
+    benchmark = PluginStartupBenchmark(
+        args.plugins, args.layers, args.concurrency, args.import_delay, args.init_delay, args.start_delay
+    )
+    print(json.dumps(benchmark.run(), indent=2))
@@ -3,14 +3,20 @@ Plugin System Module for ApexAgent
 
 This module integrates the plugin loader, registry, and discovery components
 into a cohesive plugin system for the ApexAgent platform.
+
+Plugins whose manifest sets "lazy": true are not imported at startup unless
+another plugin depends on them; they are loaded, and started if the system
+has been started, the first time they are used.
 """
 
 import os
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Set, Tuple
 
 from src.core.plugin_loader import PluginLoader, PluginRegistry
 from src.core.plugin_discovery import PluginDiscovery, ManifestSchemaValidator
+from src.core.plugin_lifecycle import PluginLifecycleManager, StartupTimeline
 from src.core.plugin_exceptions import (
     PluginError,
     PluginNotFoundError,
@@ -43,10 +49,17 @@ class PluginSystem:
         self.registry = PluginRegistry()
         self.schema_validator = ManifestSchemaValidator(schema_path) if schema_path else None
         self.discovery = PluginDiscovery(self.schema_validator)
-        self.loader = PluginLoader(self.registry)
+        self.startup_timeline = StartupTimeline()
+        self.loader = PluginLoader(self.registry, self.startup_timeline)
+        self.lifecycle = PluginLifecycleManager(self.registry, self.discovery, self.startup_timeline)
         
         # Track loaded plugins
         self.loaded_plugins = set()
+        self._load_locks = {}
+        self._load_locks_lock = threading.Lock()
+        
+        # Set once start_all_plugins has run, so plugins loaded later are started too
+        self.started = False
         
         logger.info("Plugin system initialized")
     
@@ -93,6 +106,38 @@ class PluginSystem:
         except PluginNotFoundError:
             pass
         
+        with self._get_load_lock(plugin_id):
+            # Another thread may have loaded the plugin while this one waited
+            try:
+                return self.registry.get_plugin(plugin_id)
+            except PluginNotFoundError:
+                return self._load_plugin(plugin_id)
+    
+    def _get_load_lock(self, plugin_id: str) -> threading.Lock:
+        """
+        Get the lock serializing loads of a plugin.
+        
+        Args:
+            plugin_id: ID of the plugin
+            
+        Returns:
+            The plugin's load lock
+        """
+        with self._load_locks_lock:
+            if plugin_id not in self._load_locks:
+                self._load_locks[plugin_id] = threading.Lock()
+            return self._load_locks[plugin_id]
+    
+    def _load_plugin(self, plugin_id: str) -> Any:
+        """
+        Import, register, and initialize a plugin that is not loaded yet.
+        
+        Args:
+            plugin_id: ID of the plugin to load
+            
+        Returns:
+            Plugin instance
+        """
         # Get plugin path from discovery
         try:
             plugin_path = self.discovery.get_plugin_path(plugin_id)
@@ -120,7 +165,8 @@ class PluginSystem:
             # Initialize the plugin
             plugin_instance = result['instance']
             if hasattr(plugin_instance, 'initialize') and callable(getattr(plugin_instance, 'initialize')):
-                plugin_instance.initialize()
+                with self.startup_timeline.phase(plugin_id, "init"):
+                    plugin_instance.initialize()
                 self.registry.set_plugin_state(plugin_id, 'initialized')
             
             logger.info(f"Loaded and initialized plugin: {plugin_id}")
@@ -131,9 +177,69 @@ class PluginSystem:
                 raise
             raise PluginInitializationError(f"Failed to load plugin {plugin_id}: {e}")
     
+    def is_lazy_plugin(self, plugin_id: str) -> bool:
+        """
+        Check whether a plugin's manifest defers loading it until first use.
+        
+        Args:
+            plugin_id: ID of the plugin
+            
+        Returns:
+            True if the manifest sets "lazy": true
+        """
+        try:
+            return bool(self.get_plugin_metadata(plugin_id).get('lazy', False))
+        except PluginNotFoundError:
+            return False
+    
+    def get_startup_plugin_ids(self) -> List[str]:
+        """
+        Get the IDs of the discovered plugins to load at startup.
+        
+        Lazy plugins are left out; those that eager plugins depend on are
+        still loaded at startup, as dependencies.
+        
+        Returns:
+            List of plugin IDs
+        """
+        return [
+            plugin_id for plugin_id in self.discovery.get_all_plugin_ids()
+            if not self.is_lazy_plugin(plugin_id)
+        ]
+    
+    def start_all_plugins(self, max_concurrency: int = 4, ignore_failures: bool = True) -> Dict[str, Any]:
+        """
+        Load and start all discovered plugins except lazy ones, in parallel.
+        
+        Each plugin is imported, initialized, and started as soon as its
+        dependencies are active, on up to max_concurrency threads. The time
+        each plugin spends in each phase is recorded in startup_timeline.
+        
+        Args:
+            max_concurrency: Maximum number of plugins loading or starting at once
+            ignore_failures: If True, continue starting plugins even if some fail
+            
+        Returns:
+            Dictionary with 'success' and 'failed' lists, and the startup 'timeline'
+        """
+        # Discover plugins if not already done
+        if not self.discovery.discovered_plugins:
+            self.discover_plugins()
+        
+        self.startup_timeline.reset()
+        result = self.lifecycle.start_plugins_parallel(
+            self.get_startup_plugin_ids(),
+            max_concurrency=max_concurrency,
+            ignore_failures=ignore_failures,
+            load_plugin=self.load_plugin
+        )
+        self.started = True
+        
+        return result
+    
     def load_all_plugins(self) -> Dict[str, Any]:
         """
-        Load all discovered plugins.
+        Load all discovered plugins, except lazy ones.
         
         Returns:
             Dictionary mapping plugin IDs to plugin instances
@@ -147,7 +253,7 @@ class PluginSystem:
         failed = {}
         
         # Load each plugin
-        for plugin_id in self.discovery.get_all_plugin_ids():
+        for plugin_id in self.get_startup_plugin_ids():
             try:
                 plugin = self.load_plugin(plugin_id)
                 loaded[plugin_id] = plugin
@@ -206,8 +312,17 @@ class PluginSystem:
         try:
             return self.registry.get_plugin(plugin_id)
         except PluginNotFoundError:
-            # Try to load the plugin if it's not in the registry
+            pass
+        
+        # Try to load the plugin if it's not in the registry, such as a lazy plugin
+        if not self.started:
             return self.load_plugin(plugin_id)
+        
+        # Once the system has started, plugins are started, with their dependencies, on first use
+        result = self.lifecycle.start_plugins_parallel([plugin_id], load_plugin=self.load_plugin)
+        if plugin_id in result['failed']:
+            raise PluginInitializationError(result['failed'][plugin_id])
+        return self.registry.get_plugin(plugin_id)
     
     def get_plugin_metadata(self, plugin_id: str) -> Dict[str, Any]:
         """
@@ -378,6 +493,7 @@ class PluginSystem:
             
             # Unregister the plugin
             self.registry.unregister_plugin(plugin_id)
+            self.lifecycle.plugin_states.pop(plugin_id, None)
             
             # Remove from loaded plugins
             self.loaded_plugins.remove(plugin_id)
@@ -420,4 +536,5 @@ class PluginSystem:
             except Exception as e:
                 logger.error(f"Error shutting down plugin {plugin_id}: {e}")
         
+        self.started = False
         logger.info("Plugin system shutdown complete")
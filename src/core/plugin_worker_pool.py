@@ -0,0 +1,757 @@
+"""
+Plugin Worker Pool Module for ApexAgent
+
+This module runs plugin actions in a pool of pre-forked worker processes, so a
+CPU-heavy plugin does not hold the host interpreter's GIL and a leaking plugin
+does not grow the host's memory. Workers are started up front and reused
+across actions, and are recycled after a number of actions, when their memory
+grows too large, or when an action breaks its limits. A worker only ever runs
+actions of one plugin, so state one plugin leaves behind in a worker, such as
+patched modules, is never visible to another.
+
+Workers run untrusted code, so the host never unpickles arbitrary objects
+from them: results are read with an unpickler that only accepts plain data
+types, and errors come back as their type name, message and traceback text.
+Workers are started with the standard library and site-packages ahead of
+the rest of sys.path, so modules in the repository cannot shadow them.
+
+Every action runs under per-plugin limits: CPU time, address space and file
+size are enforced with RLIMITs inside the worker, and wall-clock time is
+enforced by the host, which kills a worker that overruns. Large binary
+arguments and results travel through shared memory instead of the worker
+pipe, and SharedPayload gives plugins zero-copy access to such buffers.
+"""
+
+import io
+import os
+import sys
+import math
+import errno
+import pickle
+import signal
+import builtins
+import asyncio
+import logging
+import resource
+import threading
+import functools
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory, resource_tracker
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Callable
+
+from src.core.plugin_exceptions import PluginError, PluginResourceError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Shared memory segments this process has mapped, closed by workers after each action
+_open_segments: List[shared_memory.SharedMemory] = []
+
+# Directory containing the src package
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Workers inherit sys.path as it is when they start, so starts swap it one at a time
+_spawn_lock = threading.Lock()
+
+# Globals a worker's result may refer to; anything else is refused by the host
+_RESULT_GLOBALS = {
+    ("builtins", "bytes"),
+    ("builtins", "bytearray"),
+    ("builtins", "complex"),
+    ("builtins", "set"),
+    ("builtins", "frozenset"),
+    ("builtins", "range"),
+    ("builtins", "slice"),
+    ("collections", "OrderedDict"),
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "time"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+    ("decimal", "Decimal"),
+    (__name__, "SharedPayload"),
+    (__name__, "_SharedBytes")
+}
+
+
+@dataclass
+class PluginWorkerPoolConfig:
+    """Configuration for the plugin worker pool."""
+    workers: int = os.cpu_count() or 1
+    max_tasks_per_worker: int = 1000  # actions before a worker is replaced
+    max_worker_rss: int = 256 * 1024 * 1024  # resident memory (bytes) above which a worker is replaced
+    shm_threshold: int = 64 * 1024  # bytes payloads of this size or larger go through shared memory
+    default_wall_time: float = 30.0  # seconds, when the limits give no wall_time or cpu_time
+    start_method: Optional[str] = None  # "forkserver" where available, otherwise "spawn"
+
+
+class SharedPayload:
+    """
+    Binary buffer in shared memory that can be passed to and from workers without copying.
+
+    Pickling a SharedPayload sends only the segment name and size; the
+    receiving process maps the same memory on first access to ``buf``. The
+    process that created the payload owns it and must call ``release`` once
+    no process needs it any more. Payloads created by a worker and returned
+    from an action are owned by the caller.
+    """
+
+    def __init__(self, name: str, size: int):
+        """
+        Attach to an existing shared memory segment.
+
+        Args:
+            name: Name of the segment
+            size: Size of the payload in bytes
+        """
+        self.name = name
+        self.size = size
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    @classmethod
+    def create(cls, size: int) -> "SharedPayload":
+        """
+        Create a new shared memory payload.
+
+        Args:
+            size: Size of the payload in bytes
+
+        Returns:
+            The new payload, owned by the caller
+        """
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        payload = cls(shm.name, size)
+        payload._shm = shm
+        return payload
+
+    @classmethod
+    def from_bytes(cls, data: Any) -> "SharedPayload":
+        """
+        Create a shared memory payload holding a copy of a buffer.
+
+        Args:
+            data: Bytes-like object to copy
+
+        Returns:
+            The new payload, owned by the caller
+        """
+        view = memoryview(data).cast("B")
+        payload = cls.create(view.nbytes)
+        payload.buf[:] = view
+        return payload
+
+    @property
+    def buf(self) -> memoryview:
+        """Writable view of the payload's memory."""
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            _open_segments.append(self._shm)
+        return self._shm.buf[:self.size]
+
+    def tobytes(self) -> bytes:
+        """Copy the payload into a bytes object."""
+        return bytes(self.buf)
+
+    def close(self) -> None:
+        """Unmap the payload from this process without destroying it."""
+        if self._shm is not None:
+            try:
+                _open_segments.remove(self._shm)
+            except ValueError:
+                pass
+            try:
+                self._shm.close()
+            except BufferError:
+                # A view of the buffer is still alive; the mapping goes when it does
+                pass
+            self._shm = None
+
+    def release(self) -> None:
+        """Destroy the payload. Only the owner may call this."""
+        shm = self._shm or shared_memory.SharedMemory(name=self.name)
+        self._shm = shm
+        self.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __reduce__(self):
+        return (SharedPayload, (self.name, self.size))
+
+
+class _SharedBytes:
+    """Marker for a bytes value moved through shared memory by the pool."""
+
+    def __init__(self, payload: SharedPayload, kind: type):
+        self.payload = payload
+        self.kind = kind
+
+
+class _ResultUnpickler(pickle.Unpickler):
+    """Unpickler for worker responses that only loads plain data types."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in _RESULT_GLOBALS:
+            raise pickle.UnpicklingError(f"{module}.{name} is not allowed in a worker result")
+        return super().find_class(module, name)
+
+
+def _load_response(data: bytes) -> Any:
+    """Unpickle a worker response, refusing anything but plain data."""
+    return _ResultUnpickler(io.BytesIO(data)).load()
+
+
+def _remote_error(type_name: str, message: str, traceback_text: str) -> Exception:
+    """
+    Rebuild an error raised by an action in a worker.
+
+    Built-in exception types are raised as themselves; any other type is
+    raised as a PluginError naming it. The worker's traceback is kept in the
+    error's ``remote_traceback`` attribute.
+    """
+    error_class = getattr(builtins, type_name, None)
+    error = None
+    if isinstance(error_class, type) and issubclass(error_class, Exception):
+        try:
+            error = error_class(message)
+        except Exception:
+            error = None
+    if error is None:
+        error = PluginError(f"{type_name}: {message}")
+    error.remote_traceback = traceback_text
+    return error
+
+
+def _worker_sys_path(path: List[str]) -> List[str]:
+    """
+    Order a sys.path for worker processes.
+
+    The standard library and site-packages come first, then the repository
+    root, then the remaining entries, so directories such as src/ that hold
+    modules named like standard library ones cannot shadow them.
+    """
+    prefixes = {
+        os.path.realpath(prefix)
+        for prefix in (sys.prefix, sys.base_prefix, sys.exec_prefix, sys.base_exec_prefix)
+    }
+
+    def is_system(entry: str) -> bool:
+        real = os.path.realpath(entry or os.curdir)
+        if "site-packages" in real or "dist-packages" in real:
+            return True
+        return any(real == prefix or real.startswith(prefix + os.sep) for prefix in prefixes)
+
+    system = [entry for entry in path if is_system(entry)]
+    rest = [entry for entry in path if not is_system(entry) and entry != _REPO_ROOT]
+    return system + [_REPO_ROOT] + rest
+
+
+class _CPULimitExceeded(BaseException):
+    """Raised in a worker when an action uses up its CPU time."""
+
+
+def _raise_cpu_limit(signum, frame):
+    raise _CPULimitExceeded()
+
+
+def _memory_usage() -> Dict[str, int]:
+    """Get the virtual and resident memory size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            size, rss = f.read().split()[:2]
+        return {"vm": int(size) * _PAGE_SIZE, "rss": int(rss) * _PAGE_SIZE}
+    except (OSError, ValueError):
+        # No procfs: fall back to peak RSS, with no baseline for the address space limit
+        return {"vm": 0, "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+
+
+def _export(value: Any, threshold: int, payloads: List[SharedPayload]) -> Any:
+    """Replace a large bytes value with a shared memory marker."""
+    if isinstance(value, (bytes, bytearray)) and len(value) >= threshold:
+        payload = SharedPayload.from_bytes(value)
+        payloads.append(payload)
+        return _SharedBytes(payload, type(value))
+    return value
+
+
+def _import(value: Any, release: bool) -> Any:
+    """Turn a shared memory marker back into a bytes value."""
+    if not isinstance(value, _SharedBytes):
+        return value
+    try:
+        if value.kind not in (bytes, bytearray) or not isinstance(value.payload, SharedPayload):
+            raise PluginError("Invalid shared memory result from worker")
+        return value.kind(value.payload.buf)
+    finally:
+        if release:
+            value.payload.release()
+        else:
+            value.payload.close()
+
+
+def _apply_limits(limits: Dict[str, Any], hard_limits: Dict[int, int]) -> None:
+    """Set a worker's RLIMITs for one action, relative to what it already uses."""
+    if limits.get("cpu_time"):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(math.ceil(usage.ru_utime + usage.ru_stime + float(limits["cpu_time"])))
+        _set_soft_limit(resource.RLIMIT_CPU, soft, hard_limits)
+
+    if limits.get("memory"):
+        baseline = _memory_usage()["vm"]
+        if baseline:
+            _set_soft_limit(resource.RLIMIT_AS, baseline + int(limits["memory"]), hard_limits)
+
+    if limits.get("file_size"):
+        _set_soft_limit(resource.RLIMIT_FSIZE, int(limits["file_size"]), hard_limits)
+
+
+def _set_soft_limit(limit: int, value: int, hard_limits: Dict[int, int]) -> None:
+    hard = hard_limits[limit]
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(limit, (value, hard))
+
+
+def _reset_limits(hard_limits: Dict[int, int]) -> None:
+    """Lift a worker's RLIMITs back to their hard limits."""
+    for limit, hard in hard_limits.items():
+        resource.setrlimit(limit, (hard, hard))
+
+
+def _worker_main(conn, shm_threshold: int) -> None:
+    """
+    Main loop of a worker process.
+
+    Args:
+        conn: Pipe connection to the host
+        shm_threshold: Size from which results go through shared memory
+    """
+    # Interrupts are handled by the host, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    # Writes past the file size limit then fail with EFBIG instead of killing the worker
+    signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+    hard_limits = {
+        limit: resource.getrlimit(limit)[1]
+        for limit in (resource.RLIMIT_CPU, resource.RLIMIT_AS, resource.RLIMIT_FSIZE)
+    }
+
+    while True:
+        try:
+            message = conn.recv_bytes()
+        except (EOFError, OSError):
+            break
+        if not message:
+            break
+
+        payloads: List[SharedPayload] = []
+        try:
+            func, args, kwargs, limits = pickle.loads(message)
+            args = [_import(arg, release=False) for arg in args]
+            kwargs = {key: _import(value, release=False) for key, value in kwargs.items()}
+            try:
+                _apply_limits(limits, hard_limits)
+                result = func(*args, **kwargs)
+            finally:
+                _reset_limits(hard_limits)
+            response = ("ok", _export(result, shm_threshold, payloads))
+        except _CPULimitExceeded:
+            response = ("limit", f"exceeded its CPU time limit of {limits.get('cpu_time')}s")
+        except MemoryError:
+            response = ("limit", f"exceeded its memory limit of {limits.get('memory')} bytes")
+        except OSError as e:
+            if e.errno == errno.EFBIG:
+                response = ("limit", f"exceeded its file size limit of {limits.get('file_size')} bytes")
+            else:
+                response = ("error", _describe_error(e))
+        except Exception as e:
+            response = ("error", _describe_error(e))
+
+        usage = _memory_usage()["rss"]
+        try:
+            data = pickle.dumps(response + (usage,), protocol=pickle.HIGHEST_PROTOCOL)
+            # The host only accepts plain data, so check here to report a clear error
+            _load_response(data)
+        except Exception as e:
+            error = ("PluginError", f"Cannot return {type(response[1]).__name__} from worker: {e}", "")
+            data = pickle.dumps(("error", error, usage), protocol=pickle.HIGHEST_PROTOCOL)
+
+        # The host owns result segments from here; only unmap them in the worker
+        for payload in payloads:
+            payload.close()
+        for segment in list(_open_segments):
+            try:
+                segment.close()
+            except BufferError:
+                continue
+            _open_segments.remove(segment)
+
+        try:
+            conn.send_bytes(data)
+        except (BrokenPipeError, OSError):
+            break
+
+
+def _describe_error(error: BaseException) -> tuple:
+    """Describe an action's error as plain strings for the host."""
+    return (
+        type(error).__name__,
+        str(error),
+        "".join(traceback.format_exception(type(error), error, error.__traceback__))
+    )
+
+
+class _Worker:
+    """Host-side handle of a worker process."""
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.plugin_id: Optional[str] = None  # plugin the worker is pinned to once it has run an action
+        self.tasks = 0
+        self.rss = 0
+
+
+class PluginWorkerPool:
+    """
+    Pool of pre-forked worker processes for running plugin actions.
+
+    Actions are callables that can be pickled by reference, such as
+    module-level functions and methods of picklable plugin objects. Each call
+    takes an idle worker, sends it the action and its limits, and waits for
+    the result; callers block while all workers are busy.
+
+    The first action a worker runs pins it to that action's plugin. Later
+    actions of the plugin prefer its pinned workers, then fresh ones; when
+    only workers pinned to other plugins are idle, one of them is replaced
+    with a fresh process rather than handed over.
+
+    Results must be plain data: built-in scalars and containers, bytes,
+    dates and times, decimals and SharedPayloads. Exceptions of built-in
+    types are raised again in the host; others are raised as PluginError.
+
+    Limits are given per call as a dictionary with the same keys as the
+    security manager's resource limits: ``cpu_time`` (seconds), ``memory``
+    (bytes the action may add to the worker's address space), ``file_size``
+    (bytes) and ``wall_time`` (seconds). An action that breaks a limit raises
+    PluginResourceError, and its worker is replaced.
+    """
+
+    def __init__(self, config: Optional[PluginWorkerPoolConfig] = None):
+        """
+        Initialize the pool. Workers are started by start() or on first use.
+
+        Args:
+            config: Pool configuration
+        """
+        self.config = config or PluginWorkerPoolConfig()
+        method = self.config.start_method
+        if method is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(method)
+        self._lock = threading.Lock()
+        self._idle_changed = threading.Condition(self._lock)
+        self._idle: List[_Worker] = []  # in the order workers became idle
+        self._workers: List[_Worker] = []
+        self._started = False
+        self._closed = False
+        self._stats = {
+            "tasks": 0,
+            "errors": 0,
+            "limit_violations": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "recycled": 0,
+            "reassigned": 0,
+            "shared_payloads": 0
+        }
+
+    def start(self) -> None:
+        """Start the worker processes."""
+        with self._lock:
+            if self._started:
+                return
+            if self._closed:
+                raise PluginError("Plugin worker pool is shut down")
+            # Workers must share the host's tracker, so segments passed between them are tracked once
+            resource_tracker.ensure_running()
+            for _ in range(max(1, self.config.workers)):
+                self._idle.append(self._spawn())
+            self._started = True
+        logger.info(f"Started plugin worker pool with {len(self._workers)} workers")
+
+    def _spawn(self) -> _Worker:
+        """Start a worker process. Called with the lock held."""
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.config.shm_threshold),
+            name="plugin-worker",
+            daemon=True
+        )
+        with _spawn_lock:
+            # The new process (and the fork server, when it first starts) copies sys.path
+            host_path = sys.path
+            sys.path = _worker_sys_path(host_path)
+            try:
+                process.start()
+            finally:
+                sys.path = host_path
+        child_conn.close()
+        worker = _Worker(process, conn)
+        self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, replace: bool = True) -> None:
+        """Stop a worker and start a replacement."""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            if replace and not self._closed:
+                self._stats["recycled"] += 1
+                self._idle.append(self._spawn())
+                self._idle_changed.notify_all()
+        try:
+            worker.conn.close()
+        except OSError:
+            pass
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.process.join(1.0)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def run(
+        self,
+        plugin_id: str,
+        func: Callable,
+        *args,
+        limits: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run a plugin action in a worker process.
+
+        Args:
+            plugin_id: ID of the plugin the action belongs to
+            func: Function to run
+            *args: Positional arguments to pass to the function
+            limits: Resource limits for the action
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            Result of the function
+
+        Raises:
+            pickle.PicklingError: If the action or its arguments cannot be sent to a worker
+            PluginResourceError: If the action exceeds a limit or its worker dies
+            PluginError: If the pool is shut down
+            Exception: Whatever the action raised
+        """
+        if not self._started:
+            self.start()
+
+        limits = dict(limits or {})
+        wall_time = limits.get("wall_time") or (
+            float(limits["cpu_time"]) * 1.5 if limits.get("cpu_time") else self.config.default_wall_time
+        )
+
+        payloads: List[SharedPayload] = []
+        try:
+            threshold = self.config.shm_threshold
+            message = pickle.dumps((
+                func,
+                [_export(arg, threshold, payloads) for arg in args],
+                {key: _export(value, threshold, payloads) for key, value in kwargs.items()},
+                limits
+            ))
+        except (pickle.PickleError, TypeError, AttributeError) as e:
+            for payload in payloads:
+                payload.release()
+            raise pickle.PicklingError(f"Cannot send action of plugin {plugin_id} to a worker: {e}") from e
+
+        if payloads:
+            with self._lock:
+                self._stats["shared_payloads"] += len(payloads)
+
+        worker = self._acquire(plugin_id)
+        worker.plugin_id = plugin_id
+        recycle = False
+        try:
+            worker.conn.send_bytes(message)
+            if not worker.conn.poll(wall_time):
+                recycle = True
+                self._count("timeouts")
+                raise PluginResourceError(
+                    f"Plugin {plugin_id} exceeded its wall-clock time limit of {wall_time:.1f}s"
+                )
+
+            try:
+                data = worker.conn.recv_bytes()
+            except (EOFError, OSError):
+                recycle = True
+                self._count("crashes")
+                worker.process.join(1.0)
+                raise PluginResourceError(
+                    f"Worker running plugin {plugin_id} exited unexpectedly "
+                    f"(exit code {worker.process.exitcode})"
+                )
+
+            try:
+                status, value, rss = _load_response(data)
+                if status not in ("ok", "limit", "error") or not isinstance(rss, int):
+                    raise ValueError(f"unexpected status {status!r}")
+                if status == "error" and not (
+                    isinstance(value, tuple) and len(value) == 3 and all(isinstance(part, str) for part in value)
+                ):
+                    raise ValueError("malformed error")
+            except Exception as e:
+                # A well-behaved worker never sends this; treat the worker as compromised
+                recycle = True
+                self._count("errors")
+                raise PluginError(f"Invalid response from worker running plugin {plugin_id}: {e}")
+
+            worker.tasks += 1
+            worker.rss = rss
+            recycle = worker.tasks >= self.config.max_tasks_per_worker or rss > self.config.max_worker_rss
+            self._count("tasks")
+
+            if status == "limit":
+                recycle = True
+                self._count("limit_violations")
+                raise PluginResourceError(f"Plugin {plugin_id} {value}")
+            if status == "error":
+                self._count("errors")
+                raise _remote_error(*value)
+            if isinstance(value, _SharedBytes):
+                self._count("shared_payloads")
+            return _import(value, release=True)
+
+        finally:
+            for payload in payloads:
+                payload.release()
+            if recycle:
+                self._retire(worker)
+            else:
+                with self._lock:
+                    self._idle.append(worker)
+                    self._idle_changed.notify_all()
+
+    def _acquire(self, plugin_id: str) -> _Worker:
+        """
+        Take an idle worker for a plugin, waiting for one if all are busy.
+
+        Prefers a worker already pinned to the plugin, then a fresh one. A
+        worker pinned to another plugin is replaced, never handed over.
+        """
+        while True:
+            with self._lock:
+                worker = None
+                while worker is None:
+                    if self._closed:
+                        raise PluginError("Plugin worker pool is shut down")
+                    worker = (
+                        next((w for w in self._idle if w.plugin_id == plugin_id), None)
+                        or next((w for w in self._idle if w.plugin_id is None), None)
+                        or (self._idle[0] if self._idle else None)
+                    )
+                    if worker is None:
+                        self._idle_changed.wait(0.5)
+                self._idle.remove(worker)
+
+            if not worker.process.is_alive():
+                # Died while idle, e.g. killed from outside
+                self._count("crashes")
+                self._retire(worker)
+            elif worker.plugin_id not in (None, plugin_id):
+                self._count("reassigned")
+                self._retire(worker)
+            else:
+                return worker
+
+    async def run_async(
+        self,
+        plugin_id: str,
+        func: Callable,
+        *args,
+        limits: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run a plugin action in a worker process without blocking the event loop.
+
+        Args:
+            plugin_id: ID of the plugin the action belongs to
+            func: Function to run
+            *args: Positional arguments to pass to the function
+            limits: Resource limits for the action
+            **kwargs: Keyword arguments to pass to the function
+
+        Returns:
+            Result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.run, plugin_id, func, *args, limits=limits, **kwargs)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Worker counts, action and failure counters, and per-worker details
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            workers = list(self._workers)
+            stats["idle_workers"] = len(self._idle)
+        stats["workers"] = len(workers)
+        stats["worker_details"] = [
+            {"pid": worker.process.pid, "plugin_id": worker.plugin_id, "tasks": worker.tasks, "rss": worker.rss}
+            for worker in workers
+        ]
+        return stats
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """
+        Stop all worker processes.
+
+        Args:
+            timeout: Seconds to wait for idle workers to exit before killing them
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+            idle = self._idle
+            self._idle = []
+            self._idle_changed.notify_all()
+
+        for worker in idle:
+            try:
+                worker.conn.send_bytes(b"")
+            except OSError:
+                pass
+
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.kill()
+                worker.process.join(1.0)
+            worker.conn.close()
+
+        if self._started:
+            logger.info("Shut down plugin worker pool")
@@ -0,0 +1,205 @@
+"""
+Plugin Worker Pool Benchmark for ApexAgent
+
+This script compares running plugin actions in the host interpreter with
+running them in the plugin worker pool and reports:
+1. Dispatch overhead per action for a no-op action: in-process call, pooled
+   worker, and a new process per action (how sandboxed actions used to run)
+2. Aggregate throughput for CPU-bound actions run concurrently from threads,
+   where in-process execution is serialized by the GIL
+3. Transfer time for a large binary payload sent through the worker pipe and
+   through shared memory
+
+Usage:
+    python -m src.core.plugin_worker_pool_benchmark --workers 4 --tasks 64
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+
+from src.core.plugin_worker_pool import PluginWorkerPool, PluginWorkerPoolConfig
+
+logger = logging.getLogger(__name__)
+
+
+def noop() -> None:
+    """Action that does nothing."""
+
+
+def cpu_bound(iterations: int) -> int:
+    """Action that keeps one core busy."""
+    total = 0
+    for i in range(iterations):
+        total += i * i
+    return total
+
+
+def payload_size(data: bytes) -> int:
+    """Action that reads a payload."""
+    return len(data)
+
+
+class PluginWorkerPoolBenchmark:
+    """Benchmark for the plugin worker pool."""
+
+    def __init__(self, workers: int = os.cpu_count() or 1, tasks: int = 64, iterations: int = 300000):
+        """
+        Initialize the benchmark.
+
+        Args:
+            workers: Number of pool workers, and of threads submitting actions
+            tasks: Number of CPU-bound actions per throughput run
+            iterations: Loop iterations per CPU-bound action
+        """
+        self.workers = workers
+        self.tasks = tasks
+        self.iterations = iterations
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def _create_pool(self, **config) -> PluginWorkerPool:
+        pool = PluginWorkerPool(PluginWorkerPoolConfig(workers=self.workers, **config))
+        pool.start()
+        # Warm the workers up so imports are not counted
+        for _ in range(self.workers * 2):
+            pool.run("benchmark", noop)
+        return pool
+
+    def benchmark_dispatch(self, calls: int = 500) -> Dict[str, float]:
+        """
+        Measure per-action dispatch overhead.
+
+        Args:
+            calls: Number of no-op actions per measurement
+
+        Returns:
+            Microseconds per action by execution mode
+        """
+        start = time.perf_counter()
+        for _ in range(calls):
+            noop()
+        in_process = (time.perf_counter() - start) / calls * 1e6
+
+        pool = self._create_pool()
+        try:
+            start = time.perf_counter()
+            for _ in range(calls):
+                pool.run("benchmark", noop)
+            pooled = (time.perf_counter() - start) / calls * 1e6
+        finally:
+            pool.shutdown()
+
+        process_calls = max(1, calls // 50)
+        start = time.perf_counter()
+        for _ in range(process_calls):
+            process = multiprocessing.Process(target=noop)
+            process.start()
+            process.join()
+        per_process = (time.perf_counter() - start) / process_calls * 1e6
+
+        summary = {
+            "in_process_us": in_process,
+            "pooled_worker_us": pooled,
+            "process_per_action_us": per_process
+        }
+        self.results["dispatch"] = summary
+        logger.info(
+            f"dispatch: in-process={in_process:.1f}us pooled={pooled:.1f}us "
+            f"process-per-action={per_process:.1f}us"
+        )
+        return summary
+
+    def benchmark_throughput(self) -> Dict[str, float]:
+        """
+        Measure aggregate throughput of concurrent CPU-bound actions.
+
+        Returns:
+            Actions per second by execution mode
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            start = time.perf_counter()
+            list(executor.map(cpu_bound, [self.iterations] * self.tasks))
+            in_process = self.tasks / (time.perf_counter() - start)
+
+            pool = self._create_pool()
+            try:
+                start = time.perf_counter()
+                list(executor.map(
+                    lambda iterations: pool.run("benchmark", cpu_bound, iterations),
+                    [self.iterations] * self.tasks
+                ))
+                pooled = self.tasks / (time.perf_counter() - start)
+            finally:
+                pool.shutdown()
+
+        summary = {
+            "in_process_actions_per_sec": in_process,
+            "pooled_actions_per_sec": pooled,
+            "speedup": pooled / in_process
+        }
+        self.results["throughput"] = summary
+        logger.info(
+            f"throughput ({self.workers} threads): in-process={in_process:.1f}/s "
+            f"pooled={pooled:.1f}/s speedup={summary['speedup']:.2f}x"
+        )
+        return summary
+
+    def benchmark_payload(self, size: int = 16 * 1024 * 1024, calls: int = 20) -> Dict[str, float]:
+        """
+        Measure transfer time of a large payload to a worker.
+
+        Args:
+            size: Payload size in bytes
+            calls: Number of actions per measurement
+
+        Returns:
+            Milliseconds per action by transport
+        """
+        data = os.urandom(size)
+        summary = {}
+        for transport, threshold in (("pipe_ms", size + 1), ("shared_memory_ms", 64 * 1024)):
+            pool = self._create_pool(shm_threshold=threshold)
+            try:
+                start = time.perf_counter()
+                for _ in range(calls):
+                    pool.run("benchmark", payload_size, data)
+                summary[transport] = (time.perf_counter() - start) / calls * 1e3
+            finally:
+                pool.shutdown()
+
+        self.results["payload"] = summary
+        logger.info(
+            f"payload ({size // (1024 * 1024)} MB): pipe={summary['pipe_ms']:.2f}ms "
+            f"shared memory={summary['shared_memory_ms']:.2f}ms"
+        )
+        return summary
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all benchmarks.
+
+        Returns:
+            Results by benchmark
+        """
+        self.benchmark_dispatch()
+        self.benchmark_throughput()
+        self.benchmark_payload()
+        return self.results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark the plugin worker pool")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool workers and submitting threads")
+    parser.add_argument("--tasks", type=int, default=64, help="CPU-bound actions per throughput run")
+    parser.add_argument("--iterations", type=int, default=300000, help="Loop iterations per CPU-bound action")
+    args = parser.parse_args()
+
+    benchmark = PluginWorkerPoolBenchmark(args.workers, args.tasks, args.iterations)
+    print(json.dumps(benchmark.run(), indent=2))
@@ -0,0 +1,295 @@
+"""
+Stream Pipeline Module for ApexAgent
+
+This module chains stream transforms into a pipeline that processes a stream
+chunk by chunk, so post-processing (for example of LLM output) starts with
+the first chunk instead of after the whole response.
+
+Transforms declare how far they look ahead. Chunk-local transforms (lookahead
+0) emit each chunk's output before reading the next chunk, so consecutive
+chunk-local transforms are fused into one stage and run as a plain chain of
+generators. A transform that holds back chunks (lookahead > 0, or None when
+it may need the whole stream) starts a new stage. Stages run as separate
+tasks connected by bounded queues: a slow consumer stalls the stages before
+it instead of letting chunks pile up, and a stage that buffers does not
+stall the ones before it.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Union
+
+from .async_utils import CancellationToken
+from .plugin_exceptions import StreamTransformationError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+StreamSource = Union[AsyncIterator[Any], Iterable[Any]]
+
+_END = object()
+
+
+class _SourceError(Exception):
+    """Carries an error raised by the source stream through the transform stages."""
+
+    def __init__(self, error: BaseException):
+        super().__init__(str(error))
+        self.error = error
+
+
+class _Failure:
+    """An error passed from a stage to the next one through their queue."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StreamTransform:
+    """
+    A step of a stream pipeline.
+
+    A transform is either a chunk function, called with each chunk and
+    returning the output chunk (or None to drop it), or a stream function,
+    called with the input as an async iterator and returning an async
+    iterator. Either may be async.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        name: Optional[str] = None,
+        lookahead: Optional[int] = None,
+        per_chunk: bool = False
+    ):
+        """
+        Initialize a transform.
+
+        Args:
+            func: Chunk function or stream function
+            name: Name used in errors (defaults to the function's name)
+            lookahead: Number of input chunks the transform may hold before emitting output;
+                0 for chunk-local transforms, None if it may need the whole stream
+            per_chunk: Whether func is a chunk function
+        """
+        self.func = func
+        self.name = name or getattr(func, "__name__", type(func).__name__)
+        self.per_chunk = per_chunk
+        self.lookahead = 0 if per_chunk else lookahead
+        self.is_async = per_chunk and inspect.iscoroutinefunction(func)
+
+    @property
+    def chunk_local(self) -> bool:
+        """Whether the transform emits each chunk's output before reading the next chunk."""
+        return self.lookahead == 0
+
+    @classmethod
+    def map(cls, func: Callable[[Any], Any], name: Optional[str] = None) -> "StreamTransform":
+        """
+        Create a chunk-local transform from a chunk function.
+
+        Args:
+            func: Function called with each chunk; returns the output chunk, or None to drop it
+            name: Name used in errors
+
+        Returns:
+            The transform
+        """
+        return cls(func, name=name, per_chunk=True)
+
+    @classmethod
+    def filter(cls, predicate: Callable[[Any], bool], name: Optional[str] = None) -> "StreamTransform":
+        """
+        Create a chunk-local transform that keeps the chunks matching a predicate.
+
+        Args:
+            predicate: Function called with each chunk
+            name: Name used in errors
+
+        Returns:
+            The transform
+        """
+        return cls(lambda chunk: chunk if predicate(chunk) else None, name=name or "filter", per_chunk=True)
+
+    @classmethod
+    def batch(cls, size: int, name: Optional[str] = None) -> "StreamTransform":
+        """
+        Create a transform that groups chunks into lists of up to size chunks.
+
+        Args:
+            size: Chunks per batch
+            name: Name used in errors
+
+        Returns:
+            The transform
+        """
+        async def batch(stream: AsyncIterator[Any]) -> AsyncIterator[List[Any]]:
+            chunks = []
+            async for chunk in stream:
+                chunks.append(chunk)
+                if len(chunks) >= size:
+                    yield chunks
+                    chunks = []
+            if chunks:
+                yield chunks
+
+        return cls(batch, name=name or "batch", lookahead=size - 1)
+
+
+class StreamPipeline:
+    """
+    Chain of stream transforms run over a stream.
+
+    The source is read by its own task into a bounded queue, so it keeps
+    producing while downstream stages work, up to queue_size chunks ahead.
+    Errors raised by a transform reach the consumer as
+    StreamTransformationError; errors raised by the source are re-raised
+    unchanged. Closing the output early cancels all stages.
+    """
+
+    def __init__(
+        self,
+        transforms: List[StreamTransform],
+        queue_size: int = 16,
+        cancellation_token: Optional[CancellationToken] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            transforms: Transforms, in the order they are applied
+            queue_size: Capacity of the queues between stages, in chunks
+            cancellation_token: Token that ends the stream when cancelled
+        """
+        self.transforms = list(transforms)
+        self.queue_size = max(1, queue_size)
+        self.cancellation_token = cancellation_token
+        self.stages = self._plan_stages(self.transforms)
+
+    @staticmethod
+    def _plan_stages(transforms: List[StreamTransform]) -> List[List[StreamTransform]]:
+        """Split transforms into stages, starting a new stage at each transform that looks ahead."""
+        stages: List[List[StreamTransform]] = [[]]
+        for transform in transforms:
+            if not transform.chunk_local and stages[-1]:
+                stages.append([])
+            stages[-1].append(transform)
+        return stages
+
+    def _queue_size(self, stage: List[StreamTransform]) -> int:
+        """Get the capacity of the queue feeding a stage."""
+        lookahead = stage[0].lookahead if stage else 0
+        # Let the previous stage run while this one fills its lookahead window
+        return max(self.queue_size, lookahead or 0)
+
+    async def run(self, source: StreamSource) -> AsyncIterator[Any]:
+        """
+        Run the pipeline over a stream.
+
+        Args:
+            source: Async iterator or iterable of input chunks
+
+        Yields:
+            Output chunks
+        """
+        tasks: List[asyncio.Task] = []
+        stream = self._read_source(source)
+        try:
+            for stage in self.stages:
+                queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size(stage))
+                tasks.append(asyncio.ensure_future(self._pump(stream, queue)))
+                stream = self._apply_stage(stage, self._drain(queue))
+
+            async for chunk in stream:
+                yield chunk
+        except _SourceError as e:
+            raise e.error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _read_source(self, source: StreamSource) -> AsyncIterator[Any]:
+        """Read the source, stopping when the pipeline is cancelled."""
+        token = self.cancellation_token
+        try:
+            if hasattr(source, "__aiter__"):
+                async for chunk in source:
+                    if token is not None and token.is_cancelled:
+                        return
+                    yield chunk
+            else:
+                for chunk in source:
+                    if token is not None and token.is_cancelled:
+                        return
+                    yield chunk
+        except Exception as e:
+            raise _SourceError(e) from e
+
+    async def _pump(self, stream: AsyncIterator[Any], queue: asyncio.Queue) -> None:
+        """Move a stream's chunks into a queue, followed by the end marker or the stream's error."""
+        try:
+            async for chunk in stream:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(_Failure(e))
+        else:
+            await queue.put(_END)
+
+    @staticmethod
+    async def _drain(queue: asyncio.Queue) -> AsyncIterator[Any]:
+        """Read chunks from a queue until the end marker."""
+        while True:
+            chunk = await queue.get()
+            if chunk is _END:
+                return
+            if isinstance(chunk, _Failure):
+                raise chunk.error
+            yield chunk
+
+    def _apply_stage(self, stage: List[StreamTransform], stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Chain a stage's transforms onto a stream, fusing consecutive chunk functions into one loop."""
+        functions: List[StreamTransform] = []
+        for transform in stage:
+            if transform.per_chunk:
+                functions.append(transform)
+                continue
+            if functions:
+                stream = self._map_chunks(functions, stream)
+                functions = []
+            stream = self._apply_stream_transform(transform, stream)
+        if functions:
+            stream = self._map_chunks(functions, stream)
+        return stream
+
+    @staticmethod
+    async def _map_chunks(functions: List[StreamTransform], stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Apply chunk functions to each chunk in turn."""
+        async for chunk in stream:
+            for transform in functions:
+                try:
+                    chunk = transform.func(chunk)
+                    if transform.is_async:
+                        chunk = await chunk
+                except Exception as e:
+                    raise StreamTransformationError(f"Stream transform {transform.name} failed: {e}") from e
+                if chunk is None:
+                    break
+            else:
+                yield chunk
+
+    @staticmethod
+    async def _apply_stream_transform(transform: StreamTransform, stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Apply a stream function, telling its own errors apart from upstream ones."""
+        try:
+            output = transform.func(stream)
+            if inspect.isawaitable(output):
+                output = await output
+            async for chunk in output:
+                yield chunk
+        except (_SourceError, StreamTransformationError):
+            raise
+        except Exception as e:
+            raise StreamTransformationError(f"Stream transform {transform.name} failed: {e}") from e
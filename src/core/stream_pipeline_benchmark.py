@@ -0,0 +1,224 @@
+"""
+Stream Pipeline Benchmark for ApexAgent
+
+This script runs a chain of five transforms over a simulated LLM response
+stream and reports, for buffering the whole response before transforming it
+(how plugins post-process output without the pipeline), for the pipeline,
+and for the pipeline with every transform in its own stage:
+1. Time to first chunk, with the source producing chunks at a fixed interval
+   like a model generating tokens
+2. Throughput in chunks per second, with the source producing chunks as fast
+   as they are consumed
+
+Usage:
+    python -m src.core.stream_pipeline_benchmark --chunks 200 --interval 0.005
+"""
+
+import re
+import json
+import time
+import asyncio
+import logging
+import argparse
+from typing import Any, AsyncIterator, Dict, List
+
+from src.core.stream_pipeline import StreamPipeline, StreamTransform
+
+logger = logging.getLogger(__name__)
+
+WORDS = (
+    "The  quarterly report is ready. Please contact jane.doe@example.com with questions, "
+    "or reach the \"finance\" team at finance-team@example.org before Friday. "
+).split(" ")
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+TERMS = re.compile(r"\bquarterly\b", re.IGNORECASE)
+
+
+def normalize_whitespace(chunk: str) -> str:
+    return re.sub(r"[ \t]+", " ", chunk)
+
+
+async def redact_emails(stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    # Hold back the last, possibly incomplete word so addresses split across chunks are caught
+    carry = ""
+    async for chunk in stream:
+        text = carry + chunk
+        cut = text.rfind(" ") + 1
+        carry = text[cut:]
+        if cut:
+            yield EMAIL.sub("[email]", text[:cut])
+    if carry:
+        yield EMAIL.sub("[email]", carry)
+
+
+def mask_terms(chunk: str) -> str:
+    return TERMS.sub("*****", chunk)
+
+
+def smart_quotes(chunk: str) -> str:
+    return chunk.replace('"', "”")
+
+
+async def coalesce(stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    # Merge small chunks into ones of at least 16 characters
+    buffer = ""
+    async for chunk in stream:
+        buffer += chunk
+        if len(buffer) >= 16:
+            yield buffer
+            buffer = ""
+    if buffer:
+        yield buffer
+
+
+def create_transforms() -> List[StreamTransform]:
+    """Create the benchmark's chain of five transforms."""
+    return [
+        StreamTransform.map(normalize_whitespace),
+        StreamTransform(redact_emails, lookahead=1),
+        StreamTransform.map(mask_terms),
+        StreamTransform.map(smart_quotes),
+        StreamTransform(coalesce, lookahead=8)
+    ]
+
+
+def create_unfused_transforms() -> List[StreamTransform]:
+    """Create the same chain with every transform declared as needing its own stage."""
+    def as_stream(func):
+        async def transform(stream):
+            async for chunk in stream:
+                yield func(chunk)
+        return transform
+
+    return [
+        StreamTransform(as_stream(normalize_whitespace), name="normalize_whitespace"),
+        StreamTransform(redact_emails),
+        StreamTransform(as_stream(mask_terms), name="mask_terms"),
+        StreamTransform(as_stream(smart_quotes), name="smart_quotes"),
+        StreamTransform(coalesce)
+    ]
+
+
+async def generate(chunks: int, interval: float) -> AsyncIterator[str]:
+    """Simulate a model streaming one word per chunk."""
+    for i in range(chunks):
+        if interval:
+            await asyncio.sleep(interval)
+        else:
+            await asyncio.sleep(0)
+        yield WORDS[i % len(WORDS)] + " "
+
+
+async def buffered(source: AsyncIterator[str], transforms: List[StreamTransform]) -> AsyncIterator[str]:
+    """Collect the whole response, then transform it in one piece."""
+    text = "".join([chunk async for chunk in source])
+    chunks = [text]
+    for transform in transforms:
+        if transform.per_chunk:
+            chunks = [transform.func(chunk) for chunk in chunks]
+        else:
+            async def replay(items=chunks):
+                for item in items:
+                    yield item
+            chunks = [chunk async for chunk in transform.func(replay())]
+    for chunk in chunks:
+        yield chunk
+
+
+class StreamPipelineBenchmark:
+    """Benchmark for stream pipeline latency and throughput."""
+
+    def __init__(self, chunks: int = 200, interval: float = 0.005, throughput_chunks: int = 20000):
+        """
+        Initialize the benchmark.
+
+        Args:
+            chunks: Chunks in the paced response for time to first chunk
+            interval: Seconds between chunks of the paced response
+            throughput_chunks: Chunks in the unpaced response for throughput
+        """
+        self.chunks = chunks
+        self.interval = interval
+        self.throughput_chunks = throughput_chunks
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def _modes(self):
+        return {
+            "buffered": lambda source: buffered(source, create_transforms()),
+            "pipeline": lambda source: StreamPipeline(create_transforms()).run(source),
+            "pipeline_unfused": lambda source: StreamPipeline(create_unfused_transforms()).run(source)
+        }
+
+    async def _measure(self, mode, chunks: int, interval: float) -> Dict[str, float]:
+        start = time.perf_counter()
+        first = None
+        count = 0
+        async for _ in mode(generate(chunks, interval)):
+            if first is None:
+                first = time.perf_counter() - start
+            count += 1
+        return {"first": first, "total": time.perf_counter() - start, "chunks": count}
+
+    def benchmark_latency(self) -> Dict[str, float]:
+        """
+        Measure time to first chunk over a paced response.
+
+        Returns:
+            Milliseconds to the first output chunk by mode
+        """
+        summary = {}
+        for name, mode in self._modes().items():
+            measured = asyncio.run(self._measure(mode, self.chunks, self.interval))
+            summary[f"{name}_ttfc_ms"] = measured["first"] * 1e3
+        summary["generation_ms"] = self.chunks * self.interval * 1e3
+        self.results["latency"] = summary
+        logger.info(
+            f"time to first chunk: buffered={summary['buffered_ttfc_ms']:.1f}ms "
+            f"pipeline={summary['pipeline_ttfc_ms']:.1f}ms "
+            f"unfused={summary['pipeline_unfused_ttfc_ms']:.1f}ms"
+        )
+        return summary
+
+    def benchmark_throughput(self) -> Dict[str, float]:
+        """
+        Measure throughput over an unpaced response.
+
+        Returns:
+            Input chunks per second by mode
+        """
+        summary = {}
+        for name, mode in self._modes().items():
+            measured = asyncio.run(self._measure(mode, self.throughput_chunks, 0))
+            summary[f"{name}_chunks_per_sec"] = self.throughput_chunks / measured["total"]
+        self.results["throughput"] = summary
+        logger.info(
+            f"throughput: buffered={summary['buffered_chunks_per_sec']:,.0f}/s "
+            f"pipeline={summary['pipeline_chunks_per_sec']:,.0f}/s "
+            f"unfused={summary['pipeline_unfused_chunks_per_sec']:,.0f}/s"
+        )
+        return summary
+
+    def run(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Run all benchmarks.
+
+        Returns:
+            Results by benchmark
+        """
+        self.benchmark_latency()
+        self.benchmark_throughput()
+        return self.results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark the stream pipeline")
+    parser.add_argument("--chunks", type=int, default=200, help="Chunks in the paced response")
+    parser.add_argument("--interval", type=float, default=0.005, help="Seconds between paced chunks")
+    parser.add_argument("--throughput-chunks", type=int, default=20000, help="Chunks in the unpaced response")
+    args = parser.parse_args()
+
+    benchmark = StreamPipelineBenchmark(args.chunks, args.interval, args.throughput_chunks)
+    print(json.dumps(benchmark.run(), indent=2))
@@ -0,0 +1,456 @@
+"""
+Streaming statistics for ApexAgent.
+
+This module provides constant-memory summaries shared by the streaming
+anomaly detectors of security monitoring and analytics: running moments
+(Welford with an optional EWMA), a time-decayed count-min sketch and a
+bounded map of the heaviest items for categorical frequencies, and
+time-decayed histograms for bounded categories such as hour of day.
+"""
+
+import array
+import base64
+import hashlib
+import math
+from typing import Any, Dict, List, Optional
+
+
+class RunningMoments:
+    """
+    Running mean and variance of a numeric series.
+
+    Uses Welford's algorithm for the all-time moments and, when an alpha is
+    given, also tracks exponentially weighted moments of recent values.
+    """
+    __slots__ = ("count", "mean", "m2", "alpha", "ewma_mean", "ewma_var")
+
+    def __init__(self, alpha: Optional[float] = None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.alpha = alpha
+        self.ewma_mean = 0.0
+        self.ewma_var = 0.0
+
+    def update(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: Value to add
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.alpha is not None:
+            if self.count == 1:
+                self.ewma_mean = value
+                self.ewma_var = 0.0
+            else:
+                ewma_delta = value - self.ewma_mean
+                increment = self.alpha * ewma_delta
+                self.ewma_mean += increment
+                self.ewma_var = (1 - self.alpha) * (self.ewma_var + ewma_delta * increment)
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation of all values."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    @property
+    def ewma_stdev(self) -> float:
+        """Exponentially weighted standard deviation."""
+        return math.sqrt(self.ewma_var)
+
+    def to_list(self) -> List[float]:
+        """
+        Serialize to a compact list.
+
+        Returns:
+            List of state values
+        """
+        state = [self.count, self.mean, self.m2]
+        if self.alpha is not None:
+            state.extend([self.alpha, self.ewma_mean, self.ewma_var])
+        return state
+
+    @classmethod
+    def from_list(cls, state: List[float]) -> 'RunningMoments':
+        """
+        Restore from a compact list.
+
+        Args:
+            state: List produced by to_list
+
+        Returns:
+            RunningMoments object
+        """
+        moments = cls(alpha=state[3] if len(state) > 3 else None)
+        moments.count = int(state[0])
+        moments.mean = state[1]
+        moments.m2 = state[2]
+        if len(state) > 3:
+            moments.ewma_mean = state[4]
+            moments.ewma_var = state[5]
+        return moments
+
+
+def decay_factor(elapsed_seconds: float, half_life_seconds: Optional[float]) -> float:
+    """
+    Get the weight remaining after a period of exponential decay.
+
+    Args:
+        elapsed_seconds: Time elapsed
+        half_life_seconds: Half-life of the decay (None for no decay)
+
+    Returns:
+        Multiplier between 0 and 1
+    """
+    if not half_life_seconds or elapsed_seconds <= 0:
+        return 1.0
+    return 0.5 ** (elapsed_seconds / half_life_seconds)
+
+
+class DecayedCounter:
+    """A single counter that decays exponentially over time."""
+    __slots__ = ("value", "updated_at")
+
+    def __init__(self, value: float = 0.0, updated_at: float = 0.0):
+        self.value = value
+        self.updated_at = updated_at
+
+    def get(self, now: float, half_life_seconds: Optional[float]) -> float:
+        """
+        Get the decayed value.
+
+        Args:
+            now: Current time in seconds
+            half_life_seconds: Half-life of the decay
+
+        Returns:
+            Decayed value
+        """
+        return self.value * decay_factor(now - self.updated_at, half_life_seconds)
+
+    def add(self, weight: float, now: float, half_life_seconds: Optional[float]) -> None:
+        """
+        Add weight to the counter.
+
+        Args:
+            weight: Weight to add
+            now: Current time in seconds
+            half_life_seconds: Half-life of the decay
+        """
+        self.value = self.get(now, half_life_seconds) + weight
+        self.updated_at = max(self.updated_at, now)
+
+
+class DecayedHistogram:
+    """
+    Histogram over a fixed number of bins whose counts decay over time.
+
+    Suited to bounded categories such as login hour of day.
+    """
+    __slots__ = ("counts", "updated_at")
+
+    def __init__(self, bins: int, counts: Optional[List[float]] = None, updated_at: float = 0.0):
+        self.counts = counts if counts is not None else [0.0] * bins
+        self.updated_at = updated_at
+
+    def _decay_to(self, now: float, half_life_seconds: Optional[float]) -> None:
+        """Apply decay up to a point in time."""
+        factor = decay_factor(now - self.updated_at, half_life_seconds)
+        if factor != 1.0:
+            self.counts = [count * factor for count in self.counts]
+        self.updated_at = max(self.updated_at, now)
+
+    def add(self, bin_index: int, now: float, half_life_seconds: Optional[float], weight: float = 1.0) -> None:
+        """
+        Add weight to a bin.
+
+        Args:
+            bin_index: Bin to add to
+            now: Current time in seconds
+            half_life_seconds: Half-life of the decay
+            weight: Weight to add
+        """
+        self._decay_to(now, half_life_seconds)
+        self.counts[bin_index % len(self.counts)] += weight
+
+    def frequency(self, bin_index: int) -> float:
+        """
+        Get the share of the total weight in a bin.
+
+        Decay scales every bin equally, so the share does not depend on time.
+
+        Args:
+            bin_index: Bin to look up
+
+        Returns:
+            Frequency between 0 and 1
+        """
+        total = sum(self.counts)
+        if total <= 0:
+            return 0.0
+        return self.counts[bin_index % len(self.counts)] / total
+
+    def total(self) -> float:
+        """Get the undecayed total weight as of the last update."""
+        return sum(self.counts)
+
+    def to_list(self) -> List[float]:
+        """
+        Serialize to a compact list.
+
+        Returns:
+            List of the update time followed by bin counts
+        """
+        return [self.updated_at] + [round(count, 6) for count in self.counts]
+
+    @classmethod
+    def from_list(cls, state: List[float]) -> 'DecayedHistogram':
+        """
+        Restore from a compact list.
+
+        Args:
+            state: List produced by to_list
+
+        Returns:
+            DecayedHistogram object
+        """
+        return cls(len(state) - 1, counts=list(state[1:]), updated_at=state[0])
+
+
+class DecayedTopK:
+    """
+    Bounded map of the heaviest items, with counts that decay over time.
+
+    Uses the space-saving algorithm: once full, a new item replaces the
+    lightest one and inherits its count, so tracked counts overestimate by
+    at most the lightest count and untracked items weigh no more than it.
+    Suited to one user's values of a categorical behavior, where a few
+    values carry nearly all of the weight.
+    """
+    __slots__ = ("capacity", "counts", "updated_at")
+    DEFAULT_CAPACITY = 32
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, counts: Optional[Dict[str, float]] = None,
+                 updated_at: float = 0.0):
+        self.capacity = capacity
+        self.counts = counts if counts is not None else {}
+        self.updated_at = updated_at
+
+    def _decay_to(self, now: float, half_life_seconds: Optional[float]) -> None:
+        """Apply decay up to a point in time."""
+        factor = decay_factor(now - self.updated_at, half_life_seconds)
+        if factor != 1.0:
+            self.counts = {item: count * factor for item, count in self.counts.items()}
+        self.updated_at = max(self.updated_at, now)
+
+    def add(self, item: str, now: float, half_life_seconds: Optional[float], weight: float = 1.0) -> None:
+        """
+        Add weight for an item.
+
+        Args:
+            item: Item to count
+            now: Current time in seconds
+            half_life_seconds: Half-life of the decay
+            weight: Weight to add
+        """
+        self._decay_to(now, half_life_seconds)
+        if item in self.counts:
+            self.counts[item] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = weight
+        else:
+            lightest = min(self.counts, key=self.counts.get)
+            self.counts[item] = self.counts.pop(lightest) + weight
+
+    def frequency(self, item: str) -> float:
+        """
+        Get the share of the total weight held by an item.
+
+        Decay scales every count equally, so the share does not depend on time.
+
+        Args:
+            item: Item to look up
+
+        Returns:
+            Frequency between 0 and 1 (0 for untracked items)
+        """
+        total = sum(self.counts.values())
+        if total <= 0:
+            return 0.0
+        return self.counts.get(item, 0.0) / total
+
+    def to_list(self) -> List[Any]:
+        """
+        Serialize to a compact list.
+
+        Returns:
+            List of the capacity, the update time and the item counts
+        """
+        return [self.capacity, self.updated_at, {item: round(count, 6) for item, count in self.counts.items()}]
+
+    @classmethod
+    def from_list(cls, state: List[Any]) -> 'DecayedTopK':
+        """
+        Restore from a compact list.
+
+        Args:
+            state: List produced by to_list
+
+        Returns:
+            DecayedTopK object
+        """
+        return cls(state[0], counts=dict(state[2]), updated_at=state[1])
+
+
+class CountMinSketch:
+    """
+    Count-min sketch with optional exponential time decay.
+
+    Estimates never undercount, and overcount by at most e / width of the
+    total weight with probability 1 - e ** -depth. Decay is applied lazily
+    through a global scale factor, so adding and estimating stay O(depth).
+    """
+    # Overcount below 0.07% of the total weight with 98% probability, in 128 KB
+    DEFAULT_WIDTH = 2 ** 12
+    DEFAULT_DEPTH = 4
+    # Fold decay into the counts once weights grow past 2 ** MAX_SCALE_EXPONENT
+    MAX_SCALE_EXPONENT = 40
+
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH,
+                 half_life_seconds: Optional[float] = None, origin: Optional[float] = None):
+        self.width = width
+        self.depth = depth
+        self.half_life_seconds = half_life_seconds
+        self.origin = origin
+        self.counts = array.array("d", bytes(8 * width * depth))
+
+    @classmethod
+    def for_error(cls, epsilon: float, delta: float,
+                  half_life_seconds: Optional[float] = None) -> 'CountMinSketch':
+        """
+        Create the smallest sketch that meets an error bound.
+
+        Args:
+            epsilon: Maximum overcount as a fraction of the total weight
+            delta: Probability of exceeding the maximum overcount
+            half_life_seconds: Half-life of the decay (None for no decay)
+
+        Returns:
+            CountMinSketch object
+        """
+        width = 2 ** math.ceil(math.log2(math.e / epsilon))
+        depth = max(1, math.ceil(math.log(1 / delta)))
+        return cls(width=width, depth=depth, half_life_seconds=half_life_seconds)
+
+    def _scale(self, now: float) -> float:
+        """Get the weight multiplier for a point in time, rescaling counts if needed."""
+        if not self.half_life_seconds:
+            return 1.0
+        if self.origin is None:
+            self.origin = now
+
+        exponent = (now - self.origin) / self.half_life_seconds
+        if exponent > self.MAX_SCALE_EXPONENT:
+            # Fold the elapsed decay into the counts and restart the clock
+            factor = 0.5 ** exponent
+            for i in range(len(self.counts)):
+                self.counts[i] *= factor
+            self.origin = now
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _positions(self, item: str) -> List[int]:
+        """Get the cell of an item in each row."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=8 * self.depth).digest()
+        return [
+            row * self.width + int.from_bytes(digest[8 * row:8 * row + 8], "little") % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, item: str, now: float = 0.0, weight: float = 1.0) -> None:
+        """
+        Add weight for an item.
+
+        Args:
+            item: Item to count
+            now: Current time in seconds (used for decay)
+            weight: Weight to add
+        """
+        scaled = weight * self._scale(now)
+        for position in self._positions(item):
+            self.counts[position] += scaled
+
+    def estimate(self, item: str, now: float = 0.0) -> float:
+        """
+        Estimate the decayed weight of an item.
+
+        Args:
+            item: Item to look up
+            now: Current time in seconds (used for decay)
+
+        Returns:
+            Estimated weight (never less than the true weight)
+        """
+        scale = self._scale(now)
+        return min(self.counts[position] for position in self._positions(item)) / scale
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the sketch.
+
+        Mostly empty sketches store only their non-zero cells.
+
+        Returns:
+            Dictionary with dimensions, decay settings and base64-encoded
+            counts, or cell indexes and values when sparse
+        """
+        sketch_dict = {
+            "width": self.width,
+            "depth": self.depth,
+            "half_life_seconds": self.half_life_seconds,
+            "origin": self.origin
+        }
+
+        cells = array.array("I", (i for i, count in enumerate(self.counts) if count))
+        # A sparse cell takes 12 bytes against 8 for a dense one
+        if 3 * len(cells) < 2 * len(self.counts):
+            values = array.array("d", (self.counts[i] for i in cells))
+            sketch_dict["cells"] = base64.b64encode(cells.tobytes()).decode("ascii")
+            sketch_dict["values"] = base64.b64encode(values.tobytes()).decode("ascii")
+        else:
+            sketch_dict["counts"] = base64.b64encode(self.counts.tobytes()).decode("ascii")
+        return sketch_dict
+
+    @classmethod
+    def from_dict(cls, sketch_dict: Dict[str, Any]) -> 'CountMinSketch':
+        """
+        Restore a serialized sketch.
+
+        Args:
+            sketch_dict: Dictionary produced by to_dict
+
+        Returns:
+            CountMinSketch object
+        """
+        sketch = cls(
+            width=sketch_dict["width"],
+            depth=sketch_dict["depth"],
+            half_life_seconds=sketch_dict.get("half_life_seconds"),
+            origin=sketch_dict.get("origin")
+        )
+        if "counts" in sketch_dict:
+            sketch.counts = array.array("d", base64.b64decode(sketch_dict["counts"]))
+        else:
+            cells = array.array("I", base64.b64decode(sketch_dict["cells"]))
+            values = array.array("d", base64.b64decode(sketch_dict["values"]))
+            for cell, value in zip(cells, values):
+                sketch.counts[cell] = value
+        return sketch
@@ -15,8 +15,10 @@ from .backup_recovery import (
     BackupMetadata,
     RecoveryMetadata,
     BackupSchedule,
+    BackupProgress,
     BackupService
 )
+from .chunking import ContentDefinedChunker, FixedSizeChunker, ChunkStore
 
 __all__ = [
     'BackupType',
@@ -27,5 +29,9 @@ __all__ = [
     'BackupMetadata',
     'RecoveryMetadata',
     'BackupSchedule',
-    'BackupService'
+    'BackupProgress',
+    'BackupService',
+    'ContentDefinedChunker',
+    'FixedSizeChunker',
+    'ChunkStore'
 ]
@@ -88,6 +88,10 @@ class CryptoCore:
     abstracting the underlying implementations and providing secure defaults.
     """
     
+    # Sizes of the IV and authentication tag produced by symmetric encryption
+    IV_SIZE = 16  # 128 bits
+    TAG_SIZE = 16  # 128 bits for GCM
+    
     def __init__(self):
         """Initialize the CryptoCore with secure defaults."""
         self._default_symmetric_algorithm = EncryptionAlgorithm.AES_256_GCM
@@ -98,9 +102,9 @@ class CryptoCore:
         # Secure defaults
         self._pbkdf2_iterations = 600000  # High iteration count for security
         self._salt_size = 32  # 256 bits
-        self._iv_size = 16  # 128 bits
+        self._iv_size = self.IV_SIZE
         self._key_size = 32  # 256 bits
-        self._tag_size = 16  # 128 bits for GCM
+        self._tag_size = self.TAG_SIZE
         
         logger.info("CryptoCore initialized with secure defaults")
     
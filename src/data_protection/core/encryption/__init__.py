@@ -14,6 +14,8 @@ from .encryption_service import (
     RestEncryptionService,
     MessageEncryptionService
 )
+from .key_cache import DataKeyCache
+from .chunked_encryption import ChunkedFormatError
 
 __all__ = [
     'EncryptionService',
@@ -22,5 +24,7 @@ __all__ = [
     'EncryptionError',
     'TransitEncryptionService',
     'RestEncryptionService',
-    'MessageEncryptionService'
+    'MessageEncryptionService',
+    'DataKeyCache',
+    'ChunkedFormatError'
 ]
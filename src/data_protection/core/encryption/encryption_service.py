@@ -11,6 +11,7 @@ import json
 import base64
 import logging
 import uuid
+import threading
 from typing import Dict, List, Optional, Tuple, Union, Any
 from enum import Enum
 
@@ -33,6 +34,16 @@ from ..key_management import (
     KeyNotFoundError
 )
 
+from .key_cache import DataKeyCache, zeroize
+from .chunked_encryption import (
+    DEFAULT_CHUNK_SIZE,
+    ChunkedFileHeader,
+    new_header,
+    encrypt_stream,
+    decrypt_stream,
+    decrypt_range
+)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -162,7 +173,8 @@ class EncryptedData:
         iv: Optional[bytes] = None,
         tag: Optional[bytes] = None,
         key_id: Optional[str] = None,
-        version: int = 1
+        version: Optional[int] = None,
+        wrapped_key: Optional[bytes] = None
     ):
         """
         Initialize encrypted data container.
@@ -172,15 +184,18 @@ class EncryptedData:
             context: The encryption context
             iv: Initialization vector or nonce
             tag: Authentication tag for AEAD modes
-            key_id: ID of the key used for encryption
-            version: Format version
+            key_id: ID of the key used for encryption, or of the key
+                encryption key when the data key is wrapped
+            version: Format version (2 for envelope encryption, 1 otherwise)
+            wrapped_key: Data encryption key wrapped with key_id (envelope encryption)
         """
         self.ciphertext = ciphertext
         self.context = context
         self.iv = iv
         self.tag = tag
         self.key_id = key_id or context.key_id
-        self.version = version
+        self.wrapped_key = wrapped_key
+        self.version = version or (2 if wrapped_key else 1)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
@@ -190,6 +205,7 @@ class EncryptedData:
             'iv': base64.b64encode(self.iv).decode('utf-8') if self.iv else None,
             'tag': base64.b64encode(self.tag).decode('utf-8') if self.tag else None,
             'key_id': self.key_id,
+            'wrapped_key': base64.b64encode(self.wrapped_key).decode('utf-8') if self.wrapped_key else None,
             'version': self.version
         }
     
@@ -204,7 +220,8 @@ class EncryptedData:
             iv=base64.b64decode(data['iv']) if data['iv'] else None,
             tag=base64.b64decode(data['tag']) if data['tag'] else None,
             key_id=data['key_id'],
-            version=data['version']
+            version=data['version'],
+            wrapped_key=base64.b64decode(data['wrapped_key']) if data.get('wrapped_key') else None
         )
     
     def serialize(self) -> bytes:
@@ -226,12 +243,22 @@ class EncryptionService:
     
     This service provides a unified interface for encryption operations,
     abstracting the underlying cryptographic operations and key management.
+    
+    When no key is specified, data is encrypted with envelope encryption:
+    a data encryption key (DEK) is generated locally, wrapped with a key
+    encryption key (KEK) held by the key management service, and stored
+    alongside the ciphertext. One DEK is reused per owner and resource type
+    until it reaches its use limit or expires from the key cache, so bulk
+    encryption does not create or fetch a managed key per call.
     """
     
     def __init__(
         self,
         crypto_core: Optional[CryptoCore] = None,
-        key_manager: Optional[KeyManagementService] = None
+        key_manager: Optional[KeyManagementService] = None,
+        key_cache_size: int = 1024,
+        key_cache_ttl: int = 300,
+        max_data_key_uses: int = 2 ** 20
     ):
         """
         Initialize the encryption service.
@@ -239,9 +266,22 @@ class EncryptionService:
         Args:
             crypto_core: CryptoCore instance for cryptographic operations
             key_manager: KeyManagementService instance for key management
+            key_cache_size: Maximum number of keys held in the key cache
+            key_cache_ttl: Seconds a cached key may be used before it is
+                fetched again (bounds how long a revoked key stays usable)
+            max_data_key_uses: Number of encryptions after which a reused
+                data encryption key is replaced
         """
         self._crypto = crypto_core or CryptoCore()
         self._key_manager = key_manager or KeyManagementService()
+        self._key_cache = DataKeyCache(max_entries=key_cache_size, ttl_seconds=key_cache_ttl)
+        self._max_data_key_uses = max_data_key_uses
+        
+        # Owner -> ID of the key encryption key used for envelope encryption
+        self._kek_ids: Dict[str, str] = {}
+        # Owner -> ID of the key used for keyed content digests
+        self._digest_key_ids: Dict[str, str] = {}
+        self._kek_lock = threading.Lock()
         
         logger.info("Encryption Service initialized")
     
@@ -276,41 +316,11 @@ class EncryptionService:
             if key_id:
                 context.key_id = key_id
             
-            # If no key_id is specified, create a new data encryption key
-            if not context.key_id:
-                context.key_id = self._key_manager.create_key(
-                    key_type=KeyType.DATA_ENCRYPTION,
-                    algorithm=context.algorithm,
-                    usage=[KeyUsage.ENCRYPT, KeyUsage.DECRYPT],
-                    owner=user_id
-                )
-            
-            # Get the encryption key
-            key = self._key_manager.get_key(
-                context.key_id,
-                usage=KeyUsage.ENCRYPT,
-                requester=user_id
-            )
-            
-            # Get associated data
-            associated_data = context.get_associated_data_bytes()
-            
-            # Encrypt the data
-            encrypted = self._crypto.encrypt_symmetric(
-                plaintext,
-                key,
-                algorithm=context.algorithm,
-                associated_data=associated_data
-            )
-            
-            # Create and return encrypted data container
-            return EncryptedData(
-                ciphertext=encrypted['ciphertext'],
-                context=context,
-                iv=encrypted.get('iv') or encrypted.get('nonce'),
-                tag=encrypted.get('tag'),
-                key_id=context.key_id
-            )
+            key, used_key_id, wrapped_key = self._get_encryption_key(context, user_id)
+            try:
+                return self._encrypt_with_key(plaintext, context, key, used_key_id, wrapped_key)
+            finally:
+                zeroize(key)
         except Exception as e:
             logger.error(f"Encryption failed: {str(e)}")
             raise EncryptionError(f"Encryption failed: {str(e)}")
@@ -334,38 +344,441 @@ class EncryptionService:
             EncryptionError: If decryption fails
         """
         try:
-            # Get the decryption key
-            key = self._key_manager.get_key(
-                encrypted_data.key_id,
-                usage=KeyUsage.DECRYPT,
-                requester=user_id
+            key = self._get_decryption_key(encrypted_data, user_id)
+            try:
+                return self._decrypt_with_key(encrypted_data, key)
+            finally:
+                zeroize(key)
+        except Exception as e:
+            logger.error(f"Decryption failed: {str(e)}")
+            raise EncryptionError(f"Decryption failed: {str(e)}")
+    
+    def encrypt_many(
+        self,
+        plaintexts: List[bytes],
+        contexts: Optional[List[EncryptionContext]] = None,
+        key_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> List[EncryptedData]:
+        """
+        Encrypt a batch of items.
+        
+        Keys are resolved once per distinct key or envelope scope in the
+        batch rather than once per item.
+        
+        Args:
+            plaintexts: Data items to encrypt
+            contexts: Encryption context for each item (a new context per item if None)
+            key_id: ID of the key to use for every item (overrides context.key_id)
+            user_id: ID of the user performing the operation
+        
+        Returns:
+            List[EncryptedData]: The encrypted items, in input order
+        
+        Raises:
+            EncryptionError: If encryption of any item fails
+        """
+        if contexts is not None and len(contexts) != len(plaintexts):
+            raise EncryptionError("Number of contexts does not match number of plaintexts")
+        
+        resolved = {}  # batch key -> [key, key_id, wrapped_key, uses]
+        try:
+            results = []
+            for index, plaintext in enumerate(plaintexts):
+                context = contexts[index] if contexts is not None else EncryptionContext(user_id=user_id)
+                if key_id:
+                    context.key_id = key_id
+                
+                scope = None if context.key_id else self._envelope_scope(context, user_id)
+                batch_key = context.key_id or scope
+                
+                if batch_key in resolved and scope and resolved[batch_key][3] >= self._max_data_key_uses:
+                    # Replace a data key that reached its use limit mid-batch
+                    zeroize(resolved.pop(batch_key)[0])
+                    self._key_cache.invalidate(('active_dek',) + scope)
+                
+                if batch_key not in resolved:
+                    resolved[batch_key] = list(self._get_encryption_key(context, user_id)) + [0]
+                key, used_key_id, wrapped_key, _ = resolved[batch_key]
+                resolved[batch_key][3] += 1
+                
+                results.append(self._encrypt_with_key(plaintext, context, key, used_key_id, wrapped_key))
+            return results
+        except Exception as e:
+            logger.error(f"Batch encryption failed: {str(e)}")
+            raise EncryptionError(f"Batch encryption failed: {str(e)}")
+        finally:
+            for entry in resolved.values():
+                zeroize(entry[0])
+    
+    def decrypt_many(
+        self,
+        encrypted_items: List[EncryptedData],
+        user_id: Optional[str] = None
+    ) -> List[bytes]:
+        """
+        Decrypt a batch of items.
+        
+        Keys are resolved once per distinct key or wrapped data key in the
+        batch rather than once per item.
+        
+        Args:
+            encrypted_items: The encrypted items
+            user_id: ID of the user performing the operation
+        
+        Returns:
+            List[bytes]: The decrypted plaintexts, in input order
+        
+        Raises:
+            EncryptionError: If decryption of any item fails
+        """
+        resolved = {}
+        try:
+            results = []
+            for encrypted_data in encrypted_items:
+                batch_key = (encrypted_data.key_id, encrypted_data.wrapped_key)
+                if batch_key not in resolved:
+                    resolved[batch_key] = self._get_decryption_key(encrypted_data, user_id)
+                results.append(self._decrypt_with_key(encrypted_data, resolved[batch_key]))
+            return results
+        except Exception as e:
+            logger.error(f"Batch decryption failed: {str(e)}")
+            raise EncryptionError(f"Batch decryption failed: {str(e)}")
+        finally:
+            for key in resolved.values():
+                zeroize(key)
+    
+    def invalidate_key_cache(self, key_id: Optional[str] = None) -> int:
+        """
+        Drop cached keys so they are fetched from key management again.
+        
+        Args:
+            key_id: Only drop keys derived from this managed key (all keys if None)
+        
+        Returns:
+            int: Number of cached keys dropped
+        """
+        if key_id is None:
+            count = len(self._key_cache)
+            self._key_cache.clear()
+            return count
+        
+        return self._key_cache.invalidate_where(
+            lambda cache_key, entry: key_id in (cache_key[1], entry.attributes.get('kek_id'))
+        )
+    
+    def content_digest(self, data: bytes, owner: Optional[str] = None) -> str:
+        """
+        Compute a keyed digest of data with an owner's digest key.
+        
+        Unlike a plain hash, the digest reveals nothing about the data to
+        anyone without the owner's key, while equal data of the same owner
+        still gets equal digests.
+        
+        Args:
+            data: Data to digest
+            owner: Owner whose digest key is used (defaults to "system")
+        
+        Returns:
+            str: Hex HMAC-SHA256 of the data
+        
+        Raises:
+            EncryptionError: If the digest key cannot be obtained
+        """
+        owner = owner or "system"
+        try:
+            key_id = self._get_digest_key_id(owner)
+            key = self._get_managed_key(key_id, KeyUsage.SIGN, owner)
+        except Exception as e:
+            logger.error(f"Failed to get digest key: {str(e)}")
+            raise EncryptionError(f"Failed to get digest key: {str(e)}")
+        try:
+            return self._crypto.hmac_data(data, key, HashAlgorithm.SHA256).hex()
+        finally:
+            zeroize(key)
+    
+    def get_key_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get key cache statistics.
+        
+        Returns:
+            Dict: Key cache statistics
+        """
+        return self._key_cache.get_stats()
+    
+    def _encrypt_with_key(
+        self,
+        plaintext: bytes,
+        context: EncryptionContext,
+        key: bytes,
+        key_id: str,
+        wrapped_key: Optional[bytes]
+    ) -> EncryptedData:
+        """Encrypt data with a resolved key."""
+        encrypted = self._crypto.encrypt_symmetric(
+            plaintext,
+            key,
+            algorithm=context.algorithm,
+            associated_data=context.get_associated_data_bytes()
+        )
+        
+        return EncryptedData(
+            ciphertext=encrypted['ciphertext'],
+            context=context,
+            iv=encrypted.get('iv') or encrypted.get('nonce'),
+            tag=encrypted.get('tag'),
+            key_id=key_id,
+            wrapped_key=wrapped_key
+        )
+    
+    def _decrypt_with_key(self, encrypted_data: EncryptedData, key: bytes) -> bytes:
+        """Decrypt data with a resolved key."""
+        # Prepare ciphertext data for decryption
+        ciphertext_data = {
+            'ciphertext': encrypted_data.ciphertext,
+            'iv': encrypted_data.iv
+        }
+        
+        # Add tag if present
+        if encrypted_data.tag:
+            ciphertext_data['tag'] = encrypted_data.tag
+        
+        return self._crypto.decrypt_symmetric(
+            ciphertext_data,
+            key,
+            algorithm=encrypted_data.context.algorithm,
+            associated_data=encrypted_data.context.get_associated_data_bytes()
+        )
+    
+    def _get_encryption_key(
+        self,
+        context: EncryptionContext,
+        user_id: Optional[str]
+    ) -> Tuple[bytearray, str, Optional[bytes]]:
+        """
+        Resolve the key to encrypt with.
+        
+        Args:
+            context: Encryption context
+            user_id: ID of the user performing the operation
+        
+        Returns:
+            Tuple of (key, key_id, wrapped_key); the caller must zeroize the key
+        """
+        if context.key_id:
+            return self._get_managed_key(context.key_id, KeyUsage.ENCRYPT, user_id), context.key_id, None
+        
+        # Envelope encryption with a reused data key for this scope
+        scope = self._envelope_scope(context, user_id)
+        cache_key = ('active_dek',) + scope
+        entry = self._key_cache.get(cache_key)
+        if entry is not None and entry.uses <= self._max_data_key_uses:
+            return entry.key, entry.attributes['kek_id'], entry.attributes['wrapped_key']
+        if entry is not None:
+            zeroize(entry.key)
+        
+        owner = scope[0]
+        kek_id = self._get_kek_id(owner)
+        data_key = bytearray(self._crypto.generate_symmetric_key(context.algorithm))
+        kek = self._get_managed_key(kek_id, KeyUsage.WRAP, user_id)
+        try:
+            wrapped_key = self._wrap_data_key(data_key, kek, kek_id)
+        finally:
+            zeroize(kek)
+        
+        attributes = {'kek_id': kek_id, 'wrapped_key': wrapped_key}
+        self._key_cache.put(cache_key, data_key, attributes)
+        self._key_cache.put(('dek', kek_id, wrapped_key, user_id), data_key, attributes)
+        return data_key, kek_id, wrapped_key
+    
+    def _get_decryption_key(
+        self,
+        encrypted_data: EncryptedData,
+        user_id: Optional[str]
+    ) -> bytearray:
+        """
+        Resolve the key to decrypt with.
+        
+        Args:
+            encrypted_data: The encrypted data and metadata
+            user_id: ID of the user performing the operation
+        
+        Returns:
+            bytearray: The key; the caller must zeroize it
+        """
+        return self._get_key_for_decryption(encrypted_data.key_id, encrypted_data.wrapped_key, user_id)
+    
+    def _get_key_for_decryption(
+        self,
+        key_id: str,
+        wrapped_key: Optional[bytes],
+        user_id: Optional[str]
+    ) -> bytearray:
+        """
+        Resolve a decryption key from a managed key ID and optional wrapped data key.
+        
+        Args:
+            key_id: ID of the managed key (the key encryption key if wrapped_key is set)
+            wrapped_key: Wrapped data encryption key, if envelope encryption was used
+            user_id: ID of the user performing the operation
+        
+        Returns:
+            bytearray: The key; the caller must zeroize it
+        """
+        if not wrapped_key:
+            return self._get_managed_key(key_id, KeyUsage.DECRYPT, user_id)
+        
+        kek_id = key_id
+        cache_key = ('dek', kek_id, wrapped_key, user_id)
+        entry = self._key_cache.get(cache_key)
+        if entry is not None:
+            return entry.key
+        
+        kek = self._get_managed_key(kek_id, KeyUsage.UNWRAP, user_id)
+        try:
+            data_key = bytearray(self._unwrap_data_key(wrapped_key, kek, kek_id))
+        finally:
+            zeroize(kek)
+        
+        self._key_cache.put(cache_key, data_key, {'kek_id': kek_id})
+        return data_key
+    
+    def _get_managed_key(self, key_id: str, usage: KeyUsage, requester: Optional[str]) -> bytearray:
+        """
+        Get a key from key management, using the key cache.
+        
+        Entries are cached per requester and usage so that the key manager's
+        access checks still apply to each combination.
+        
+        Args:
+            key_id: ID of the key
+            usage: Intended usage for the key
+            requester: Entity requesting the key
+        
+        Returns:
+            bytearray: The key; the caller must zeroize it
+        """
+        cache_key = ('managed', key_id, usage.value, requester)
+        entry = self._key_cache.get(cache_key)
+        if entry is not None:
+            return entry.key
+        
+        key = self._key_manager.get_key(key_id, usage=usage, requester=requester)
+        self._key_cache.put(cache_key, key)
+        return bytearray(key)
+    
+    def _envelope_scope(self, context: EncryptionContext, user_id: Optional[str]) -> Tuple[str, str, str]:
+        """
+        Get the scope a reused data key is shared within.
+        
+        Args:
+            context: Encryption context
+            user_id: ID of the user performing the operation
+        
+        Returns:
+            Tuple of (owner, resource type, algorithm)
+        """
+        owner = user_id or context.user_id or "system"
+        return owner, context.resource_type or "", context.algorithm.value
+    
+    def _get_kek_id(self, owner: str) -> str:
+        """
+        Get the key encryption key for an owner, creating it if needed.
+        
+        Args:
+            owner: Owner of the key encryption key
+        
+        Returns:
+            str: ID of the key encryption key
+        """
+        with self._kek_lock:
+            kek_id = self._kek_ids.get(owner)
+            if kek_id:
+                return kek_id
+            
+            existing = self._key_manager.list_keys(
+                key_type=KeyType.KEY_ENCRYPTION,
+                status=KeyStatus.ACTIVE,
+                owner=owner,
+                tags={'purpose': 'envelope'}
             )
+            if existing:
+                kek_id = max(existing, key=lambda metadata: metadata.created_at).key_id
+            else:
+                kek_id = self._key_manager.create_key(
+                    key_type=KeyType.KEY_ENCRYPTION,
+                    algorithm=EncryptionAlgorithm.AES_256_GCM,
+                    usage=[KeyUsage.WRAP, KeyUsage.UNWRAP],
+                    description="Envelope key encryption key",
+                    tags={'purpose': 'envelope'},
+                    owner=owner
+                )
             
-            # Get associated data
-            associated_data = encrypted_data.context.get_associated_data_bytes()
-            
-            # Prepare ciphertext data for decryption
-            ciphertext_data = {
-                'ciphertext': encrypted_data.ciphertext,
-                'iv': encrypted_data.iv
-            }
-            
-            # Add tag if present
-            if encrypted_data.tag:
-                ciphertext_data['tag'] = encrypted_data.tag
+            self._kek_ids[owner] = kek_id
+            return kek_id
+    
+    def _get_digest_key_id(self, owner: str) -> str:
+        """
+        Get the content digest key for an owner, creating it if needed.
+        
+        Args:
+            owner: Owner of the digest key
+        
+        Returns:
+            str: ID of the digest key
+        """
+        with self._kek_lock:
+            key_id = self._digest_key_ids.get(owner)
+            if key_id:
+                return key_id
             
-            # Decrypt the data
-            plaintext = self._crypto.decrypt_symmetric(
-                ciphertext_data,
-                key,
-                algorithm=encrypted_data.context.algorithm,
-                associated_data=associated_data
+            existing = self._key_manager.list_keys(
+                key_type=KeyType.AUTHENTICATION,
+                status=KeyStatus.ACTIVE,
+                owner=owner,
+                tags={'purpose': 'content-digest'}
             )
+            if existing:
+                # Digests must stay stable, so keep using the oldest key
+                key_id = min(existing, key=lambda metadata: metadata.created_at).key_id
+            else:
+                key_id = self._key_manager.create_key(
+                    key_type=KeyType.AUTHENTICATION,
+                    algorithm=EncryptionAlgorithm.AES_256_GCM,
+                    usage=[KeyUsage.SIGN, KeyUsage.VERIFY],
+                    description="Content digest key",
+                    tags={'purpose': 'content-digest'},
+                    owner=owner
+                )
             
-            return plaintext
-        except Exception as e:
-            logger.error(f"Decryption failed: {str(e)}")
-            raise EncryptionError(f"Decryption failed: {str(e)}")
+            self._digest_key_ids[owner] = key_id
+            return key_id
+    
+    def _wrap_data_key(self, data_key: bytes, kek: bytes, kek_id: str) -> bytes:
+        """Wrap a data key with a key encryption key (iv || tag || ciphertext)."""
+        wrapped = self._crypto.encrypt_symmetric(
+            bytes(data_key),
+            kek,
+            algorithm=EncryptionAlgorithm.AES_256_GCM,
+            associated_data=kek_id.encode('utf-8')
+        )
+        return wrapped['iv'] + wrapped['tag'] + wrapped['ciphertext']
+    
+    def _unwrap_data_key(self, wrapped_key: bytes, kek: bytes, kek_id: str) -> bytes:
+        """Unwrap a data key wrapped by _wrap_data_key."""
+        tag_end = CryptoCore.IV_SIZE + CryptoCore.TAG_SIZE
+        if len(wrapped_key) <= tag_end:
+            raise CryptoError("Wrapped data key is truncated")
+        return self._crypto.decrypt_symmetric(
+            {
+                'iv': wrapped_key[:CryptoCore.IV_SIZE],
+                'tag': wrapped_key[CryptoCore.IV_SIZE:tag_end],
+                'ciphertext': wrapped_key[tag_end:]
+            },
+            kek,
+            algorithm=EncryptionAlgorithm.AES_256_GCM,
+            associated_data=kek_id.encode('utf-8')
+        )
     
     def create_encryption_context(
         self,
@@ -426,10 +839,20 @@ class EncryptionService:
                 encrypted_data.key_id,
                 requester=user_id
             )
+            self.invalidate_key_cache(encrypted_data.key_id)
             
             # Create a new context with the new key
             new_context = EncryptionContext.from_dict(encrypted_data.context.to_dict())
-            new_context.key_id = new_key_id
+            
+            if encrypted_data.wrapped_key:
+                # Envelope encryption: new data keys are wrapped with the new key encryption key
+                with self._kek_lock:
+                    for owner, kek_id in list(self._kek_ids.items()):
+                        if kek_id == encrypted_data.key_id:
+                            self._kek_ids[owner] = new_key_id
+                new_context.key_id = None
+            else:
+                new_context.key_id = new_key_id
             
             # Re-encrypt with the new key
             return self.encrypt(plaintext, new_context, user_id=user_id)
@@ -698,11 +1121,17 @@ class RestEncryptionService:
         resource_type: str,
         user_id: Optional[str] = None,
         sensitivity_level: Optional[str] = None,
-        chunk_size: int = 4096
-    ):
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = 4
+    ) -> int:
         """
         Encrypt a file.
         
+        The file is written in the chunked authenticated format: each chunk
+        is sealed independently, so chunks are encrypted in parallel and
+        memory use stays bounded by chunk_size * max_workers regardless of
+        file size.
+        
         Args:
             input_path: Path to the file to encrypt
             output_path: Path to save the encrypted file
@@ -710,7 +1139,11 @@ class RestEncryptionService:
             resource_type: Type of resource being encrypted
             user_id: ID of the user owning the file
             sensitivity_level: Sensitivity level of the file
-            chunk_size: Size of chunks to process at once
+            chunk_size: Plaintext bytes per chunk
+            max_workers: Number of threads encrypting chunks in parallel
+        
+        Returns:
+            int: Size of the encrypted file in bytes
         
         Raises:
             EncryptionError: If file encryption fails
@@ -726,57 +1159,20 @@ class RestEncryptionService:
                 tags={'purpose': 'file_storage'}
             )
             
-            # Create a key for this file
-            key_id = self._encryption._key_manager.create_key(
-                key_type=KeyType.DATA_ENCRYPTION,
-                algorithm=self._default_algorithm,
-                usage=[KeyUsage.ENCRYPT, KeyUsage.DECRYPT],
-                owner=user_id,
-                tags={'resource_id': resource_id, 'resource_type': resource_type}
-            )
-            
-            # Set the key ID in the context
-            context.key_id = key_id
-            
-            # Get the encryption key
-            key = self._encryption._key_manager.get_key(
-                key_id,
-                usage=KeyUsage.ENCRYPT,
-                requester=user_id
-            )
-            
-            # Open the input and output files
-            with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile:
-                # Write the serialized context as a header
-                header = json.dumps(context.to_dict()).encode('utf-8')
-                header_length = len(header).to_bytes(4, byteorder='big')
-                outfile.write(header_length)
-                outfile.write(header)
-                
-                # Generate IV
-                iv = self._encryption._crypto.generate_random_bytes(16)
-                outfile.write(iv)
-                
-                # Initialize cipher
-                cipher = self._encryption._crypto._create_cipher(key, iv, context.algorithm)
-                
-                # Process the file in chunks
-                while True:
-                    chunk = infile.read(chunk_size)
-                    if not chunk:
-                        break
-                    
-                    # Encrypt the chunk
-                    encrypted_chunk = cipher.update(chunk)
-                    outfile.write(encrypted_chunk)
-                
-                # Finalize encryption
-                final_chunk = cipher.finalize()
-                outfile.write(final_chunk)
-                
-                # Write authentication tag if using AEAD mode
-                if hasattr(cipher, 'tag'):
-                    outfile.write(cipher.tag)
+            # Get a data key for this owner and resource type
+            key, key_id, wrapped_key = self._encryption._get_encryption_key(context, user_id)
+            try:
+                with open(input_path, 'rb') as infile, open(output_path, 'wb') as outfile:
+                    header = new_header(
+                        plaintext_size=os.fstat(infile.fileno()).st_size,
+                        chunk_size=chunk_size,
+                        key_id=key_id,
+                        wrapped_key=wrapped_key,
+                        context=context.to_dict()
+                    )
+                    return encrypt_stream(infile, outfile, key, header, max_workers=max_workers)
+            finally:
+                zeroize(key)
         except Exception as e:
             logger.error(f"File encryption failed: {str(e)}")
             raise EncryptionError(f"File encryption failed: {str(e)}")
@@ -786,63 +1182,87 @@ class RestEncryptionService:
         input_path: str,
         output_path: str,
         user_id: Optional[str] = None,
-        chunk_size: int = 4096
-    ):
+        max_workers: int = 4
+    ) -> int:
         """
         Decrypt a file.
         
+        Every chunk is authenticated before it is written, and chunks are
+        decrypted in parallel with bounded memory. Plaintext is written to a
+        temporary file next to output_path and renamed into place only once
+        every chunk has been authenticated, so a failed decryption never
+        leaves partial or unauthenticated plaintext at output_path.
+        
         Args:
             input_path: Path to the encrypted file
             output_path: Path to save the decrypted file
             user_id: ID of the user accessing the file
-            chunk_size: Size of chunks to process at once
+            max_workers: Number of threads decrypting chunks in parallel
+        
+        Returns:
+            int: Size of the decrypted file in bytes
         
         Raises:
             EncryptionError: If file decryption fails
         """
         try:
-            # Open the input file
             with open(input_path, 'rb') as infile:
-                # Read the header length
-                header_length = int.from_bytes(infile.read(4), byteorder='big')
-                
-                # Read and parse the context
-                header = infile.read(header_length)
-                context_dict = json.loads(header.decode('utf-8'))
-                context = EncryptionContext.from_dict(context_dict)
-                
-                # Read the IV
-                iv = infile.read(16)
-                
-                # Get the decryption key
-                key = self._encryption._key_manager.get_key(
-                    context.key_id,
-                    usage=KeyUsage.DECRYPT,
-                    requester=user_id
-                )
-                
-                # Initialize cipher
-                cipher = self._encryption._crypto._create_decipher(key, iv, context.algorithm)
-                
-                # Open the output file
-                with open(output_path, 'wb') as outfile:
-                    # Process the file in chunks
-                    while True:
-                        chunk = infile.read(chunk_size)
-                        if not chunk:
-                            break
-                        
-                        # Decrypt the chunk
-                        decrypted_chunk = cipher.update(chunk)
-                        outfile.write(decrypted_chunk)
-                    
-                    # Finalize decryption
-                    final_chunk = cipher.finalize()
-                    outfile.write(final_chunk)
+                header = ChunkedFileHeader.read(infile)
+                key = self._encryption._get_key_for_decryption(header.key_id, header.wrapped_key, user_id)
+                temp_path = f"{output_path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(temp_path, 'wb') as outfile:
+                        size = decrypt_stream(infile, outfile, key, header, max_workers=max_workers)
+                    os.replace(temp_path, output_path)
+                    return size
+                except BaseException:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    raise
+                finally:
+                    zeroize(key)
         except Exception as e:
             logger.error(f"File decryption failed: {str(e)}")
             raise EncryptionError(f"File decryption failed: {str(e)}")
     
+    def decrypt_file_range(
+        self,
+        input_path: str,
+        offset: int,
+        length: int,
+        user_id: Optional[str] = None
+    ) -> bytes:
+        """
+        Decrypt a byte range of an encrypted file.
+        
+        Only the chunks covering the range are read and authenticated.
+        
+        Args:
+            input_path: Path to the encrypted file
+            offset: Offset of the range in the decrypted file
+            length: Number of bytes to decrypt
+            user_id: ID of the user accessing the file
+        
+        Returns:
+            bytes: The decrypted range (shorter if it extends past the end of the file)
+        
+        Raises:
+            EncryptionError: If decryption fails
+        """
+        try:
+            with open(input_path, 'rb') as infile:
+                header = ChunkedFileHeader.read(infile)
+                key = self._encryption._get_key_for_decryption(header.key_id, header.wrapped_key, user_id)
+                try:
+                    return decrypt_range(infile, key, header, offset, length)
+                finally:
+                    zeroize(key)
+        except Exception as e:
+            logger.error(f"File range decryption failed: {str(e)}")
+            raise EncryptionError(f"File range decryption failed: {str(e)}")
+    
     def encrypt_config_value(
         self,
         value: str,
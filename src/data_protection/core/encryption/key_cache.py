@@ -0,0 +1,214 @@
+"""
+Data Key Cache for the Data Protection Framework.
+
+This module provides a bounded, time-limited in-memory cache for key
+material used by the encryption services, so that repeated operations do
+not go back to the key management service for every call. Cached keys are
+held in mutable buffers and overwritten with zeros when they leave the
+cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def zeroize(buffer: bytearray) -> None:
+    """
+    Overwrite a key buffer with zeros.
+
+    Args:
+        buffer: The buffer to clear
+    """
+    buffer[:] = bytes(len(buffer))
+
+
+class CachedKey:
+    """
+    A cached key and its bookkeeping.
+
+    The key material is stored in a bytearray so that it can be zeroized
+    when the entry is evicted, expires, or is invalidated.
+    """
+
+    __slots__ = ('key', 'expires_at', 'uses', 'attributes')
+
+    def __init__(self, key: bytes, expires_at: float, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a cached key.
+
+        Args:
+            key: The key material (copied into a private buffer)
+            expires_at: Monotonic time after which the entry is no longer served
+            attributes: Additional data stored with the key
+        """
+        self.key = bytearray(key)
+        self.expires_at = expires_at
+        self.uses = 0
+        self.attributes = attributes or {}
+
+    def copy(self) -> 'CachedKey':
+        """
+        Copy the entry into a new key buffer.
+
+        Returns:
+            CachedKey: A detached copy the caller may zeroize when done
+        """
+        entry = CachedKey(self.key, self.expires_at, self.attributes)
+        entry.uses = self.uses
+        return entry
+
+
+class DataKeyCache:
+    """
+    Bounded LRU cache of key material with a time-to-live.
+
+    Entries are evicted in least-recently-used order once the cache is full
+    and are never served after their TTL. Every entry that leaves the cache
+    has its key buffer zeroized. Lookups return a detached copy, so an entry
+    evicted by another thread never changes a key that is in use; callers
+    should zeroize the copy once the operation is done.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of keys to hold
+            ttl_seconds: How long a key may be served after it was cached
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Hashable, CachedKey]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, cache_key: Hashable) -> Optional[CachedKey]:
+        """
+        Get a cached key.
+
+        Args:
+            cache_key: Cache key to look up
+
+        Returns:
+            CachedKey: A copy of the cached entry, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._discard(cache_key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(cache_key)
+            entry.uses += 1
+            self._stats['hits'] += 1
+            return entry.copy()
+
+    def put(
+        self,
+        cache_key: Hashable,
+        key: bytes,
+        attributes: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Cache a key, replacing any existing entry.
+
+        Args:
+            cache_key: Cache key to store under
+            key: The key material
+            attributes: Additional data stored with the key
+            ttl_seconds: Override for the cache TTL
+        """
+        ttl = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = CachedKey(key, time.monotonic() + ttl, attributes)
+
+        with self._lock:
+            if cache_key in self._entries:
+                self._discard(cache_key)
+
+            self._entries[cache_key] = entry
+
+            while len(self._entries) > self._max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, cache_key: Hashable) -> bool:
+        """
+        Remove a cached key.
+
+        Args:
+            cache_key: Cache key to remove
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        with self._lock:
+            if cache_key not in self._entries:
+                return False
+            self._discard(cache_key)
+            self._stats['invalidations'] += 1
+            return True
+
+    def invalidate_where(self, predicate: Callable[[Hashable, CachedKey], bool]) -> int:
+        """
+        Remove all cached keys matching a predicate.
+
+        Args:
+            predicate: Function of (cache_key, entry) returning True for entries to remove
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            matches = [k for k, entry in self._entries.items() if predicate(k, entry)]
+            for cache_key in matches:
+                self._discard(cache_key)
+            self._stats['invalidations'] += len(matches)
+            return len(matches)
+
+    def clear(self):
+        """Remove and zeroize all cached keys."""
+        with self._lock:
+            for cache_key in list(self._entries):
+                self._discard(cache_key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict: Entry count, limits, and hit/miss counters
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+
+        stats['max_entries'] = self._max_entries
+        stats['ttl_seconds'] = self._ttl_seconds
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _discard(self, cache_key: Hashable):
+        """Remove an entry and zeroize its key. Caller must hold the lock."""
+        entry = self._entries.pop(cache_key)
+        zeroize(entry.key)
@@ -730,7 +730,8 @@ class MemoryCacheBackend(StorageBackend):
                 # Get metadata for each object
                 for object_id in object_ids:
                     if count >= max_keys:
-                        next_marker = object_id
+                        # Markers are exclusive, so resume after the last returned object
+                        next_marker = results[-1].object_id
                         break
                     
                     _, metadata = self.objects[object_id]
@@ -828,7 +829,20 @@ class SecureStorageService:
             processed_data = data
             
             # Calculate integrity hash if requested
-            if verify_integrity:
+            if verify_integrity and not encrypt and hasattr(data, "read") and hasattr(data, "seek"):
+                # Hash a seekable stream in blocks, so the backend can store it
+                # without the object being read into memory
+                data.seek(0)
+                hash_state = hashlib.sha256()
+                for block in iter(lambda: data.read(1024 * 1024), b''):
+                    hash_state.update(block)
+                data.seek(0)
+                
+                metadata.integrity_info = {
+                    'algorithm': HashAlgorithm.SHA256.value,
+                    'hash': base64.b64encode(hash_state.digest()).decode('utf-8')
+                }
+            elif verify_integrity:
                 # Convert to bytes if it's a file-like object
                 if hasattr(data, "read"):
                     if hasattr(data, "seek"):
@@ -839,7 +853,7 @@ class SecureStorageService:
                     data_bytes = data
                 
                 # Calculate hash
-                hash_value = self._crypto.hash(
+                hash_value = self._crypto.hash_data(
                     data_bytes,
                     HashAlgorithm.SHA256
                 )
@@ -938,7 +952,7 @@ class SecureStorageService:
                 stored_hash = base64.b64decode(metadata.integrity_info['hash'])
                 
                 # Calculate hash
-                calculated_hash = self._crypto.hash(data, algorithm)
+                calculated_hash = self._crypto.hash_data(data, algorithm)
                 
                 # Compare hashes
                 if stored_hash != calculated_hash:
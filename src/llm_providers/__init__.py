@@ -28,7 +28,11 @@ from .core.provider_interface import (
     ChatGenerationChunk,
     LLMError
 )
+from .core.tokenization import TokenCounter, TokenCounterConfig, get_token_counter
 from .provider_manager import ProviderManager
+from .response_cache import ResponseCache, ResponseCacheConfig, HashingEmbedder
+from .routing import RoutingConfig, ProviderRouter, CircuitBreaker, CircuitState, LatencyStats
+from .coalescing import CoalescingConfig, RequestCoalescer
 from .aws_bedrock import AWSBedrockProvider, AWSCredentials, AWSAuthType
 from .azure_openai import AzureOpenAIProvider, AzureCredentials, AzureAuthType
 from .llm_providers import LLMProviders, generate_text, generate_chat_response, generate_embedding, generate_image
@@ -59,6 +63,19 @@ __all__ = [
     
     # Provider management
     'ProviderManager',
+    'ResponseCache',
+    'ResponseCacheConfig',
+    'HashingEmbedder',
+    'RoutingConfig',
+    'ProviderRouter',
+    'CircuitBreaker',
+    'CircuitState',
+    'LatencyStats',
+    'CoalescingConfig',
+    'RequestCoalescer',
+    'TokenCounter',
+    'TokenCounterConfig',
+    'get_token_counter',
     
     # AWS Bedrock
     'AWSBedrockProvider',
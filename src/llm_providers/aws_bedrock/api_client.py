@@ -5,6 +5,8 @@ This module implements the API client for AWS Bedrock, handling all API calls
 and transformations between the common interface and AWS Bedrock's specific formats.
 """
 
+import asyncio
+import functools
 import json
 import logging
 import time
@@ -36,6 +38,8 @@ from ..core.provider_interface import (
     ChatGenerationChunk,
     LLMError
 )
+from ..core.tokenization import get_token_counter
+from ..core.worker_pool import AsyncWorkerPool, WorkerPoolConfig, WorkerPoolOverloadedError
 from .auth import AWSAuthManager, AWSCredentials
 
 logger = logging.getLogger(__name__)
@@ -179,15 +183,25 @@ class AWSBedrockProvider(LLMProvider):
     This class implements the LLMProvider interface for AWS Bedrock,
     handling all API calls and transformations between the common interface
     and AWS Bedrock's specific formats.
+    
+    The AWS SDK is blocking, so async methods run SDK calls on a bounded
+    worker pool with per-model concurrency limits instead of blocking the
+    event loop.
     """
     
-    def __init__(self, auth_manager: Optional[AWSAuthManager] = None, credentials: Optional[AWSCredentials] = None):
+    def __init__(
+        self,
+        auth_manager: Optional[AWSAuthManager] = None,
+        credentials: Optional[AWSCredentials] = None,
+        worker_pool_config: Optional[WorkerPoolConfig] = None
+    ):
         """
         Initialize the AWS Bedrock provider.
         
         Args:
             auth_manager: Optional pre-configured AWS authentication manager
             credentials: Optional AWS credentials to create an auth manager
+            worker_pool_config: Worker pool and backpressure settings for async calls
         """
         if auth_manager:
             self.auth_manager = auth_manager
@@ -211,8 +225,60 @@ class AWSBedrockProvider(LLMProvider):
         self._health_cache_timestamp = 0
         self._health_cache_ttl = 60  # 1 minute
         
+        # Worker pool for async calls
+        self._worker_pool = AsyncWorkerPool(worker_pool_config, name="bedrock-worker")
+        
         logger.info("AWS Bedrock provider initialized")
     
+    def close(self) -> None:
+        """Shut down the async worker pool."""
+        self._worker_pool.shutdown(wait=False)
+    
+    def get_worker_pool_stats(self) -> Dict[str, int]:
+        """
+        Get statistics of the async worker pool.
+        
+        Returns:
+            Counts of waiting, running and rejected calls
+        """
+        return self._worker_pool.get_stats()
+    
+    async def _run_async(self, key: str, func: Any, *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run a blocking call on the worker pool.
+        
+        Args:
+            key: Concurrency key, usually the Bedrock model ID
+            func: Blocking callable
+            *args: Arguments for the callable
+            timeout: Maximum time to wait for the result in seconds
+            
+        Returns:
+            The callable's result
+            
+        Raises:
+            LLMError: If the pool is overloaded or the call times out
+        """
+        try:
+            return await self._worker_pool.run(key, func, *args, timeout=timeout)
+        except WorkerPoolOverloadedError as e:
+            logger.warning(f"Rejecting AWS Bedrock call for {key}: {str(e)}")
+            raise LLMError(
+                f"AWS Bedrock request rejected: {str(e)}",
+                LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
+                "aws_bedrock",
+                retryable=True,
+                original_error=e
+            )
+        except asyncio.TimeoutError as e:
+            raise LLMError(
+                f"AWS Bedrock request timed out after {timeout}s",
+                LLMErrorType.TIMEOUT_ERROR,
+                "aws_bedrock",
+                retryable=True,
+                original_error=e
+            )
+    
     def _resolve_model_id(self, model: str) -> str:
         """
         Resolve a user-friendly model name to the AWS Bedrock model ID.
@@ -614,18 +680,21 @@ class AWSBedrockProvider(LLMProvider):
                 retryable=False
             )
     
-    def _estimate_tokens(self, text: str) -> int:
+    def _estimate_tokens(self, text: str, model_id: Optional[str] = None) -> int:
         """
-        Estimate the number of tokens in a text string.
+        Count the number of tokens in a text string.
+        
+        Uses the model's tokenizer when its vocabulary is available locally,
+        and a heuristic estimate otherwise.
         
         Args:
-            text: The text to estimate tokens for
+            text: The text to count tokens for
+            model_id: AWS Bedrock model ID
             
         Returns:
-            Estimated token count
+            Token count
         """
-        # Simple estimation: ~4 characters per token
-        return len(text) // 4
+        return get_token_counter().count(text, model_id)
     
     def _handle_bedrock_error(self, error: Exception, model_id: str) -> LLMError:
         """
@@ -638,7 +707,9 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             Converted LLMError
         """
-        if isinstance(error, ClientError):
+        if isinstance(error, LLMError):
+            return error
+        elif isinstance(error, ClientError):
             error_code = error.response.get("Error", {}).get("Code", "")
             error_message = error.response.get("Error", {}).get("Message", str(error))
             
@@ -846,8 +917,8 @@ class AWSBedrockProvider(LLMProvider):
                 finish_reason = FinishReason.STOP
             
             # Estimate token usage
-            prompt_tokens = self._estimate_tokens(prompt)
-            completion_tokens = self._estimate_tokens(text)
+            prompt_tokens = self._estimate_tokens(prompt, model_id)
+            completion_tokens = self._estimate_tokens(text, model_id)
             
             return TextGenerationResult(
                 text=text,
@@ -876,8 +947,8 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             Generated text result
         """
-        # AWS SDK doesn't have native async support, so we'll just call the sync version
-        return self.generate_text(prompt, options)
+        model_id = self._resolve_model_id(options.model)
+        return await self._run_async(model_id, self.generate_text, prompt, options, timeout=options.timeout)
     
     async def generate_text_stream(self, prompt: str, options: TextGenerationOptions) -> AsyncIterator[TextGenerationChunk]:
         """
@@ -935,9 +1006,14 @@ class AWSBedrockProvider(LLMProvider):
         
         # Make the API call
         try:
-            response = self.bedrock_runtime_client.invoke_model_with_response_stream(
-                modelId=model_id,
-                body=json.dumps(request_body)
+            response = await self._run_async(
+                model_id,
+                functools.partial(
+                    self.bedrock_runtime_client.invoke_model_with_response_stream,
+                    modelId=model_id,
+                    body=json.dumps(request_body)
+                ),
+                timeout=options.timeout
             )
             
             # Process the streaming response
@@ -950,8 +1026,8 @@ class AWSBedrockProvider(LLMProvider):
                     retryable=False
                 )
             
-            # Yield chunks as they arrive
-            for event in stream:
+            # Yield chunks as they arrive, reading the stream on the worker pool
+            async for event in self._worker_pool.iterate(model_id, stream):
                 chunk = event.get("chunk", {})
                 if not chunk:
                     continue
@@ -1231,8 +1307,8 @@ class AWSBedrockProvider(LLMProvider):
                 finish_reason = FinishReason.STOP
             
             # Estimate token usage
-            prompt_tokens = sum(self._estimate_tokens(msg.content) for msg in messages)
-            completion_tokens = self._estimate_tokens(chat_message.content)
+            prompt_tokens = get_token_counter().count_messages(messages, model_id)
+            completion_tokens = self._estimate_tokens(chat_message.content, model_id)
             
             return ChatGenerationResult(
                 message=chat_message,
@@ -1261,8 +1337,8 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             Generated chat result
         """
-        # AWS SDK doesn't have native async support, so we'll just call the sync version
-        return self.generate_chat(messages, options)
+        model_id = self._resolve_model_id(options.model)
+        return await self._run_async(model_id, self.generate_chat, messages, options, timeout=options.timeout)
     
     async def generate_chat_stream(self, messages: List[ChatMessage], options: ChatGenerationOptions) -> AsyncIterator[ChatGenerationChunk]:
         """
@@ -1350,9 +1426,14 @@ class AWSBedrockProvider(LLMProvider):
         
         # Make the API call
         try:
-            response = self.bedrock_runtime_client.invoke_model_with_response_stream(
-                modelId=model_id,
-                body=json.dumps(request_body)
+            response = await self._run_async(
+                model_id,
+                functools.partial(
+                    self.bedrock_runtime_client.invoke_model_with_response_stream,
+                    modelId=model_id,
+                    body=json.dumps(request_body)
+                ),
+                timeout=options.timeout
             )
             
             # Process the streaming response
@@ -1365,8 +1446,8 @@ class AWSBedrockProvider(LLMProvider):
                     retryable=False
                 )
             
-            # Yield chunks as they arrive
-            for event in stream:
+            # Yield chunks as they arrive, reading the stream on the worker pool
+            async for event in self._worker_pool.iterate(model_id, stream):
                 chunk = event.get("chunk", {})
                 if not chunk:
                     continue
@@ -1518,7 +1599,7 @@ class AWSBedrockProvider(LLMProvider):
                 )
             
             # Estimate token usage
-            prompt_tokens = self._estimate_tokens(text)
+            prompt_tokens = self._estimate_tokens(text, model_id)
             
             return EmbeddingResult(
                 embedding=embedding,
@@ -1545,8 +1626,8 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             Generated embedding result
         """
-        # AWS SDK doesn't have native async support, so we'll just call the sync version
-        return self.generate_embedding(text, options)
+        model_id = self._resolve_model_id(options.model)
+        return await self._run_async(model_id, self.generate_embedding, text, options)
     
     def generate_image(self, prompt: str, options: ImageGenerationOptions) -> ImageGenerationResult:
         """
@@ -1615,8 +1696,8 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             Generated image result
         """
-        # AWS SDK doesn't have native async support, so we'll just call the sync version
-        return self.generate_image(prompt, options)
+        model_id = self._resolve_model_id(options.model or "stable-diffusion-xl")
+        return await self._run_async(model_id, self.generate_image, prompt, options)
     
     def get_models(self) -> List[ModelInfo]:
         """
@@ -1678,8 +1759,7 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             List of model information
         """
-        # AWS SDK doesn't have native async support, so we'll just call the sync version
-        return self.get_models()
+        return await self._run_async("control", self.get_models)
     
     def get_capabilities(self) -> ProviderCapabilities:
         """
@@ -1758,8 +1838,7 @@ class AWSBedrockProvider(LLMProvider):
         Returns:
             Provider health status
         """
-        # AWS SDK doesn't have native async support, so we'll just call the sync version
-        return self.get_health()
+        return await self._run_async("control", self.get_health)
     
     def get_name(self) -> str:
         """
@@ -40,6 +40,7 @@ class AWSCredentials:
     role_arn: Optional[str] = None
     region: str = "us-east-1"
     endpoint_url: Optional[str] = None
+    max_pool_connections: int = 32  # HTTP connections per client; match the async worker pool size
 
 
 class AWSAuthManager:
@@ -188,7 +189,8 @@ class AWSAuthManager:
                 retries={
                     'max_attempts': 3,
                     'mode': 'standard'
-                }
+                },
+                max_pool_connections=self.credentials.max_pool_connections
             )
             
             # Create the Bedrock client
@@ -213,7 +215,8 @@ class AWSAuthManager:
                 retries={
                     'max_attempts': 3,
                     'mode': 'standard'
-                }
+                },
+                max_pool_connections=self.credentials.max_pool_connections
             )
             
             # Create the Bedrock Runtime client
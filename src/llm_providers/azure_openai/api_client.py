@@ -3,15 +3,18 @@ Azure OpenAI API client for the LLM Providers integration.
 
 This module provides the Azure OpenAI provider implementation for the LLM Providers
 integration system, supporting text generation, chat, embeddings, and image generation.
+Requests go through pooled keep-alive transports, with a native asyncio path for the
+async and streaming methods.
 """
 
+import asyncio
 import json
 import logging
 import time
-import uuid
-from enum import Enum
-from typing import Any, Dict, List, Optional, Union, Tuple
+from dataclasses import asdict, is_dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+import aiohttp
 import requests
 
 from ..core.provider_interface import (
@@ -37,138 +40,285 @@ from ..core.provider_interface import (
     ChatGenerationChunk,
     LLMError
 )
-from .auth import AzureAuthManager, AzureCredentials
+from ..core.http_transport import AsyncHTTPTransport, HTTPTransport, TransportConfig
+from .auth import AzureAuthManager, AzureAuthType, AzureCredentials
 
 logger = logging.getLogger(__name__)
 
+PROVIDER_NAME = "azure_openai"
+
 
 class AzureOpenAIProvider(LLMProvider):
     """
     Azure OpenAI provider implementation.
-    
+
     This class implements the LLMProvider interface for Azure OpenAI,
     providing access to Azure-hosted OpenAI models for text generation,
     chat, embeddings, and image generation.
+
+    Synchronous methods share one pooled requests session and async methods
+    share one pooled aiohttp session, so connections are reused across calls
+    instead of being opened per request.
     """
-    
-    def __init__(self, credentials: AzureCredentials):
+
+    def __init__(self, credentials: AzureCredentials, transport_config: Optional[TransportConfig] = None):
         """
         Initialize the Azure OpenAI provider.
-        
+
         Args:
             credentials: Azure OpenAI credentials
+            transport_config: Connection pool, timeout and retry settings
         """
         self.credentials = credentials
         self.auth_manager = AzureAuthManager(credentials)
         self.endpoint = credentials.endpoint.rstrip('/')
         self.api_version = credentials.api_version
-        
+
+        # Pooled HTTP transports
+        self.transport_config = transport_config or TransportConfig()
+        self._transport = HTTPTransport(self.transport_config)
+        self._async_transport = AsyncHTTPTransport(self.transport_config)
+
         # Model capabilities mapping
         self.model_capabilities = {
             # GPT-4 models
-            "gpt-4": [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT],
-            "gpt-4-32k": [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT],
-            "gpt-4-turbo": [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT, ProviderCapabilities.VISION],
-            "gpt-4o": [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT, ProviderCapabilities.VISION],
-            
+            "gpt-4": ["text", "chat", "functions"],
+            "gpt-4-32k": ["text", "chat", "functions"],
+            "gpt-4-turbo": ["text", "chat", "vision", "functions"],
+            "gpt-4o": ["text", "chat", "vision", "functions"],
+
             # GPT-3.5 models
-            "gpt-35-turbo": [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT],
-            "gpt-35-turbo-16k": [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT],
-            
+            "gpt-35-turbo": ["text", "chat", "functions"],
+            "gpt-35-turbo-16k": ["text", "chat", "functions"],
+
             # Embedding models
-            "text-embedding-ada-002": [ProviderCapabilities.EMBEDDING],
-            
+            "text-embedding-ada-002": ["embeddings"],
+
             # Image generation models
-            "dall-e-3": [ProviderCapabilities.IMAGE],
-            "dall-e-2": [ProviderCapabilities.IMAGE]
+            "dall-e-3": ["image"],
+            "dall-e-2": ["image"]
+        }
+
+        # Model context lengths
+        self.model_max_tokens = {
+            "gpt-4": 8192,
+            "gpt-4-32k": 32768,
+            "gpt-4-turbo": 128000,
+            "gpt-4o": 128000,
+            "gpt-35-turbo": 4096,
+            "gpt-35-turbo-16k": 16384,
+            "text-embedding-ada-002": 8191
         }
-        
+
         # Model name mapping (Azure deployment name to standard model name)
         self.model_name_mapping = {}
-        
+
         # Initialize model list
         self._models_cache = None
         self._models_cache_timestamp = 0
         self._models_cache_ttl = 300  # 5 minutes
-    
+
+    def close(self) -> None:
+        """Close pooled connections of the synchronous transport."""
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        """Close pooled connections of the async transport."""
+        await self._async_transport.close()
+
+    def _get_params(self, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Get query parameters including the API version."""
+        query = {"api-version": self.api_version}
+        if params:
+            query.update(params)
+        return query
+
+    async def _get_auth_headers_async(self) -> Dict[str, str]:
+        """Get authentication headers without blocking the event loop."""
+        if self.credentials.auth_type == AzureAuthType.API_KEY:
+            return self.auth_manager.get_auth_headers()
+        # Token acquisition may do blocking network I/O
+        return await asyncio.to_thread(self.auth_manager.get_auth_headers)
+
+    def _raise_for_status(self, status_code: int, content: bytes) -> None:
+        """
+        Raise an LLMError for a non-success response.
+
+        Args:
+            status_code: HTTP status code
+            content: Response body
+
+        Raises:
+            LLMError: If the status code is not 2xx
+        """
+        if 200 <= status_code < 300:
+            return
+
+        error_message = f"Azure OpenAI API request failed: {status_code}"
+        try:
+            error_data = json.loads(content)
+            error_message = f"{error_message} - {error_data.get('error', {}).get('message', 'Unknown error')}"
+        except (ValueError, AttributeError):
+            pass
+
+        raise LLMError(
+            message=error_message,
+            error_type=self._map_http_error_to_llm_error(status_code),
+            provider=PROVIDER_NAME,
+            retryable=status_code >= 500 or status_code == 429
+        )
+
+    def _map_transport_error(self, error: Exception) -> LLMError:
+        """Map a transport exception to an LLMError."""
+        if isinstance(error, (requests.Timeout, asyncio.TimeoutError)):
+            error_type = LLMErrorType.TIMEOUT_ERROR
+        else:
+            error_type = LLMErrorType.SERVICE_UNAVAILABLE_ERROR
+
+        return LLMError(
+            message=f"Azure OpenAI API request failed: {str(error) or type(error).__name__}",
+            error_type=error_type,
+            provider=PROVIDER_NAME,
+            retryable=True,
+            original_error=error
+        )
+
     def _make_request(
-        self, method: str, path: str, data: Optional[Dict[str, Any]] = None, 
-        params: Optional[Dict[str, Any]] = None, stream: bool = False
+        self, method: str, path: str, data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None, stream: bool = False,
+        timeout: Optional[float] = None
     ) -> Union[Dict[str, Any], requests.Response]:
         """
         Make a request to the Azure OpenAI API.
-        
+
         Args:
             method: HTTP method (GET, POST, etc.)
             path: API path (without endpoint)
             data: Request data (for POST, PUT, etc.)
             params: Query parameters
             stream: Whether to stream the response
-            
+            timeout: Read timeout in seconds (defaults to the transport setting)
+
         Returns:
             Response data as dictionary or Response object for streaming
-            
+
         Raises:
             LLMError: If the request fails
         """
         url = f"{self.endpoint}{path}"
         headers = self.auth_manager.get_auth_headers()
-        
+
         try:
-            response = requests.request(
+            response = self._transport.request(
                 method=method,
                 url=url,
                 headers=headers,
                 json=data,
-                params=params,
-                stream=stream
+                params=self._get_params(params),
+                stream=stream,
+                timeout=timeout
             )
-            
+
             if stream:
-                if response.status_code != 200:
-                    error_message = f"Azure OpenAI API request failed: {response.status_code}"
-                    try:
-                        error_data = response.json()
-                        error_message = f"{error_message} - {error_data.get('error', {}).get('message', 'Unknown error')}"
-                    except:
-                        pass
-                    
-                    raise LLMError(
-                        message=error_message,
-                        error_type=self._map_http_error_to_llm_error(response.status_code),
-                        provider="azure_openai",
-                        retryable=response.status_code >= 500 or response.status_code == 429
-                    )
+                if response.status_code >= 300:
+                    self._raise_for_status(response.status_code, response.content)
                 return response
-            
-            if response.status_code >= 200 and response.status_code < 300:
-                if response.content:
-                    return response.json()
-                return {}
-            
-            # Handle error response
-            error_message = f"Azure OpenAI API request failed: {response.status_code}"
-            try:
-                error_data = response.json()
-                error_message = f"{error_message} - {error_data.get('error', {}).get('message', 'Unknown error')}"
-            except:
-                pass
-            
-            raise LLMError(
-                message=error_message,
-                error_type=self._map_http_error_to_llm_error(response.status_code),
-                provider="azure_openai",
-                retryable=response.status_code >= 500 or response.status_code == 429
-            )
-        
+
+            self._raise_for_status(response.status_code, response.content)
+            if response.content:
+                return response.json()
+            return {}
+
         except requests.RequestException as e:
-            raise LLMError(
-                message=f"Azure OpenAI API request failed: {str(e)}",
-                error_type=LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
-                provider="azure_openai",
-                retryable=True
+            raise self._map_transport_error(e)
+
+    async def _make_request_async(
+        self, method: str, path: str, data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Make a request to the Azure OpenAI API asynchronously.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            path: API path (without endpoint)
+            data: Request data (for POST, PUT, etc.)
+            params: Query parameters
+            timeout: Read timeout in seconds (defaults to the transport setting)
+
+        Returns:
+            Response data as dictionary
+
+        Raises:
+            LLMError: If the request fails
+        """
+        url = f"{self.endpoint}{path}"
+        headers = await self._get_auth_headers_async()
+
+        try:
+            response = await self._async_transport.request(
+                method,
+                url,
+                headers=headers,
+                json=data,
+                params=self._get_params(params),
+                timeout=timeout
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise self._map_transport_error(e)
+
+        self._raise_for_status(response.status_code, response.content)
+        if response.content:
+            return response.json()
+        return {}
+
+    async def _stream_request_async(
+        self, path: str, data: Dict[str, Any], timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Make a streaming request and yield server-sent events.
+
+        Args:
+            path: API path (without endpoint)
+            data: Request data
+            timeout: Read timeout in seconds (defaults to the transport setting)
+
+        Returns:
+            Stream of decoded event payloads
+
+        Raises:
+            LLMError: If the request fails
+        """
+        url = f"{self.endpoint}{path}"
+        headers = await self._get_auth_headers_async()
+
+        try:
+            lines = self._async_transport.stream_lines(
+                "POST",
+                url,
+                headers=headers,
+                json=data,
+                params=self._get_params(None),
+                timeout=timeout
             )
-    
+            try:
+                response = await lines.__anext__()
+                self._raise_for_status(response.status_code, response.content)
+
+                async for line in lines:
+                    line = line.strip()
+                    if not line.startswith(b"data:"):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == b"[DONE]":
+                        break
+                    yield json.loads(payload)
+            finally:
+                await lines.aclose()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise self._map_transport_error(e)
+
     def _map_http_error_to_llm_error(self, status_code: int) -> LLMErrorType:
         """Map HTTP status code to LLMErrorType."""
         if status_code == 400:
@@ -176,16 +326,18 @@ class AzureOpenAIProvider(LLMProvider):
         elif status_code == 401:
             return LLMErrorType.AUTHENTICATION_ERROR
         elif status_code == 403:
-            return LLMErrorType.PERMISSION_ERROR
+            return LLMErrorType.AUTHORIZATION_ERROR
         elif status_code == 404:
-            return LLMErrorType.NOT_FOUND_ERROR
+            return LLMErrorType.MODEL_NOT_FOUND_ERROR
+        elif status_code == 408:
+            return LLMErrorType.TIMEOUT_ERROR
         elif status_code == 429:
             return LLMErrorType.RATE_LIMIT_ERROR
         elif status_code >= 500:
             return LLMErrorType.SERVICE_UNAVAILABLE_ERROR
         else:
             return LLMErrorType.UNKNOWN_ERROR
-    
+
     def _map_finish_reason(self, reason: Optional[str]) -> FinishReason:
         """Map Azure OpenAI finish reason to FinishReason enum."""
         if reason == "stop":
@@ -194,53 +346,305 @@ class AzureOpenAIProvider(LLMProvider):
             return FinishReason.LENGTH
         elif reason == "content_filter":
             return FinishReason.CONTENT_FILTER
-        elif reason == "function_call":
+        elif reason in ("function_call", "tool_calls"):
             return FinishReason.FUNCTION_CALL
-        elif reason == "tool_calls":
-            return FinishReason.TOOL_CALLS
         else:
-            return FinishReason.OTHER
-    
+            return FinishReason.UNKNOWN
+
     def _map_chat_message_to_azure(self, message: ChatMessage) -> Dict[str, Any]:
         """Map ChatMessage to Azure OpenAI format."""
         result = {
             "role": message.role,
             "content": message.content
         }
-        
+
         if message.name:
             result["name"] = message.name
-        
+
         if message.function_call:
             result["function_call"] = message.function_call
-        
+
         return result
-    
+
     def _map_azure_message_to_chat_message(self, message: Dict[str, Any]) -> ChatMessage:
         """Map Azure OpenAI message to ChatMessage."""
         return ChatMessage(
             role=message.get("role", "assistant"),
-            content=message.get("content", ""),
+            content=message.get("content") or "",
             name=message.get("name"),
             function_call=message.get("function_call")
         )
-    
-    def _map_function_to_azure(self, function: Dict[str, Any]) -> Dict[str, Any]:
+
+    def _map_function_to_azure(self, function: Union[FunctionDefinition, Dict[str, Any]]) -> Dict[str, Any]:
         """Map function definition to Azure OpenAI format."""
         # Azure OpenAI uses the same format as OpenAI
-        return function
-    
+        if not is_dataclass(function):
+            return function
+
+        parameters = dict(function.parameters)
+        if function.required is not None:
+            parameters["required"] = function.required
+        return {
+            "name": function.name,
+            "description": function.description,
+            "parameters": parameters
+        }
+
+    def _to_chat_options(self, options: TextGenerationOptions) -> ChatGenerationOptions:
+        """Convert text generation options to chat generation options."""
+        return ChatGenerationOptions(**asdict(options))
+
+    def _build_chat_request(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions, stream: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request body for a chat completion."""
+        request_data = {
+            "messages": [self._map_chat_message_to_azure(msg) for msg in messages],
+            "temperature": options.temperature if options.temperature is not None else 0.7,
+            "top_p": options.top_p if options.top_p is not None else 1.0,
+            "n": 1  # Azure OpenAI only supports a single completion for now
+        }
+
+        if stream:
+            request_data["stream"] = True
+
+        if options.max_tokens is not None:
+            request_data["max_tokens"] = options.max_tokens
+
+        if options.stop is not None:
+            request_data["stop"] = options.stop
+
+        if options.frequency_penalty is not None:
+            request_data["frequency_penalty"] = options.frequency_penalty
+
+        if options.presence_penalty is not None:
+            request_data["presence_penalty"] = options.presence_penalty
+
+        if options.functions:
+            request_data["functions"] = [
+                self._map_function_to_azure(func) for func in options.functions
+            ]
+
+            if options.function_call:
+                request_data["function_call"] = options.function_call
+
+        return request_data
+
+    def _parse_chat_response(self, response: Dict[str, Any], options: ChatGenerationOptions) -> ChatGenerationResult:
+        """Parse a chat completion response."""
+        # Extract response data
+        choice = (response.get("choices") or [{}])[0]
+        message = self._map_azure_message_to_chat_message(choice.get("message", {}))
+        finish_reason = self._map_finish_reason(choice.get("finish_reason"))
+
+        # Extract usage information
+        usage_data = response.get("usage", {})
+        usage = UsageInfo(
+            prompt_tokens=usage_data.get("prompt_tokens", 0),
+            completion_tokens=usage_data.get("completion_tokens", 0),
+            total_tokens=usage_data.get("total_tokens", 0)
+        )
+
+        return ChatGenerationResult(
+            message=message,
+            model=options.model,
+            provider=PROVIDER_NAME,
+            usage=usage,
+            finish_reason=finish_reason
+        )
+
+    def _chat_to_text_result(self, chat_result: ChatGenerationResult) -> TextGenerationResult:
+        """Convert a chat result to a text result."""
+        return TextGenerationResult(
+            text=chat_result.message.content or "",
+            model=chat_result.model,
+            provider=PROVIDER_NAME,
+            usage=chat_result.usage,
+            finish_reason=chat_result.finish_reason
+        )
+
+    def _parse_embedding_response(self, response: Dict[str, Any], options: EmbeddingOptions) -> EmbeddingResult:
+        """Parse an embeddings response."""
+        # Extract embedding data
+        data = (response.get("data") or [{}])[0]
+        embedding = data.get("embedding", [])
+
+        # Extract usage information
+        usage_data = response.get("usage", {})
+        usage = UsageInfo(
+            prompt_tokens=usage_data.get("prompt_tokens", 0),
+            completion_tokens=0,
+            total_tokens=usage_data.get("total_tokens", 0)
+        )
+
+        return EmbeddingResult(
+            embedding=embedding,
+            model=options.model,
+            provider=PROVIDER_NAME,
+            usage=usage
+        )
+
+    def _parse_embeddings_response(
+        self, response: Dict[str, Any], texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """Parse a batched embeddings response into one result per input."""
+        data = sorted(response.get("data") or [], key=lambda item: item.get("index", 0))
+        if len(data) != len(texts):
+            raise LLMError(
+                f"Expected {len(texts)} embeddings, got {len(data)}",
+                LLMErrorType.INVALID_REQUEST_ERROR,
+                PROVIDER_NAME,
+                retryable=False
+            )
+
+        # Usage is reported for the whole batch; attribute it by input length
+        prompt_tokens = response.get("usage", {}).get("prompt_tokens", 0)
+        total_chars = sum(len(text) for text in texts) or 1
+        results = []
+        remaining = prompt_tokens
+        for i, (item, text) in enumerate(zip(data, texts)):
+            tokens = remaining if i == len(texts) - 1 else prompt_tokens * len(text) // total_chars
+            remaining -= tokens
+            results.append(EmbeddingResult(
+                embedding=item.get("embedding", []),
+                model=options.model,
+                provider=PROVIDER_NAME,
+                usage=UsageInfo(prompt_tokens=tokens, completion_tokens=0, total_tokens=tokens)
+            ))
+        return results
+
+    def _build_image_request(self, prompt: str, options: ImageGenerationOptions) -> Dict[str, Any]:
+        """Build the request body for an image generation."""
+        request_data = {
+            "prompt": prompt,
+            "n": 1  # Azure OpenAI only supports a single image for now
+        }
+
+        # Map size to DALL-E format
+        if options.size:
+            # Convert common formats to DALL-E format
+            size_mapping = {
+                "small": "256x256",
+                "medium": "512x512",
+                "large": "1024x1024",
+                "square": "1024x1024",
+                "portrait": "1024x1792",
+                "landscape": "1792x1024"
+            }
+
+            request_data["size"] = size_mapping.get(options.size.lower(), options.size)
+        else:
+            # Default to 1024x1024
+            request_data["size"] = "1024x1024"
+
+        # Add quality if specified
+        if options.quality:
+            request_data["quality"] = options.quality
+
+        # Add style if specified
+        if options.style:
+            request_data["style"] = options.style
+
+        return request_data
+
+    def _parse_image_response(self, response: Dict[str, Any], options: ImageGenerationOptions) -> ImageGenerationResult:
+        """Parse an image generation response."""
+        data = response.get("data", [])
+        images = [item.get("url") or item.get("b64_json", "") for item in data]
+
+        return ImageGenerationResult(
+            images=images,
+            model=options.model,
+            provider=PROVIDER_NAME
+        )
+
+    def _parse_models_response(self, response: Dict[str, Any]) -> List[ModelInfo]:
+        """Parse a deployments listing into model information."""
+        models = []
+        for deployment in response.get("data", []):
+            model_id = deployment.get("id")
+            base_model = deployment.get("model")
+
+            # Map deployment name to standard model name for future reference
+            self.model_name_mapping[model_id] = base_model
+
+            # Determine capabilities based on model type
+            capabilities = self.model_capabilities.get(base_model, [])
+            if not capabilities:
+                # Default to text and chat for unknown models
+                capabilities = ["text", "chat"]
+
+            models.append(ModelInfo(
+                id=model_id,
+                provider_model_id=model_id,
+                provider=PROVIDER_NAME,
+                capabilities=capabilities,
+                max_tokens=self.model_max_tokens.get(base_model, 4096),
+                cost_per_input_token=0.0,
+                cost_per_output_token=0.0
+            ))
+
+        return models
+
+    def _wrap_error(self, error: Exception, action: str) -> LLMError:
+        """Log an unexpected error and wrap it in an LLMError."""
+        logger.error(f"Failed to {action}: {str(error)}")
+        return LLMError(
+            message=f"Failed to {action}: {str(error)}",
+            error_type=LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
+            provider=PROVIDER_NAME,
+            retryable=True,
+            original_error=error
+        )
+
     def get_provider_type(self) -> ProviderType:
         """Get the provider type."""
         return ProviderType.AZURE_OPENAI
-    
+
+    def get_type(self) -> ProviderType:
+        """
+        Get provider type.
+
+        Returns:
+            Provider type
+        """
+        return ProviderType.AZURE_OPENAI
+
+    def get_name(self) -> str:
+        """
+        Get provider name.
+
+        Returns:
+            Provider name
+        """
+        return "Azure OpenAI"
+
+    def get_capabilities(self) -> ProviderCapabilities:
+        """
+        Get provider capabilities.
+
+        Returns:
+            Provider capabilities
+        """
+        return ProviderCapabilities(
+            supports_text=True,
+            supports_chat=True,
+            supports_embeddings=True,
+            supports_images=True,
+            supports_streaming=True,
+            supports_functions=True,
+            supports_vision=True,
+            supports_audio=False,
+            supports_batch_embeddings=True
+        )
+
     def get_models(self) -> List[ModelInfo]:
         """
         Get available models from Azure OpenAI.
-        
+
         Returns:
             List of model information
-            
+
         Raises:
             LLMError: If the request fails
         """
@@ -248,51 +652,70 @@ class AzureOpenAIProvider(LLMProvider):
         current_time = time.time()
         if self._models_cache is not None and current_time - self._models_cache_timestamp < self._models_cache_ttl:
             return self._models_cache
-        
+
         try:
             # Get deployments from Azure OpenAI
             response = self._make_request("GET", "/openai/deployments")
-            
-            models = []
-            for deployment in response.get("data", []):
-                model_id = deployment.get("id")
-                base_model = deployment.get("model")
-                
-                # Map deployment name to standard model name for future reference
-                self.model_name_mapping[model_id] = base_model
-                
-                # Determine capabilities based on model type
-                capabilities = self.model_capabilities.get(base_model, [])
-                if not capabilities:
-                    # Default to text and chat for unknown models
-                    capabilities = [ProviderCapabilities.TEXT, ProviderCapabilities.CHAT]
-                
-                models.append(ModelInfo(
-                    id=model_id,
-                    name=model_id,
-                    provider=ProviderType.AZURE_OPENAI,
-                    capabilities=capabilities
-                ))
-            
-            # Cache the results
-            self._models_cache = models
-            self._models_cache_timestamp = current_time
-            
-            return models
-        
+            models = self._parse_models_response(response)
         except Exception as e:
-            logger.error(f"Failed to get models from Azure OpenAI: {str(e)}")
-            raise LLMError(
-                message=f"Failed to get models from Azure OpenAI: {str(e)}",
-                error_type=LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
-                provider="azure_openai",
-                retryable=True
+            raise self._wrap_error(e, "get models from Azure OpenAI")
+
+        # Cache the results
+        self._models_cache = models
+        self._models_cache_timestamp = current_time
+
+        return models
+
+    async def get_models_async(self) -> List[ModelInfo]:
+        """
+        Get available models from Azure OpenAI asynchronously.
+
+        Returns:
+            List of model information
+
+        Raises:
+            LLMError: If the request fails
+        """
+        current_time = time.time()
+        if self._models_cache is not None and current_time - self._models_cache_timestamp < self._models_cache_ttl:
+            return self._models_cache
+
+        try:
+            response = await self._make_request_async("GET", "/openai/deployments")
+            models = self._parse_models_response(response)
+        except Exception as e:
+            raise self._wrap_error(e, "get models from Azure OpenAI")
+
+        self._models_cache = models
+        self._models_cache_timestamp = current_time
+
+        return models
+
+    def _health_status(self, start_time: float, error: Optional[Exception] = None) -> HealthStatus:
+        """Build a health status from a health check request."""
+        # Latency in milliseconds, measured for failed requests as well
+        latency = (time.time() - start_time) * 1000
+
+        if error is None:
+            return HealthStatus(
+                available=True,
+                latency=latency,
+                error_rate=0.0,
+                message="Azure OpenAI provider is healthy"
             )
-    
+
+        logger.error(f"Azure OpenAI provider health check failed: {str(error)}")
+        return HealthStatus(
+            available=False,
+            latency=latency,
+            error_rate=1.0,
+            message=f"Azure OpenAI provider is unhealthy: {str(error)}"
+        )
+
     def get_health(self) -> HealthStatus:
         """
         Get the health status of the Azure OpenAI provider.
-        
+
         Returns:
             Provider health status
         """
@@ -300,41 +723,37 @@ class AzureOpenAIProvider(LLMProvider):
         try:
             # Make a simple request to check health
             self._make_request("GET", "/openai/deployments")
-            
-            # Calculate latency
-            latency = time.time() - start_time
-            
-            return HealthStatus(
-                available=True,
-                latency=latency,
-                error_rate=0.0,
-                message="Azure OpenAI provider is healthy"
-            )
         except Exception as e:
-            # Calculate latency even for failed requests
-            latency = time.time() - start_time
-            
-            logger.error(f"Azure OpenAI provider health check failed: {str(e)}")
-            return HealthStatus(
-                available=False,
-                latency=latency,
-                error_rate=1.0,
-                message=f"Azure OpenAI provider is unhealthy: {str(e)}"
-            )
-    
-    def generate_text(
+            return self._health_status(start_time, e)
+        return self._health_status(start_time)
+
+    async def get_health_async(self) -> HealthStatus:
+        """
+        Get the health status of the Azure OpenAI provider asynchronously.
+
+        Returns:
+            Provider health status
+        """
+        start_time = time.time()
+        try:
+            await self._make_request_async("GET", "/openai/deployments")
+        except Exception as e:
+            return self._health_status(start_time, e)
+        return self._health_status(start_time)
+
+    def generate_text(
         self, prompt: str, options: TextGenerationOptions
     ) -> TextGenerationResult:
         """
         Generate text from a prompt.
-        
+
         Args:
             prompt: The text prompt
             options: Text generation options
-            
+
         Returns:
             Generated text result
-            
+
         Raises:
             LLMError: If the request fails
         """
@@ -342,222 +761,304 @@ class AzureOpenAIProvider(LLMProvider):
         messages = [
             ChatMessage(role="user", content=prompt)
         ]
-        
-        # Convert to chat options
-        chat_options = ChatGenerationOptions(
-            model=options.model,
-            max_tokens=options.max_tokens,
-            temperature=options.temperature,
-            top_p=options.top_p,
-            frequency_penalty=options.frequency_penalty,
-            presence_penalty=options.presence_penalty,
-            stop=options.stop,
-            provider=options.provider
-        )
-        
-        # Generate chat response
-        chat_result = self.generate_chat(messages, chat_options)
-        
-        # Convert to text result
-        return TextGenerationResult(
-            text=chat_result.message.content or "",
-            model=chat_result.model,
-            usage=chat_result.usage,
-            finish_reason=chat_result.finish_reason
-        )
-    
+        chat_result = self.generate_chat(messages, self._to_chat_options(options))
+        return self._chat_to_text_result(chat_result)
+
+    async def generate_text_async(
+        self, prompt: str, options: TextGenerationOptions
+    ) -> TextGenerationResult:
+        """
+        Generate text from a prompt asynchronously.
+
+        Args:
+            prompt: The text prompt
+            options: Text generation options
+
+        Returns:
+            Generated text result
+
+        Raises:
+            LLMError: If the request fails
+        """
+        messages = [
+            ChatMessage(role="user", content=prompt)
+        ]
+        chat_result = await self.generate_chat_async(messages, self._to_chat_options(options))
+        return self._chat_to_text_result(chat_result)
+
+    async def generate_text_stream(
+        self, prompt: str, options: TextGenerationOptions
+    ) -> AsyncIterator[TextGenerationChunk]:
+        """
+        Generate text from a prompt with streaming response.
+
+        Args:
+            prompt: The text prompt
+            options: Text generation options
+
+        Returns:
+            Stream of text generation chunks
+
+        Raises:
+            LLMError: If the request fails
+        """
+        messages = [
+            ChatMessage(role="user", content=prompt)
+        ]
+        async for chunk in self.generate_chat_stream(messages, self._to_chat_options(options)):
+            yield TextGenerationChunk(
+                text=chunk.delta.get("content") or "",
+                finish_reason=chunk.finish_reason,
+                is_final=chunk.is_final
+            )
+
     def generate_chat(
         self, messages: List[ChatMessage], options: ChatGenerationOptions
     ) -> ChatGenerationResult:
         """
         Generate a chat response.
-        
+
         Args:
             messages: List of chat messages
             options: Chat generation options
-            
+
         Returns:
             Generated chat result
-            
+
         Raises:
             LLMError: If the request fails
         """
-        # Prepare request data
-        request_data = {
-            "messages": [self._map_chat_message_to_azure(msg) for msg in messages],
-            "temperature": options.temperature if options.temperature is not None else 0.7,
-            "top_p": options.top_p if options.top_p is not None else 1.0,
-            "n": 1  # Azure OpenAI only supports a single completion for now
-        }
-        
-        if options.max_tokens is not None:
-            request_data["max_tokens"] = options.max_tokens
-        
-        if options.stop is not None:
-            request_data["stop"] = options.stop
-        
-        if options.frequency_penalty is not None:
-            request_data["frequency_penalty"] = options.frequency_penalty
-        
-        if options.presence_penalty is not None:
-            request_data["presence_penalty"] = options.presence_penalty
-        
-        if options.functions:
-            request_data["functions"] = [
-                self._map_function_to_azure(func) for func in options.functions
-            ]
-            
-            if options.function_call:
-                request_data["function_call"] = options.function_call
-        
+        request_data = self._build_chat_request(messages, options)
+
         # Make the API request
         try:
             response = self._make_request(
                 "POST",
                 f"/openai/deployments/{options.model}/chat/completions",
-                data=request_data
-            )
-            
-            # Extract response data
-            choice = response.get("choices", [{}])[0]
-            message = self._map_azure_message_to_chat_message(choice.get("message", {}))
-            finish_reason = self._map_finish_reason(choice.get("finish_reason"))
-            
-            # Extract usage information
-            usage_data = response.get("usage", {})
-            usage = UsageInfo(
-                prompt_tokens=usage_data.get("prompt_tokens", 0),
-                completion_tokens=usage_data.get("completion_tokens", 0),
-                total_tokens=usage_data.get("total_tokens", 0)
-            )
-            
-            return ChatGenerationResult(
-                message=message,
-                model=options.model,
-                usage=usage,
-                finish_reason=finish_reason
+                data=request_data,
+                timeout=options.timeout
             )
-        
+            return self._parse_chat_response(response, options)
+
         except LLMError:
             # Re-raise LLMError
             raise
-        
+
         except Exception as e:
-            logger.error(f"Failed to generate chat response: {str(e)}")
-            raise LLMError(
-                message=f"Failed to generate chat response: {str(e)}",
-                error_type=LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
-                provider="azure_openai",
-                retryable=True
+            raise self._wrap_error(e, "generate chat response")
+
+    async def generate_chat_async(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions
+    ) -> ChatGenerationResult:
+        """
+        Generate a chat response asynchronously.
+
+        Args:
+            messages: List of chat messages
+            options: Chat generation options
+
+        Returns:
+            Generated chat result
+
+        Raises:
+            LLMError: If the request fails
+        """
+        request_data = self._build_chat_request(messages, options)
+
+        try:
+            response = await self._make_request_async(
+                "POST",
+                f"/openai/deployments/{options.model}/chat/completions",
+                data=request_data,
+                timeout=options.timeout
             )
-    
+            return self._parse_chat_response(response, options)
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise self._wrap_error(e, "generate chat response")
+
+    async def generate_chat_stream(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """
+        Generate a chat response with streaming.
+
+        Args:
+            messages: List of chat messages
+            options: Chat generation options
+
+        Returns:
+            Stream of chat generation chunks
+
+        Raises:
+            LLMError: If the request fails
+        """
+        request_data = self._build_chat_request(messages, options, stream=True)
+
+        try:
+            async for event in self._stream_request_async(
+                f"/openai/deployments/{options.model}/chat/completions",
+                request_data,
+                timeout=options.timeout
+            ):
+                # Azure sends content filter results as events without choices
+                for choice in event.get("choices", []):
+                    reason = choice.get("finish_reason")
+                    yield ChatGenerationChunk(
+                        delta=choice.get("delta", {}),
+                        finish_reason=self._map_finish_reason(reason) if reason else None,
+                        is_final=reason is not None
+                    )
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise self._wrap_error(e, "stream chat response")
+
     def generate_embedding(
         self, text: str, options: EmbeddingOptions
     ) -> EmbeddingResult:
         """
         Generate embeddings for text.
-        
+
         Args:
             text: The text to generate embeddings for
             options: Embedding options
-            
+
         Returns:
             Generated embedding result
-            
+
         Raises:
             LLMError: If the request fails
         """
-        # Prepare request data
-        request_data = {
-            "input": text
-        }
-        
         # Make the API request
         try:
             response = self._make_request(
                 "POST",
                 f"/openai/deployments/{options.model}/embeddings",
-                data=request_data
+                data={"input": text}
             )
-            
-            # Extract embedding data
-            data = response.get("data", [{}])[0]
-            embedding = data.get("embedding", [])
-            
-            # Extract usage information
-            usage_data = response.get("usage", {})
-            usage = UsageInfo(
-                prompt_tokens=usage_data.get("prompt_tokens", 0),
-                completion_tokens=0,
-                total_tokens=usage_data.get("total_tokens", 0)
+            return self._parse_embedding_response(response, options)
+
+        except LLMError:
+            # Re-raise LLMError
+            raise
+
+        except Exception as e:
+            raise self._wrap_error(e, "generate embedding")
+
+    async def generate_embedding_async(
+        self, text: str, options: EmbeddingOptions
+    ) -> EmbeddingResult:
+        """
+        Generate embeddings for text asynchronously.
+
+        Args:
+            text: The text to generate embeddings for
+            options: Embedding options
+
+        Returns:
+            Generated embedding result
+
+        Raises:
+            LLMError: If the request fails
+        """
+        try:
+            response = await self._make_request_async(
+                "POST",
+                f"/openai/deployments/{options.model}/embeddings",
+                data={"input": text}
             )
-            
-            return EmbeddingResult(
-                embedding=embedding,
-                model=options.model,
-                usage=usage
+            return self._parse_embedding_response(response, options)
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise self._wrap_error(e, "generate embedding")
+
+    def generate_embeddings(
+        self, texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """
+        Generate embeddings for several texts in one request.
+
+        Args:
+            texts: The texts to generate embeddings for
+            options: Embedding options
+
+        Returns:
+            One embedding result per text
+
+        Raises:
+            LLMError: If the request fails
+        """
+        try:
+            response = self._make_request(
+                "POST",
+                f"/openai/deployments/{options.model}/embeddings",
+                data={"input": texts}
             )
-        
+            return self._parse_embeddings_response(response, texts, options)
+
         except LLMError:
-            # Re-raise LLMError
             raise
-        
+
         except Exception as e:
-            logger.error(f"Failed to generate embedding: {str(e)}")
-            raise LLMError(
-                message=f"Failed to generate embedding: {str(e)}",
-                error_type=LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
-                provider="azure_openai",
-                retryable=True
+            raise self._wrap_error(e, "generate embeddings")
+
+    async def generate_embeddings_async(
+        self, texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """
+        Generate embeddings for several texts in one request asynchronously.
+
+        Args:
+            texts: The texts to generate embeddings for
+            options: Embedding options
+
+        Returns:
+            One embedding result per text
+
+        Raises:
+            LLMError: If the request fails
+        """
+        try:
+            response = await self._make_request_async(
+                "POST",
+                f"/openai/deployments/{options.model}/embeddings",
+                data={"input": texts}
             )
-    
+            return self._parse_embeddings_response(response, texts, options)
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise self._wrap_error(e, "generate embeddings")
+
     def generate_image(
         self, prompt: str, options: ImageGenerationOptions
     ) -> ImageGenerationResult:
         """
         Generate images from a prompt.
-        
+
         Args:
             prompt: The text prompt
             options: Image generation options
-            
+
         Returns:
             Generated image result
-            
+
         Raises:
             LLMError: If the request fails
         """
-        # Prepare request data
-        request_data = {
-            "prompt": prompt,
-            "n": 1  # Azure OpenAI only supports a single image for now
-        }
-        
-        # Map size to DALL-E format
-        if options.size:
-            # Convert common formats to DALL-E format
-            size_mapping = {
-                "small": "256x256",
-                "medium": "512x512",
-                "large": "1024x1024",
-                "square": "1024x1024",
-                "portrait": "1024x1792",
-                "landscape": "1792x1024"
-            }
-            
-            request_data["size"] = size_mapping.get(options.size.lower(), options.size)
-        else:
-            # Default to 1024x1024
-            request_data["size"] = "1024x1024"
-        
-        # Add quality if specified
-        if options.quality:
-            request_data["quality"] = options.quality
-        
-        # Add style if specified
-        if options.style:
-            request_data["style"] = options.style
-        
+        request_data = self._build_image_request(prompt, options)
+
         # Make the API request
         try:
             response = self._make_request(
@@ -565,25 +1066,43 @@ class AzureOpenAIProvider(LLMProvider):
                 f"/openai/deployments/{options.model}/images/generations",
                 data=request_data
             )
-            
-            # Extract image data
-            data = response.get("data", [])
-            images = [item.get("url", "") for item in data]
-            
-            return ImageGenerationResult(
-                images=images,
-                model=options.model
-            )
-        
+            return self._parse_image_response(response, options)
+
         except LLMError:
             # Re-raise LLMError
             raise
-        
+
         except Exception as e:
-            logger.error(f"Failed to generate image: {str(e)}")
-            raise LLMError(
-                message=f"Failed to generate image: {str(e)}",
-                error_type=LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
-                provider="azure_openai",
-                retryable=True
+            raise self._wrap_error(e, "generate image")
+
+    async def generate_image_async(
+        self, prompt: str, options: ImageGenerationOptions
+    ) -> ImageGenerationResult:
+        """
+        Generate images from a prompt asynchronously.
+
+        Args:
+            prompt: The text prompt
+            options: Image generation options
+
+        Returns:
+            Generated image result
+
+        Raises:
+            LLMError: If the request fails
+        """
+        request_data = self._build_image_request(prompt, options)
+
+        try:
+            response = await self._make_request_async(
+                "POST",
+                f"/openai/deployments/{options.model}/images/generations",
+                data=request_data
             )
+            return self._parse_image_response(response, options)
+
+        except LLMError:
+            raise
+
+        except Exception as e:
+            raise self._wrap_error(e, "generate image")
@@ -0,0 +1,318 @@
+"""
+Azure OpenAI client transport benchmark for the LLM Providers integration.
+
+This script runs a local fake Azure OpenAI server with simulated latency and
+measures chat completion throughput and latency for:
+1. Unpooled requests (a new connection per call, the previous client behaviour)
+2. The pooled synchronous transport driven by a thread pool
+3. The pooled async transport driven by asyncio.gather
+
+Results report p50 and p99 latency in milliseconds and requests per second.
+
+Usage:
+    python -m src.llm_providers.azure_openai.benchmark --requests 500 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from ..core.http_transport import TransportConfig
+from ..core.provider_interface import ChatGenerationOptions, ChatMessage
+from .api_client import AzureOpenAIProvider
+from .auth import AzureAuthType, AzureCredentials
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETION = {
+    "id": "chatcmpl-benchmark",
+    "object": "chat.completion",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Hello from the fake server."},
+        "finish_reason": "stop"
+    }],
+    "usage": {"prompt_tokens": 5, "completion_tokens": 6, "total_tokens": 11}
+}
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server with a listen backlog sized for concurrent clients."""
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class FakeAzureOpenAIServer:
+    """
+    Local HTTP/1.1 server that imitates Azure OpenAI chat completions.
+
+    Responses are delayed by a fixed latency to simulate model time. The
+    server can be told to answer a number of requests with 429 and a
+    Retry-After header to exercise client backoff.
+    """
+
+    def __init__(self, latency: float = 0.02, throttle_count: int = 0, retry_after: str = "0"):
+        """
+        Initialize the server.
+
+        Args:
+            latency: Simulated processing time per request in seconds
+            throttle_count: Number of initial requests answered with 429
+            retry_after: Retry-After header value for throttled responses
+        """
+        self.latency = latency
+        self.throttle_count = throttle_count
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_HTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """Get the server URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _create_handler(self) -> type:
+        """Create the request handler class bound to this server."""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY the body
+            # waits for the client's delayed ACK on keep-alive connections
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connection_count += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                with fake._lock:
+                    fake.request_count += 1
+                    throttled = fake.throttle_count > 0
+                    if throttled:
+                        fake.throttle_count -= 1
+
+                if throttled:
+                    self._send(429, {"error": {"message": "Rate limit exceeded"}}, {"Retry-After": fake.retry_after})
+                    return
+
+                time.sleep(fake.latency)
+
+                if not request.get("stream"):
+                    self._send(200, CHAT_COMPLETION)
+                    return
+
+                # Stream the completion as server-sent events
+                events = [
+                    {"choices": [{"index": 0, "delta": {"role": "assistant", "content": word}, "finish_reason": None}]}
+                    for word in ["Hello ", "from ", "the ", "fake ", "server."]
+                ]
+                events.append({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                body = b"".join(f"data: {json.dumps(event)}\n\n".encode("utf-8") for event in events)
+                body += b"data: [DONE]\n\n"
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self) -> "FakeAzureOpenAIServer":
+        """Start serving on a free local port."""
+        self._server = _HTTPServer(("127.0.0.1", 0), self._create_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class TransportBenchmark:
+    """Benchmark for Azure OpenAI client transports."""
+
+    def __init__(self, requests_count: int = 500, concurrency: int = 32, latency: float = 0.02):
+        """
+        Initialize the benchmark.
+
+        Args:
+            requests_count: Number of chat completions per mode
+            concurrency: Number of concurrent callers
+            latency: Simulated server latency in seconds
+        """
+        self.requests_count = requests_count
+        self.concurrency = concurrency
+        self.latency = latency
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def _create_provider(self, endpoint: str) -> AzureOpenAIProvider:
+        """Create a provider pointed at the fake server."""
+        credentials = AzureCredentials(
+            auth_type=AzureAuthType.API_KEY,
+            api_key="benchmark",
+            endpoint=endpoint
+        )
+        return AzureOpenAIProvider(
+            credentials,
+            transport_config=TransportConfig(pool_maxsize=self.concurrency)
+        )
+
+    def _summarize(self, name: str, latencies: List[float], elapsed: float, connections: int) -> Dict[str, float]:
+        """Summarize the latencies of a run."""
+        latencies = sorted(latencies)
+        summary = {
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+            "rps": len(latencies) / elapsed,
+            "connections": connections
+        }
+        self.results[name] = summary
+        logger.info(
+            f"{name}: p50={summary['p50_ms']:.1f}ms p99={summary['p99_ms']:.1f}ms "
+            f"rps={summary['rps']:.1f} connections={connections}"
+        )
+        return summary
+
+    def _run_threaded(self, name: str, create_call: Callable[[str], Callable[[], Any]]) -> Dict[str, float]:
+        """Run a synchronous call concurrently from a thread pool."""
+        server = FakeAzureOpenAIServer(latency=self.latency).start()
+        call = create_call(server.endpoint)
+        try:
+            def timed(_):
+                start = time.perf_counter()
+                call()
+                return time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                latencies = list(executor.map(timed, range(self.requests_count)))
+            elapsed = time.perf_counter() - start
+            return self._summarize(name, latencies, elapsed, server.connection_count)
+        finally:
+            server.stop()
+
+    def benchmark_unpooled(self) -> Dict[str, float]:
+        """Benchmark one connection per request."""
+        body = {"messages": [{"role": "user", "content": "Hello"}]}
+
+        def create_call(endpoint):
+            def call():
+                response = requests.post(
+                    f"{endpoint}/openai/deployments/gpt-4/chat/completions",
+                    json=body,
+                    headers={"Connection": "close"}
+                )
+                response.json()
+            return call
+
+        return self._run_threaded("unpooled", create_call)
+
+    def benchmark_pooled_sync(self) -> Dict[str, float]:
+        """Benchmark the pooled synchronous transport."""
+        providers = []
+
+        def create_call(endpoint):
+            provider = self._create_provider(endpoint)
+            providers.append(provider)
+            return lambda: provider.generate_chat(
+                [ChatMessage(role="user", content="Hello")],
+                ChatGenerationOptions(model="gpt-4")
+            )
+
+        try:
+            return self._run_threaded("pooled_sync", create_call)
+        finally:
+            for provider in providers:
+                provider.close()
+
+    def benchmark_pooled_async(self) -> Dict[str, float]:
+        """Benchmark the pooled async transport."""
+        server = FakeAzureOpenAIServer(latency=self.latency).start()
+        provider = self._create_provider(server.endpoint)
+        semaphore = None
+
+        async def timed():
+            async with semaphore:
+                start = time.perf_counter()
+                await provider.generate_chat_async(
+                    [ChatMessage(role="user", content="Hello")],
+                    ChatGenerationOptions(model="gpt-4")
+                )
+                return time.perf_counter() - start
+
+        async def run():
+            nonlocal semaphore
+            semaphore = asyncio.Semaphore(self.concurrency)
+            try:
+                start = time.perf_counter()
+                latencies = await asyncio.gather(*(timed() for _ in range(self.requests_count)))
+                return latencies, time.perf_counter() - start
+            finally:
+                await provider.aclose()
+
+        try:
+            latencies, elapsed = asyncio.run(run())
+            return self._summarize("pooled_async", latencies, elapsed, server.connection_count)
+        finally:
+            server.stop()
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """
+        Run all benchmarks.
+
+        Returns:
+            Results by mode
+        """
+        self.benchmark_unpooled()
+        self.benchmark_pooled_sync()
+        self.benchmark_pooled_async()
+        return self.results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark Azure OpenAI client transports")
+    parser.add_argument("--requests", type=int, default=500, help="Chat completions per mode")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated server latency in seconds")
+    args = parser.parse_args()
+
+    benchmark = TransportBenchmark(args.requests, args.concurrency, args.latency)
+    print(json.dumps(benchmark.run(), indent=2))
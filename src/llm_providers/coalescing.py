@@ -0,0 +1,378 @@
+"""
+Request coalescing for the LLM Providers integration.
+
+This module implements the coalescing layer used by the provider manager.
+Single-flight makes concurrent identical requests share one upstream call:
+the first caller sends the request and the others wait for its result. The
+micro-batcher holds small compatible requests (such as embeddings for the
+same model) for a short window and sends them to the provider as one batch
+call, up to a maximum batch size.
+"""
+
+import asyncio
+import copy
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalescingConfig:
+    """Configuration for request coalescing."""
+    single_flight_enabled: bool = True
+    batching_enabled: bool = True
+    batch_window: float = 0.005  # time a batch waits for more requests, in seconds
+    max_batch_size: int = 16  # requests per batch call
+    max_batch_item_size: int = 8192  # larger inputs (in characters) are sent on their own
+
+
+class _Flight:
+    """An upstream call shared by identical synchronous requests."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class _AsyncFlight:
+    """An upstream call shared by identical async requests."""
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+        self.shared = False
+
+
+class _Batch:
+    """Requests collected for one synchronous batch call."""
+
+    def __init__(self, batch_call: Callable[[List[Any]], List[Any]]):
+        self.batch_call = batch_call
+        self.items: List[Any] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Optional[List[Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class _AsyncBatch:
+    """Requests collected for one async batch call."""
+
+    def __init__(self, batch_call: Callable[[List[Any]], Awaitable[List[Any]]]):
+        self.batch_call = batch_call
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestCoalescer:
+    """
+    Shares and batches upstream calls for concurrent requests.
+
+    A request passes through single-flight first, keyed on the full request,
+    and then, if a batch call is given and the input is small enough, joins
+    the open batch for its batch key. The first request of a batch waits up
+    to batch_window for others to join; a batch is sent as soon as it holds
+    max_batch_size requests.
+
+    Followers of a shared call receive copies of the result, so callers
+    never share mutable result objects.
+    """
+
+    def __init__(self, config: Optional[CoalescingConfig] = None):
+        """
+        Initialize the coalescer.
+
+        Args:
+            config: Coalescing configuration
+        """
+        self.config = config or CoalescingConfig()
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._batches: Dict[str, _Batch] = {}
+        # Async flights and batches belong to one event loop, so keep a set per loop
+        self._async_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _AsyncFlight]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_batches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _AsyncBatch]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._stats = {
+            "requests": 0,
+            "upstream_calls": 0,
+            "shared": 0,
+            "batches": 0,
+            "batched_requests": 0
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._stats[name] += amount
+
+    def _can_batch(self, batch_call: Optional[Callable], item: Any) -> bool:
+        """Check whether a request may join a batch."""
+        if not self.config.batching_enabled or batch_call is None or self.config.max_batch_size < 2:
+            return False
+        return not isinstance(item, str) or len(item) <= self.config.max_batch_item_size
+
+    def execute(
+        self,
+        key: Optional[str],
+        call: Callable[[], T],
+        batch_key: Optional[str] = None,
+        item: Any = None,
+        batch_call: Optional[Callable[[List[Any]], List[T]]] = None
+    ) -> T:
+        """
+        Run a synchronous request, sharing or batching its upstream call.
+
+        Args:
+            key: Key of the full request for single-flight (no sharing if None)
+            call: Function that sends the request on its own
+            batch_key: Key of the requests it may be batched with
+            item: Input of the request within a batch
+            batch_call: Function that sends a list of inputs in one call and returns one result per input
+
+        Returns:
+            The request's result
+        """
+        self._count("requests")
+        if key is None or not self.config.single_flight_enabled:
+            return self._dispatch(call, batch_key, item, batch_call)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.followers += 1
+                self._stats["shared"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        result = None
+        try:
+            result = self._dispatch(call, batch_key, item, batch_call)
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                followers = flight.followers
+            if followers and flight.error is None:
+                # Snapshot before the leader's caller can modify the result
+                flight.result = copy.deepcopy(result)
+            flight.done.set()
+
+    def _dispatch(
+        self,
+        call: Callable[[], T],
+        batch_key: Optional[str],
+        item: Any,
+        batch_call: Optional[Callable[[List[Any]], List[T]]]
+    ) -> T:
+        """Send a request upstream on its own or as part of a batch."""
+        if batch_key is None or not self._can_batch(batch_call, item):
+            self._count("upstream_calls")
+            return call()
+
+        with self._lock:
+            batch = self._batches.get(batch_key)
+            owner = batch is None
+            if owner:
+                batch = self._batches[batch_key] = _Batch(batch_call)
+            index = len(batch.items)
+            batch.items.append(item)
+            if len(batch.items) >= self.config.max_batch_size:
+                del self._batches[batch_key]
+                batch.full.set()
+
+        if owner:
+            batch.full.wait(self.config.batch_window)
+            with self._lock:
+                if self._batches.get(batch_key) is batch:
+                    del self._batches[batch_key]
+                items = list(batch.items)
+            try:
+                batch.results = self._run_batch(batch.batch_call, items)
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[index]
+
+    def _run_batch(self, batch_call: Callable[[List[Any]], List[T]], items: List[Any]) -> List[T]:
+        """Send a batch and check that it returned one result per input."""
+        with self._lock:
+            self._stats["upstream_calls"] += 1
+            self._stats["batches"] += 1
+            self._stats["batched_requests"] += len(items)
+        results = batch_call(items)
+        if len(results) != len(items):
+            raise ValueError(f"Batch call returned {len(results)} results for {len(items)} inputs")
+        return results
+
+    async def execute_async(
+        self,
+        key: Optional[str],
+        call: Callable[[], Awaitable[T]],
+        batch_key: Optional[str] = None,
+        item: Any = None,
+        batch_call: Optional[Callable[[List[Any]], Awaitable[List[T]]]] = None
+    ) -> T:
+        """
+        Run an async request, sharing or batching its upstream call.
+
+        The shared upstream call is cancelled only when every request waiting
+        for it has been cancelled.
+
+        Args:
+            key: Key of the full request for single-flight (no sharing if None)
+            call: Coroutine function that sends the request on its own
+            batch_key: Key of the requests it may be batched with
+            item: Input of the request within a batch
+            batch_call: Coroutine function that sends a list of inputs in one call and returns one result per input
+
+        Returns:
+            The request's result
+        """
+        self._count("requests")
+        if key is None or not self.config.single_flight_enabled:
+            return await self._dispatch_async(call, batch_key, item, batch_call)
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights = self._async_flights.setdefault(loop, {})
+        flight = flights.get(key)
+        if flight is None:
+            flight = _AsyncFlight(asyncio.ensure_future(self._dispatch_async(call, batch_key, item, batch_call)))
+            flights[key] = flight
+
+            def forget(_):
+                if flights.get(key) is flight:
+                    del flights[key]
+
+            flight.task.add_done_callback(forget)
+        else:
+            flight.shared = True
+            self._count("shared")
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+        return copy.deepcopy(result) if flight.shared else result
+
+    async def _dispatch_async(
+        self,
+        call: Callable[[], Awaitable[T]],
+        batch_key: Optional[str],
+        item: Any,
+        batch_call: Optional[Callable[[List[Any]], Awaitable[List[T]]]]
+    ) -> T:
+        """Send an async request upstream on its own or as part of a batch."""
+        if batch_key is None or not self._can_batch(batch_call, item):
+            self._count("upstream_calls")
+            return await call()
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            batches = self._async_batches.setdefault(loop, {})
+        batch = batches.get(batch_key)
+        if batch is None:
+            batch = batches[batch_key] = _AsyncBatch(batch_call)
+            batch.timer = loop.call_later(self.config.batch_window, self._flush_async, batches, batch_key, batch)
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.config.max_batch_size:
+            self._flush_async(batches, batch_key, batch)
+        return await future
+
+    def _flush_async(self, batches: Dict[str, _AsyncBatch], batch_key: str, batch: _AsyncBatch) -> None:
+        """Close an async batch and send it."""
+        if batches.get(batch_key) is not batch:
+            return
+        del batches[batch_key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._run_batch_async(batch))
+        # Keep a reference so the task is not garbage collected while running
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        # A task cancelled before it starts never runs its own cleanup
+        task.add_done_callback(lambda _: self._cancel_pending(batch))
+
+    @staticmethod
+    def _cancel_pending(batch: _AsyncBatch) -> None:
+        """Cancel the futures of a batch's requests that were not resolved."""
+        for future in batch.futures:
+            if not future.done():
+                future.cancel()
+
+    async def _run_batch_async(self, batch: _AsyncBatch) -> None:
+        """Send an async batch and resolve the futures of its requests."""
+        with self._lock:
+            self._stats["upstream_calls"] += 1
+            self._stats["batches"] += 1
+            self._stats["batched_requests"] += len(batch.items)
+        try:
+            results = await batch.batch_call(batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(f"Batch call returned {len(results)} results for {len(batch.items)} inputs")
+        except asyncio.CancelledError:
+            # Waiting requests would otherwise never be resolved
+            self._cancel_pending(batch)
+            raise
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Request, upstream call, sharing and batching counters, and the
+            upstream call reduction ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        requests = stats["requests"]
+        stats["upstream_reduction"] = 1.0 - stats["upstream_calls"] / requests if requests else 0.0
+        stats["average_batch_size"] = stats["batched_requests"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
@@ -28,6 +28,28 @@ from .provider_interface import (
     ChatGenerationChunk,
     LLMError
 )
+from .http_transport import (
+    RetryPolicy,
+    TransportConfig,
+    HTTPResponse,
+    HTTPTransport,
+    AsyncHTTPTransport
+)
+from .tokenization import (
+    TokenEncoder,
+    BPEEncoder,
+    SentencePieceEncoder,
+    TiktokenEncoder,
+    HeuristicEncoder,
+    TokenCounterConfig,
+    TokenCounter,
+    get_token_counter
+)
+from .worker_pool import (
+    WorkerPoolConfig,
+    WorkerPoolOverloadedError,
+    AsyncWorkerPool
+)
 
 __all__ = [
     'LLMProvider',
@@ -50,5 +72,21 @@ __all__ = [
     'ImageGenerationResult',
     'TextGenerationChunk',
     'ChatGenerationChunk',
-    'LLMError'
+    'LLMError',
+    'RetryPolicy',
+    'TransportConfig',
+    'HTTPResponse',
+    'HTTPTransport',
+    'AsyncHTTPTransport',
+    'TokenEncoder',
+    'BPEEncoder',
+    'SentencePieceEncoder',
+    'TiktokenEncoder',
+    'HeuristicEncoder',
+    'TokenCounterConfig',
+    'TokenCounter',
+    'get_token_counter',
+    'WorkerPoolConfig',
+    'WorkerPoolOverloadedError',
+    'AsyncWorkerPool'
 ]
@@ -0,0 +1,454 @@
+"""
+Pooled HTTP transport for the LLM Providers integration.
+
+This module provides the HTTP layer shared by REST-based provider adapters:
+a synchronous transport backed by a pooled requests Session and an asyncio
+transport backed by a pooled aiohttp session. Both keep connections alive
+between calls, bound the number of connections per host, apply connect and
+read timeouts, and retry rate-limited and failed requests with jittered
+exponential backoff that honours Retry-After. A request that may already
+have reached the server (it timed out waiting for the response) is only
+retried if its method is idempotent, so a completion is never generated,
+and billed, twice.
+"""
+
+import asyncio
+import email.utils
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, FrozenSet, Mapping, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import EmptyPoolError
+
+logger = logging.getLogger(__name__)
+
+# aiohttp 3.10+ raises ConnectionTimeoutError when connecting times out. Older
+# versions raise a plain ServerTimeoutError for connect and read timeouts alike,
+# so there every timeout counts as a request that may have been sent.
+_CONNECT_TIMEOUT_ERRORS = getattr(aiohttp, "ConnectionTimeoutError", ())
+
+
+@dataclass
+class RetryPolicy:
+    """Retry policy for HTTP requests."""
+    max_retries: int = 3
+    backoff_base: float = 0.5  # in seconds
+    backoff_max: float = 30.0  # in seconds
+    retry_statuses: FrozenSet[int] = frozenset({408, 429, 500, 502, 503, 504})
+    respect_retry_after: bool = True
+    idempotent_methods: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def should_retry_status(self, status_code: int, attempt: int) -> bool:
+        """Check whether a response status should be retried after the given attempt."""
+        return attempt < self.max_retries and status_code in self.retry_statuses
+
+    def should_retry_error(self, method: str, request_sent: bool, attempt: int) -> bool:
+        """
+        Check whether a failed request should be retried after the given attempt.
+
+        Args:
+            method: HTTP method of the request
+            request_sent: Whether the request may have reached the server
+            attempt: Number of the attempt that failed (starting at 0)
+
+        Returns:
+            Whether to retry
+        """
+        if attempt >= self.max_retries:
+            return False
+        return not request_sent or method.upper() in self.idempotent_methods
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        Uses full jitter: a uniform delay between zero and an exponentially
+        growing cap, so clients that failed together do not retry together.
+        A Retry-After header from the server takes precedence.
+
+        Args:
+            attempt: Number of the attempt that failed (starting at 0)
+            retry_after: Value of the Retry-After response header
+
+        Returns:
+            Delay in seconds
+        """
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.backoff_max)
+
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, cap)
+
+
+@dataclass
+class TransportConfig:
+    """Connection pool, timeout and retry settings for an HTTP transport."""
+    pool_connections: int = 10  # number of hosts to keep pools for
+    pool_maxsize: int = 32  # maximum connections per host
+    pool_timeout: float = 30.0  # time to wait for a free pooled connection, in seconds
+    connect_timeout: float = 5.0  # in seconds
+    read_timeout: float = 120.0  # in seconds
+    keepalive_timeout: float = 30.0  # idle time before a pooled connection is closed, in seconds
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+
+
+@dataclass
+class HTTPResponse:
+    """Buffered HTTP response returned by the async transport."""
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+    def json(self) -> Any:
+        """Decode the response body as JSON."""
+        return json.loads(self.content)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Delay in seconds, or None if the value cannot be parsed
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _PoolTimeoutMixin:
+    """Connection pool mixin that waits at most pool_timeout for a free connection."""
+    pool_timeout: Optional[float] = None
+
+    def urlopen(self, method, url, *args, **kwargs):
+        if kwargs.get("pool_timeout") is None:
+            kwargs["pool_timeout"] = self.pool_timeout
+        return super().urlopen(method, url, *args, **kwargs)
+
+
+class _PoolTimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter whose blocking pools give up waiting for a connection after a timeout."""
+
+    def __init__(self, pool_timeout: float, **kwargs: Any):
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        # requests never passes pool_timeout to urllib3, so bake it into the pool classes
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(pool_class.__name__, (_PoolTimeoutMixin, pool_class), {"pool_timeout": self.pool_timeout})
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class HTTPTransport:
+    """
+    Synchronous HTTP transport with a shared connection pool.
+
+    A single requests Session is shared by all calls. Its pool blocks when
+    every connection to a host is in use, so the number of connections per
+    host never exceeds pool_maxsize regardless of how many threads call in;
+    a call that cannot get a connection within pool_timeout fails with
+    requests.ConnectionError.
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            config: Transport configuration
+        """
+        self.config = config or TransportConfig()
+
+        adapter = _PoolTimeoutAdapter(
+            self.config.pool_timeout,
+            pool_connections=self.config.pool_connections,
+            pool_maxsize=self.config.pool_maxsize,
+            pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        timeout: Optional[float] = None
+    ) -> requests.Response:
+        """
+        Send a request, retrying according to the retry policy.
+
+        Responses with a retryable status are retried until the policy is
+        exhausted; the last response is returned either way, so callers
+        handle error statuses as usual.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            json: JSON request body
+            params: Query parameters
+            stream: Whether to stream the response body
+            timeout: Read timeout override in seconds
+
+        Returns:
+            The response
+
+        Raises:
+            requests.RequestException: If the request fails after all retries; a
+                timed-out request is not retried unless its method is idempotent
+        """
+        retry = self.config.retry
+        timeouts = (self.config.connect_timeout, timeout or self.config.read_timeout)
+        attempt = 0
+
+        while True:
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    json=json,
+                    params=params,
+                    stream=stream,
+                    timeout=timeouts
+                )
+            except EmptyPoolError as e:
+                raise requests.ConnectionError(
+                    f"No connection to {url} became free within {self.config.pool_timeout}s"
+                ) from e
+            except (requests.ConnectionError, requests.Timeout) as e:
+                request_sent = isinstance(e, requests.ReadTimeout)
+                if not retry.should_retry_error(method, request_sent, attempt):
+                    raise
+                delay = retry.get_delay(attempt)
+                logger.warning(f"HTTP {method} {url} failed ({str(e)}), retrying in {delay:.2f}s")
+            else:
+                if not retry.should_retry_status(response.status_code, attempt):
+                    return response
+                delay = retry.get_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"HTTP {method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                # Release the connection back to the pool before sleeping
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+class AsyncHTTPTransport:
+    """
+    Asyncio HTTP transport with a shared connection pool.
+
+    All coroutines running on the same event loop share one aiohttp session,
+    so many in-flight requests reuse a bounded set of keep-alive connections.
+    The session is created on first use in the running loop and recreated
+    if the transport is later used from a different loop, closing the
+    previous session on its own loop.
+    """
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        """
+        Initialize the transport.
+
+        Args:
+            config: Transport configuration
+        """
+        self.config = config or TransportConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._close_stale_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.config.pool_connections * self.config.pool_maxsize,
+                limit_per_host=self.config.pool_maxsize,
+                keepalive_timeout=self.config.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    connect=self.config.connect_timeout,
+                    sock_read=self.config.read_timeout
+                )
+            )
+            self._loop = loop
+        return self._session
+
+    def _close_stale_session(self) -> None:
+        """Close the session of a previous event loop before it is replaced."""
+        session, loop = self._session, self._loop
+        self._session = None
+        self._loop = None
+        if session is None or session.closed:
+            return
+        if loop.is_closed():
+            # A closed loop cannot close its connections; they close when collected
+            logger.debug("Dropping HTTP session of a closed event loop")
+            return
+        # Sessions are bound to their loop, so close it there
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        json: Optional[Any],
+        params: Optional[Dict[str, Any]],
+        timeout: Optional[float]
+    ) -> aiohttp.ClientResponse:
+        """Send a request, retrying according to the retry policy, and return the open response."""
+        retry = self.config.retry
+        session = self._get_session()
+        # Passing timeout=None would disable the session's timeouts, so only override them when asked
+        request_timeout = session.timeout
+        if timeout is not None:
+            request_timeout = aiohttp.ClientTimeout(
+                total=None,
+                connect=self.config.connect_timeout,
+                sock_read=timeout
+            )
+        attempt = 0
+
+        while True:
+            try:
+                response = await session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    json=json,
+                    params=params,
+                    timeout=request_timeout
+                )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                request_sent = isinstance(e, asyncio.TimeoutError) and not isinstance(e, _CONNECT_TIMEOUT_ERRORS)
+                if not retry.should_retry_error(method, request_sent, attempt):
+                    raise
+                delay = retry.get_delay(attempt)
+                logger.warning(f"HTTP {method} {url} failed ({str(e)}), retrying in {delay:.2f}s")
+            else:
+                if not retry.should_retry_status(response.status, attempt):
+                    return response
+                delay = retry.get_delay(attempt, response.headers.get("Retry-After"))
+                logger.warning(f"HTTP {method} {url} returned {response.status}, retrying in {delay:.2f}s")
+                response.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> HTTPResponse:
+        """
+        Send a request and read the whole response body.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            json: JSON request body
+            params: Query parameters
+            timeout: Read timeout override in seconds
+
+        Returns:
+            The buffered response
+
+        Raises:
+            aiohttp.ClientError: If the request fails after all retries
+            asyncio.TimeoutError: If the request times out after all retries; a
+                timed-out request is not retried unless its method is idempotent
+        """
+        response = await self._send(method, url, headers, json, params, timeout)
+        async with response:
+            content = await response.read()
+            return HTTPResponse(
+                status_code=response.status,
+                headers=dict(response.headers),
+                content=content
+            )
+
+    async def stream_lines(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        json: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Send a request and stream the response body line by line.
+
+        The first item yielded is the HTTPResponse with an empty body, so
+        callers can check the status before consuming lines. For an error
+        status the body is read into that response and nothing else is
+        yielded.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            json: JSON request body
+            params: Query parameters
+            timeout: Read timeout override in seconds
+
+        Yields:
+            The response, followed by each line of the body as bytes
+        """
+        response = await self._send(method, url, headers, json, params, timeout)
+        async with response:
+            if response.status >= 300:
+                yield HTTPResponse(response.status, dict(response.headers), await response.read())
+                return
+
+            yield HTTPResponse(response.status, dict(response.headers), b"")
+            async for line in response.content:
+                yield line
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
@@ -5,6 +5,7 @@ This module defines the common interfaces and data models that all LLM provider
 adapters must implement, ensuring a consistent API across different providers.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
@@ -87,6 +88,7 @@ class ProviderCapabilities:
     supports_functions: bool = False
     supports_vision: bool = False
     supports_audio: bool = False
+    supports_batch_embeddings: bool = False  # generate_embeddings sends many inputs in one call
 
 
 @dataclass
@@ -277,6 +279,18 @@ class LLMProvider(ABC):
         """Generate embeddings for text asynchronously."""
         pass
     
+    def generate_embeddings(
+        self, texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """Generate embeddings for several texts, in one call where the API supports it."""
+        return [self.generate_embedding(text, options) for text in texts]
+    
+    async def generate_embeddings_async(
+        self, texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """Generate embeddings for several texts asynchronously."""
+        return list(await asyncio.gather(*(self.generate_embedding_async(text, options) for text in texts)))
+    
     @abstractmethod
     def generate_image(
         self, prompt: str, options: ImageGenerationOptions
@@ -0,0 +1,596 @@
+"""
+Token counting for the LLM Providers integration.
+
+This module counts tokens with the models' real tokenizers so that quota
+enforcement and context-window checks see the same numbers the provider
+will bill and enforce. Vocabularies are loaded from local files:
+
+- Byte-level BPE vocabularies in tiktoken format (``<encoding>.tiktoken``,
+  one base64 token and its rank per line), used by the GPT and Llama 3
+  families. They are encoded with the ``tiktoken`` package when it is
+  installed, and with a pure-Python BPE implementation otherwise. Without
+  a local file, the OpenAI encodings are loaded through ``tiktoken`` when
+  it is installed.
+- SentencePiece models (``<encoding>.model``), used by Llama 2, Mistral
+  and Titan, which require the ``sentencepiece`` package.
+
+Models without a vocabulary file fall back to a heuristic estimate that
+accounts for code, digits and non-Latin scripts. Encoders are loaded once
+and shared, and counts of repeated texts such as system prompts are
+memoized.
+"""
+
+import base64
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .provider_interface import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+# Pre-tokenization patterns by encoding: (tiktoken pattern, Python re equivalent).
+# The re versions stand in \p{L} with [^\W\d_] and \p{N} with \d; the o200k
+# version also does not split words at case changes.
+_CL100K_PATTERNS = (
+    r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+""",
+    r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|(?:[^\r\n\w]|_)?[^\W\d_]+|\d{1,3}| ?(?:[^\s\w]|_)+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+)
+_O200K_PATTERNS = (
+    "|".join([
+        r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+        r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+        r"""\p{N}{1,3}""",
+        r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+        r"""\s*[\r\n]+""",
+        r"""\s+(?!\S)""",
+        r"""\s+""",
+    ]),
+    r"""(?:[^\r\n\w]|_)?[^\W\d_]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?|\d{1,3}| ?(?:[^\s\w]|_)+[\r\n/]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+)
+_GPT2_PATTERNS = (
+    r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+    r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+"""
+)
+
+ENCODING_PATTERNS: Dict[str, Tuple[str, str]] = {
+    "cl100k_base": _CL100K_PATTERNS,
+    "o200k_base": _O200K_PATTERNS,
+    "p50k_base": _GPT2_PATTERNS,
+    "r50k_base": _GPT2_PATTERNS,
+    "llama3": _CL100K_PATTERNS,
+}
+
+# Encodings tiktoken can load without a local vocabulary file
+TIKTOKEN_ENCODINGS = ("cl100k_base", "o200k_base", "p50k_base", "r50k_base")
+
+# Encoding used by each model family, matched by substring of the model ID
+# in order, so more specific names come first
+DEFAULT_MODEL_ENCODINGS: List[Tuple[str, str]] = [
+    ("gpt-4o", "o200k_base"),
+    ("gpt-4.1", "o200k_base"),
+    ("o1-", "o200k_base"),
+    ("o3-", "o200k_base"),
+    ("gpt-4", "cl100k_base"),
+    ("gpt-35", "cl100k_base"),
+    ("gpt-3.5", "cl100k_base"),
+    ("text-embedding-3", "cl100k_base"),
+    ("text-embedding-ada-002", "cl100k_base"),
+    ("davinci", "p50k_base"),
+    ("llama3", "llama3"),
+    ("llama-3", "llama3"),
+    ("llama2", "llama2"),
+    ("llama-2", "llama2"),
+    ("mistral", "mistral"),
+    ("mixtral", "mistral"),
+    ("titan", "titan"),
+    ("claude", "claude"),
+    ("command", "cohere"),
+    ("j2", "ai21"),
+]
+
+_CJK_START = 0x2E80  # CJK radicals onwards; Hangul, kana and ideographs are roughly one token per character
+
+
+class TokenEncoder(ABC):
+    """Base class for tokenizers."""
+
+    def __init__(self, name: str):
+        """
+        Initialize the encoder.
+
+        Args:
+            name: Encoding name
+        """
+        self.name = name
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts match the model's tokenizer exactly."""
+        return True
+
+    @abstractmethod
+    def encode(self, text: str) -> List[int]:
+        """
+        Encode text into token IDs.
+
+        Args:
+            text: Text to encode
+
+        Returns:
+            Token IDs
+        """
+        pass
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens in a text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Token count
+        """
+        return len(self.encode(text))
+
+
+def load_tiktoken_ranks(path: str) -> Dict[bytes, int]:
+    """
+    Load a BPE vocabulary in tiktoken format.
+
+    Args:
+        path: Path to the vocabulary file
+
+    Returns:
+        Mapping of token bytes to rank
+    """
+    ranks: Dict[bytes, int] = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            token, rank = line.split()
+            ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+class BPEEncoder(TokenEncoder):
+    """
+    Byte-level BPE encoder for tiktoken-format vocabularies.
+
+    Uses the tiktoken package when it is installed. Otherwise text is split
+    with the encoding's pre-tokenization pattern and each piece is merged in
+    pure Python, with merged pieces cached since natural language and code
+    repeat the same words.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ranks: Dict[bytes, int],
+        patterns: Optional[Tuple[str, str]] = None,
+        piece_cache_size: int = 100000,
+        use_tiktoken: bool = True
+    ):
+        """
+        Initialize the encoder.
+
+        Args:
+            name: Encoding name
+            ranks: Mapping of token bytes to rank, as loaded by load_tiktoken_ranks
+            patterns: Pre-tokenization patterns (tiktoken, Python re); defaults to cl100k's
+            piece_cache_size: Maximum number of merged pieces to cache
+            use_tiktoken: Whether to use the tiktoken package if it is installed
+        """
+        super().__init__(name)
+        self._ranks = ranks
+        patterns = patterns or _CL100K_PATTERNS
+        self._pattern = re.compile(patterns[1])
+        self._piece_cache: Dict[bytes, Tuple[int, ...]] = {}
+        self._piece_cache_size = piece_cache_size
+        self._tiktoken = None
+
+        if use_tiktoken:
+            try:
+                import tiktoken
+                self._tiktoken = tiktoken.Encoding(
+                    name=name, pat_str=patterns[0], mergeable_ranks=ranks, special_tokens={}
+                )
+            except ImportError:
+                logger.debug("tiktoken package not available, using pure-Python BPE")
+
+    @property
+    def backend(self) -> str:
+        """Name of the implementation doing the encoding."""
+        return "tiktoken" if self._tiktoken is not None else "python"
+
+    def _merge(self, piece: bytes) -> Tuple[int, ...]:
+        """Apply BPE merges to one pre-tokenized piece."""
+        rank = self._ranks.get(piece)
+        if rank is not None:
+            return (rank,)
+
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best_rank = None
+            best_index = 0
+            for i in range(len(parts) - 1):
+                rank = self._ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = i
+            if best_rank is None:
+                break
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+
+        # Byte-level vocabularies contain every single byte
+        return tuple(self._ranks.get(part, -1) for part in parts)
+
+    def encode(self, text: str) -> List[int]:
+        if self._tiktoken is not None:
+            return self._tiktoken.encode_ordinary(text)
+
+        tokens: List[int] = []
+        cache = self._piece_cache
+        for match in self._pattern.finditer(text):
+            piece = match.group().encode("utf-8")
+            merged = cache.get(piece)
+            if merged is None:
+                merged = self._merge(piece)
+                if len(cache) >= self._piece_cache_size:
+                    cache.clear()
+                cache[piece] = merged
+            tokens.extend(merged)
+        return tokens
+
+
+class SentencePieceEncoder(TokenEncoder):
+    """Encoder for SentencePiece models."""
+
+    def __init__(self, name: str, path: str):
+        """
+        Initialize the encoder.
+
+        Args:
+            name: Encoding name
+            path: Path to the SentencePiece model file
+
+        Raises:
+            ImportError: If the sentencepiece package is not installed
+        """
+        super().__init__(name)
+        import sentencepiece
+        self._processor = sentencepiece.SentencePieceProcessor(model_file=path)
+
+    def encode(self, text: str) -> List[int]:
+        return self._processor.encode(text)
+
+
+class TiktokenEncoder(TokenEncoder):
+    """
+    Encoder for the encodings published with the tiktoken package.
+
+    tiktoken downloads the vocabulary on first use and caches it (see
+    TIKTOKEN_CACHE_DIR), so this is used only when no local file exists.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the encoder.
+
+        Args:
+            name: tiktoken encoding name, e.g. "cl100k_base"
+
+        Raises:
+            ImportError: If the tiktoken package is not installed
+            ValueError: If tiktoken does not know the encoding
+        """
+        super().__init__(name)
+        import tiktoken
+        self._encoding = tiktoken.get_encoding(name)
+
+    @property
+    def backend(self) -> str:
+        """Name of the implementation doing the encoding."""
+        return "tiktoken"
+
+    def encode(self, text: str) -> List[int]:
+        return self._encoding.encode_ordinary(text)
+
+
+class HeuristicEncoder(TokenEncoder):
+    """
+    Token estimator for models without a local vocabulary.
+
+    Splits text like a BPE pre-tokenizer and estimates each piece: short
+    words are one token and long ones several, digits go in groups of
+    three, punctuation runs (common in code) take about one token per two
+    characters, and CJK text about one token per character.
+    """
+
+    def __init__(self, name: str = "heuristic"):
+        super().__init__(name)
+        self._pattern = re.compile(_CL100K_PATTERNS[1])
+
+    @property
+    def exact(self) -> bool:
+        return False
+
+    @staticmethod
+    def _estimate_piece(piece: str) -> int:
+        """Estimate the tokens in one pre-tokenized piece."""
+        word = piece.lstrip()
+        if not word:
+            return 1
+        if word.isascii():
+            if word[0].isalpha() or word[0] == "'":
+                return 1 + (len(word) - 1) // 6
+            if word[0].isdigit():
+                return 1
+            return max(1, math.ceil(len(piece.strip()) / 2))
+
+        cjk = sum(1 for char in word if ord(char) >= _CJK_START)
+        other = len(word) - cjk
+        return max(1, cjk + math.ceil(other / 2))
+
+    def encode(self, text: str) -> List[int]:
+        # Estimates have no token IDs; return placeholders of the estimated length
+        return [-1] * self.count(text)
+
+    def count(self, text: str) -> int:
+        return sum(self._estimate_piece(match.group()) for match in self._pattern.finditer(text))
+
+
+@dataclass
+class TokenCounterConfig:
+    """Configuration for token counting."""
+    vocab_dir: Optional[str] = None  # defaults to $LLM_TOKENIZER_VOCAB_DIR, then the package's vocab directory
+    model_encodings: Dict[str, str] = field(default_factory=dict)  # model ID substring to encoding, checked first
+    tokens_per_message: int = 3  # chat format overhead per message
+    tokens_per_name: int = 1  # extra overhead when a message has a name
+    tokens_per_reply: int = 3  # tokens priming the assistant's reply
+    cache_size: int = 4096  # memoized text counts; 0 disables memoization
+    min_cached_length: int = 64  # shorter texts are cheaper to count than to look up
+    use_tiktoken: bool = True
+
+
+class TokenCounter:
+    """
+    Counts tokens for any model using a shared set of encoders.
+
+    Encoders are loaded lazily, once per encoding, from the vocabulary
+    directory. Counts of texts of at least min_cached_length characters
+    are memoized in an LRU cache keyed by a digest of the text, so a
+    system prompt repeated across a conversation or across requests is
+    tokenized once without the cache holding on to the prompts themselves.
+    """
+
+    def __init__(self, config: Optional[TokenCounterConfig] = None):
+        """
+        Initialize the token counter.
+
+        Args:
+            config: Token counter configuration
+        """
+        self.config = config or TokenCounterConfig()
+        self.vocab_dir = (
+            self.config.vocab_dir
+            or os.environ.get("LLM_TOKENIZER_VOCAB_DIR")
+            or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vocab")
+        )
+        self._encoders: Dict[str, TokenEncoder] = {}
+        self._heuristic = HeuristicEncoder()
+        self._cache: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_encoding_name(self, model: Optional[str]) -> Optional[str]:
+        """
+        Get the encoding used by a model.
+
+        Args:
+            model: Model identifier, e.g. "gpt-4" or "anthropic.claude-3-haiku-20240307-v1:0"
+
+        Returns:
+            Encoding name, or None if the model is unknown
+        """
+        if not model:
+            return None
+        model = model.lower()
+        for prefix, encoding in list(self.config.model_encodings.items()) + DEFAULT_MODEL_ENCODINGS:
+            if prefix.lower() in model:
+                return encoding
+        return None
+
+    def _load_encoder(self, encoding: str) -> Optional[TokenEncoder]:
+        """Load an encoder from the vocabulary directory."""
+        bpe_path = os.path.join(self.vocab_dir, f"{encoding}.tiktoken")
+        if os.path.exists(bpe_path):
+            return BPEEncoder(
+                encoding,
+                load_tiktoken_ranks(bpe_path),
+                ENCODING_PATTERNS.get(encoding),
+                use_tiktoken=self.config.use_tiktoken
+            )
+
+        sp_path = os.path.join(self.vocab_dir, f"{encoding}.model")
+        if os.path.exists(sp_path):
+            try:
+                return SentencePieceEncoder(encoding, sp_path)
+            except ImportError:
+                logger.warning(f"sentencepiece package not available, estimating tokens for {encoding}")
+                return None
+
+        if self.config.use_tiktoken and encoding in TIKTOKEN_ENCODINGS:
+            try:
+                return TiktokenEncoder(encoding)
+            except ImportError:
+                pass
+            except Exception as e:
+                logger.warning(f"tiktoken could not load {encoding}: {str(e)}")
+
+        logger.info(f"No vocabulary for {encoding} in {self.vocab_dir}, estimating tokens")
+        return None
+
+    def get_encoder(self, model: Optional[str]) -> TokenEncoder:
+        """
+        Get the encoder for a model.
+
+        Args:
+            model: Model identifier
+
+        Returns:
+            The model's tokenizer, or a heuristic estimator if its vocabulary is not available
+        """
+        encoding = self.get_encoding_name(model)
+        if encoding is None:
+            return self._heuristic
+
+        encoder = self._encoders.get(encoding)
+        if encoder is None:
+            with self._load_lock:
+                encoder = self._encoders.get(encoding)
+                if encoder is None:
+                    encoder = self._load_encoder(encoding) or self._heuristic
+                    self._encoders[encoding] = encoder
+        return encoder
+
+    def _count(self, encoder: TokenEncoder, text: str) -> int:
+        """Count the tokens in a text, using the memoized count if there is one."""
+        if len(text) < self.config.min_cached_length or self.config.cache_size <= 0:
+            return encoder.count(text)
+
+        # A fixed-size digest keeps long prompts out of memory and makes lookups cheap
+        key = (encoder.name, hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest())
+        with self._lock:
+            count = self._cache.get(key)
+            if count is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return count
+            self._misses += 1
+
+        count = encoder.count(text)
+        with self._lock:
+            self._cache[key] = count
+            while len(self._cache) > self.config.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def count(self, text: str, model: Optional[str] = None) -> int:
+        """
+        Count the tokens in a text.
+
+        Args:
+            text: Text to count
+            model: Model whose tokenizer to use
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        return self._count(self.get_encoder(model), text)
+
+    def count_batch(self, texts: Iterable[str], model: Optional[str] = None) -> List[int]:
+        """
+        Count the tokens in several texts for the same model.
+
+        Args:
+            texts: Texts to count
+            model: Model whose tokenizer to use
+
+        Returns:
+            Token count of each text
+        """
+        encoder = self.get_encoder(model)
+        return [self._count(encoder, text) if text else 0 for text in texts]
+
+    def count_messages(self, messages: Iterable[ChatMessage], model: Optional[str] = None) -> int:
+        """
+        Count the prompt tokens of a conversation in one pass.
+
+        Includes the chat format's per-message overhead and the tokens that
+        prime the assistant's reply.
+
+        Args:
+            messages: Chat messages
+            model: Model whose tokenizer to use
+
+        Returns:
+            Token count of the conversation
+        """
+        encoder = self.get_encoder(model)
+        total = self.config.tokens_per_reply
+        for message in messages:
+            total += self.config.tokens_per_message
+            total += self._count(encoder, message.role)
+            if message.content:
+                total += self._count(encoder, message.content)
+            if message.name:
+                total += self.config.tokens_per_name + self._count(encoder, message.name)
+            if message.function_call:
+                for value in message.function_call.values():
+                    total += self._count(encoder, str(value))
+        return total
+
+    def is_exact(self, model: Optional[str]) -> bool:
+        """
+        Check whether counts for a model come from its real tokenizer.
+
+        Args:
+            model: Model identifier
+
+        Returns:
+            True if the model's vocabulary is loaded, False if counts are estimates
+        """
+        return self.get_encoder(model).exact
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get token counter statistics.
+
+        Returns:
+            Memoization counters and the loaded encoders
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "cache_entries": len(self._cache),
+                "cache_hits": self._hits,
+                "cache_misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "encoders": {
+                    name: getattr(encoder, "backend", "sentencepiece") if encoder.exact else "heuristic"
+                    for name, encoder in self._encoders.items()
+                }
+            }
+
+
+_token_counter: Optional[TokenCounter] = None
+_token_counter_lock = threading.Lock()
+
+
+def get_token_counter() -> TokenCounter:
+    """
+    Get the token counter shared by all providers.
+
+    Returns:
+        Shared token counter
+    """
+    global _token_counter
+    if _token_counter is None:
+        with _token_counter_lock:
+            if _token_counter is None:
+                _token_counter = TokenCounter()
+    return _token_counter
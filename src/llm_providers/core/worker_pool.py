@@ -0,0 +1,254 @@
+"""
+Async worker pool for the LLM Providers integration.
+
+This module lets provider adapters built on blocking SDKs expose genuinely
+non-blocking async methods. Blocking calls run on a bounded thread pool
+while the event loop keeps serving other requests, with per-key (typically
+per-model) concurrency limits, cancellation of queued calls, optional
+timeouts, and a bounded backlog that rejects calls once it is full.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_END_OF_ITERATION = object()
+
+
+class WorkerPoolOverloadedError(Exception):
+    """Raised when a call is rejected because the worker pool backlog is full."""
+
+
+@dataclass
+class WorkerPoolConfig:
+    """Sizing and backpressure settings for an async worker pool."""
+    max_workers: int = 32  # threads running blocking calls
+    max_concurrency_per_key: int = 8  # concurrent calls per key (e.g. per model)
+    key_limits: Dict[str, int] = field(default_factory=dict)  # per-key overrides
+    max_queue_depth: int = 256  # calls allowed to wait for a slot before new calls are rejected
+
+
+class AsyncWorkerPool:
+    """
+    Runs blocking calls from asyncio code on a bounded thread pool.
+
+    A call first waits for a slot under its key's concurrency limit, then
+    runs on a worker thread. Calls that are waiting count towards the
+    backlog; once max_queue_depth calls are waiting, new calls are rejected
+    with WorkerPoolOverloadedError instead of queueing without bound.
+
+    Cancelling the awaiting task, or a timeout, stops a call still waiting
+    for a slot or a thread from ever starting. A call already running
+    cannot be stopped: it finishes on its thread, its result is discarded,
+    and it keeps its slot until then, so the limits bound the threads that
+    are actually busy.
+    """
+
+    def __init__(self, config: Optional[WorkerPoolConfig] = None, name: str = "llm-worker"):
+        """
+        Initialize the worker pool.
+
+        Args:
+            config: Pool configuration
+            name: Thread name prefix for the workers
+        """
+        self.config = config or WorkerPoolConfig()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_workers,
+            thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._rejected = 0
+        # Semaphores belong to one event loop, so keep a set per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_limit(self, key: str) -> int:
+        """
+        Get the concurrency limit for a key.
+
+        Args:
+            key: Concurrency key
+
+        Returns:
+            Maximum concurrent calls for the key
+        """
+        return self.config.key_limits.get(key, self.config.max_concurrency_per_key)
+
+    def _get_semaphore(self, key: str) -> asyncio.Semaphore:
+        """Get the semaphore for a key in the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(key)
+            if semaphore is None:
+                semaphore = semaphores[key] = asyncio.Semaphore(self.get_limit(key))
+            return semaphore
+
+    def _enter_queue(self) -> None:
+        """Reserve a place in the backlog or reject the call."""
+        with self._lock:
+            if self._waiting >= self.config.max_queue_depth:
+                self._rejected += 1
+                raise WorkerPoolOverloadedError(
+                    f"Worker pool backlog is full ({self.config.max_queue_depth} calls waiting)"
+                )
+            self._waiting += 1
+
+    def _leave_queue(self, started: bool) -> None:
+        """Release a place in the backlog."""
+        with self._lock:
+            self._waiting -= 1
+            if started:
+                self._running += 1
+
+    def _finish(self, loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+        """Record the end of a running call and release its slot; safe to call from any thread."""
+        with self._lock:
+            self._running -= 1
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # The event loop is closed, and its semaphores with it
+            pass
+    
+    async def _acquire(self, key: str) -> asyncio.Semaphore:
+        """Wait in the backlog for a slot under a key's limit, and take it."""
+        semaphore = self._get_semaphore(key)
+        self._enter_queue()
+        started = False
+        try:
+            await semaphore.acquire()
+            started = True
+        finally:
+            self._leave_queue(started)
+        return semaphore
+
+    async def run(
+        self,
+        key: str,
+        func: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> T:
+        """
+        Run a blocking call without blocking the event loop.
+
+        Args:
+            key: Concurrency key the call counts against
+            func: Blocking callable
+            *args: Positional arguments for the callable
+            timeout: Maximum time to wait for the result, including queueing, in seconds
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's result
+
+        Raises:
+            WorkerPoolOverloadedError: If the backlog is full
+            asyncio.TimeoutError: If the call does not finish within the timeout
+        """
+        if timeout is not None:
+            return await asyncio.wait_for(self.run(key, func, *args, **kwargs), timeout)
+
+        semaphore = await self._acquire(key)
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._finish(loop, semaphore)
+            raise
+        # Release the slot when the thread is done with the call, not when the caller stops waiting
+        future.add_done_callback(lambda _: self._finish(loop, semaphore))
+        return await asyncio.wrap_future(future)
+
+    async def iterate(self, key: str, iterable: Iterable[T]) -> AsyncIterator[T]:
+        """
+        Consume a blocking iterable without blocking the event loop.
+
+        Each item is fetched on a worker thread, so a stream that waits on
+        the network between items does not hold up other coroutines. The
+        stream waits in the backlog and holds one slot under its key's limit
+        for as long as it is consumed.
+
+        When iteration ends early (the consumer breaks out, is cancelled, or
+        fails), the iterable is closed once no item fetch is running, and
+        only then is the slot released.
+
+        Args:
+            key: Concurrency key the stream counts against
+            iterable: Blocking iterable such as a streaming response body
+
+        Yields:
+            Items of the iterable
+
+        Raises:
+            WorkerPoolOverloadedError: If the backlog is full
+        """
+        semaphore = await self._acquire(key)
+        loop = asyncio.get_running_loop()
+        iterator = iter(iterable)
+        sources = [iterator] if iterator is iterable else [iterator, iterable]
+        future = None
+
+        def close(_=None):
+            try:
+                for source in sources:
+                    if hasattr(source, "close"):
+                        source.close()
+            except Exception as e:
+                logger.warning(f"Failed to close stream for {key}: {str(e)}")
+            finally:
+                self._finish(loop, semaphore)
+
+        try:
+            while True:
+                future = self._executor.submit(next, iterator, _END_OF_ITERATION)
+                item = await asyncio.wrap_future(future)
+                if item is _END_OF_ITERATION:
+                    return
+                yield item
+        finally:
+            if future is not None and not future.done():
+                # A fetch is still running on a worker thread; close the stream after it
+                future.add_done_callback(close)
+            else:
+                close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Counts of waiting, running and rejected calls
+        """
+        with self._lock:
+            return {
+                "waiting": self._waiting,
+                "running": self._running,
+                "rejected": self._rejected,
+                "max_workers": self.config.max_workers,
+                "max_queue_depth": self.config.max_queue_depth
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the worker threads.
+
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=True)
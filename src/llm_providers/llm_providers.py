@@ -23,6 +23,9 @@ from .core.provider_interface import (
     ImageGenerationResult
 )
 from .provider_manager import ProviderManager
+from .response_cache import ResponseCache, ResponseCacheConfig
+from .routing import RoutingConfig
+from .coalescing import CoalescingConfig
 from .aws_bedrock import AWSBedrockProvider, AWSCredentials, AWSAuthType
 from .azure_openai import AzureOpenAIProvider, AzureCredentials, AzureAuthType
 
@@ -40,14 +43,28 @@ class LLMProviders:
     """
     
     @staticmethod
-    def create_provider_manager() -> ProviderManager:
+    def create_provider_manager(
+        cache_config: Optional[ResponseCacheConfig] = None,
+        routing_config: Optional[RoutingConfig] = None,
+        coalescing_config: Optional[CoalescingConfig] = None
+    ) -> ProviderManager:
         """
         Create a new provider manager.
         
+        Args:
+            cache_config: Response cache configuration (caching is disabled if None)
+            routing_config: Routing, hedging and circuit breaker configuration
+            coalescing_config: Single-flight and micro-batching configuration
+        
         Returns:
             Provider manager instance
         """
-        return ProviderManager()
+        response_cache = ResponseCache(cache_config) if cache_config is not None else None
+        return ProviderManager(
+            response_cache=response_cache,
+            routing_config=routing_config,
+            coalescing_config=coalescing_config
+        )
     
     @staticmethod
     def create_aws_bedrock_provider(
@@ -199,6 +216,9 @@ class LLMProviders:
             except Exception as e:
                 logger.error(f"Failed to register Azure OpenAI provider: {str(e)}")
         
+        # Keep health checks off the request path
+        manager.start_health_monitor()
+        
         return manager
 
 
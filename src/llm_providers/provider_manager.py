@@ -5,8 +5,9 @@ This module implements the provider manager that handles provider selection,
 routing, and fallback mechanisms for the LLM Providers integration system.
 """
 
+import functools
 import logging
-import random
+import threading
 import time
 from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
 
@@ -33,6 +34,9 @@ from .core.provider_interface import (
     ChatGenerationChunk,
     LLMError
 )
+from .coalescing import CoalescingConfig, RequestCoalescer
+from .response_cache import DEFAULT_TENANT, ResponseCache
+from .routing import ProviderRouter, RoutingConfig
 
 logger = logging.getLogger(__name__)
 
@@ -42,15 +46,265 @@ class ProviderManager:
     Manager for LLM providers.
     
     This class handles provider registration, selection, routing, and fallback
-    mechanisms for the LLM Providers integration system.
+    mechanisms for the LLM Providers integration system. Text, chat and
+    embedding responses are served from a response cache when one is
+    configured.
+    
+    Requests are routed by live latency statistics, hedged to a second
+    provider when slow, and failed over on retryable errors (see
+    ProviderRouter). Health checks run in a background thread started with
+    start_health_monitor, never on the request path.
+    
+    Concurrent identical requests share one upstream call, and small
+    embedding requests are merged into provider batch calls where the
+    provider supports them (see RequestCoalescer).
     """
     
-    def __init__(self):
-        """Initialize the provider manager."""
+    def __init__(
+        self,
+        response_cache: Optional[ResponseCache] = None,
+        routing_config: Optional[RoutingConfig] = None,
+        coalescing_config: Optional[CoalescingConfig] = None
+    ):
+        """
+        Initialize the provider manager.
+        
+        Args:
+            response_cache: Optional cache for provider responses
+            routing_config: Routing, hedging and circuit breaker configuration
+            coalescing_config: Single-flight and micro-batching configuration
+        """
         self.providers: Dict[str, LLMProvider] = {}
         self.provider_health_cache: Dict[str, Tuple[HealthStatus, float]] = {}
         self.provider_health_ttl = 60  # 1 minute
         self.model_provider_mapping: Dict[str, Set[str]] = {}
+        self.response_cache = response_cache
+        self.router = ProviderRouter(routing_config)
+        self.coalescer = RequestCoalescer(coalescing_config)
+        
+        # Background health monitor
+        self._health_monitor_thread: Optional[threading.Thread] = None
+        self._health_monitor_stop = threading.Event()
+    
+    def start_health_monitor(self, interval: Optional[float] = None) -> None:
+        """
+        Start refreshing provider health in a background thread.
+        
+        Args:
+            interval: Refresh interval in seconds (defaults to the routing configuration)
+        """
+        if self._health_monitor_thread is not None and self._health_monitor_thread.is_alive():
+            return
+        
+        interval = interval or self.router.config.health_check_interval
+        self._health_monitor_stop.clear()
+        
+        def monitor():
+            while True:
+                self.refresh_provider_health()
+                if self._health_monitor_stop.wait(interval):
+                    return
+        
+        self._health_monitor_thread = threading.Thread(
+            target=monitor, name="llm-health-monitor", daemon=True
+        )
+        self._health_monitor_thread.start()
+    
+    def stop_health_monitor(self) -> None:
+        """Stop the background health monitor."""
+        self._health_monitor_stop.set()
+        if self._health_monitor_thread is not None:
+            self._health_monitor_thread.join()
+            self._health_monitor_thread = None
+    
+    def shutdown(self) -> None:
+        """Stop background work started by the manager."""
+        self.stop_health_monitor()
+        self.router.shutdown()
+    
+    def refresh_provider_health(self) -> None:
+        """Check the health of every provider and update the health cache."""
+        for provider_id, provider in list(self.providers.items()):
+            try:
+                health = provider.get_health()
+            except Exception as e:
+                logger.error(f"Failed to get health for provider {provider_id}: {str(e)}")
+                health = HealthStatus(
+                    available=False,
+                    latency=0.0,
+                    error_rate=1.0,
+                    message=f"Error getting health: {str(e)}"
+                )
+            self.provider_health_cache[provider_id] = (health, time.time())
+    
+    def _get_cached_health(self, provider_id: str) -> Optional[HealthStatus]:
+        """Get the last known health of a provider without checking it."""
+        entry = self.provider_health_cache.get(provider_id)
+        if entry is None:
+            return None
+        health, timestamp = entry
+        # Ignore results too old to trust when the monitor is not running
+        if time.time() - timestamp > max(self.provider_health_ttl, 2 * self.router.config.health_check_interval):
+            return None
+        return health
+    
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """
+        Get routing statistics.
+        
+        Returns:
+            Hedge and failover counters, circuit states, and latency statistics per provider and model
+        """
+        return self.router.get_routing_stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get response cache statistics.
+        
+        Returns:
+            Cache counters, or an empty dictionary if caching is disabled
+        """
+        if self.response_cache is None:
+            return {}
+        return self.response_cache.get_stats()
+    
+    def _cached_call(
+        self,
+        kind: str,
+        options: Any,
+        call: Any,
+        tenant_id: Optional[str],
+        use_cache: bool,
+        messages: Optional[List[ChatMessage]] = None,
+        text: Optional[str] = None,
+        semantic: bool = True,
+        batch_call: Any = None
+    ) -> Any:
+        """
+        Serve a request from the response cache, or send it through the
+        coalescer and cache the result.
+        
+        Args:
+            kind: Request kind (text, chat or embedding)
+            options: Request options
+            call: Function that performs the provider request
+            tenant_id: Tenant making the request
+            use_cache: Whether the request may use the cache and share an in-flight call
+                (only deterministic requests share calls, see _is_shareable)
+            messages: Chat messages of the request
+            text: Prompt or input text of the request
+            semantic: Whether near-duplicate requests may be served
+            batch_call: Function that performs several requests of this kind in one provider call
+            
+        Returns:
+            Provider result
+        """
+        keys = ResponseCache.build_key(kind, options, messages=messages, text=text) if use_cache else None
+        cacheable = keys is not None and self.response_cache is not None and self.response_cache.is_cacheable(options, tenant_id)
+        if cacheable:
+            result = self._cache_lookup(keys, tenant_id, semantic)
+            if result is not None:
+                return result
+        
+        start_time = time.time()
+        flight_key = self._flight_key(keys, tenant_id) if self._is_shareable(options, cacheable) else None
+        result = self.coalescer.execute(
+            flight_key, call,
+            self._batch_key(kind, options, batch_call), text, batch_call
+        )
+        if cacheable:
+            self._cache_store(keys, tenant_id, result, time.time() - start_time, semantic)
+        return result
+    
+    async def _cached_call_async(
+        self,
+        kind: str,
+        options: Any,
+        call: Any,
+        tenant_id: Optional[str],
+        use_cache: bool,
+        messages: Optional[List[ChatMessage]] = None,
+        text: Optional[str] = None,
+        semantic: bool = True,
+        batch_call: Any = None
+    ) -> Any:
+        """
+        Async version of _cached_call; call and batch_call are coroutine functions.
+        """
+        keys = ResponseCache.build_key(kind, options, messages=messages, text=text) if use_cache else None
+        cacheable = keys is not None and self.response_cache is not None and self.response_cache.is_cacheable(options, tenant_id)
+        if cacheable:
+            result = self._cache_lookup(keys, tenant_id, semantic)
+            if result is not None:
+                return result
+        
+        start_time = time.time()
+        flight_key = self._flight_key(keys, tenant_id) if self._is_shareable(options, cacheable) else None
+        result = await self.coalescer.execute_async(
+            flight_key, call,
+            self._batch_key(kind, options, batch_call), text, batch_call
+        )
+        if cacheable:
+            self._cache_store(keys, tenant_id, result, time.time() - start_time, semantic)
+        return result
+    
+    def _is_shareable(self, options: Any, cacheable: bool) -> bool:
+        """
+        Check if a request may share an in-flight upstream call.
+        
+        Sharing hands every caller the same sample, so it is limited to requests
+        whose result could be served from the cache: with a cache configured, the
+        requests it accepts; without one, requests with deterministic sampling
+        (temperature 0, or no sampling at all as with embeddings).
+        """
+        if self.response_cache is not None:
+            return cacheable
+        return getattr(options, "temperature", 0) == 0
+    
+    @staticmethod
+    def _flight_key(keys: Optional[Tuple[str, str, str]], tenant_id: Optional[str]) -> Optional[str]:
+        """Get the single-flight key of a request; tenants never share calls, as with the cache."""
+        if keys is None:
+            return None
+        return f"{tenant_id or DEFAULT_TENANT}:{keys[0]}"
+    
+    @staticmethod
+    def _batch_key(kind: str, options: Any, batch_call: Any) -> Optional[str]:
+        """Get the key of the requests a request may be batched with."""
+        if batch_call is None:
+            return None
+        # Without a conversation, the partition covers exactly the request parameters
+        return ResponseCache.build_key(kind, options)[1]
+    
+    def _cache_lookup(self, keys: Tuple[str, str, str], tenant_id: Optional[str], semantic: bool) -> Any:
+        """Look up a request in the response cache."""
+        key, partition, semantic_text = keys
+        return self.response_cache.get(tenant_id, key, partition, semantic_text if semantic else None)
+    
+    def _cache_store(
+        self,
+        keys: Tuple[str, str, str],
+        tenant_id: Optional[str],
+        result: Any,
+        latency: float,
+        semantic: bool
+    ) -> None:
+        """Cache a provider result."""
+        # Do not cache failed generations
+        if getattr(result, "finish_reason", None) != FinishReason.ERROR:
+            key, partition, semantic_text = keys
+            self.response_cache.put(
+                tenant_id, key, partition, result, latency, semantic_text if semantic else None
+            )
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """
+        Get request coalescing statistics.
+        
+        Returns:
+            Request and upstream call counters and the upstream call reduction ratio
+        """
+        return self.coalescer.get_stats()
     
     def register_provider(self, provider_id: str, provider: LLMProvider) -> None:
         """
@@ -195,32 +449,27 @@ class ProviderManager:
                 logger.error(f"Failed to get models from provider {provider_id}: {str(e)}")
         return all_models
     
-    def select_provider_for_model(
+    def rank_providers_for_model(
         self, model_id: str, preferred_provider: Optional[str] = None
-    ) -> str:
+    ) -> List[str]:
         """
-        Select the best provider for a specific model.
+        Rank the providers that can serve a model, best first.
+        
+        Uses live latency statistics and the last background health check;
+        no provider is contacted.
         
         Args:
             model_id: Model identifier
             preferred_provider: Optional preferred provider ID
             
         Returns:
-            Selected provider ID
+            Provider IDs, best first
             
         Raises:
             LLMError: If no suitable provider is found
         """
-        # Check if preferred provider supports the model
-        if preferred_provider and preferred_provider in self.providers:
-            if model_id in self.model_provider_mapping and preferred_provider in self.model_provider_mapping[model_id]:
-                # Check if the preferred provider is healthy
-                health = self.get_provider_health(preferred_provider)
-                if health.available:
-                    return preferred_provider
-        
         # Get all providers that support the model
-        providers = self.get_providers_for_model(model_id)
+        providers = [p for p in self.get_providers_for_model(model_id) if p in self.providers]
         if not providers:
             raise LLMError(
                 f"No provider found for model: {model_id}",
@@ -229,44 +478,46 @@ class ProviderManager:
                 retryable=False
             )
         
-        # Filter to available providers
+        # Filter out providers the last health check found unavailable
+        prior_latencies = {}
         available_providers = []
         for provider_id in providers:
-            try:
-                health = self.get_provider_health(provider_id)
-                if health.available:
-                    available_providers.append((provider_id, health))
-            except Exception as e:
-                logger.warning(f"Failed to get health for provider {provider_id}: {str(e)}")
+            health = self._get_cached_health(provider_id)
+            if health is None or health.available:
+                available_providers.append(provider_id)
+                if health is not None:
+                    prior_latencies[provider_id] = health.latency / 1000.0
         
-        if not available_providers:
+        ranked = self.router.rank(model_id, available_providers, preferred_provider, prior_latencies)
+        if not ranked:
             raise LLMError(
                 f"No available provider found for model: {model_id}",
                 LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
                 "provider_manager",
                 retryable=True
             )
-        
-        # Sort by latency (lower is better)
-        available_providers.sort(key=lambda x: x[1].latency)
-        
-        # Return the provider with the lowest latency
-        return available_providers[0][0]
+        return ranked
     
-    def generate_text(
-        self, prompt: str, options: TextGenerationOptions
-    ) -> TextGenerationResult:
+    def select_provider_for_model(
+        self, model_id: str, preferred_provider: Optional[str] = None
+    ) -> str:
         """
-        Generate text from a prompt using the best available provider.
+        Select the best provider for a specific model.
         
         Args:
-            prompt: The text prompt
-            options: Text generation options
+            model_id: Model identifier
+            preferred_provider: Optional preferred provider ID
             
         Returns:
-            Generated text result
+            Selected provider ID
+            
+        Raises:
+            LLMError: If no suitable provider is found
         """
-        provider_id = self.select_provider_for_model(options.model, options.provider)
+        return self.rank_providers_for_model(model_id, preferred_provider)[0]
+    
+    def _require_provider(self, provider_id: str) -> LLMProvider:
+        """Get a provider by ID or raise an LLMError."""
         provider = self.get_provider(provider_id)
         if not provider:
             raise LLMError(
@@ -275,11 +526,71 @@ class ProviderManager:
                 "provider_manager",
                 retryable=False
             )
+        return provider
+    
+    def generate_text(
+        self, prompt: str, options: TextGenerationOptions,
+        tenant_id: Optional[str] = None, use_cache: bool = True
+    ) -> TextGenerationResult:
+        """
+        Generate text from a prompt using the best available provider.
+        
+        Args:
+            prompt: The text prompt
+            options: Text generation options
+            tenant_id: Tenant making the request; cached responses are only shared within a tenant,
+                and requests without one are not cached
+            use_cache: Whether the response cache may be used
+            
+        Returns:
+            Generated text result
+        """
+        return self._cached_call(
+            "text", options, lambda: self._generate_text(prompt, options),
+            tenant_id, use_cache, text=prompt
+        )
+    
+    def _generate_text(
+        self, prompt: str, options: TextGenerationOptions
+    ) -> TextGenerationResult:
+        """Generate text with hedging and failover, bypassing the cache."""
+        ranked = self.rank_providers_for_model(options.model, options.provider)
+        return self.router.execute(
+            options.model, ranked,
+            lambda provider_id: self._require_provider(provider_id).generate_text(prompt, options)
+        )
+    
+    async def generate_text_async(
+        self, prompt: str, options: TextGenerationOptions,
+        tenant_id: Optional[str] = None, use_cache: bool = True
+    ) -> TextGenerationResult:
+        """
+        Generate text asynchronously using the best available provider.
+        
+        A hedged request that loses the race is cancelled.
+        
+        Args:
+            prompt: The text prompt
+            options: Text generation options
+            tenant_id: Tenant making the request; cached responses are only shared within a tenant,
+                and requests without one are not cached
+            use_cache: Whether the response cache may be used
+            
+        Returns:
+            Generated text result
+        """
+        async def call():
+            ranked = self.rank_providers_for_model(options.model, options.provider)
+            return await self.router.execute_async(
+                options.model, ranked,
+                lambda provider_id: self._require_provider(provider_id).generate_text_async(prompt, options)
+            )
         
-        return provider.generate_text(prompt, options)
+        return await self._cached_call_async("text", options, call, tenant_id, use_cache, text=prompt)
     
     def generate_chat(
-        self, messages: List[ChatMessage], options: ChatGenerationOptions
+        self, messages: List[ChatMessage], options: ChatGenerationOptions,
+        tenant_id: Optional[str] = None, use_cache: bool = True
     ) -> ChatGenerationResult:
         """
         Generate a chat response using the best available provider.
@@ -287,46 +598,154 @@ class ProviderManager:
         Args:
             messages: List of chat messages
             options: Chat generation options
+            tenant_id: Tenant making the request; cached responses are only shared within a tenant,
+                and requests without one are not cached
+            use_cache: Whether the response cache may be used
             
         Returns:
             Generated chat result
         """
-        provider_id = self.select_provider_for_model(options.model, options.provider)
-        provider = self.get_provider(provider_id)
-        if not provider:
-            raise LLMError(
-                f"Provider not found: {provider_id}",
-                LLMErrorType.INVALID_REQUEST_ERROR,
-                "provider_manager",
-                retryable=False
+        return self._cached_call(
+            "chat", options, lambda: self._generate_chat(messages, options),
+            tenant_id, use_cache, messages=messages
+        )
+    
+    def _generate_chat(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions
+    ) -> ChatGenerationResult:
+        """Generate a chat response with hedging and failover, bypassing the cache."""
+        ranked = self.rank_providers_for_model(options.model, options.provider)
+        return self.router.execute(
+            options.model, ranked,
+            lambda provider_id: self._require_provider(provider_id).generate_chat(messages, options)
+        )
+    
+    async def generate_chat_async(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions,
+        tenant_id: Optional[str] = None, use_cache: bool = True
+    ) -> ChatGenerationResult:
+        """
+        Generate a chat response asynchronously using the best available provider.
+        
+        A hedged request that loses the race is cancelled.
+        
+        Args:
+            messages: List of chat messages
+            options: Chat generation options
+            tenant_id: Tenant making the request; cached responses are only shared within a tenant,
+                and requests without one are not cached
+            use_cache: Whether the response cache may be used
+            
+        Returns:
+            Generated chat result
+        """
+        async def call():
+            ranked = self.rank_providers_for_model(options.model, options.provider)
+            return await self.router.execute_async(
+                options.model, ranked,
+                lambda provider_id: self._require_provider(provider_id).generate_chat_async(messages, options)
             )
         
-        return provider.generate_chat(messages, options)
+        return await self._cached_call_async("chat", options, call, tenant_id, use_cache, messages=messages)
     
     def generate_embedding(
-        self, text: str, options: EmbeddingOptions
+        self, text: str, options: EmbeddingOptions,
+        tenant_id: Optional[str] = None, use_cache: bool = True
     ) -> EmbeddingResult:
         """
         Generate embeddings for text using the best available provider.
         
+        Embeddings are only served for exactly matching input, since a
+        near-duplicate text has a different embedding. Concurrent small
+        requests for the same model are batched into one provider call.
+        
         Args:
             text: The text to generate embeddings for
             options: Embedding options
+            tenant_id: Tenant making the request; cached responses are only shared within a tenant,
+                and requests without one are not cached
+            use_cache: Whether the response cache may be used
             
         Returns:
             Generated embedding result
         """
-        provider_id = self.select_provider_for_model(options.model, options.provider)
-        provider = self.get_provider(provider_id)
-        if not provider:
-            raise LLMError(
-                f"Provider not found: {provider_id}",
-                LLMErrorType.INVALID_REQUEST_ERROR,
-                "provider_manager",
-                retryable=False
+        batch_call = None
+        if self._supports_embedding_batches(options.model):
+            batch_call = functools.partial(self._generate_embedding_batch, options=options)
+        
+        return self._cached_call(
+            "embedding", options, lambda: self._generate_embedding(text, options),
+            tenant_id, use_cache, text=text, semantic=False, batch_call=batch_call
+        )
+    
+    def _generate_embedding(
+        self, text: str, options: EmbeddingOptions
+    ) -> EmbeddingResult:
+        """Generate embeddings with hedging and failover, bypassing the cache."""
+        ranked = self.rank_providers_for_model(options.model, options.provider)
+        return self.router.execute(
+            options.model, ranked,
+            lambda provider_id: self._require_provider(provider_id).generate_embedding(text, options)
+        )
+    
+    def _generate_embedding_batch(
+        self, texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """Generate embeddings for several texts in one provider call."""
+        ranked = self.rank_providers_for_model(options.model, options.provider)
+        return self.router.execute(
+            options.model, ranked,
+            lambda provider_id: self._require_provider(provider_id).generate_embeddings(texts, options)
+        )
+    
+    async def _generate_embedding_batch_async(
+        self, texts: List[str], options: EmbeddingOptions
+    ) -> List[EmbeddingResult]:
+        """Generate embeddings for several texts in one provider call asynchronously."""
+        ranked = self.rank_providers_for_model(options.model, options.provider)
+        return await self.router.execute_async(
+            options.model, ranked,
+            lambda provider_id: self._require_provider(provider_id).generate_embeddings_async(texts, options)
+        )
+    
+    def _supports_embedding_batches(self, model_id: str) -> bool:
+        """Check whether every provider of a model can embed several texts in one call."""
+        providers = [self.providers[p] for p in self.get_providers_for_model(model_id) if p in self.providers]
+        return bool(providers) and all(
+            provider.get_capabilities().supports_batch_embeddings is True for provider in providers
+        )
+    
+    async def generate_embedding_async(
+        self, text: str, options: EmbeddingOptions,
+        tenant_id: Optional[str] = None, use_cache: bool = True
+    ) -> EmbeddingResult:
+        """
+        Generate embeddings asynchronously using the best available provider.
+        
+        Args:
+            text: The text to generate embeddings for
+            options: Embedding options
+            tenant_id: Tenant making the request; cached responses are only shared within a tenant,
+                and requests without one are not cached
+            use_cache: Whether the response cache may be used
+            
+        Returns:
+            Generated embedding result
+        """
+        async def call():
+            ranked = self.rank_providers_for_model(options.model, options.provider)
+            return await self.router.execute_async(
+                options.model, ranked,
+                lambda provider_id: self._require_provider(provider_id).generate_embedding_async(text, options)
             )
         
-        return provider.generate_embedding(text, options)
+        batch_call = None
+        if self._supports_embedding_batches(options.model):
+            batch_call = functools.partial(self._generate_embedding_batch_async, options=options)
+        
+        return await self._cached_call_async(
+            "embedding", options, call, tenant_id, use_cache, text=text, semantic=False, batch_call=batch_call
+        )
     
     def generate_image(
         self, prompt: str, options: ImageGenerationOptions
@@ -344,15 +763,7 @@ class ProviderManager:
         # If no model specified, use a default one
         model_id = options.model or "stable-diffusion-xl"
         
-        provider_id = self.select_provider_for_model(model_id, options.provider)
-        provider = self.get_provider(provider_id)
-        if not provider:
-            raise LLMError(
-                f"Provider not found: {provider_id}",
-                LLMErrorType.INVALID_REQUEST_ERROR,
-                "provider_manager",
-                retryable=False
-            )
+        ranked = self.rank_providers_for_model(model_id, options.provider)
         
         # Update options with the model ID if it wasn't provided
         if not options.model:
@@ -364,4 +775,9 @@ class ProviderManager:
                 provider=options.provider
             )
         
-        return provider.generate_image(prompt, options)
+        # Image generation is expensive, so fail over but never hedge
+        return self.router.execute(
+            model_id, ranked,
+            lambda provider_id: self._require_provider(provider_id).generate_image(prompt, options),
+            hedge=False
+        )
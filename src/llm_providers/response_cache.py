@@ -0,0 +1,451 @@
+"""
+Response cache for the LLM Providers integration.
+
+This module implements the response cache used by the provider manager. Exact
+hits are keyed on a normalized hash of the request (model, messages, sampling
+parameters and functions); an optional semantic tier serves near-duplicate
+prompts whose local embedding is similar enough to a cached one. Entries are
+bounded by TTL and by total and per-tenant byte size, and tenants never see
+each other's entries. Requests that do not name a tenant bypass the cache.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .core.provider_interface import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+# Tenant used for single-flight keys of requests that do not specify one;
+# such requests are never cached
+DEFAULT_TENANT = "default"
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class ResponseCacheConfig:
+    """Configuration for the response cache."""
+    ttl: float = 300.0  # in seconds
+    max_bytes: int = 64 * 1024 * 1024  # total size of cached responses
+    max_bytes_per_tenant: Optional[int] = None  # size limit for any single tenant
+    max_entry_bytes: int = 1024 * 1024  # larger responses are not cached
+    max_temperature: Optional[float] = None  # requests sampled above this temperature are not cached
+    semantic_enabled: bool = False
+    similarity_threshold: float = 0.95  # minimum cosine similarity for a semantic hit
+    embedding_dimensions: int = 4096  # feature space of the default local embedding
+
+
+class HashingEmbedder:
+    """
+    Local text embedding based on feature hashing.
+
+    Words and word bigrams are hashed into a fixed number of dimensions and
+    weighted by term frequency, giving a sparse unit vector. It needs no
+    model or network call, so it costs far less than the request it may save,
+    and prompts that differ only in a few words stay highly similar.
+    """
+
+    def __init__(self, dimensions: int = 4096):
+        """
+        Initialize the embedder.
+
+        Args:
+            dimensions: Number of hashed feature dimensions
+        """
+        self.dimensions = dimensions
+
+    def _feature(self, token: str) -> int:
+        """Hash a token to a feature index."""
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % self.dimensions
+
+    def embed(self, text: str) -> Dict[int, float]:
+        """
+        Embed text as a sparse unit vector.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Mapping of feature index to weight
+        """
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        vector: Dict[int, float] = {}
+        for feature in features:
+            index = self._feature(feature)
+            vector[index] = vector.get(index, 0.0) + 1.0
+
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if norm:
+            for index in vector:
+                vector[index] /= norm
+        return vector
+
+
+def cosine_similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """
+    Compute the cosine similarity of two sparse unit vectors.
+
+    Args:
+        a: First vector
+        b: Second vector
+
+    Returns:
+        Similarity between -1 and 1
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+
+@dataclass
+class CacheEntry:
+    """A cached response."""
+    tenant: str
+    key: str
+    partition: str  # requests that may share semantic hits
+    payload: bytes  # pickled result
+    created_at: float
+    expires_at: float
+    latency: float  # provider latency of the original request, in seconds
+    tokens: int  # tokens used by the original request
+    vector: Optional[Dict[int, float]] = None
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint of the entry in bytes."""
+        return len(self.payload) + (len(self.vector) * 16 if self.vector else 0) + 256
+
+
+class ResponseCache:
+    """
+    Two-tier cache for provider responses.
+
+    Every lookup first tries the exact tier. If that misses and the
+    semantic tier is enabled, it compares the prompt embedding against
+    cached entries from the same tenant whose other parameters match, and
+    serves the most similar one above the threshold. Responses are stored
+    pickled, so callers never share mutable result objects.
+    """
+
+    def __init__(
+        self,
+        config: Optional[ResponseCacheConfig] = None,
+        embedder: Optional[Callable[[str], Dict[int, float]]] = None
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            config: Cache configuration
+            embedder: Function mapping text to a sparse unit vector (defaults to HashingEmbedder)
+        """
+        self.config = config or ResponseCacheConfig()
+        self._embed = embedder or HashingEmbedder(self.config.embedding_dimensions).embed
+        self._lock = threading.Lock()
+
+        self._entries: "OrderedDict[Tuple[str, str], CacheEntry]" = OrderedDict()  # in LRU order
+        self._partitions: Dict[Tuple[str, str], Dict[str, CacheEntry]] = {}  # semantic candidates
+        self._tenant_bytes: Dict[str, int] = {}
+        self._bytes = 0
+
+        self._stats = {
+            "hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "skipped": 0,
+            "latency_saved": 0.0,
+            "tokens_saved": 0
+        }
+
+    @staticmethod
+    def _normalize(value: Any) -> Any:
+        """Convert request values to a canonical JSON-compatible form."""
+        if is_dataclass(value):
+            value = asdict(value)
+        if isinstance(value, dict):
+            return {str(k): ResponseCache._normalize(v) for k, v in value.items() if v is not None}
+        if isinstance(value, (list, tuple)):
+            return [ResponseCache._normalize(v) for v in value]
+        if isinstance(value, str):
+            # Surrounding whitespace and line endings do not change the request
+            return value.strip().replace("\r\n", "\n")
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    @staticmethod
+    def _hash(data: Any) -> str:
+        """Hash normalized request data."""
+        encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def build_key(
+        kind: str,
+        options: Any,
+        messages: Optional[List[ChatMessage]] = None,
+        text: Optional[str] = None
+    ) -> Tuple[str, str, str]:
+        """
+        Build the cache key for a request.
+
+        Args:
+            kind: Request kind (text, chat or embedding)
+            options: Request options
+            messages: Chat messages
+            text: Prompt or input text
+
+        Returns:
+            Tuple of exact key, semantic partition, and the text to embed
+        """
+        parameters = ResponseCache._normalize(options)
+        # Routing and transport settings do not change the response
+        for name in ("provider", "timeout", "retry_count"):
+            parameters.pop(name, None)
+
+        if messages is not None:
+            normalized_messages = ResponseCache._normalize(messages)
+            # Only the final message is compared semantically; the conversation
+            # before it must match exactly, so a long shared system prompt
+            # cannot make different questions look alike
+            context = normalized_messages[:-1]
+            semantic_text = messages[-1].content if messages else ""
+        else:
+            normalized_messages = ResponseCache._normalize(text or "")
+            context = None
+            semantic_text = text or ""
+
+        key = ResponseCache._hash({"kind": kind, "parameters": parameters, "input": normalized_messages})
+        partition = ResponseCache._hash({"kind": kind, "parameters": parameters, "context": context})
+        return key, partition, semantic_text
+
+    def is_cacheable(self, options: Any, tenant: Optional[str]) -> bool:
+        """
+        Check if a request may be served from or stored in the cache.
+
+        Args:
+            options: Request options
+            tenant: Tenant making the request; requests without one are not cacheable
+
+        Returns:
+            Whether the request is cacheable
+        """
+        if tenant is None:
+            return False
+        temperature = getattr(options, "temperature", None)
+        if self.config.max_temperature is not None and temperature is not None:
+            return temperature <= self.config.max_temperature
+        return True
+
+    def _remove(self, entry: CacheEntry) -> None:
+        """Remove an entry. Must be called with the lock held."""
+        self._entries.pop((entry.tenant, entry.key), None)
+        partition = self._partitions.get((entry.tenant, entry.partition))
+        if partition is not None:
+            partition.pop(entry.key, None)
+            if not partition:
+                del self._partitions[(entry.tenant, entry.partition)]
+        self._bytes -= entry.size
+        self._tenant_bytes[entry.tenant] -= entry.size
+        if not self._tenant_bytes[entry.tenant]:
+            del self._tenant_bytes[entry.tenant]
+
+    def _hit(self, entry: CacheEntry, semantic: bool) -> Any:
+        """Record a hit and return a copy of the cached result. Must be called with the lock held."""
+        self._entries.move_to_end((entry.tenant, entry.key))
+        self._stats["hits"] += 1
+        if semantic:
+            self._stats["semantic_hits"] += 1
+        self._stats["latency_saved"] += entry.latency
+        self._stats["tokens_saved"] += entry.tokens
+        return pickle.loads(entry.payload)
+
+    def get(
+        self,
+        tenant: Optional[str],
+        key: str,
+        partition: str,
+        semantic_text: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            tenant: Tenant making the request; without one the cache is bypassed
+            key: Exact cache key
+            partition: Semantic partition of the request
+            semantic_text: Text to compare for semantic hits
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        if tenant is None:
+            # A shared partition would serve one caller's response to another
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get((tenant, key))
+            if entry is not None:
+                if entry.expires_at > now:
+                    return self._hit(entry, semantic=False)
+                self._remove(entry)
+                self._stats["expirations"] += 1
+
+            candidates = self._partitions.get((tenant, partition))
+            if not (self.config.semantic_enabled and semantic_text and candidates):
+                self._stats["misses"] += 1
+                return None
+            candidates = list(candidates.values())
+
+        # Compare embeddings outside the lock
+        vector = self._embed(semantic_text)
+        best, best_score = None, self.config.similarity_threshold
+        for candidate in candidates:
+            if candidate.vector is None or candidate.expires_at <= now:
+                continue
+            score = cosine_similarity(vector, candidate.vector)
+            if score >= best_score:
+                best, best_score = candidate, score
+
+        with self._lock:
+            if best is not None and (tenant, best.key) in self._entries:
+                logger.debug(f"Semantic cache hit for tenant {tenant} (similarity {best_score:.3f})")
+                return self._hit(best, semantic=True)
+            self._stats["misses"] += 1
+            return None
+
+    def put(
+        self,
+        tenant: Optional[str],
+        key: str,
+        partition: str,
+        result: Any,
+        latency: float,
+        semantic_text: Optional[str] = None
+    ) -> bool:
+        """
+        Store a response.
+
+        Args:
+            tenant: Tenant that made the request; without one nothing is stored
+            key: Exact cache key
+            partition: Semantic partition of the request
+            result: Provider result to cache
+            latency: Provider latency of the request in seconds
+            semantic_text: Text to embed for semantic lookups
+
+        Returns:
+            Whether the response was stored
+        """
+        if tenant is None:
+            return False
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Response is not cacheable: {str(e)}")
+            with self._lock:
+                self._stats["skipped"] += 1
+            return False
+
+        vector = None
+        if self.config.semantic_enabled and semantic_text:
+            vector = self._embed(semantic_text)
+
+        usage = getattr(result, "usage", None)
+        now = time.time()
+        entry = CacheEntry(
+            tenant=tenant,
+            key=key,
+            partition=partition,
+            payload=payload,
+            created_at=now,
+            expires_at=now + self.config.ttl,
+            latency=latency,
+            tokens=(getattr(usage, "total_tokens", None) or 0) if usage else 0,
+            vector=vector
+        )
+
+        tenant_limit = self.config.max_bytes_per_tenant or self.config.max_bytes
+        if entry.size > min(self.config.max_entry_bytes, tenant_limit):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return False
+
+        with self._lock:
+            existing = self._entries.get((tenant, key))
+            if existing is not None:
+                self._remove(existing)
+
+            # Evict this tenant's least recently used entries first if it is over its share
+            if self.config.max_bytes_per_tenant is not None:
+                for old in list(self._entries.values()):
+                    if self._tenant_bytes.get(tenant, 0) + entry.size <= tenant_limit:
+                        break
+                    if old.tenant == tenant:
+                        self._remove(old)
+                        self._stats["evictions"] += 1
+
+            while self._entries and self._bytes + entry.size > self.config.max_bytes:
+                old = next(iter(self._entries.values()))
+                self._remove(old)
+                self._stats["evictions"] += 1
+
+            self._entries[(tenant, key)] = entry
+            if vector is not None:
+                self._partitions.setdefault((tenant, partition), {})[key] = entry
+            self._bytes += entry.size
+            self._tenant_bytes[tenant] = self._tenant_bytes.get(tenant, 0) + entry.size
+            self._stats["stores"] += 1
+
+        return True
+
+    def invalidate(self, tenant: Optional[str] = None) -> int:
+        """
+        Remove cached responses.
+
+        Args:
+            tenant: Tenant whose entries to remove (all tenants if None)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            entries = [e for e in self._entries.values() if tenant is None or e.tenant == tenant]
+            for entry in entries:
+                self._remove(entry)
+            return len(entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Hit, miss and eviction counters, latency and tokens saved, and current size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["tenant_bytes"] = dict(self._tenant_bytes)
+            return stats
@@ -0,0 +1,676 @@
+"""
+Latency-aware routing for the LLM Providers integration.
+
+This module implements the router used by the provider manager. It keeps live
+latency and error statistics per provider and model, ranks providers by them,
+takes failing providers out of rotation with a circuit breaker, fails over to
+the next provider on retryable errors, and hedges slow requests by sending a
+second request to the next-best provider once the first has taken longer
+than its recent p95 latency.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from .core.provider_interface import LLMError, LLMErrorType
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class RoutingConfig:
+    """Configuration for provider routing."""
+    ewma_alpha: float = 0.2  # weight of the newest latency sample
+    window_size: int = 200  # latency samples kept for percentiles
+    min_samples: int = 10  # samples needed before the p95 drives hedging
+    default_latency: float = 1.0  # assumed latency of providers without samples, in seconds
+    hedging_enabled: bool = True
+    hedge_quantile: float = 0.95  # hedge once a request is slower than this quantile
+    initial_hedge_delay: float = 2.0  # hedge delay before enough samples exist, in seconds
+    min_hedge_delay: float = 0.05  # in seconds
+    max_hedge_delay: float = 10.0  # in seconds
+    max_attempts: int = 3  # providers tried per request, including hedges and failovers
+    failure_threshold: int = 5  # consecutive failures that open a provider's circuit
+    recovery_timeout: float = 30.0  # time before an open circuit admits a trial request, in seconds
+    health_check_interval: float = 30.0  # background health refresh interval, in seconds
+    max_workers: int = 32  # threads for hedged synchronous requests
+
+
+class LatencyStats:
+    """
+    Live latency and error statistics for one provider and model.
+
+    Keeps an exponentially weighted moving average of latency and error
+    rate, and a sliding window of recent latencies for percentiles.
+    """
+
+    def __init__(self, alpha: float = 0.2, window_size: int = 200):
+        """
+        Initialize the statistics.
+
+        Args:
+            alpha: Weight of the newest sample in the moving averages
+            window_size: Number of recent latencies kept for percentiles
+        """
+        self.alpha = alpha
+        self.ewma_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples: Deque[float] = deque(maxlen=window_size)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request latency in seconds."""
+        with self._lock:
+            self.requests += 1
+            self.samples.append(latency)
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+            self.error_rate *= 1 - self.alpha
+
+    def record_latency(self, latency: float) -> None:
+        """Record a lower bound on latency for a request that was abandoned."""
+        with self._lock:
+            self.samples.append(latency)
+            # The true latency is at least this long, so it can only raise the average
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            elif latency > self.ewma_latency:
+                self.ewma_latency += self.alpha * (latency - self.ewma_latency)
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self.error_rate += self.alpha * (1.0 - self.error_rate)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Get a latency quantile over the sliding window.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        with self._lock:
+            if not self.samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert statistics to a dictionary."""
+        return {
+            "ewma_latency": self.ewma_latency,
+            "p50_latency": self.quantile(0.5),
+            "p95_latency": self.quantile(0.95),
+            "error_rate": self.error_rate,
+            "requests": self.requests,
+            "errors": self.errors
+        }
+
+
+class CircuitState(str, Enum):
+    """Enumeration of circuit breaker states."""
+    CLOSED = "closed"  # requests flow normally
+    OPEN = "open"  # provider is out of rotation
+    HALF_OPEN = "half_open"  # a single trial request decides whether to close
+
+
+class CircuitBreaker:
+    """Circuit breaker that takes a provider out of rotation after repeated failures."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Time before an open circuit admits a trial request, in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """Check whether the circuit would admit a request, without admitting one."""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN:
+                return time.monotonic() - self.opened_at >= self.recovery_timeout
+            return not self._trial_in_flight
+
+    def allow_request(self) -> bool:
+        """
+        Admit a request if the circuit allows it.
+
+        Returns:
+            Whether the request may be sent
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if self.state == CircuitState.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = CircuitState.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state != CircuitState.CLOSED:
+                logger.info("Circuit closed after successful trial request")
+            self.state = CircuitState.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request."""
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Release a trial request that finished without a verdict (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class ProviderRouter:
+    """
+    Routes requests across providers using live latency and error statistics.
+
+    Providers are ranked by their latency EWMA, inflated by their recent
+    error rate. A request goes to the best provider; if it has not
+    completed after the provider's recent p95 latency, a hedged request goes
+    to the next-best provider and whichever finishes first wins. Retryable
+    failures fail over to the next provider. Providers whose circuit is
+    open are skipped until their recovery timeout passes.
+    """
+
+    def __init__(self, config: Optional[RoutingConfig] = None):
+        """
+        Initialize the router.
+
+        Args:
+            config: Routing configuration
+        """
+        self.config = config or RoutingConfig()
+        self._stats: Dict[Tuple[str, str], LatencyStats] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Pool threads not running a request; requests are never queued on the pool
+        self._slots = threading.BoundedSemaphore(self.config.max_workers)
+        self._counters = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0}
+
+    def get_stats(self, provider_id: str, model: str) -> LatencyStats:
+        """
+        Get the statistics for a provider and model.
+
+        Args:
+            provider_id: Provider identifier
+            model: Model identifier
+
+        Returns:
+            Live statistics
+        """
+        with self._lock:
+            stats = self._stats.get((provider_id, model))
+            if stats is None:
+                stats = self._stats[(provider_id, model)] = LatencyStats(
+                    self.config.ewma_alpha, self.config.window_size
+                )
+            return stats
+
+    def get_breaker(self, provider_id: str) -> CircuitBreaker:
+        """
+        Get the circuit breaker for a provider.
+
+        Args:
+            provider_id: Provider identifier
+
+        Returns:
+            Circuit breaker
+        """
+        with self._lock:
+            breaker = self._breakers.get(provider_id)
+            if breaker is None:
+                breaker = self._breakers[provider_id] = CircuitBreaker(
+                    self.config.failure_threshold, self.config.recovery_timeout
+                )
+            return breaker
+
+    def _score(self, provider_id: str, model: str, prior_latency: Optional[float]) -> float:
+        """Get the expected cost of sending a request to a provider."""
+        stats = self.get_stats(provider_id, model)
+        latency = stats.ewma_latency
+        if latency is None:
+            latency = prior_latency if prior_latency is not None else self.config.default_latency
+        return latency / max(0.05, 1.0 - stats.error_rate)
+
+    def rank(
+        self,
+        model: str,
+        provider_ids: List[str],
+        preferred_provider: Optional[str] = None,
+        prior_latencies: Optional[Dict[str, float]] = None
+    ) -> List[str]:
+        """
+        Rank providers for a model, best first.
+
+        Args:
+            model: Model identifier
+            provider_ids: Candidate providers
+            preferred_provider: Provider to try first if its circuit allows
+            prior_latencies: Latencies in seconds for providers without samples, e.g. from health checks
+
+        Returns:
+            Providers whose circuit admits requests, best first
+        """
+        prior_latencies = prior_latencies or {}
+        available = [p for p in provider_ids if self.get_breaker(p).is_available()]
+        available.sort(key=lambda p: self._score(p, model, prior_latencies.get(p)))
+        if preferred_provider in available:
+            available.remove(preferred_provider)
+            available.insert(0, preferred_provider)
+        return available
+
+    def hedge_delay(self, provider_id: str, model: str) -> float:
+        """
+        Get how long to wait for a provider before hedging.
+
+        Args:
+            provider_id: Provider identifier
+            model: Model identifier
+
+        Returns:
+            Delay in seconds
+        """
+        stats = self.get_stats(provider_id, model)
+        if len(stats.samples) < self.config.min_samples:
+            delay = self.config.initial_hedge_delay
+        else:
+            delay = stats.quantile(self.config.hedge_quantile)
+        return min(self.config.max_hedge_delay, max(self.config.min_hedge_delay, delay))
+
+    def _record_success(self, provider_id: str, model: str, latency: float) -> None:
+        """Record a successful request."""
+        self.get_stats(provider_id, model).record_success(latency)
+        self.get_breaker(provider_id).record_success()
+
+    def _record_failure(self, provider_id: str, model: str, error: Exception) -> None:
+        """Record a failed request."""
+        logger.warning(f"Provider {provider_id} failed for model {model}: {str(error)}")
+        self.get_stats(provider_id, model).record_failure()
+        self.get_breaker(provider_id).record_failure()
+
+    def _record_abandoned(self, provider_id: str, model: str, elapsed: float) -> None:
+        """Record a request that lost a hedge race."""
+        self.get_stats(provider_id, model).record_latency(elapsed)
+        self.get_breaker(provider_id).release()
+
+    def _count(self, name: str) -> None:
+        """Increment a routing counter."""
+        with self._lock:
+            self._counters[name] += 1
+
+    @staticmethod
+    def _is_provider_failure(error: Exception) -> bool:
+        """Check whether an error should count against the provider and trigger failover."""
+        return not isinstance(error, LLMError) or error.retryable
+
+    def _no_provider_error(self, model: str, errors: List[Exception]) -> Exception:
+        """Get the error to raise when every attempt failed."""
+        if errors:
+            return errors[-1]
+        return LLMError(
+            f"No available provider found for model: {model}",
+            LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
+            "provider_manager",
+            retryable=True
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool for hedged synchronous requests."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    thread_name_prefix="llm-router"
+                )
+            return self._executor
+
+    def _submit(self, call: Callable[[str], T], provider_id: str) -> Optional[Tuple[Future, List[float]]]:
+        """
+        Start a request on the thread pool if a thread is free.
+
+        Requests never queue behind others: without a free thread this
+        returns None and the caller runs the request itself or skips the hedge.
+
+        Returns:
+            The request's future and a list that receives its start time, or None
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        started: List[float] = []
+
+        def run() -> T:
+            started.append(time.monotonic())
+            return call(provider_id)
+
+        try:
+            future = self._get_executor().submit(run)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future, started
+
+    def _execute_inline(
+        self,
+        model: str,
+        candidates: List[str],
+        call: Callable[[str], T],
+        attempts: int = 0,
+        errors: Optional[List[Exception]] = None
+    ) -> T:
+        """
+        Run a request on the caller's thread, failing over without hedging.
+
+        Args:
+            model: Model identifier
+            candidates: Providers left to try, best first
+            call: Function that sends the request to a provider ID
+            attempts: Attempts already made for the request
+            errors: Errors of the attempts already made
+
+        Returns:
+            The first successful result
+        """
+        errors = errors if errors is not None else []
+        for provider_id in candidates:
+            if attempts >= self.config.max_attempts:
+                break
+            if not self.get_breaker(provider_id).allow_request():
+                continue
+            if attempts:
+                self._count("failovers")
+            attempts += 1
+            started = time.monotonic()
+            try:
+                result = call(provider_id)
+            except Exception as e:
+                if not self._is_provider_failure(e):
+                    self.get_breaker(provider_id).release()
+                    raise
+                self._record_failure(provider_id, model, e)
+                errors.append(e)
+                continue
+            except BaseException:
+                self.get_breaker(provider_id).release()
+                raise
+            self._record_success(provider_id, model, time.monotonic() - started)
+            return result
+
+        raise self._no_provider_error(model, errors)
+
+    def execute(self, model: str, ranked: List[str], call: Callable[[str], T], hedge: bool = True) -> T:
+        """
+        Run a synchronous request with hedging and failover.
+
+        Requests that cannot be hedged run on the caller's thread. A request
+        that may be hedged runs on the router's thread pool, so the caller
+        can return as soon as a hedge wins; when no pool thread is free it
+        runs on the caller's thread without hedging instead of queueing.
+
+        Args:
+            model: Model identifier
+            ranked: Providers to use, best first (see rank)
+            call: Function that sends the request to a provider ID
+            hedge: Whether the request may be hedged, e.g. False for expensive or non-idempotent calls
+
+        Returns:
+            The first successful result
+
+        Raises:
+            LLMError: If a non-retryable error occurs or every attempt fails
+        """
+        self._count("requests")
+        candidates = list(ranked)
+        if not (hedge and self.config.hedging_enabled and len(candidates) > 1):
+            return self._execute_inline(model, candidates, call)
+
+        pending: Dict[Future, Tuple[str, List[float]]] = {}
+        errors: List[Exception] = []
+        attempts = 0
+        hedged = False
+        can_hedge = True
+
+        def launch() -> Optional[bool]:
+            """Start the next attempt: True if started, False if none is left, None if no thread is free."""
+            nonlocal attempts
+            while candidates and attempts < self.config.max_attempts:
+                provider_id = candidates[0]
+                if not self.get_breaker(provider_id).allow_request():
+                    candidates.pop(0)
+                    continue
+                submitted = self._submit(call, provider_id)
+                if submitted is None:
+                    self.get_breaker(provider_id).release()
+                    return None
+                candidates.pop(0)
+                attempts += 1
+                pending[submitted[0]] = (provider_id, submitted[1])
+                return True
+            return False
+
+        def elapsed_since_start(started: List[float], now: float) -> float:
+            return now - started[0] if started else 0.0
+
+        def abandon_pending() -> None:
+            now = time.monotonic()
+            for future, (provider_id, started) in pending.items():
+                future.cancel()
+                self._record_abandoned(provider_id, model, elapsed_since_start(started, now))
+
+        launched = launch()
+        if launched is None:
+            return self._execute_inline(model, candidates, call)
+        if not launched:
+            raise self._no_provider_error(model, errors)
+        first_provider = next(iter(pending.values()))[0]
+
+        while pending:
+            timeout = None
+            if can_hedge and candidates and attempts < self.config.max_attempts:
+                primary, started = list(pending.values())[-1]
+                # Wait from when the latest attempt actually started running
+                running_for = elapsed_since_start(started, time.monotonic())
+                timeout = max(0.0, self.hedge_delay(primary, model) - running_for)
+
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                launched = launch()
+                if launched:
+                    hedged = True
+                    self._count("hedges")
+                elif launched is None:
+                    # The pool is saturated; hedging now would only add load
+                    can_hedge = False
+                continue
+
+            for future in done:
+                provider_id, started = pending.pop(future)
+                elapsed = elapsed_since_start(started, time.monotonic())
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not self._is_provider_failure(e):
+                        self.get_breaker(provider_id).release()
+                        abandon_pending()
+                        raise
+                    self._record_failure(provider_id, model, e)
+                    errors.append(e)
+                    continue
+
+                self._record_success(provider_id, model, elapsed)
+                if hedged and provider_id != first_provider:
+                    self._count("hedge_wins")
+                abandon_pending()
+                return result
+
+            # Fail over when every in-flight request has failed
+            if not pending:
+                launched = launch()
+                if launched:
+                    self._count("failovers")
+                elif launched is None:
+                    return self._execute_inline(model, candidates, call, attempts, errors)
+
+        raise self._no_provider_error(model, errors)
+
+    async def execute_async(
+        self, model: str, ranked: List[str], call: Callable[[str], Awaitable[T]], hedge: bool = True
+    ) -> T:
+        """
+        Run an async request with hedging and failover.
+
+        The losing request of a hedge race is cancelled.
+
+        Args:
+            model: Model identifier
+            ranked: Providers to use, best first (see rank)
+            call: Coroutine function that sends the request to a provider ID
+            hedge: Whether the request may be hedged
+
+        Returns:
+            The first successful result
+
+        Raises:
+            LLMError: If a non-retryable error occurs or every attempt fails
+        """
+        self._count("requests")
+        candidates = list(ranked)
+        pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+        errors: List[Exception] = []
+        attempts = 0
+        hedged = False
+        last_launch = 0.0
+
+        def launch() -> bool:
+            nonlocal attempts, last_launch
+            while candidates and attempts < self.config.max_attempts:
+                provider_id = candidates.pop(0)
+                if not self.get_breaker(provider_id).allow_request():
+                    continue
+                attempts += 1
+                last_launch = time.monotonic()
+                pending[asyncio.ensure_future(call(provider_id))] = (provider_id, last_launch)
+                return True
+            return False
+
+        async def cancel_pending() -> None:
+            now = time.monotonic()
+            for task, (provider_id, started) in pending.items():
+                task.cancel()
+                self._record_abandoned(provider_id, model, now - started)
+            await asyncio.gather(*pending, return_exceptions=True)
+            pending.clear()
+
+        if not launch():
+            raise self._no_provider_error(model, errors)
+        first_provider = next(iter(pending.values()))[0]
+
+        try:
+            while pending:
+                timeout = None
+                if hedge and self.config.hedging_enabled and candidates and attempts < self.config.max_attempts:
+                    primary = list(pending.values())[-1][0]
+                    timeout = max(0.0, self.hedge_delay(primary, model) - (time.monotonic() - last_launch))
+
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        hedged = True
+                        self._count("hedges")
+                    continue
+
+                for task in done:
+                    provider_id, started = pending.pop(task)
+                    elapsed = time.monotonic() - started
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        if not self._is_provider_failure(e):
+                            self.get_breaker(provider_id).release()
+                            raise
+                        self._record_failure(provider_id, model, e)
+                        errors.append(e)
+                        continue
+
+                    self._record_success(provider_id, model, elapsed)
+                    if hedged and provider_id != first_provider:
+                        self._count("hedge_wins")
+                    return result
+
+                if not pending and launch():
+                    self._count("failovers")
+        finally:
+            # Cancel losers, and everything in flight if the caller was cancelled
+            await cancel_pending()
+
+        raise self._no_provider_error(model, errors)
+
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """
+        Get routing statistics.
+
+        Returns:
+            Request, hedge and failover counters, circuit states, and per provider and model statistics
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            stats = dict(self._stats)
+            breakers = dict(self._breakers)
+
+        return {
+            **counters,
+            "circuits": {provider_id: breaker.state.value for provider_id, breaker in breakers.items()},
+            "providers": {f"{provider_id}/{model}": s.to_dict() for (provider_id, model), s in stats.items()}
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the thread pool for synchronous requests."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,368 @@
+"""
+Routing simulation for the LLM Providers integration.
+
+This script registers simulated providers with lognormal latency, occasional
+stalls and failures in a provider manager, and measures request latency with
+hedging disabled and enabled. It shows how hedging a request that is slower
+than the provider's recent p95 cuts the tail latency caused by stalls.
+
+Results report p50, p95 and p99 latency in milliseconds, together with the
+router's hedge and failover counters.
+
+Usage:
+    python -m src.llm_providers.routing_simulation --requests 400 --stall-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
+
+from .core.provider_interface import (
+    LLMProvider,
+    ProviderType,
+    LLMErrorType,
+    FinishReason,
+    ChatMessage,
+    ModelInfo,
+    ProviderCapabilities,
+    HealthStatus,
+    UsageInfo,
+    TextGenerationOptions,
+    ChatGenerationOptions,
+    EmbeddingOptions,
+    ImageGenerationOptions,
+    TextGenerationResult,
+    ChatGenerationResult,
+    EmbeddingResult,
+    ImageGenerationResult,
+    TextGenerationChunk,
+    ChatGenerationChunk,
+    LLMError
+)
+from .provider_manager import ProviderManager
+from .routing import RoutingConfig
+
+logger = logging.getLogger(__name__)
+
+
+class SimulatedProvider(LLMProvider):
+    """
+    Provider that answers after a simulated delay.
+
+    Latency is lognormal around a median, with a fraction of requests
+    stalling for much longer and a fraction failing with a retryable error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        median_latency: float = 0.05,
+        sigma: float = 0.25,
+        stall_rate: float = 0.0,
+        stall_latency: float = 1.0,
+        failure_rate: float = 0.0,
+        models: Optional[List[str]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the simulated provider.
+
+        Args:
+            name: Provider name
+            median_latency: Median latency in seconds
+            sigma: Spread of the lognormal latency distribution
+            stall_rate: Fraction of requests that stall
+            stall_latency: Latency of a stalled request in seconds
+            failure_rate: Fraction of requests that fail
+            models: Models served by the provider
+            seed: Random seed for reproducible runs
+        """
+        self.name = name
+        self.median_latency = median_latency
+        self.sigma = sigma
+        self.stall_rate = stall_rate
+        self.stall_latency = stall_latency
+        self.failure_rate = failure_rate
+        self.models = models or ["sim-model"]
+        self.available = True
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _next_outcome(self) -> float:
+        """Draw the latency of the next request, or raise if it should fail."""
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+            latency = self.median_latency * math.exp(self._random.gauss(0.0, self.sigma))
+        if roll < self.failure_rate:
+            raise LLMError(
+                f"Simulated failure from {self.name}",
+                LLMErrorType.SERVICE_UNAVAILABLE_ERROR,
+                self.name,
+                retryable=True
+            )
+        if roll < self.failure_rate + self.stall_rate:
+            return self.stall_latency
+        return latency
+
+    def _text_result(self, options: TextGenerationOptions) -> TextGenerationResult:
+        return TextGenerationResult(
+            text=f"response from {self.name}",
+            model=options.model,
+            provider=self.name,
+            usage=UsageInfo(prompt_tokens=5, completion_tokens=5, total_tokens=10),
+            finish_reason=FinishReason.STOP
+        )
+
+    def _chat_result(self, options: ChatGenerationOptions) -> ChatGenerationResult:
+        return ChatGenerationResult(
+            message=ChatMessage(role="assistant", content=f"response from {self.name}"),
+            model=options.model,
+            provider=self.name,
+            usage=UsageInfo(prompt_tokens=5, completion_tokens=5, total_tokens=10),
+            finish_reason=FinishReason.STOP
+        )
+
+    def _embedding_result(self, options: EmbeddingOptions) -> EmbeddingResult:
+        return EmbeddingResult(
+            embedding=[0.0] * 8,
+            model=options.model,
+            provider=self.name,
+            usage=UsageInfo(prompt_tokens=5, total_tokens=5)
+        )
+
+    def _image_result(self, options: ImageGenerationOptions) -> ImageGenerationResult:
+        return ImageGenerationResult(
+            images=[],
+            model=options.model,
+            provider=self.name
+        )
+
+    def generate_text(self, prompt: str, options: TextGenerationOptions) -> TextGenerationResult:
+        time.sleep(self._next_outcome())
+        return self._text_result(options)
+
+    async def generate_text_async(self, prompt: str, options: TextGenerationOptions) -> TextGenerationResult:
+        await asyncio.sleep(self._next_outcome())
+        return self._text_result(options)
+
+    async def generate_text_stream(
+        self, prompt: str, options: TextGenerationOptions
+    ) -> AsyncIterator[TextGenerationChunk]:
+        result = await self.generate_text_async(prompt, options)
+        yield TextGenerationChunk(text=result.text, finish_reason=FinishReason.STOP, is_final=True)
+
+    def generate_chat(self, messages: List[ChatMessage], options: ChatGenerationOptions) -> ChatGenerationResult:
+        time.sleep(self._next_outcome())
+        return self._chat_result(options)
+
+    async def generate_chat_async(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions
+    ) -> ChatGenerationResult:
+        await asyncio.sleep(self._next_outcome())
+        return self._chat_result(options)
+
+    async def generate_chat_stream(
+        self, messages: List[ChatMessage], options: ChatGenerationOptions
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        result = await self.generate_chat_async(messages, options)
+        yield ChatGenerationChunk(
+            delta={"role": "assistant", "content": result.message.content},
+            finish_reason=FinishReason.STOP,
+            is_final=True
+        )
+
+    def generate_embedding(self, text: str, options: EmbeddingOptions) -> EmbeddingResult:
+        time.sleep(self._next_outcome())
+        return self._embedding_result(options)
+
+    async def generate_embedding_async(self, text: str, options: EmbeddingOptions) -> EmbeddingResult:
+        await asyncio.sleep(self._next_outcome())
+        return self._embedding_result(options)
+
+    def generate_image(self, prompt: str, options: ImageGenerationOptions) -> ImageGenerationResult:
+        time.sleep(self._next_outcome())
+        return self._image_result(options)
+
+    async def generate_image_async(self, prompt: str, options: ImageGenerationOptions) -> ImageGenerationResult:
+        await asyncio.sleep(self._next_outcome())
+        return self._image_result(options)
+
+    def get_models(self) -> List[ModelInfo]:
+        return [ModelInfo(model, model, self.name, ["text", "chat"], 8192, 0.0, 0.0) for model in self.models]
+
+    async def get_models_async(self) -> List[ModelInfo]:
+        return self.get_models()
+
+    def get_capabilities(self) -> ProviderCapabilities:
+        return ProviderCapabilities(supports_text=True, supports_chat=True, supports_embeddings=True)
+
+    def get_health(self) -> HealthStatus:
+        return HealthStatus(
+            available=self.available,
+            latency=self.median_latency * 1000,
+            error_rate=self.failure_rate
+        )
+
+    async def get_health_async(self) -> HealthStatus:
+        return self.get_health()
+
+    def get_name(self) -> str:
+        return self.name
+
+    def get_type(self) -> ProviderType:
+        return ProviderType.CUSTOM
+
+
+class RoutingSimulation:
+    """Simulation comparing request latency with and without hedging."""
+
+    def __init__(
+        self,
+        requests_count: int = 400,
+        concurrency: int = 16,
+        median_latency: float = 0.05,
+        stall_rate: float = 0.05,
+        stall_latency: float = 1.0,
+        failure_rate: float = 0.0,
+        seed: int = 7
+    ):
+        """
+        Initialize the simulation.
+
+        Args:
+            requests_count: Number of requests per mode
+            concurrency: Number of concurrent callers
+            median_latency: Median provider latency in seconds
+            stall_rate: Fraction of requests that stall
+            stall_latency: Latency of a stalled request in seconds
+            failure_rate: Fraction of requests that fail
+            seed: Random seed for reproducible runs
+        """
+        self.requests_count = requests_count
+        self.concurrency = concurrency
+        self.median_latency = median_latency
+        self.stall_rate = stall_rate
+        self.stall_latency = stall_latency
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def create_manager(self, hedging_enabled: bool) -> ProviderManager:
+        """
+        Create a provider manager with two simulated providers.
+
+        Args:
+            hedging_enabled: Whether slow requests are hedged
+
+        Returns:
+            Provider manager
+        """
+        manager = ProviderManager(routing_config=RoutingConfig(
+            hedging_enabled=hedging_enabled,
+            initial_hedge_delay=self.median_latency * 4,
+            min_samples=20
+        ))
+        for index in range(2):
+            manager.register_provider(f"sim-{index}", SimulatedProvider(
+                f"sim-{index}",
+                median_latency=self.median_latency,
+                stall_rate=self.stall_rate,
+                stall_latency=self.stall_latency,
+                failure_rate=self.failure_rate,
+                seed=self.seed + index
+            ))
+        return manager
+
+    def _summarize(self, name: str, latencies: List[float], errors: int, manager: ProviderManager) -> Dict[str, float]:
+        """Summarize the latencies of a run."""
+        latencies = sorted(latencies)
+
+        def percentile(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+
+        routing = manager.get_routing_stats()
+        summary = {
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "errors": errors,
+            "routed": routing["requests"],
+            "hedges": routing["hedges"],
+            "hedge_wins": routing["hedge_wins"],
+            "failovers": routing["failovers"]
+        }
+        self.results[name] = summary
+        logger.info(
+            f"{name}: p50={summary['p50_ms']:.1f}ms p95={summary['p95_ms']:.1f}ms "
+            f"p99={summary['p99_ms']:.1f}ms hedges={summary['hedges']} errors={errors}"
+        )
+        return summary
+
+    def run_mode(self, name: str, hedging_enabled: bool) -> Dict[str, float]:
+        """
+        Run the requests of one mode.
+
+        Args:
+            name: Result name
+            hedging_enabled: Whether slow requests are hedged
+
+        Returns:
+            Latency summary
+        """
+        manager = self.create_manager(hedging_enabled)
+        errors = 0
+
+        def timed(index):
+            nonlocal errors
+            start = time.perf_counter()
+            try:
+                # Distinct prompts, so every request is routed instead of sharing a call
+                manager.generate_text(f"Hello {index}", TextGenerationOptions(model="sim-model"))
+            except LLMError:
+                errors += 1
+            return time.perf_counter() - start
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                latencies = list(executor.map(timed, range(self.requests_count)))
+            return self._summarize(name, latencies, errors, manager)
+        finally:
+            manager.shutdown()
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """
+        Run the simulation without and with hedging.
+
+        Returns:
+            Results by mode
+        """
+        self.run_mode("no_hedging", hedging_enabled=False)
+        self.run_mode("hedging", hedging_enabled=True)
+        return self.results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Simulate latency-aware hedged routing")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent callers")
+    parser.add_argument("--latency", type=float, default=0.05, help="Median provider latency in seconds")
+    parser.add_argument("--stall-rate", type=float, default=0.05, help="Fraction of requests that stall")
+    parser.add_argument("--stall-latency", type=float, default=1.0, help="Stalled request latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    args = parser.parse_args()
+
+    simulation = RoutingSimulation(
+        args.requests, args.concurrency, args.latency, args.stall_rate, args.stall_latency, args.failure_rate
+    )
+    print(json.dumps(simulation.run(), indent=2))
@@ -0,0 +1,203 @@
+"""
+Token counting benchmark for the LLM Providers integration.
+
+This script counts a corpus of English prose, source code, JSON and
+non-English text and reports:
+1. Throughput in tokens per second for single texts, for batches, and for
+   conversations sharing a system prompt, both with the memoized counts and
+   with memoization disabled so the encoder's own speed is visible
+2. Accuracy of the previous ``len(text) // 4`` approximation and of the
+   heuristic estimator, as mean absolute error against the model's real
+   tokenizer
+
+Accuracy needs the model's real tokenizer: its vocabulary in the
+vocabulary directory (see TokenCounter) or, for the OpenAI encodings, the
+optional ``tiktoken`` package. Without either only throughput is reported.
+
+Usage:
+    python -m src.llm_providers.token_counting_benchmark --model gpt-4 --vocab-dir /path/to/vocab
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Dict, List, Optional
+
+from .core.provider_interface import ChatMessage
+from .core.tokenization import HeuristicEncoder, TokenCounter, TokenCounterConfig
+
+logger = logging.getLogger(__name__)
+
+CORPUS: Dict[str, List[str]] = {
+    "english": [
+        "The quick brown fox jumps over the lazy dog while the farmer watches from the porch.",
+        "Quarterly revenue grew by eleven percent, driven mainly by subscriptions in new markets.",
+        "Please summarize the attached meeting notes and list the open action items with owners.",
+        "Internationalization and localization are often abbreviated as i18n and l10n respectively.",
+    ],
+    "code": [
+        "def fibonacci(n: int) -> int:\n    if n < 2:\n        return n\n    return fibonacci(n - 1) + fibonacci(n - 2)\n",
+        "for (let i = 0; i < items.length; i++) {\n  if (items[i].id === targetId) { return items[i]; }\n}\n",
+        "SELECT u.id, COUNT(o.id) AS orders FROM users u LEFT JOIN orders o ON o.user_id = u.id GROUP BY u.id;",
+        "const handler = async (req, res) => { const { data } = await axios.get(`${API}/v1/items?limit=50`); res.json(data); };",
+    ],
+    "json": [
+        '{"id": 4821, "name": "Widget", "tags": ["blue", "small"], "price": 19.99, "in_stock": true}',
+        '[{"ts": "2024-05-01T12:00:00Z", "cpu": 0.73, "mem": 512}, {"ts": "2024-05-01T12:01:00Z", "cpu": 0.81, "mem": 530}]',
+    ],
+    "chinese": [
+        "今天天气很好，我们一起去公园散步吧。",
+        "请把这份报告翻译成英文，并总结其中的主要观点。",
+    ],
+    "japanese": [
+        "東京の天気は明日から崩れる見込みです。傘を忘れないでください。",
+    ],
+    "russian": [
+        "Пожалуйста, подготовьте краткий отчёт о результатах тестирования за прошлую неделю.",
+    ],
+    "german": [
+        "Die Geschwindigkeitsbegrenzung auf der Autobahn wird seit Jahrzehnten kontrovers diskutiert.",
+    ],
+}
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant for an enterprise knowledge base. Answer using only the provided "
+    "context, cite the document titles you used, and say when the answer is not in the context. "
+) * 8
+
+
+class TokenCountingBenchmark:
+    """Benchmark for token counting throughput and accuracy."""
+
+    def __init__(self, model: str = "gpt-4", vocab_dir: Optional[str] = None, repeat: int = 200):
+        """
+        Initialize the benchmark.
+
+        Args:
+            model: Model whose tokenizer to benchmark
+            vocab_dir: Directory holding vocabulary files
+            repeat: Number of passes over the corpus for throughput runs
+        """
+        self.model = model
+        self.vocab_dir = vocab_dir
+        self.repeat = repeat
+        self.results: Dict[str, Dict[str, float]] = {}
+
+    def _create_counter(self, cache_size: int = 4096) -> TokenCounter:
+        return TokenCounter(TokenCounterConfig(vocab_dir=self.vocab_dir, cache_size=cache_size))
+
+    def benchmark_throughput(self) -> Dict[str, float]:
+        """
+        Measure counting throughput.
+
+        Returns:
+            Tokens per second by workload
+        """
+        counter = self._create_counter()
+        encoder = counter.get_encoder(self.model)
+        texts = [text for texts in CORPUS.values() for text in texts]
+        corpus_tokens = sum(encoder.count(text) for text in texts)
+
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            for text in texts:
+                counter.count(text, self.model)
+        single = corpus_tokens * self.repeat / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            counter.count_batch(texts, self.model)
+        batch = corpus_tokens * self.repeat / (time.perf_counter() - start)
+
+        conversations = [
+            [ChatMessage(role="system", content=SYSTEM_PROMPT), ChatMessage(role="user", content=text)]
+            for text in texts
+        ]
+        conversation_tokens = sum(counter.count_messages(messages, self.model) for messages in conversations)
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            for messages in conversations:
+                counter.count_messages(messages, self.model)
+        conversation = conversation_tokens * self.repeat / (time.perf_counter() - start)
+
+        uncached_counter = self._create_counter(cache_size=0)
+        uncached_counter.get_encoder(self.model)
+        start = time.perf_counter()
+        for _ in range(self.repeat):
+            for messages in conversations:
+                uncached_counter.count_messages(messages, self.model)
+        conversation_uncached = conversation_tokens * self.repeat / (time.perf_counter() - start)
+
+        summary = {
+            "encoder": counter.get_stats()["encoders"].get(counter.get_encoding_name(self.model), "heuristic"),
+            "single_tokens_per_sec": single,
+            "batch_tokens_per_sec": batch,
+            "conversation_tokens_per_sec": conversation,
+            "conversation_uncached_tokens_per_sec": conversation_uncached,
+            "cache_hit_rate": counter.get_stats()["hit_rate"]
+        }
+        self.results["throughput"] = summary
+        logger.info(
+            f"throughput ({summary['encoder']}): single={single:,.0f} batch={batch:,.0f} "
+            f"conversation={conversation:,.0f} uncached conversation={conversation_uncached:,.0f} tokens/s"
+        )
+        return summary
+
+    def benchmark_accuracy(self) -> Dict[str, Dict[str, float]]:
+        """
+        Compare the old approximation and the heuristic with the real tokenizer.
+
+        Returns:
+            Mean absolute error in percent by corpus category, or an empty
+            dictionary if the model's vocabulary is not available
+        """
+        counter = self._create_counter()
+        if not counter.is_exact(self.model):
+            logger.info(
+                f"No vocabulary for {self.model} and tiktoken is not installed; skipping accuracy comparison"
+            )
+            return {}
+
+        heuristic = HeuristicEncoder()
+        accuracy: Dict[str, Dict[str, float]] = {}
+        for category, texts in CORPUS.items():
+            old_errors, new_errors = [], []
+            for text in texts:
+                reference = counter.count(text, self.model)
+                old_errors.append(abs(len(text) // 4 - reference) / reference)
+                new_errors.append(abs(heuristic.count(text) - reference) / reference)
+            accuracy[category] = {
+                "chars_div_4_error_pct": 100 * sum(old_errors) / len(old_errors),
+                "heuristic_error_pct": 100 * sum(new_errors) / len(new_errors)
+            }
+            logger.info(
+                f"{category}: len/4 error={accuracy[category]['chars_div_4_error_pct']:.1f}% "
+                f"heuristic error={accuracy[category]['heuristic_error_pct']:.1f}%"
+            )
+        self.results["accuracy"] = accuracy
+        return accuracy
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """
+        Run all benchmarks.
+
+        Returns:
+            Results by benchmark
+        """
+        self.benchmark_throughput()
+        self.benchmark_accuracy()
+        return self.results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Benchmark token counting")
+    parser.add_argument("--model", default="gpt-4", help="Model whose tokenizer to benchmark")
+    parser.add_argument("--vocab-dir", default=None, help="Directory holding vocabulary files")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    benchmark = TokenCountingBenchmark(args.model, args.vocab_dir, args.repeat)
+    print(json.dumps(benchmark.run(), indent=2))
@@ -9,7 +9,9 @@ import base64
 import hashlib
 import json
 import os
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Union
@@ -87,18 +89,67 @@ class ValidationResult:
         return result
 
 
+class _CacheStripe:
+    """One independently locked LRU segment of the validation cache."""
+
+    __slots__ = ("lock", "entries", "hits", "negative_hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        """Initialize an empty stripe."""
+        self.lock = threading.Lock()
+        # License key -> (result, expiry time), least recently used first
+        self.entries: "OrderedDict[str, Tuple[ValidationResult, float]]" = OrderedDict()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
 class ValidationCache:
-    """Cache for license validation results to improve performance."""
+    """
+    Cache for license validation results to improve performance.
+
+    The cache is bounded (least recently used entries are evicted first),
+    expires entries after a time-to-live, and also caches failed validations
+    for a shorter period so forged or malformed keys do not re-run checksum
+    and signature verification on every request. Keys are spread across
+    independently locked stripes so concurrent lookups rarely contend.
+    """
 
-    def __init__(self, cache_duration_seconds: int = 3600):
+    def __init__(
+        self,
+        cache_duration_seconds: int = 3600,
+        max_entries: int = 10000,
+        negative_cache_duration_seconds: int = 60,
+        lock_stripes: int = 16
+    ):
         """
         Initialize validation cache.
 
         Args:
-            cache_duration_seconds: Duration to cache validation results in seconds
+            cache_duration_seconds: Duration to cache successful validation results in seconds
+            max_entries: Maximum number of cached results
+            negative_cache_duration_seconds: Duration to cache failed validation results in seconds
+            lock_stripes: Number of independently locked cache segments
         """
-        self.cache: Dict[str, Tuple[ValidationResult, float]] = {}
         self.cache_duration = cache_duration_seconds
+        self.negative_cache_duration = negative_cache_duration_seconds
+        self.max_entries = max_entries
+        self._stripes = [_CacheStripe() for _ in range(max(1, min(lock_stripes, max_entries)))]
+        self._stripe_capacity = max(1, max_entries // len(self._stripes))
+
+    def _get_stripe(self, license_key: str) -> _CacheStripe:
+        """
+        Get the stripe holding a license key.
+
+        Args:
+            license_key: License key
+
+        Returns:
+            Cache stripe
+        """
+        return self._stripes[hash(license_key) % len(self._stripes)]
 
     def get(self, license_key: str) -> Optional[ValidationResult]:
         """
@@ -110,18 +161,32 @@ class ValidationCache:
         Returns:
             Cached validation result or None if not found or expired
         """
-        if license_key not in self.cache:
-            return None
-
-        result, timestamp = self.cache[license_key]
+        stripe = self._get_stripe(license_key)
         current_time = time.time()
 
-        # Check if cache entry has expired
-        if current_time - timestamp > self.cache_duration:
-            del self.cache[license_key]
-            return None
+        with stripe.lock:
+            entry = stripe.entries.get(license_key)
+            if entry is None:
+                stripe.misses += 1
+                return None
 
-        return result
+            result, expires_at = entry
+
+            # A valid result must not outlive the license itself
+            if current_time > expires_at or (
+                result.is_valid and result.expiration_date and datetime.now() > result.expiration_date
+            ):
+                del stripe.entries[license_key]
+                stripe.expirations += 1
+                stripe.misses += 1
+                return None
+
+            stripe.entries.move_to_end(license_key)
+            stripe.hits += 1
+            if not result.is_valid:
+                stripe.negative_hits += 1
+
+            return result
 
     def set(self, license_key: str, result: ValidationResult) -> None:
         """
@@ -131,7 +196,18 @@ class ValidationCache:
             license_key: License key to cache
             result: Validation result to cache
         """
-        self.cache[license_key] = (result, time.time())
+        duration = self.cache_duration if result.is_valid else self.negative_cache_duration
+        if duration <= 0:
+            return
+
+        stripe = self._get_stripe(license_key)
+        with stripe.lock:
+            stripe.entries[license_key] = (result, time.time() + duration)
+            stripe.entries.move_to_end(license_key)
+
+            while len(stripe.entries) > self._stripe_capacity:
+                stripe.entries.popitem(last=False)
+                stripe.evictions += 1
 
     def invalidate(self, license_key: str) -> None:
         """
@@ -140,12 +216,41 @@ class ValidationCache:
         Args:
             license_key: License key to invalidate
         """
-        if license_key in self.cache:
-            del self.cache[license_key]
+        stripe = self._get_stripe(license_key)
+        with stripe.lock:
+            stripe.entries.pop(license_key, None)
 
     def clear(self) -> None:
         """Clear all cached validation results."""
-        self.cache.clear()
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+
+    def __len__(self) -> int:
+        """Get the number of cached results."""
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry counts, hit and miss counts and the hit rate
+        """
+        stats = {"entries": 0, "hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        for stripe in self._stripes:
+            with stripe.lock:
+                stats["entries"] += len(stripe.entries)
+                stats["hits"] += stripe.hits
+                stats["negative_hits"] += stripe.negative_hits
+                stats["misses"] += stripe.misses
+                stats["evictions"] += stripe.evictions
+                stats["expirations"] += stripe.expirations
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["max_entries"] = self.max_entries
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
 
 
 class LicenseValidator:
@@ -155,7 +260,9 @@ class LicenseValidator:
         self,
         signature_handler: LicenseSignature,
         cache_duration_seconds: int = 3600,
-        license_db_connector: Optional[object] = None
+        license_db_connector: Optional[object] = None,
+        cache_max_entries: int = 10000,
+        negative_cache_duration_seconds: int = 60
     ):
         """
         Initialize license validator.
@@ -164,9 +271,15 @@ class LicenseValidator:
             signature_handler: Handler for license signature verification
             cache_duration_seconds: Duration to cache validation results
             license_db_connector: Connector to license database for online validation
+            cache_max_entries: Maximum number of cached validation results
+            negative_cache_duration_seconds: Duration to cache failed validations
         """
         self.signature_handler = signature_handler
-        self.cache = ValidationCache(cache_duration_seconds)
+        self.cache = ValidationCache(
+            cache_duration_seconds,
+            max_entries=cache_max_entries,
+            negative_cache_duration_seconds=negative_cache_duration_seconds
+        )
         self.license_db_connector = license_db_connector
         self.prefix_map = {
             "APX-PRP": LicenseType.PERPETUAL,
@@ -283,6 +396,26 @@ class LicenseValidator:
             if cached_result:
                 return cached_result
 
+        result = self._validate_uncached(license_key)
+
+        # Cache the result; failures are cached for a shorter period. A
+        # revocation comes from the license server, which may reinstate the
+        # license at any time, so it is checked again on every lookup.
+        if result.status != LicenseStatus.REVOKED:
+            self.cache.set(license_key, result)
+
+        return result
+
+    def _validate_uncached(self, license_key: str) -> ValidationResult:
+        """
+        Validate a license key without consulting the cache.
+
+        Args:
+            license_key: License key to validate
+
+        Returns:
+            ValidationResult with validation status and details
+        """
         try:
             # Parse license key
             prefix, encoded_metadata, signature, checksum = self._parse_license_key(license_key)
@@ -333,7 +466,7 @@ class LicenseValidator:
                 )
 
             # License is valid
-            result = ValidationResult(
+            return ValidationResult(
                 is_valid=True,
                 license_id=metadata.license_id,
                 status=LicenseStatus.ACTIVE,
@@ -341,17 +474,32 @@ class LicenseValidator:
                 expiration_date=metadata.expiration_date,
                 metadata=metadata
             )
-
-            # Cache the result
-            self.cache.set(license_key, result)
-
-            return result
         except Exception as e:
             return ValidationResult(
                 is_valid=False,
                 error_message=f"License validation failed: {str(e)}"
             )
 
+    def validate_many(self, license_keys: List[str], skip_cache: bool = False) -> Dict[str, ValidationResult]:
+        """
+        Validate several license keys at once.
+
+        Duplicate keys are validated once and only cache misses are verified.
+
+        Args:
+            license_keys: License keys to validate
+            skip_cache: Whether to skip cache lookup
+
+        Returns:
+            Dictionary mapping each distinct license key to its validation result
+        """
+        results = {}
+        for license_key in license_keys:
+            if license_key not in results:
+                results[license_key] = self.validate_license_key(license_key, skip_cache=skip_cache)
+
+        return results
+
     def has_feature(self, license_key: str, feature: LicenseFeature) -> bool:
         """
         Check if a license has a specific feature.
@@ -413,6 +561,15 @@ class LicenseValidator:
         else:
             self.cache.clear()
 
+    def get_cache_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get validation cache statistics.
+
+        Returns:
+            Dictionary with cache size, hit and miss counts and the hit rate
+        """
+        return self.cache.get_stats()
+
 
 class OfflineValidator:
     """Class for offline license validation."""
@@ -5,11 +5,13 @@ This module provides functionality for defining subscription tiers, managing fea
 access based on subscription levels, and controlling feature gating.
 """
 
+import bisect
 import json
 import os
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from subscription.core.license_generator import LicenseFeature, LicenseType
 from subscription.core.license_validator import LicenseValidator
@@ -505,7 +507,14 @@ class Subscription:
 
 
 class SubscriptionRepository:
-    """Class for storing and retrieving subscriptions."""
+    """
+    Class for storing and retrieving subscriptions.
+
+    Each subscription is stored as its own JSON file. An in-memory index,
+    hydrated from those files on first use and updated on every save and
+    delete, serves lookups by ID, customer, status and end date without
+    touching the disk.
+    """
 
     def __init__(self, storage_path: str):
         """
@@ -516,6 +525,16 @@ class SubscriptionRepository:
         """
         self.storage_path = storage_path
         os.makedirs(storage_path, exist_ok=True)
+        
+        # Subscription ID -> serialized subscription
+        self._subscriptions: Optional[Dict[str, Dict]] = None
+        
+        # Secondary indexes
+        self._by_customer: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_end_date: List[Tuple[str, str]] = []  # sorted (end date ISO, subscription ID)
+        
+        self._lock = threading.RLock()
 
     def _get_subscription_file(self, subscription_id: str) -> str:
         """
@@ -529,49 +548,103 @@ class SubscriptionRepository:
         """
         return os.path.join(self.storage_path, f"subscription_{subscription_id}.json")
 
-    def _get_customer_index_file(self) -> str:
+    def _ensure_index(self) -> Dict[str, Dict]:
         """
-        Get path to customer index file.
+        Hydrate the index from the subscription files if needed. Caller holds the lock.
 
         Returns:
-            Path to customer index file
+            Dictionary mapping subscription IDs to serialized subscriptions
+        """
+        if self._subscriptions is None:
+            self._subscriptions = {}
+            self._by_customer = {}
+            self._by_status = {}
+            self._by_end_date = []
+            
+            try:
+                filenames = os.listdir(self.storage_path)
+            except Exception as e:
+                print(f"Failed to list subscriptions: {str(e)}")
+                filenames = []
+                
+            for filename in filenames:
+                if filename.startswith("subscription_") and filename.endswith(".json"):
+                    try:
+                        with open(os.path.join(self.storage_path, filename), "r") as f:
+                            self._index_add(json.load(f))
+                    except Exception as e:
+                        print(f"Failed to load subscription file {filename}: {str(e)}")
+                        
+        return self._subscriptions
+
+    def _index_add(self, data: Dict) -> None:
+        """
+        Add a serialized subscription to the index. Caller holds the lock.
+
+        Args:
+            data: Serialized subscription
         """
-        return os.path.join(self.storage_path, "customer_index.json")
+        subscription_id = data["subscription_id"]
+        self._subscriptions[subscription_id] = data
+        self._by_customer.setdefault(data["customer_id"], set()).add(subscription_id)
+        self._by_status.setdefault(data["status"], set()).add(subscription_id)
+        if data.get("end_date"):
+            bisect.insort(self._by_end_date, (data["end_date"], subscription_id))
 
-    def _update_customer_index(self, customer_id: str, subscription_id: str, remove: bool = False) -> None:
+    def _index_remove(self, subscription_id: str) -> Optional[Dict]:
         """
-        Update customer index with subscription mapping.
+        Remove a subscription from the index. Caller holds the lock.
 
         Args:
-            customer_id: Customer ID
             subscription_id: Subscription ID
-            remove: Whether to remove the mapping
+
+        Returns:
+            The removed serialized subscription or None if not indexed
         """
-        index_file = self._get_customer_index_file()
-        customer_index = {}
-        
-        # Load existing index if it exists
-        if os.path.exists(index_file):
-            try:
-                with open(index_file, "r") as f:
-                    customer_index = json.load(f)
-            except Exception:
-                customer_index = {}
-        
-        # Update index
-        if customer_id not in customer_index:
-            customer_index[customer_id] = []
+        data = self._subscriptions.pop(subscription_id, None)
+        if data is None:
+            return None
             
-        if remove:
-            if subscription_id in customer_index[customer_id]:
-                customer_index[customer_id].remove(subscription_id)
-        else:
-            if subscription_id not in customer_index[customer_id]:
-                customer_index[customer_id].append(subscription_id)
-        
-        # Save updated index
-        with open(index_file, "w") as f:
-            json.dump(customer_index, f)
+        for index, key in ((self._by_customer, data["customer_id"]), (self._by_status, data["status"])):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(subscription_id)
+                if not ids:
+                    del index[key]
+                    
+        if data.get("end_date"):
+            entry = (data["end_date"], subscription_id)
+            position = bisect.bisect_left(self._by_end_date, entry)
+            if position < len(self._by_end_date) and self._by_end_date[position] == entry:
+                del self._by_end_date[position]
+                
+        return data
+
+    def _load_many(self, subscription_ids) -> List[Subscription]:
+        """
+        Build subscriptions for indexed IDs. Caller holds the lock.
+
+        Args:
+            subscription_ids: Iterable of subscription IDs
+
+        Returns:
+            List of subscriptions
+        """
+        subscriptions = []
+        for subscription_id in subscription_ids:
+            data = self._subscriptions.get(subscription_id)
+            if data is None:
+                continue
+            try:
+                subscriptions.append(Subscription.from_dict(data))
+            except Exception as e:
+                print(f"Failed to load subscription {subscription_id}: {str(e)}")
+        return subscriptions
+
+    def refresh_index(self) -> None:
+        """Discard the in-memory index so it is rebuilt from the subscription files."""
+        with self._lock:
+            self._subscriptions = None
 
     def save(self, subscription: Subscription) -> bool:
         """
@@ -585,12 +658,17 @@ class SubscriptionRepository:
         """
         try:
             subscription_file = self._get_subscription_file(subscription.subscription_id)
+            data = subscription.to_dict()
             
-            with open(subscription_file, "w") as f:
-                json.dump(subscription.to_dict(), f, indent=2)
+            with self._lock:
+                self._ensure_index()
                 
-            # Update customer index
-            self._update_customer_index(subscription.customer_id, subscription.subscription_id)
+                with open(subscription_file, "w") as f:
+                    json.dump(data, f, indent=2)
+                    
+                # Update indexes
+                self._index_remove(subscription.subscription_id)
+                self._index_add(data)
             
             return True
         except Exception as e:
@@ -607,19 +685,11 @@ class SubscriptionRepository:
         Returns:
             Subscription or None if not found
         """
-        subscription_file = self._get_subscription_file(subscription_id)
-        
-        if not os.path.exists(subscription_file):
-            return None
+        with self._lock:
+            self._ensure_index()
+            subscriptions = self._load_many([subscription_id])
             
-        try:
-            with open(subscription_file, "r") as f:
-                subscription_data = json.load(f)
-                
-            return Subscription.from_dict(subscription_data)
-        except Exception as e:
-            print(f"Failed to load subscription {subscription_id}: {str(e)}")
-            return None
+        return subscriptions[0] if subscriptions else None
 
     def delete(self, subscription_id: str) -> bool:
         """
@@ -633,23 +703,18 @@ class SubscriptionRepository:
         """
         subscription_file = self._get_subscription_file(subscription_id)
         
-        if not os.path.exists(subscription_file):
-            return False
-            
         try:
-            # Get customer ID before deleting
-            subscription = self.get(subscription_id)
-            if subscription:
-                customer_id = subscription.customer_id
-                
+            with self._lock:
+                if subscription_id not in self._ensure_index() or not os.path.exists(subscription_file):
+                    return False
+                    
                 # Delete subscription file
                 os.remove(subscription_file)
                 
-                # Update customer index
-                self._update_customer_index(customer_id, subscription_id, remove=True)
+                # Update indexes
+                self._index_remove(subscription_id)
                 
-                return True
-            return False
+            return True
         except Exception as e:
             print(f"Failed to delete subscription {subscription_id}: {str(e)}")
             return False
@@ -664,28 +729,9 @@ class SubscriptionRepository:
         Returns:
             List of subscriptions for the customer
         """
-        index_file = self._get_customer_index_file()
-        
-        if not os.path.exists(index_file):
-            return []
-            
-        try:
-            with open(index_file, "r") as f:
-                customer_index = json.load(f)
-                
-            if customer_id not in customer_index:
-                return []
-                
-            subscriptions = []
-            for subscription_id in customer_index[customer_id]:
-                subscription = self.get(subscription_id)
-                if subscription:
-                    subscriptions.append(subscription)
-                    
-            return subscriptions
-        except Exception as e:
-            print(f"Failed to get subscriptions for customer {customer_id}: {str(e)}")
-            return []
+        with self._lock:
+            self._ensure_index()
+            return self._load_many(sorted(self._by_customer.get(customer_id, ())))
 
     def get_all(self) -> List[Subscription]:
         """
@@ -694,20 +740,8 @@ class SubscriptionRepository:
         Returns:
             List of all subscriptions
         """
-        subscriptions = []
-        
-        try:
-            for filename in os.listdir(self.storage_path):
-                if filename.startswith("subscription_") and filename.endswith(".json"):
-                    subscription_id = filename[12:-5]  # Extract ID from filename
-                    subscription = self.get(subscription_id)
-                    if subscription:
-                        subscriptions.append(subscription)
-                        
-            return subscriptions
-        except Exception as e:
-            print(f"Failed to get all subscriptions: {str(e)}")
-            return []
+        with self._lock:
+            return self._load_many(list(self._ensure_index()))
 
     def get_by_status(self, status: SubscriptionStatus) -> List[Subscription]:
         """
@@ -719,7 +753,9 @@ class SubscriptionRepository:
         Returns:
             List of subscriptions with the specified status
         """
-        return [sub for sub in self.get_all() if sub.status == status]
+        with self._lock:
+            self._ensure_index()
+            return self._load_many(sorted(self._by_status.get(status.value, ())))
 
     def get_expiring_soon(self, days: int = 30) -> List[Subscription]:
         """
@@ -729,16 +765,23 @@ class SubscriptionRepository:
             days: Number of days to check for expiration
 
         Returns:
-            List of subscriptions expiring soon
+            List of subscriptions expiring soon, ordered by end date
         """
         current_date = datetime.now()
-        expiry_threshold = current_date.replace(hour=23, minute=59, second=59)
-        expiry_threshold = expiry_threshold.replace(day=expiry_threshold.day + days)
+        expiry_threshold = current_date.replace(hour=23, minute=59, second=59) + timedelta(days=days)
         
-        return [
-            sub for sub in self.get_all() 
-            if sub.end_date and current_date <= sub.end_date <= expiry_threshold
-        ]
+        with self._lock:
+            self._ensure_index()
+            
+            # Range scan over the end date index
+            start = bisect.bisect_left(self._by_end_date, (current_date.isoformat(),))
+            end = bisect.bisect_right(self._by_end_date, (expiry_threshold.isoformat(), "\uffff"))
+            subscription_ids = [subscription_id for _, subscription_id in self._by_end_date[start:end]]
+            
+            return [
+                sub for sub in self._load_many(subscription_ids)
+                if current_date <= sub.end_date <= expiry_threshold
+            ]
 
 
 class FeatureGate:
@@ -0,0 +1,176 @@
+"""
+Usage Cube module for ApexAgent Subscription and Licensing System.
+
+This module provides an incrementally maintained aggregation of usage
+quantities by day, customer, resource type, feature and subscription, so
+that analytics queries sum a handful of cells instead of re-reading raw
+usage records.
+"""
+
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# (resource type, feature, subscription ID)
+CellKey = Tuple[str, Optional[str], Optional[str]]
+
+# (day, customer ID, resource type, feature, subscription ID, quantity)
+Cell = Tuple[str, str, str, Optional[str], Optional[str], int]
+
+
+class UsageCube:
+    """Aggregated usage quantities by day × customer × resource × feature × subscription."""
+
+    def __init__(self):
+        """Initialize an empty usage cube."""
+        # Day -> customer ID -> (resource, feature, subscription) -> quantity
+        self._days: Dict[str, Dict[str, Dict[CellKey, int]]] = {}
+
+        # Day -> resource -> customer ID -> quantity, for cross-customer queries
+        self._resource_days: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+        self._lock = threading.Lock()
+        self.records_added = 0
+
+    def add(self, record: Dict) -> None:
+        """
+        Add a usage record to the cube.
+
+        Args:
+            record: Usage record dictionary with an ISO-format "timestamp"
+        """
+        day = record["timestamp"][:10]
+        customer_id = record["customer_id"]
+        resource_type = record["resource_type"]
+        quantity = record["quantity"]
+        key = (resource_type, record.get("feature"), record.get("subscription_id"))
+
+        with self._lock:
+            cells = self._days.setdefault(day, {}).setdefault(customer_id, {})
+            cells[key] = cells.get(key, 0) + quantity
+
+            customers = self._resource_days.setdefault(day, {}).setdefault(resource_type, {})
+            customers[customer_id] = customers.get(customer_id, 0) + quantity
+
+            self.records_added += 1
+
+    def rebuild(self, records) -> None:
+        """
+        Replace the cube contents with aggregates of the given records.
+
+        Args:
+            records: Iterable of usage record dictionaries
+        """
+        rebuilt = UsageCube()
+        for record in records:
+            rebuilt.add(record)
+
+        with self._lock:
+            self._days = rebuilt._days
+            self._resource_days = rebuilt._resource_days
+            self.records_added = rebuilt.records_added
+
+    def _days_in_range(self, days, first_day: Optional[str], last_day: Optional[str]) -> List[str]:
+        """
+        Get the days of a mapping within an inclusive range. Caller holds the lock.
+
+        Args:
+            days: Mapping keyed by day
+            first_day: First day in YYYY-MM-DD format (None for unbounded)
+            last_day: Last day in YYYY-MM-DD format (None for unbounded)
+
+        Returns:
+            Sorted list of days
+        """
+        return sorted(
+            day for day in days
+            if (first_day is None or day >= first_day) and (last_day is None or day <= last_day)
+        )
+
+    def get_cells(
+        self,
+        first_day: Optional[str] = None,
+        last_day: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        resource_type: Optional[str] = None
+    ) -> List[Cell]:
+        """
+        Get cube cells for a range of whole days.
+
+        Args:
+            first_day: First day in YYYY-MM-DD format (inclusive)
+            last_day: Last day in YYYY-MM-DD format (inclusive)
+            customer_id: Filter by customer ID
+            resource_type: Filter by resource type value
+
+        Returns:
+            List of (day, customer ID, resource type, feature, subscription ID, quantity)
+        """
+        result = []
+        with self._lock:
+            for day in self._days_in_range(self._days, first_day, last_day):
+                customers = self._days[day]
+                if customer_id is not None:
+                    customers = {customer_id: customers[customer_id]} if customer_id in customers else {}
+
+                for customer, cells in customers.items():
+                    for (resource, feature, subscription_id), quantity in cells.items():
+                        if resource_type is None or resource == resource_type:
+                            result.append((day, customer, resource, feature, subscription_id, quantity))
+
+        return result
+
+    def get_customer_totals(
+        self,
+        resource_type: str,
+        first_day: Optional[str] = None,
+        last_day: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Get usage of a resource per customer for a range of whole days.
+
+        Args:
+            resource_type: Resource type value
+            first_day: First day in YYYY-MM-DD format (inclusive)
+            last_day: Last day in YYYY-MM-DD format (inclusive)
+
+        Returns:
+            Dictionary mapping customer IDs to usage quantities
+        """
+        totals: Dict[str, int] = {}
+        with self._lock:
+            for day in self._days_in_range(self._resource_days, first_day, last_day):
+                for customer_id, quantity in self._resource_days[day].get(resource_type, {}).items():
+                    totals[customer_id] = totals.get(customer_id, 0) + quantity
+
+        return totals
+
+    @staticmethod
+    def top_k(totals: Dict[str, int], limit: int) -> List[Tuple[str, int]]:
+        """
+        Get the largest entries of a totals dictionary.
+
+        Args:
+            totals: Dictionary mapping keys to quantities
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of (key, quantity) sorted by quantity, largest first
+        """
+        return heapq.nlargest(limit, totals.items(), key=lambda item: item[1])
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cube statistics.
+
+        Returns:
+            Dictionary with day, cell and record counts
+        """
+        with self._lock:
+            return {
+                "days": len(self._days),
+                "cells": sum(
+                    len(cells) for customers in self._days.values() for cells in customers.values()
+                ),
+                "records_added": self.records_added
+            }
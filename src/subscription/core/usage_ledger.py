@@ -0,0 +1,498 @@
+"""
+Usage Ledger module for ApexAgent Subscription and Licensing System.
+
+This module provides an append-only, day-partitioned ledger for usage records.
+Each record is written exactly once as a JSON line, concurrent writers share a
+single write per segment through group commit, and a customer index maps each
+customer to the days on which they have usage.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class UsageLedger:
+    """Append-only JSON Lines ledger of usage records, partitioned by day."""
+
+    SEGMENT_PREFIX = "usage_"
+    SEGMENT_SUFFIX = ".jsonl"
+    MIGRATION_SUFFIX = ".migrating"
+
+    def __init__(self, ledger_path: str, fsync: bool = False):
+        """
+        Initialize usage ledger.
+
+        Args:
+            ledger_path: Directory holding the ledger segments
+            fsync: Whether to fsync each group commit before acknowledging it
+        """
+        self.ledger_path = ledger_path
+        self.fsync = fsync
+        os.makedirs(ledger_path, exist_ok=True)
+
+        # Group commit state
+        self._commit_lock = threading.Condition(threading.Lock())
+        self._pending: List[Tuple[int, str, Dict, str]] = []
+        self._next_sequence = 0
+        self._committed_sequence = -1
+        self._writing = False
+        # Sequence -> error for records that were not written, collected by their callers
+        self._failed: Dict[int, Exception] = {}
+
+        # Open append-mode file descriptors, keyed by segment date
+        self._segment_fds: Dict[str, int] = {}
+
+        # Customer ID -> set of segment dates, built on first use
+        self._customer_index: Optional[Dict[str, Set[str]]] = None
+        self._index_lock = threading.Lock()
+
+        # Commit statistics
+        self.records_written = 0
+        self.commits = 0
+
+    def _get_segment_file(self, date_str: str) -> str:
+        """
+        Get path to a ledger segment.
+
+        Args:
+            date_str: Segment date in YYYY-MM-DD format
+
+        Returns:
+            Path to the segment file
+        """
+        return os.path.join(self.ledger_path, f"{self.SEGMENT_PREFIX}{date_str}{self.SEGMENT_SUFFIX}")
+
+    def append(self, record: Dict) -> None:
+        """
+        Append a record to the ledger.
+
+        The call returns once the record has been written to its segment;
+        it survives a process crash, and survives power loss only when the
+        ledger was created with fsync=True. Records from concurrent callers
+        are committed together, one write per segment.
+
+        Args:
+            record: Usage record dictionary with an ISO-format "timestamp"
+
+        Raises:
+            IOError: If this record could not be written; other records of
+                the same commit are unaffected, so retrying never duplicates
+        """
+        date_str = record["timestamp"][:10]
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+
+        with self._commit_lock:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+            self._pending.append((sequence, date_str, record, line))
+
+            while self._committed_sequence < sequence:
+                if self._writing:
+                    # Another caller is committing; it may pick us up next round
+                    self._commit_lock.wait()
+                    continue
+
+                # Become the commit leader for everything pending
+                batch = self._pending
+                self._pending = []
+                self._writing = True
+                self._commit_lock.release()
+                failures: Dict[int, Exception] = {}
+                try:
+                    failures = self._write_batch(batch)
+                except Exception as e:
+                    failures = {entry[0]: e for entry in batch}
+                finally:
+                    self._commit_lock.acquire()
+                    self._writing = False
+                    self._committed_sequence = batch[-1][0]
+                    self._failed.update(failures)
+                    self._commit_lock.notify_all()
+
+            error = self._failed.pop(sequence, None)
+            if error is not None:
+                raise IOError(f"Failed to append usage record: {error}") from error
+
+    def _write_batch(self, batch: List[Tuple[int, str, Dict, str]]) -> Dict[int, Exception]:
+        """
+        Write a batch of records, one write per segment.
+
+        A failed write fails only the records that did not reach the
+        segment; records written whole before the error stay appended.
+
+        Args:
+            batch: List of (sequence, segment date, record, encoded line)
+
+        Returns:
+            Dictionary mapping the sequence of each record that was not written to its error
+        """
+        by_segment: Dict[str, List[Tuple[int, Dict, bytes]]] = {}
+        for sequence, date_str, record, line in batch:
+            by_segment.setdefault(date_str, []).append((sequence, record, line.encode("utf-8")))
+
+        failures: Dict[int, Exception] = {}
+        appended: List[Tuple[str, Dict]] = []
+        for date_str, entries in by_segment.items():
+            data = b"".join(encoded for _, _, encoded in entries)
+            written = 0
+            fd = None
+            try:
+                fd = self._get_segment_fd(date_str)
+                start = os.fstat(fd).st_size
+                # O_APPEND makes each write land atomically at the end of the file
+                while written < len(data):
+                    written += os.write(fd, data[written:])
+                if self.fsync:
+                    os.fsync(fd)
+            except OSError as e:
+                if written == len(data):
+                    # The records are in the segment; retrying them would duplicate them
+                    logger.error(f"Failed to fsync usage ledger segment {date_str}: {str(e)}")
+                    self._discard_segment_fd(date_str, None)
+                else:
+                    offset = 0
+                    for sequence, record, encoded in entries:
+                        if offset + len(encoded) <= written:
+                            appended.append((date_str, record))
+                            offset += len(encoded)
+                        else:
+                            failures[sequence] = e
+                    if fd is not None:
+                        self._discard_segment_fd(date_str, start + offset if offset < written else None)
+                    continue
+            appended.extend((date_str, record) for _, record, _ in entries)
+
+        self.records_written += len(appended)
+        self.commits += 1
+
+        with self._index_lock:
+            if self._customer_index is not None:
+                for date_str, record in appended:
+                    self._customer_index.setdefault(record["customer_id"], set()).add(date_str)
+        return failures
+
+    def _discard_segment_fd(self, date_str: str, truncate_to: Optional[int]) -> None:
+        """
+        Close a segment descriptor after a failed write.
+
+        Args:
+            date_str: Segment date in YYYY-MM-DD format
+            truncate_to: Size to cut the segment back to when the write stopped
+                inside a record, so a retry does not land on a torn line
+        """
+        fd = self._segment_fds.pop(date_str, None)
+        if fd is None:
+            return
+        try:
+            if truncate_to is not None:
+                os.ftruncate(fd, truncate_to)
+        except OSError as e:
+            logger.error(f"Failed to truncate torn record in usage ledger segment {date_str}: {str(e)}")
+        finally:
+            os.close(fd)
+
+    def _get_segment_fd(self, date_str: str) -> int:
+        """
+        Get an append-mode file descriptor for a segment.
+
+        Only the most recent segments are kept open.
+
+        Args:
+            date_str: Segment date in YYYY-MM-DD format
+
+        Returns:
+            Open file descriptor
+        """
+        fd = self._segment_fds.get(date_str)
+        if fd is None:
+            fd = os.open(self._get_segment_file(date_str), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._segment_fds[date_str] = fd
+
+            # Records arrive in time order, so older segments are rarely reopened
+            for stale in sorted(self._segment_fds)[:-2]:
+                if stale != date_str:
+                    os.close(self._segment_fds.pop(stale))
+
+        return fd
+
+    def close(self) -> None:
+        """Close open segment file descriptors once any in-flight commit finishes."""
+        with self._commit_lock:
+            while self._writing:
+                self._commit_lock.wait()
+            for fd in self._segment_fds.values():
+                os.close(fd)
+            self._segment_fds = {}
+
+    def get_segment_dates(self) -> List[str]:
+        """
+        Get the dates of all ledger segments.
+
+        Returns:
+            Sorted list of segment dates in YYYY-MM-DD format
+        """
+        dates = []
+        for name in os.listdir(self.ledger_path):
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                dates.append(name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)])
+        return sorted(dates)
+
+    def read_segment(self, date_str: str) -> Iterator[Dict]:
+        """
+        Iterate over the records of one segment.
+
+        A partially written trailing line (e.g. after a crash) is skipped.
+
+        Args:
+            date_str: Segment date in YYYY-MM-DD format
+
+        Yields:
+            Usage record dictionaries in append order
+        """
+        segment_file = self._get_segment_file(date_str)
+        if not os.path.exists(segment_file):
+            return
+
+        with open(segment_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def iter_records(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        customer_id: Optional[str] = None,
+        resource_type: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Iterate over records, reading only the segments that can match.
+
+        Args:
+            start_date: Filter by start date (inclusive)
+            end_date: Filter by end date (inclusive)
+            customer_id: Filter by customer ID
+            resource_type: Filter by resource type value
+
+        Yields:
+            Usage record dictionaries
+        """
+        if customer_id is not None:
+            dates = sorted(self._get_customer_dates(customer_id))
+        else:
+            dates = self.get_segment_dates()
+
+        start_str = start_date.isoformat() if start_date else None
+        end_str = end_date.isoformat() if end_date else None
+
+        for date_str in dates:
+            if start_str and date_str < start_str[:10]:
+                continue
+            if end_str and date_str > end_str[:10]:
+                continue
+
+            for record in self.read_segment(date_str):
+                if customer_id is not None and record["customer_id"] != customer_id:
+                    continue
+                if resource_type is not None and record["resource_type"] != resource_type:
+                    continue
+                if (start_str or end_str) and not self._in_range(record["timestamp"], start_date, end_date):
+                    continue
+                yield record
+
+    def _in_range(self, timestamp: str, start_date: Optional[datetime], end_date: Optional[datetime]) -> bool:
+        """
+        Check whether an ISO timestamp falls within a date range.
+
+        Args:
+            timestamp: ISO-format timestamp
+            start_date: Start of range (inclusive)
+            end_date: End of range (inclusive)
+
+        Returns:
+            True if the timestamp is within the range
+        """
+        value = datetime.fromisoformat(timestamp)
+        if start_date and value < start_date:
+            return False
+        if end_date and value > end_date:
+            return False
+        return True
+
+    def _get_customer_dates(self, customer_id: str) -> Set[str]:
+        """
+        Get the segment dates containing records for a customer.
+
+        Args:
+            customer_id: Customer ID
+
+        Returns:
+            Set of segment dates
+        """
+        with self._index_lock:
+            if self._customer_index is None:
+                self._customer_index = self._build_customer_index()
+            return set(self._customer_index.get(customer_id, ()))
+
+    def _build_customer_index(self) -> Dict[str, Set[str]]:
+        """
+        Build the customer index with one pass over the ledger.
+
+        Returns:
+            Dictionary mapping customer IDs to segment dates
+        """
+        index: Dict[str, Set[str]] = {}
+        for date_str in self.get_segment_dates():
+            for record in self.read_segment(date_str):
+                index.setdefault(record["customer_id"], set()).add(date_str)
+        return index
+
+    def migrate_json_segments(self, legacy_daily_path: str) -> int:
+        """
+        Convert legacy per-day JSON array files into ledger segments.
+
+        Each segment is rewritten through a temporary file and an atomic
+        rename, and records already in the ledger are skipped, so a crash at
+        any point leaves either the old or the new segment and rerunning the
+        migration never duplicates records. Legacy files are removed once
+        their records are in the ledger.
+
+        Args:
+            legacy_daily_path: Directory of legacy usage_YYYY-MM-DD.json files
+
+        Returns:
+            Number of records migrated
+        """
+        # Temporary segments left by a migration that crashed before its rename
+        for name in os.listdir(self.ledger_path):
+            if name.endswith(self.MIGRATION_SUFFIX):
+                os.remove(os.path.join(self.ledger_path, name))
+
+        if not os.path.isdir(legacy_daily_path):
+            return 0
+
+        migrated = 0
+        for name in sorted(os.listdir(legacy_daily_path)):
+            if not (name.startswith(self.SEGMENT_PREFIX) and name.endswith(".json")):
+                continue
+
+            legacy_file = os.path.join(legacy_daily_path, name)
+            try:
+                with open(legacy_file, "r") as f:
+                    records = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to migrate legacy usage file {name}: {str(e)}")
+                continue
+
+            by_segment: Dict[str, List[Dict]] = {}
+            for record in records:
+                by_segment.setdefault(record["timestamp"][:10], []).append(record)
+
+            with self._commit_lock:
+                while self._writing:
+                    self._commit_lock.wait()
+                added = sum(
+                    self._merge_segment(date_str, segment_records)
+                    for date_str, segment_records in sorted(by_segment.items())
+                )
+
+            os.remove(legacy_file)
+            migrated += added
+            logger.info(f"Migrated {added} usage records from legacy file {name}")
+
+        return migrated
+
+    def _merge_segment(self, date_str: str, records: List[Dict]) -> int:
+        """
+        Atomically rewrite a segment with records it does not yet contain.
+
+        Must be called with the commit lock held and no commit in flight.
+
+        Args:
+            date_str: Segment date in YYYY-MM-DD format
+            records: Records to add to the segment
+
+        Returns:
+            Number of records added
+        """
+        segment_file = self._get_segment_file(date_str)
+        existing: List[str] = []
+        seen: Set[str] = set()
+        if os.path.exists(segment_file):
+            with open(segment_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    existing.append(line)
+                    seen.add(record.get("record_id") or line)
+
+        added = []
+        for record in records:
+            line = json.dumps(record, separators=(",", ":")) + "\n"
+            key = record.get("record_id") or line
+            if key not in seen:
+                seen.add(key)
+                added.append((record, line))
+        if not added:
+            return 0
+
+        temp_file = segment_file + self.MIGRATION_SUFFIX
+        with open(temp_file, "w", encoding="utf-8") as f:
+            f.writelines(existing)
+            f.writelines(line for _, line in added)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The open descriptor would keep appending to the replaced file
+        fd = self._segment_fds.pop(date_str, None)
+        if fd is not None:
+            os.close(fd)
+        os.replace(temp_file, segment_file)
+        self._fsync_directory()
+
+        self.records_written += len(added)
+        with self._index_lock:
+            if self._customer_index is not None:
+                for record, _ in added:
+                    self._customer_index.setdefault(record["customer_id"], set()).add(date_str)
+        return len(added)
+
+    def _fsync_directory(self) -> None:
+        """Persist renames in the ledger directory where the platform allows it."""
+        try:
+            fd = os.open(self.ledger_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get ledger commit statistics.
+
+        Returns:
+            Dictionary with record and commit counts
+        """
+        return {
+            "records_written": self.records_written,
+            "commits": self.commits,
+            "segments": len(self.get_segment_dates())
+        }
@@ -7,13 +7,16 @@ and generating usage analytics for the subscription system.
 
 import json
 import os
+import threading
 import time
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from subscription.core.license_generator import LicenseFeature
 from subscription.core.subscription_manager import SubscriptionService, SubscriptionTier
+from subscription.core.usage_cube import Cell, UsageCube
+from subscription.core.usage_ledger import UsageLedger
 
 
 class ResourceType(Enum):
@@ -477,92 +480,258 @@ class QuotaManager:
         return True
 
 
-class UsageTracker:
-    """Class for tracking resource usage."""
+class UsageCounters:
+    """
+    In-memory usage counters for every quota window.
 
-    def __init__(self, storage_path: str):
+    Each customer/resource pair keeps one running total per quota type,
+    tagged with the window it belongs to. A total is reset lazily the first
+    time it is touched in a new window, so reads and increments are O(1).
+    Counters reflect usage recorded through this process and are rebuilt
+    from the usage ledger on startup.
+    """
+
+    WINDOWS = (QuotaType.DAILY, QuotaType.WEEKLY, QuotaType.MONTHLY, QuotaType.ANNUAL, QuotaType.TOTAL)
+
+    def __init__(self, lock_stripes: int = 64):
         """
-        Initialize usage tracker.
+        Initialize usage counters.
 
         Args:
-            storage_path: Path to store usage data
+            lock_stripes: Number of locks customers are spread across
         """
-        self.storage_path = storage_path
-        os.makedirs(storage_path, exist_ok=True)
-        
-        # Create subdirectories for different time periods
-        self.daily_path = os.path.join(storage_path, "daily")
-        self.monthly_path = os.path.join(storage_path, "monthly")
-        self.customer_path = os.path.join(storage_path, "customers")
-        
-        os.makedirs(self.daily_path, exist_ok=True)
-        os.makedirs(self.monthly_path, exist_ok=True)
-        os.makedirs(self.customer_path, exist_ok=True)
+        # (customer_id, resource_type value) -> quota type -> [window key, total]
+        self._counters: Dict[Tuple[str, str], Dict[QuotaType, List[Union[str, int]]]] = {}
+        self._locks = [threading.Lock() for _ in range(max(1, lock_stripes))]
+
+    @staticmethod
+    def window_key(quota_type: QuotaType, timestamp: datetime) -> str:
+        """
+        Get the key of the quota window containing a timestamp.
+
+        Args:
+            quota_type: Quota type
+            timestamp: Point in time
+
+        Returns:
+            Window key (e.g. "2025-03-01" for a daily window)
+        """
+        if quota_type == QuotaType.DAILY:
+            return timestamp.strftime("%Y-%m-%d")
+        if quota_type == QuotaType.WEEKLY:
+            # Weeks start on Monday
+            return (timestamp - timedelta(days=timestamp.weekday())).strftime("%Y-%m-%d")
+        if quota_type == QuotaType.MONTHLY:
+            return timestamp.strftime("%Y-%m")
+        if quota_type == QuotaType.ANNUAL:
+            return timestamp.strftime("%Y")
+        return "total"
 
-    def _get_daily_file(self, date: datetime) -> str:
+    def _lock_for(self, customer_id: str) -> threading.Lock:
         """
-        Get path to daily usage file.
+        Get the lock stripe for a customer.
 
         Args:
-            date: Date for the usage file
+            customer_id: Customer ID
 
         Returns:
-            Path to daily usage file
+            Lock guarding the customer's counters
         """
-        date_str = date.strftime("%Y-%m-%d")
-        return os.path.join(self.daily_path, f"usage_{date_str}.json")
+        return self._locks[hash(customer_id) % len(self._locks)]
 
-    def _get_monthly_file(self, date: datetime) -> str:
+    def _get_total(self, key: Tuple[str, str], quota_type: QuotaType, now: datetime) -> int:
         """
-        Get path to monthly usage file.
+        Get a running total, treating a stale window as empty. Caller holds the lock.
 
         Args:
-            date: Date for the usage file
+            key: (customer_id, resource_type value)
+            quota_type: Quota type
+            now: Current time
 
         Returns:
-            Path to monthly usage file
+            Usage in the current window
         """
-        month_str = date.strftime("%Y-%m")
-        return os.path.join(self.monthly_path, f"usage_{month_str}.json")
+        windows = self._counters.get(key)
+        if not windows:
+            return 0
+        window = windows.get(quota_type)
+        if not window or window[0] != self.window_key(quota_type, now):
+            return 0
+        return window[1]
+
+    def _add(self, key: Tuple[str, str], quantity: int, timestamp: datetime, now: datetime) -> None:
+        """
+        Add usage to every window containing the timestamp. Caller holds the lock.
+
+        Args:
+            key: (customer_id, resource_type value)
+            quantity: Quantity to add
+            timestamp: When the usage occurred
+            now: Current time
+        """
+        windows = self._counters.setdefault(key, {})
+        for quota_type in self.WINDOWS:
+            current_key = self.window_key(quota_type, now)
+            if self.window_key(quota_type, timestamp) != current_key:
+                # Usage from a window that has already rolled over
+                continue
+
+            window = windows.get(quota_type)
+            if window is None or window[0] != current_key:
+                windows[quota_type] = [current_key, quantity]
+            else:
+                window[1] += quantity
 
-    def _get_customer_file(self, customer_id: str) -> str:
+    def add(
+        self,
+        customer_id: str,
+        resource_type: ResourceType,
+        quantity: int,
+        timestamp: Optional[datetime] = None
+    ) -> None:
         """
-        Get path to customer usage file.
+        Add usage to the counters.
 
         Args:
             customer_id: Customer ID
+            resource_type: Resource type
+            quantity: Quantity used
+            timestamp: When the usage occurred (defaults to now)
+        """
+        now = datetime.now()
+        with self._lock_for(customer_id):
+            self._add((customer_id, resource_type.value), quantity, timestamp or now, now)
+
+    def release(
+        self,
+        customer_id: str,
+        resource_type: ResourceType,
+        quantity: int,
+        timestamp: datetime
+    ) -> None:
+        """
+        Undo usage counted for a request that was not recorded.
+
+        The quantity is taken back from the windows it was charged to, which
+        are the windows containing its timestamp. Windows that have rolled
+        over since are left alone, so a late rollback never reduces usage in
+        a newer window.
+
+        Args:
+            customer_id: Customer ID
+            resource_type: Resource type
+            quantity: Quantity that was counted
+            timestamp: Timestamp the usage was counted with
+        """
+        with self._lock_for(customer_id):
+            windows = self._counters.get((customer_id, resource_type.value))
+            if not windows:
+                return
+            for quota_type, window in windows.items():
+                if window[0] == self.window_key(quota_type, timestamp):
+                    window[1] = max(0, window[1] - quantity)
+
+    def get(self, customer_id: str, resource_type: ResourceType, quota_type: QuotaType) -> int:
+        """
+        Get usage in the current window of a quota type.
+
+        Args:
+            customer_id: Customer ID
+            resource_type: Resource type
+            quota_type: Quota type
 
         Returns:
-            Path to customer usage file
+            Usage quantity
         """
-        return os.path.join(self.customer_path, f"usage_{customer_id}.json")
+        with self._lock_for(customer_id):
+            return self._get_total((customer_id, resource_type.value), quota_type, datetime.now())
 
-    def _append_usage_record(self, file_path: str, record: UsageRecord) -> None:
+    def check_and_increment(
+        self,
+        customer_id: str,
+        resource_type: ResourceType,
+        quantity: int,
+        quota: QuotaDefinition,
+        timestamp: Optional[datetime] = None
+    ) -> Tuple[bool, int]:
         """
-        Append usage record to a file.
+        Atomically check a quota and count the usage if it is allowed.
+
+        Usage over the limit is still counted unless the quota action is BLOCK.
 
         Args:
-            file_path: Path to usage file
-            record: Usage record to append
+            customer_id: Customer ID
+            resource_type: Resource type
+            quantity: Quantity requested
+            quota: Applicable quota definition
+            timestamp: When the usage occurs (defaults to now)
+
+        Returns:
+            Tuple of (counted, usage before this request)
+        """
+        now = datetime.now()
+        key = (customer_id, resource_type.value)
+        with self._lock_for(customer_id):
+            current_usage = self._get_total(key, quota.quota_type, now)
+            if current_usage + quantity > quota.limit and quota.action == QuotaAction.BLOCK:
+                return False, current_usage
+            self._add(key, quantity, timestamp or now, now)
+            return True, current_usage
+
+    def rebuild(self, records: Iterable[Dict]) -> None:
+        """
+        Replace the counters with totals computed from usage records.
+
+        Args:
+            records: Usage record dictionaries
+        """
+        now = datetime.now()
+        rebuilt = UsageCounters(len(self._locks))
+        for record in records:
+            rebuilt._add(
+                (record["customer_id"], record["resource_type"]),
+                record["quantity"],
+                datetime.fromisoformat(record["timestamp"]),
+                now
+            )
+        self._counters = rebuilt._counters
+
+
+class UsageTracker:
+    """Class for tracking resource usage."""
+
+    def __init__(self, storage_path: str, fsync: bool = False):
         """
-        records = []
+        Initialize usage tracker.
+
+        Args:
+            storage_path: Path to store usage data
+            fsync: Whether to fsync usage ledger commits
+        """
+        self.storage_path = storage_path
+        os.makedirs(storage_path, exist_ok=True)
+        
+        # Usage records live in an append-only ledger partitioned by day
+        self.ledger = UsageLedger(os.path.join(storage_path, "ledger"), fsync=fsync)
         
-        # Load existing records if file exists
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, "r") as f:
-                    records = json.load(f)
-            except Exception:
-                records = []
+        # Fold in per-day JSON files written by earlier versions
+        legacy_daily_path = os.path.join(storage_path, "daily")
+        migrated = self.ledger.migrate_json_segments(legacy_daily_path)
+        if migrated:
+            print(f"Migrated {migrated} usage records to the usage ledger")
         
-        # Append new record
-        records.append(record.to_dict())
+        # Quota window counters and the analytics cube, rebuilt with one pass over the ledger
+        self.counters = UsageCounters()
+        self.cube = UsageCube()
         
-        # Save updated records
-        with open(file_path, "w") as f:
-            json.dump(records, f, indent=2)
+        def replay():
+            for record in self.ledger.iter_records():
+                self.cube.add(record)
+                yield record
+        
+        self.counters.rebuild(replay())
 
-    def track_usage(
+    def create_record(
         self,
         customer_id: str,
         resource_type: ResourceType,
@@ -572,7 +741,7 @@ class UsageTracker:
         metadata: Optional[Dict[str, str]] = None
     ) -> UsageRecord:
         """
-        Track resource usage.
+        Create a usage record without recording it.
 
         Args:
             customer_id: Customer ID
@@ -583,38 +752,79 @@ class UsageTracker:
             metadata: Additional metadata about the usage
 
         Returns:
-            Created usage record
+            New usage record
         """
         # Generate record ID
         import uuid
         record_id = str(uuid.uuid4())
         
-        # Create timestamp
-        timestamp = datetime.now()
-        
-        # Create usage record
-        record = UsageRecord(
+        return UsageRecord(
             record_id=record_id,
             customer_id=customer_id,
             resource_type=resource_type,
             quantity=quantity,
-            timestamp=timestamp,
+            timestamp=datetime.now(),
             subscription_id=subscription_id,
             feature=feature,
             metadata=metadata
         )
+
+    def record_usage(self, record: UsageRecord, update_counters: bool = True) -> UsageRecord:
+        """
+        Append a usage record to the ledger.
+
+        Args:
+            record: Usage record to append
+            update_counters: Whether to add the record to the quota counters
+                (False when the caller already counted it)
+
+        Returns:
+            The recorded usage record
+        """
+        # Single append to the ledger; daily, monthly and customer views read from it
+        data = record.to_dict()
+        self.ledger.append(data)
+        self.cube.add(data)
         
-        # Append to daily file
-        self._append_usage_record(self._get_daily_file(timestamp), record)
-        
-        # Append to monthly file
-        self._append_usage_record(self._get_monthly_file(timestamp), record)
-        
-        # Append to customer file
-        self._append_usage_record(self._get_customer_file(customer_id), record)
+        if update_counters:
+            self.counters.add(record.customer_id, record.resource_type, record.quantity, record.timestamp)
         
         return record
 
+    def track_usage(
+        self,
+        customer_id: str,
+        resource_type: ResourceType,
+        quantity: int,
+        subscription_id: Optional[str] = None,
+        feature: Optional[LicenseFeature] = None,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> UsageRecord:
+        """
+        Track resource usage.
+
+        Args:
+            customer_id: Customer ID
+            resource_type: Type of resource used
+            quantity: Amount of resource used
+            subscription_id: Associated subscription ID
+            feature: Feature associated with the usage
+            metadata: Additional metadata about the usage
+
+        Returns:
+            Created usage record
+        """
+        record = self.create_record(
+            customer_id=customer_id,
+            resource_type=resource_type,
+            quantity=quantity,
+            subscription_id=subscription_id,
+            feature=feature,
+            metadata=metadata
+        )
+        
+        return self.record_usage(record)
+
     def get_daily_usage(
         self,
         date: datetime,
@@ -632,25 +842,14 @@ class UsageTracker:
         Returns:
             List of usage records
         """
-        daily_file = self._get_daily_file(date)
-        
-        if not os.path.exists(daily_file):
-            return []
-            
         try:
-            with open(daily_file, "r") as f:
-                records_data = json.load(f)
-                
-            records = [UsageRecord.from_dict(data) for data in records_data]
-            
-            # Apply filters
-            if customer_id:
-                records = [r for r in records if r.customer_id == customer_id]
-                
-            if resource_type:
-                records = [r for r in records if r.resource_type == resource_type]
-                
-            return records
+            resource_value = resource_type.value if resource_type else None
+            return [
+                UsageRecord.from_dict(data)
+                for data in self.ledger.read_segment(date.strftime("%Y-%m-%d"))
+                if (not customer_id or data["customer_id"] == customer_id)
+                and (not resource_value or data["resource_type"] == resource_value)
+            ]
         except Exception as e:
             print(f"Failed to get daily usage: {str(e)}")
             return []
@@ -674,26 +873,22 @@ class UsageTracker:
         Returns:
             List of usage records
         """
-        date = datetime(year, month, 1)
-        monthly_file = self._get_monthly_file(date)
-        
-        if not os.path.exists(monthly_file):
-            return []
+        start_date = datetime(year, month, 1)
+        if month == 12:
+            end_date = datetime(year + 1, 1, 1) - timedelta(microseconds=1)
+        else:
+            end_date = datetime(year, month + 1, 1) - timedelta(microseconds=1)
             
         try:
-            with open(monthly_file, "r") as f:
-                records_data = json.load(f)
-                
-            records = [UsageRecord.from_dict(data) for data in records_data]
-            
-            # Apply filters
-            if customer_id:
-                records = [r for r in records if r.customer_id == customer_id]
-                
-            if resource_type:
-                records = [r for r in records if r.resource_type == resource_type]
-                
-            return records
+            return [
+                UsageRecord.from_dict(data)
+                for data in self.ledger.iter_records(
+                    start_date=start_date,
+                    end_date=end_date,
+                    customer_id=customer_id,
+                    resource_type=resource_type.value if resource_type else None
+                )
+            ]
         except Exception as e:
             print(f"Failed to get monthly usage: {str(e)}")
             return []
@@ -717,28 +912,16 @@ class UsageTracker:
         Returns:
             List of usage records
         """
-        customer_file = self._get_customer_file(customer_id)
-        
-        if not os.path.exists(customer_file):
-            return []
-            
         try:
-            with open(customer_file, "r") as f:
-                records_data = json.load(f)
-                
-            records = [UsageRecord.from_dict(data) for data in records_data]
-            
-            # Apply filters
-            if start_date:
-                records = [r for r in records if r.timestamp >= start_date]
-                
-            if end_date:
-                records = [r for r in records if r.timestamp <= end_date]
-                
-            if resource_type:
-                records = [r for r in records if r.resource_type == resource_type]
-                
-            return records
+            return [
+                UsageRecord.from_dict(data)
+                for data in self.ledger.iter_records(
+                    start_date=start_date,
+                    end_date=end_date,
+                    customer_id=customer_id,
+                    resource_type=resource_type.value if resource_type else None
+                )
+            ]
         except Exception as e:
             print(f"Failed to get customer usage: {str(e)}")
             return []
@@ -762,14 +945,14 @@ class UsageTracker:
         Returns:
             Total usage quantity
         """
-        records = self.get_customer_usage(
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date,
-            resource_type=resource_type
+        return sum(
+            cell[5] for cell in self.iter_usage_cells(
+                start_date=start_date,
+                end_date=end_date,
+                customer_id=customer_id,
+                resource_type=resource_type
+            )
         )
-        
-        return sum(record.quantity for record in records)
 
     def get_daily_summary(
         self,
@@ -791,20 +974,15 @@ class UsageTracker:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        records = self.get_customer_usage(
-            customer_id=customer_id,
+        # Group by day
+        daily_summary = {}
+        for date_str, _, _, _, _, quantity in self.iter_usage_cells(
             start_date=start_date,
             end_date=end_date,
+            customer_id=customer_id,
             resource_type=resource_type
-        )
-        
-        # Group by day
-        daily_summary = {}
-        for record in records:
-            date_str = record.timestamp.strftime("%Y-%m-%d")
-            if date_str not in daily_summary:
-                daily_summary[date_str] = 0
-            daily_summary[date_str] += record.quantity
+        ):
+            daily_summary[date_str] = daily_summary.get(date_str, 0) + quantity
             
         return daily_summary
 
@@ -825,26 +1003,114 @@ class UsageTracker:
         Returns:
             Dictionary mapping customer IDs to usage quantities
         """
-        # This would be more efficient with a database
-        # For file-based storage, we need to scan all daily files
+        whole_days, edges = self._split_period(start_date, end_date)
         
-        current_date = start_date
         customer_usage = {}
+        if whole_days:
+            customer_usage = self.cube.get_customer_totals(resource_type.value, *whole_days)
         
-        while current_date <= end_date:
-            records = self.get_daily_usage(
-                date=current_date,
-                resource_type=resource_type
-            )
+        # Partially covered days come from the ledger
+        for edge_start, edge_end in edges:
+            for data in self.ledger.iter_records(
+                start_date=edge_start,
+                end_date=edge_end,
+                resource_type=resource_type.value
+            ):
+                customer_id = data["customer_id"]
+                customer_usage[customer_id] = customer_usage.get(customer_id, 0) + data["quantity"]
+            
+        return customer_usage
+
+    def _split_period(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> Tuple[Optional[Tuple[Optional[str], Optional[str]]], List[Tuple[datetime, datetime]]]:
+        """
+        Split a period into whole days and partially covered edge days.
+
+        Args:
+            start_date: Start of the period (inclusive, None for unbounded)
+            end_date: End of the period (inclusive, None for unbounded)
+
+        Returns:
+            Tuple of (whole days, edge ranges). Whole days is a (first day, last day)
+            pair of YYYY-MM-DD strings, with None for an unbounded side, or None if
+            the period contains no whole day. Edge ranges are (start, end) pairs.
+        """
+        if start_date is not None and end_date is not None and end_date < start_date:
+            return None, []
             
-            for record in records:
-                if record.customer_id not in customer_usage:
-                    customer_usage[record.customer_id] = 0
-                customer_usage[record.customer_id] += record.quantity
+        one_day = timedelta(days=1)
+        last_instant = one_day - timedelta(microseconds=1)
+        first_day = last_day = None
+        edges = []
+        
+        start_partial = False
+        if start_date is not None:
+            start_midnight = datetime.combine(start_date.date(), datetime.min.time())
+            start_partial = start_date != start_midnight
+            first_day = (start_midnight + one_day if start_partial else start_midnight).strftime("%Y-%m-%d")
+            if start_partial:
+                day_end = start_midnight + last_instant
+                edges.append((start_date, min(end_date, day_end) if end_date else day_end))
                 
-            current_date += timedelta(days=1)
+        if end_date is not None:
+            end_midnight = datetime.combine(end_date.date(), datetime.min.time())
+            end_partial = end_date < end_midnight + last_instant
+            last_day = (end_midnight - one_day if end_partial else end_midnight).strftime("%Y-%m-%d")
+            same_day_as_start = start_date is not None and start_date.date() == end_date.date()
+            if end_partial and not (start_partial and same_day_as_start):
+                edges.append((end_midnight, end_date))
+                
+        if first_day is not None and last_day is not None and first_day > last_day:
+            return None, edges
             
-        return customer_usage
+        return (first_day, last_day), edges
+
+    def iter_usage_cells(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        customer_id: Optional[str] = None,
+        resource_type: Optional[ResourceType] = None
+    ) -> Iterator[Cell]:
+        """
+        Iterate over aggregated usage for a period.
+
+        Whole days are served from the usage cube; days the period only
+        partially covers are aggregated from the ledger.
+
+        Args:
+            start_date: Filter by start date (inclusive)
+            end_date: Filter by end date (inclusive)
+            customer_id: Filter by customer ID
+            resource_type: Filter by resource type
+
+        Yields:
+            Tuples of (day, customer ID, resource type, feature, subscription ID, quantity)
+        """
+        resource_value = resource_type.value if resource_type else None
+        whole_days, edges = self._split_period(start_date, end_date)
+        
+        if whole_days:
+            yield from self.cube.get_cells(whole_days[0], whole_days[1], customer_id, resource_value)
+            
+        for edge_start, edge_end in edges:
+            for data in self.ledger.iter_records(
+                start_date=edge_start,
+                end_date=edge_end,
+                customer_id=customer_id,
+                resource_type=resource_value
+            ):
+                yield (
+                    data["timestamp"][:10],
+                    data["customer_id"],
+                    data["resource_type"],
+                    data.get("feature"),
+                    data.get("subscription_id"),
+                    data["quantity"]
+                )
 
 
 class QuotaEnforcer:
@@ -924,41 +1190,7 @@ class QuotaEnforcer:
         Returns:
             Current usage quantity
         """
-        now = datetime.now()
-        
-        if quota_type == QuotaType.DAILY:
-            # Daily quota - get usage for today
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = now
-            
-        elif quota_type == QuotaType.WEEKLY:
-            # Weekly quota - get usage for this week
-            # Assuming weeks start on Monday (0 = Monday in Python's weekday())
-            days_since_monday = now.weekday()
-            start_date = (now - timedelta(days=days_since_monday)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end_date = now
-            
-        elif quota_type == QuotaType.MONTHLY:
-            # Monthly quota - get usage for this month
-            start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            end_date = now
-            
-        elif quota_type == QuotaType.ANNUAL:
-            # Annual quota - get usage for this year
-            start_date = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-            end_date = now
-            
-        else:  # QuotaType.TOTAL
-            # Total quota - get all usage
-            start_date = datetime(2000, 1, 1)  # Far in the past
-            end_date = now
-            
-        return self.usage_tracker.get_usage_summary(
-            customer_id=customer_id,
-            resource_type=resource_type,
-            start_date=start_date,
-            end_date=end_date
-        )
+        return self.usage_tracker.counters.get(customer_id, resource_type, quota_type)
 
     def check_quota(
         self,
@@ -1033,19 +1265,22 @@ class QuotaEnforcer:
         Returns:
             Tuple of (allowed, usage_record, message)
         """
-        # Check quota first
-        allowed, action, message = self.check_quota(
-            customer_id=customer_id,
-            resource_type=resource_type,
-            quantity=quantity
-        )
+        # Get applicable quota
+        quota = self._get_applicable_quota(customer_id, resource_type)
         
-        if not allowed:
-            # Quota exceeded and action is BLOCK
-            return False, None, message
+        if not quota:
+            # No quota defined, just track the usage
+            record = self.usage_tracker.track_usage(
+                customer_id=customer_id,
+                resource_type=resource_type,
+                quantity=quantity,
+                subscription_id=subscription_id,
+                feature=feature,
+                metadata=metadata
+            )
+            return True, record, None
             
-        # Track the usage
-        record = self.usage_tracker.track_usage(
+        record = self.usage_tracker.create_record(
             customer_id=customer_id,
             resource_type=resource_type,
             quantity=quantity,
@@ -1054,13 +1289,37 @@ class QuotaEnforcer:
             metadata=metadata
         )
         
-        # Return result based on action
-        if action:
-            # Quota will be exceeded but operation is allowed
-            return True, record, message
+        # Check and count in one step so concurrent requests cannot both slip under the limit
+        counted, current_usage = self.usage_tracker.counters.check_and_increment(
+            customer_id=customer_id,
+            resource_type=resource_type,
+            quantity=quantity,
+            quota=quota,
+            timestamp=record.timestamp
+        )
+        
+        message = None
+        if current_usage + quantity > quota.limit:
+            message = (
+                f"Quota exceeded for {resource_type.value}. "
+                f"Current usage: {current_usage}, "
+                f"Requested: {quantity}, "
+                f"Limit: {quota.limit}"
+            )
             
-        # Within quota
-        return True, record, None
+        if not counted:
+            # Quota exceeded and action is BLOCK
+            return False, None, message
+            
+        # Track the usage; it has already been counted
+        try:
+            self.usage_tracker.record_usage(record, update_counters=False)
+        except Exception:
+            self.usage_tracker.counters.release(customer_id, resource_type, quantity, record.timestamp)
+            raise
+        
+        # Message is set when quota is exceeded but the operation is allowed
+        return True, record, message
 
     def get_quota_status(
         self,
@@ -1194,23 +1453,16 @@ class UsageAnalytics:
         Returns:
             Dictionary mapping resource types to usage quantities
         """
-        # Get all resource types
-        resource_types = [rt for rt in ResourceType]
-        
-        # Get usage for each resource type
+        # Group by resource type
         distribution = {}
-        for resource_type in resource_types:
-            usage = self.usage_tracker.get_usage_summary(
-                customer_id=customer_id,
-                resource_type=resource_type,
-                start_date=start_date,
-                end_date=end_date
-            )
+        for _, _, resource_key, _, _, quantity in self.usage_tracker.iter_usage_cells(
+            start_date=start_date,
+            end_date=end_date,
+            customer_id=customer_id
+        ):
+            distribution[resource_key] = distribution.get(resource_key, 0) + quantity
             
-            if usage > 0:
-                distribution[resource_type.value] = usage
-                
-        return distribution
+        return {key: usage for key, usage in distribution.items() if usage > 0}
 
     def get_feature_usage(
         self,
@@ -1229,22 +1481,15 @@ class UsageAnalytics:
         Returns:
             Dictionary mapping features to usage quantities
         """
-        # Get all usage records for the period
-        records = self.usage_tracker.get_customer_usage(
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
         # Group by feature
         feature_usage = {}
-        for record in records:
-            feature_key = record.feature.value if record.feature else "unknown"
-            
-            if feature_key not in feature_usage:
-                feature_usage[feature_key] = 0
-                
-            feature_usage[feature_key] += record.quantity
+        for _, _, _, feature, _, quantity in self.usage_tracker.iter_usage_cells(
+            start_date=start_date,
+            end_date=end_date,
+            customer_id=customer_id
+        ):
+            feature_key = feature or "unknown"
+            feature_usage[feature_key] = feature_usage.get(feature_key, 0) + quantity
             
         return feature_usage
 
@@ -1265,22 +1510,15 @@ class UsageAnalytics:
         Returns:
             Dictionary mapping subscription IDs to usage quantities
         """
-        # Get all usage records for the period
-        records = self.usage_tracker.get_customer_usage(
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
         # Group by subscription
         subscription_usage = {}
-        for record in records:
-            subscription_key = record.subscription_id or "unknown"
-            
-            if subscription_key not in subscription_usage:
-                subscription_usage[subscription_key] = 0
-                
-            subscription_usage[subscription_key] += record.quantity
+        for _, _, _, _, subscription_id, quantity in self.usage_tracker.iter_usage_cells(
+            start_date=start_date,
+            end_date=end_date,
+            customer_id=customer_id
+        ):
+            subscription_key = subscription_id or "unknown"
+            subscription_usage[subscription_key] = subscription_usage.get(subscription_key, 0) + quantity
             
         return subscription_usage
 
@@ -1301,45 +1539,22 @@ class UsageAnalytics:
         Returns:
             Dictionary with various usage metrics
         """
-        # Get all usage records for the period
-        records = self.usage_tracker.get_customer_usage(
-            customer_id=customer_id,
-            start_date=start_date,
-            end_date=end_date
-        )
-        
-        # Calculate total usage
-        total_usage = sum(record.quantity for record in records)
-        
-        # Group by resource type
+        total_usage = 0
         resource_usage = {}
-        for record in records:
-            resource_key = record.resource_type.value
-            
-            if resource_key not in resource_usage:
-                resource_usage[resource_key] = 0
-                
-            resource_usage[resource_key] += record.quantity
-            
-        # Group by feature
         feature_usage = {}
-        for record in records:
-            feature_key = record.feature.value if record.feature else "unknown"
-            
-            if feature_key not in feature_usage:
-                feature_usage[feature_key] = 0
-                
-            feature_usage[feature_key] += record.quantity
-            
-        # Group by day
         daily_usage = {}
-        for record in records:
-            date_key = record.timestamp.strftime("%Y-%m-%d")
-            
-            if date_key not in daily_usage:
-                daily_usage[date_key] = 0
-                
-            daily_usage[date_key] += record.quantity
+        
+        # One pass over the aggregated cells for the period
+        for date_key, _, resource_key, feature, _, quantity in self.usage_tracker.iter_usage_cells(
+            start_date=start_date,
+            end_date=end_date,
+            customer_id=customer_id
+        ):
+            total_usage += quantity
+            resource_usage[resource_key] = resource_usage.get(resource_key, 0) + quantity
+            feature_key = feature or "unknown"
+            feature_usage[feature_key] = feature_usage.get(feature_key, 0) + quantity
+            daily_usage[date_key] = daily_usage.get(date_key, 0) + quantity
             
         # Return comprehensive report
         return {
@@ -1377,15 +1592,8 @@ class UsageAnalytics:
             end_date=end_date
         )
         
-        # Sort by usage (descending)
-        sorted_customers = sorted(
-            customer_usage.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        # Return top N customers
-        return dict(sorted_customers[:limit])
+        # Select the top N customers with a bounded heap instead of a full sort
+        return dict(UsageCube.top_k(customer_usage, limit))
 
 
 class UsageService:
@@ -0,0 +1,187 @@
+"""
+Tests for the sharded ingest buffer of the analytics telemetry system.
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.analytics.analytics_telemetry_system import (
+    AnalyticsConfig, Event, EventCategory, EventCollector, EventType, IngestBuffer,
+    OverflowPolicy, StorageManager, StorageType
+)
+
+
+def put_from_thread(buffer, items, done=None):
+    """Put items from a new producer thread, which stays alive until done is set."""
+    queued = threading.Event()
+    
+    def produce():
+        for item in items:
+            buffer.put(item)
+        queued.set()
+        if done is not None:
+            done.wait(5.0)
+    
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    queued.wait(5.0)
+    return thread
+
+
+class TestIngestBuffer(unittest.TestCase):
+    """Test cases for IngestBuffer."""
+    
+    def test_drop_newest_rejects_incoming(self):
+        """Test that a full shard rejects new items with the DROP_NEWEST policy."""
+        buffer = IngestBuffer(capacity=3, overflow_policy=OverflowPolicy.DROP_NEWEST)
+        
+        results = [buffer.put(i) for i in range(5)]
+        
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(buffer.drain(), [0, 1, 2])
+        stats = buffer.get_stats()
+        self.assertEqual(stats["enqueued"], 3)
+        self.assertEqual(stats["dropped"], 2)
+    
+    def test_drop_oldest_evicts_queued(self):
+        """Test that a full shard evicts its oldest items with the DROP_OLDEST policy."""
+        buffer = IngestBuffer(capacity=3, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        
+        results = [buffer.put(i) for i in range(5)]
+        
+        self.assertTrue(all(results))
+        self.assertEqual(buffer.drain(), [2, 3, 4])
+        self.assertEqual(buffer.get_stats()["dropped"], 2)
+    
+    def test_block_waits_for_space(self):
+        """Test that the BLOCK policy waits for the consumer, then drops on timeout."""
+        buffer = IngestBuffer(capacity=1, overflow_policy=OverflowPolicy.BLOCK, block_timeout=0.5)
+        buffer.put("first")
+        
+        consumer = threading.Timer(0.05, buffer.drain)
+        consumer.start()
+        start = time.monotonic()
+        self.assertTrue(buffer.put("second"))
+        self.assertLess(time.monotonic() - start, 0.4)
+        consumer.join()
+        
+        buffer.block_timeout = 0.05
+        start = time.monotonic()
+        self.assertFalse(buffer.put("third"))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertEqual(buffer.drain(), ["second"])
+        self.assertEqual(buffer.get_stats()["dropped"], 1)
+    
+    def test_full_shard_wakes_consumer(self):
+        """Test that reaching the high watermark wakes the consumer."""
+        buffer = IngestBuffer(capacity=10, high_watermark=2)
+        
+        buffer.put(1)
+        self.assertFalse(buffer.wait(timeout=0))
+        buffer.put(2)
+        self.assertTrue(buffer.wait(timeout=0))
+    
+    def test_drain_order_rotates_shards(self):
+        """Test that drains keep per-producer order and start at a different shard each time."""
+        buffer = IngestBuffer()
+        done = threading.Event()
+        self.addCleanup(done.set)
+        put_from_thread(buffer, ["a1", "a2", "a3"], done)
+        put_from_thread(buffer, ["b1", "b2", "b3"], done)
+        
+        batches = [buffer.drain(max_items=2) for _ in range(3)]
+        
+        self.assertEqual(batches, [["a1", "a2"], ["b1", "b2"], ["a3", "b3"]])
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.get_stats()["drained"], 6)
+    
+    def test_exited_producers_are_pruned(self):
+        """Test that shards of exited threads are removed once empty, keeping their counters."""
+        buffer = IngestBuffer(capacity=2)
+        put_from_thread(buffer, [1, 2, 3]).join()
+        
+        self.assertEqual(buffer.drain(), [1, 2])
+        stats = buffer.get_stats()
+        self.assertEqual(stats["shards"], 0)
+        self.assertEqual(stats["enqueued"], 2)
+        self.assertEqual(stats["dropped"], 1)
+
+
+class TestIngestConsumers(unittest.TestCase):
+    """Test cases for the collectors and storage manager that consume ingest buffers."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.config = AnalyticsConfig(
+            storage_type=StorageType.LOCAL,
+            local_storage_path=self.temp_dir,
+            batch_size=10,
+            include_system_info=False,
+            include_performance_metrics=False
+        )
+    
+    def collect(self, collector, count):
+        """Collect count feature usage events."""
+        for i in range(count):
+            collector.collect_event(EventType.FEATURE_USAGE, EventCategory.FEATURE, {"index": i})
+    
+    def test_backlog_is_drained_without_waiting(self):
+        """Test that the consumer keeps draining batches while items are queued."""
+        collector = EventCollector(self.config)
+        self.addCleanup(collector.stop)
+        self.collect(collector, 45)
+        
+        collector.start()
+        deadline = time.monotonic() + 0.15
+        while len(collector.event_buffer) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        
+        self.assertEqual(len(collector.event_buffer), 0)
+    
+    def test_collector_stop_drains_buffer(self):
+        """Test that stopping the collector processes everything already queued."""
+        collector = EventCollector(self.config)
+        processed = []
+        collector.add_event_processor(lambda event: processed.append(event) or event)
+        collector.start()
+        self.collect(collector, 250)
+        
+        collector.stop()
+        
+        # Session start, 250 events and session end
+        self.assertEqual(len(processed), 252)
+        self.assertEqual(collector.get_ingest_stats()["drained"], 252)
+    
+    def test_storage_stop_flushes(self):
+        """Test that stopping the storage manager flushes events queued since the last flush."""
+        storage = StorageManager(self.config)
+        storage.start()
+        for i in range(5):
+            storage.store_event(Event(
+                event_id=str(i),
+                event_type=EventType.FEATURE_USAGE,
+                category=EventCategory.FEATURE,
+                timestamp=datetime.now(),
+                data={"index": i},
+                session_id="session"
+            ))
+        
+        storage.stop()
+        
+        self.assertEqual(storage.get_stats()["flushed_events"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Tests for the streaming anomaly detector of the metric processor.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.analytics.processing.online_anomaly import OnlineAnomalyDetector
+
+START = datetime(2026, 1, 5, 9, 0, 0)
+
+
+def series(count, start=START, step=timedelta(minutes=1)):
+    """Return alternating 10/12 values with timestamps one step apart."""
+    return [(10.0 + 2 * (i % 2), start + i * step) for i in range(count)]
+
+
+class TestOnlineAnomalyDetector(unittest.TestCase):
+    """Test cases for OnlineAnomalyDetector."""
+
+    def observe_all(self, detector, values, metric_name="latency", dimensions=None):
+        """Observe values into one series and return the reported anomalies."""
+        dimensions = dimensions or {}
+        key = ",".join(f"{k}={v}" for k, v in sorted(dimensions.items())) or "default"
+        reported = []
+        for value, timestamp in values:
+            anomaly = detector.observe(metric_name, value, key, dimensions, timestamp)
+            if anomaly is not None:
+                reported.append(anomaly)
+        return reported
+
+    def test_warm_up_before_scoring(self):
+        """Test that values are not scored until the baseline has min_samples values."""
+        detector = OnlineAnomalyDetector(seasonality=None, min_samples=10)
+
+        reported = self.observe_all(detector, series(5) + [(1000.0, START + timedelta(minutes=5))])
+
+        self.assertEqual(reported, [])
+        self.assertEqual(detector.get_stats()["observed_count"], 6)
+
+    def test_ewma_baseline(self):
+        """Test that outliers are scored against the EWMA baseline and folded in afterwards."""
+        detector = OnlineAnomalyDetector(seasonality=None, min_samples=10)
+        self.observe_all(detector, series(20))
+
+        reported = self.observe_all(detector, [(50.0, START + timedelta(minutes=20))])
+
+        self.assertEqual(len(reported), 1)
+        self.assertEqual(reported[0]["baseline_source"], "ewma")
+        self.assertEqual(reported[0]["direction"], "above")
+        self.assertAlmostEqual(reported[0]["baseline_avg"], 11.0, delta=0.5)
+
+        baseline = detector.get_baseline("latency", "default")
+        self.assertEqual(baseline["overall"]["count"], 21)
+        self.assertEqual(baseline["ewma"]["alpha"], 0.1)
+        self.assertGreater(baseline["ewma"]["mean"], reported[0]["baseline_avg"])
+        self.assertEqual(baseline["anomaly_count"], 1)
+
+    def test_seasonal_baseline(self):
+        """Test that a seasonal bucket with enough samples is preferred."""
+        detector = OnlineAnomalyDetector(seasonality="hour_of_day", min_samples=5)
+        for day in range(6):
+            self.observe_all(detector, [(100.0 + day % 2, START + timedelta(days=day))])
+            self.observe_all(detector, [(10.0 + day % 2, START + timedelta(days=day, hours=3))])
+
+        # 100 is normal at 9:00 even though the EWMA level is pulled down by 12:00 values
+        self.assertEqual(self.observe_all(detector, [(100.0, START + timedelta(days=6))]), [])
+        reported = self.observe_all(detector, [(100.0, START + timedelta(days=6, hours=3))])
+
+        self.assertEqual(reported[0]["baseline_source"], "seasonal")
+        self.assertEqual(sorted(detector.get_baseline("latency", "default")["seasonal"]), [9, 12])
+
+    def test_get_anomalies_defaults_to_detector_sensitivity(self):
+        """Test that queries without a sensitivity use the detector's, and higher ones filter."""
+        detector = OnlineAnomalyDetector(sensitivity=2.0, seasonality=None, min_samples=10)
+        self.observe_all(detector, series(20))
+        self.observe_all(detector, [(14.0, START + timedelta(minutes=20))])
+        self.observe_all(detector, [(60.0, START + timedelta(minutes=21))])
+        end = START + timedelta(hours=1)
+
+        deviations = [a["deviation"] for a in detector.get_anomalies("latency", START, end)]
+
+        self.assertEqual(len(deviations), 2)
+        self.assertTrue(all(d >= 2.0 for d in deviations))
+        strict = detector.get_anomalies("latency", START, end, sensitivity=max(deviations))
+        self.assertEqual([a["value"] for a in strict], [60.0])
+        self.assertEqual(detector.get_anomalies("latency", START, end, sensitivity=0),
+                         detector.get_anomalies("latency", START, end))
+
+    def test_retain_sensitivity_answers_lower_queries(self):
+        """Test that anomalies between retain_sensitivity and sensitivity are queryable but not reported."""
+        detector = OnlineAnomalyDetector(
+            sensitivity=4.0, retain_sensitivity=1.5, seasonality=None, min_samples=10
+        )
+        self.observe_all(detector, series(20))
+        reported = self.observe_all(detector, [(14.0, START + timedelta(minutes=20))])
+        end = START + timedelta(hours=1)
+
+        self.assertEqual(reported, [])
+        self.assertEqual(detector.get_anomalies("latency", START, end), [])
+        lower = detector.get_anomalies("latency", START, end, sensitivity=1.5)
+        self.assertEqual([a["value"] for a in lower], [14.0])
+        self.assertEqual(detector.get_stats()["anomaly_count"], 0)
+
+    def test_get_anomalies_filters_time_and_dimensions(self):
+        """Test that queries filter by time range and dimension subset."""
+        detector = OnlineAnomalyDetector(seasonality=None, min_samples=10)
+        for region in ("us", "eu"):
+            dimensions = {"region": region, "host": "a"}
+            self.observe_all(detector, series(20), dimensions=dimensions)
+            self.observe_all(detector, [(60.0, START + timedelta(minutes=30))], dimensions=dimensions)
+        end = START + timedelta(hours=1)
+
+        self.assertEqual(len(detector.get_anomalies("latency", START, end)), 2)
+        eu = detector.get_anomalies("latency", START, end, dimensions={"region": "eu"})
+        self.assertEqual([a["dimensions"]["region"] for a in eu], ["eu"])
+        self.assertEqual(detector.get_anomalies("latency", START, START + timedelta(minutes=29)), [])
+        self.assertEqual(detector.get_anomalies("errors", START, end), [])
+
+    def test_rebuild_matches_live_observation(self):
+        """Test that replaying stored values rebuilds the same baselines and anomalies."""
+        values = series(30) + [(60.0, START + timedelta(minutes=30))]
+        live = OnlineAnomalyDetector(min_samples=10)
+        self.observe_all(live, values)
+
+        restarted = OnlineAnomalyDetector(min_samples=10)
+        replayed = restarted.rebuild(
+            ("latency", value, "default", {}, timestamp) for value, timestamp in reversed(values)
+        )
+        end = START + timedelta(hours=1)
+
+        self.assertEqual(replayed, len(values))
+        self.assertEqual(restarted.get_baseline("latency", "default"), live.get_baseline("latency", "default"))
+        self.assertEqual(restarted.get_anomalies("latency", START, end), live.get_anomalies("latency", START, end))
+
+    def test_reset(self):
+        """Test that reset discards one metric or all baselines."""
+        detector = OnlineAnomalyDetector(seasonality=None)
+        self.observe_all(detector, series(3), metric_name="latency")
+        self.observe_all(detector, series(3), metric_name="errors")
+
+        detector.reset("latency")
+        self.assertIsNone(detector.get_baseline("latency", "default"))
+        self.assertIsNotNone(detector.get_baseline("errors", "default"))
+
+        detector.reset()
+        self.assertEqual(detector.get_stats()["series_count"], 0)
+
+    def test_invalid_seasonality(self):
+        """Test that an unknown seasonality is rejected."""
+        with self.assertRaises(ValueError):
+            OnlineAnomalyDetector(seasonality="minute_of_hour")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+Tests for the segmented audit log store.
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.auth.security.audit_log_store import AuditLogStore, InMemoryAuditLogStore
+
+DAY = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def entry(index, timestamp, actor_id="alice", action="login", resource_id=None):
+    """Build a serialized audit log."""
+    return {
+        "log_id": str(index),
+        "timestamp": timestamp.isoformat(),
+        "action": action,
+        "actor_id": actor_id,
+        "actor_type": "user",
+        "resource_type": "session",
+        "resource_id": resource_id,
+        "result": "success"
+    }
+
+
+class TestAuditLogStore(unittest.TestCase):
+    """Test cases for AuditLogStore."""
+
+    def setUp(self):
+        """Set up a store in a temporary directory."""
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        self.store = self.open_store()
+
+    def open_store(self, **kwargs):
+        """Open a store over the test directory."""
+        store = AuditLogStore(self.path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def ids(self, results):
+        """Get the log IDs of query results."""
+        return [log_dict["log_id"] for log_dict in results]
+
+    def test_day_rollover_seals_segment(self):
+        """Test that a new day seals the previous segment and writes its sidecar index."""
+        self.store.append(entry(1, DAY))
+        self.store.append(entry(2, DAY + timedelta(days=1)))
+
+        self.assertEqual(self.store.get_segment_dates(), ["2026-03-01", "2026-03-02"])
+        with open(os.path.join(self.path, "audit_2026-03-01.idx.json")) as f:
+            index = json.load(f)
+        self.assertEqual(index["size"], os.path.getsize(os.path.join(self.path, "audit_2026-03-01.jsonl")))
+        self.assertEqual(index["postings"]["actor_id"]["alice"], [0])
+        self.assertEqual(self.store.get_stats()["active_segment"], "2026-03-02")
+        self.assertFalse(os.path.exists(os.path.join(self.path, "audit_2026-03-02.idx.json")))
+
+    def test_indexed_queries(self):
+        """Test that indexed filters return matching entries newest first across segments."""
+        for i in range(30):
+            self.store.append(entry(
+                i, DAY + timedelta(hours=6 * i), actor_id=f"user{i % 3}",
+                action="login" if i % 2 else "logout", resource_id=f"res{i % 5}"
+            ))
+
+        results = self.store.query({"actor_id": "user1", "action": "login"}, limit=100)
+        self.assertEqual(self.ids(results), [str(i) for i in reversed(range(30)) if i % 3 == 1 and i % 2])
+
+        limited = self.store.query({"resource_id": "res0"}, limit=2)
+        self.assertEqual(self.ids(limited), ["25", "20"])
+
+        self.assertEqual(self.store.query({"actor_id": "nobody"}), [])
+        self.assertEqual(self.store.query({}, limit=0), [])
+
+    def test_time_range_queries(self):
+        """Test that queries only return entries in the time range."""
+        for i in range(10):
+            self.store.append(entry(i, DAY + timedelta(hours=12 * i)))
+
+        results = self.store.query(
+            {"actor_id": "alice"}, start_time=DAY + timedelta(days=1), end_time=DAY + timedelta(days=2)
+        )
+
+        self.assertEqual(self.ids(results), ["4", "3", "2"])
+        self.assertEqual(self.ids(self.store.query({}, end_time=DAY)), ["0"])
+
+    def test_sealed_indexes_are_bounded(self):
+        """Test that sealed segment indexes are loaded on demand into a bounded LRU."""
+        store = self.open_store(max_resident_segments=2)
+        for day in range(5):
+            store.append(entry(day, DAY + timedelta(days=day)))
+
+        self.assertEqual(self.ids(store.query({"actor_id": "alice"}, limit=10)), ["4", "3", "2", "1", "0"])
+        stats = store.get_stats()
+        self.assertEqual(stats["resident_indexes"], 2)
+        self.assertGreater(stats["index_loads"], 0)
+        self.assertEqual(stats["index_builds"], 0)
+
+    def test_late_entries_keep_active_segment(self):
+        """Test that late entries go to their own day without sealing the active segment."""
+        self.store.append(entry(1, DAY))
+        self.store.append(entry(2, DAY + timedelta(days=1)))
+        self.assertEqual(self.ids(self.store.query({"actor_id": "alice"})), ["2", "1"])
+
+        self.store.append(entry(3, DAY + timedelta(hours=1), actor_id="bob"))
+        self.store.append(entry(4, DAY + timedelta(days=1, hours=1)))
+
+        stats = self.store.get_stats()
+        self.assertEqual(stats["active_segment"], "2026-03-02")
+        self.assertEqual(stats["late_appends"], 1)
+        self.assertEqual(self.ids(self.store.query({}, end_time=DAY + timedelta(hours=23))), ["3", "1"])
+        self.assertEqual(self.ids(self.store.query({"actor_id": "bob"})), ["3"])
+        self.assertEqual(self.ids(self.store.query({"actor_id": "alice"})), ["4", "2", "1"])
+
+        # Late postings reach the sidecar on close
+        self.store.close()
+        reopened = self.open_store()
+        self.assertEqual(self.ids(reopened.query({"actor_id": "bob"})), ["3"])
+        self.assertEqual(reopened.get_stats()["index_builds"], 0)
+
+    def test_late_entry_for_unindexed_segment(self):
+        """Test that a late entry for a non-resident segment makes its stale index rebuild."""
+        store = self.open_store(max_resident_segments=1)
+        for day in range(3):
+            store.append(entry(day, DAY + timedelta(days=day)))
+        self.assertEqual(store.get_stats()["resident_indexes"], 1)
+
+        store.append(entry(9, DAY + timedelta(hours=2), actor_id="bob"))
+
+        self.assertEqual(self.ids(store.query({"actor_id": "bob"})), ["9"])
+        self.assertEqual(store.get_stats()["index_builds"], 1)
+
+    def test_recovery(self):
+        """Test that a reopened store resumes the active segment and rebuilds missing indexes."""
+        self.store.append(entry(1, DAY))
+        self.store.append(entry(2, DAY + timedelta(days=1)))
+        self.store.append(entry(3, DAY + timedelta(days=1, hours=1)))
+
+        # Simulate a crash: no close, lost sidecar and a torn last write
+        os.remove(os.path.join(self.path, "audit_2026-03-01.idx.json"))
+        with open(os.path.join(self.path, "audit_2026-03-02.jsonl"), "ab") as f:
+            f.write(b'{"log_id": "torn", "actor_id": "al')
+
+        recovered = AuditLogStore(self.path)
+        self.addCleanup(recovered.close)
+
+        self.assertEqual(self.ids(recovered.query({"actor_id": "alice"})), ["3", "2", "1"])
+        self.assertEqual(recovered.get_stats()["index_builds"], 2)
+
+        recovered.append(entry(4, DAY + timedelta(days=1, hours=2)))
+        self.assertEqual(self.ids(recovered.query({"actor_id": "alice"}, limit=1)), ["4"])
+        self.assertEqual(recovered.get_stats()["active_segment"], "2026-03-02")
+
+
+class TestInMemoryAuditLogStore(unittest.TestCase):
+    """Test cases for InMemoryAuditLogStore."""
+
+    def test_bounded_and_newest_first(self):
+        """Test that the oldest entries are discarded and queries return newest first."""
+        store = InMemoryAuditLogStore(max_entries=3)
+        for i in range(5):
+            store.append(entry(i, DAY + timedelta(minutes=i), actor_id="alice" if i % 2 else "bob"))
+
+        self.assertEqual([e["log_id"] for e in store.query({})], ["4", "3", "2"])
+        self.assertEqual([e["log_id"] for e in store.query({"actor_id": "alice"})], ["3"])
+        self.assertEqual(store.get_stats()["entries"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
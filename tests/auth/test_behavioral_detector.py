@@ -0,0 +1,72 @@
+"""
+Tests for the streaming behavioral anomaly detector.
+"""
+
+import os
+import sys
+import json
+import unittest
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.auth.security.security_monitoring import StreamingBehavioralDetector
+
+
+class TestStreamingBehavioralDetector(unittest.TestCase):
+    """Test cases for StreamingBehavioralDetector."""
+
+    def setUp(self):
+        """Create a detector with a one-day half-life."""
+        self.detector = StreamingBehavioralDetector(
+            detector_id="user-behavior",
+            name="User Behavior",
+            description="Detect unusual user behavior patterns",
+            data_source="user_actions",
+            histogram_keys={"login_hour": 24},
+            half_life_seconds=24 * 3600
+        )
+
+    def test_rare_value_is_anomalous_among_many_users(self):
+        """Test that other users' traffic does not make a value this user never sent look common."""
+        for user in range(10000):
+            for event in range(10):
+                self.detector.update_user_profile(
+                    f"user-{user}", {"network": f"net-{(user + event) % 5000}"}, timestamp=float(event)
+                )
+        for event in range(50):
+            self.detector.update_user_profile("alice", {"network": "office"}, timestamp=float(event))
+
+        is_anomaly, score, details = self.detector.detect("alice", {"network": "net-42"}, timestamp=60.0)
+        self.assertTrue(is_anomaly)
+        self.assertEqual(details["details"]["network"]["frequency"], 0.0)
+
+        is_anomaly, score, _ = self.detector.detect("alice", {"network": "office"}, timestamp=60.0)
+        self.assertFalse(is_anomaly)
+        self.assertEqual(score, 0.0)
+
+    def test_round_trip(self):
+        """Test that profiles survive serialization."""
+        for event in range(20):
+            self.detector.update_user_profile(
+                "alice",
+                {"network": "office" if event % 4 else "home", "login_hour": 9, "bytes": 1000 + event},
+                timestamp=float(event)
+            )
+
+        restored = StreamingBehavioralDetector.from_dict(json.loads(json.dumps(self.detector.to_dict())))
+        behavior = {"network": "home", "login_hour": 3, "bytes": 1010}
+        restored_result = restored.detect("alice", behavior)
+        original_result = self.detector.detect("alice", behavior)
+        self.assertEqual(restored_result[0], original_result[0])
+        self.assertAlmostEqual(restored_result[1], original_result[1], places=4)
+        self.assertAlmostEqual(
+            restored.categorical_values["alice"]["network"].frequency("home"),
+            self.detector.categorical_values["alice"]["network"].frequency("home"),
+            places=4
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for the dynamic permission rule index of the enhanced RBAC manager.
+"""
+
+import os
+import sys
+import random
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.auth.authorization.auth_rbac import AuthorizationManager, Permission, Role
+from src.auth.authorization.enhanced_rbac import EnhancedRBACManager
+
+PERMISSIONS = ("doc.read", "doc.write", "doc.delete")
+RESOURCE_TYPES = ("document", "folder")
+
+
+def linear_scan(manager, permission_id, resource_type, context):
+    """Evaluate dynamic rules by scanning every registered rule."""
+    rules = [
+        rule for rule in manager.dynamic_rules.values()
+        if rule.is_active and rule.permission_id == permission_id and rule.resource_type == resource_type
+    ]
+    if not rules:
+        return None
+    rules.sort(key=lambda rule: rule.priority, reverse=True)
+    return any(rule.evaluate(context) for rule in rules)
+
+
+class TestDynamicRuleIndex(unittest.TestCase):
+    """Test cases for indexed dynamic rule evaluation."""
+
+    def setUp(self):
+        """Set up a user holding every test permission."""
+        event_manager = MagicMock()
+        base = AuthorizationManager(event_manager=event_manager)
+        self.permission_ids = [
+            base.register_permission(Permission(name=name, description=name)).permission_id
+            for name in PERMISSIONS
+        ]
+        role = base.register_role(Role(name="member", description="Member", permissions=self.permission_ids))
+        base.assign_role_to_user("alice", role.role_id)
+        self.manager = EnhancedRBACManager(base_rbac_manager=base, event_manager=event_manager)
+
+    def add_rule(self, permission_id, resource_type, threshold, priority=0):
+        """Register a rule granting access when the context level reaches a threshold."""
+        return self.manager.register_dynamic_rule(
+            permission_id, resource_type, lambda context, t=threshold: context.get("level", 0) >= t,
+            priority=priority
+        )
+
+    def test_rules_sorted_by_priority(self):
+        """Test that indexed rules are sorted by priority, keeping registration order for ties."""
+        permission_id = self.permission_ids[0]
+        low = self.add_rule(permission_id, "document", 1, priority=0)
+        high = self.add_rule(permission_id, "document", 1, priority=5)
+        tie = self.add_rule(permission_id, "document", 1, priority=0)
+
+        self.assertEqual(self.manager.rule_index[(permission_id, "document")], [high, low, tie])
+
+    def test_remove_rule_prunes_index(self):
+        """Test that removing rules prunes the index and restores the base decision."""
+        permission_id = self.permission_ids[0]
+        first = self.add_rule(permission_id, "document", 10)
+        second = self.add_rule(permission_id, "document", 20)
+        self.assertFalse(self.manager.evaluate_permission("alice", permission_id, "document", context={"level": 5}))
+
+        self.assertTrue(self.manager.remove_dynamic_rule(first.rule_id))
+        self.assertEqual(self.manager.rule_index[(permission_id, "document")], [second])
+
+        self.assertTrue(self.manager.remove_dynamic_rule(second.rule_id))
+        self.assertNotIn((permission_id, "document"), self.manager.rule_index)
+        self.assertNotIn(permission_id, self.manager.permission_rules)
+        self.assertNotIn("document", self.manager.resource_type_rules)
+        self.assertTrue(self.manager.evaluate_permission("alice", permission_id, "document", context={"level": 5}))
+
+        self.assertFalse(self.manager.remove_dynamic_rule(second.rule_id))
+
+    def test_remove_rule_invalidates_decisions(self):
+        """Test that cached decisions are dropped when a rule is removed."""
+        manager = self.manager
+        manager.decision_cache_size = 16
+        permission_id = self.permission_ids[1]
+        rule = manager.register_dynamic_rule(
+            permission_id, "document", lambda context: context.get("level", 0) >= 10, context_keys=["level"]
+        )
+        self.assertFalse(manager.evaluate_permission("alice", permission_id, "document", context={"level": 5}))
+        self.assertEqual(manager.get_decision_cache_stats()["size"], 1)
+
+        manager.remove_dynamic_rule(rule.rule_id)
+
+        self.assertEqual(manager.get_decision_cache_stats()["size"], 0)
+        self.assertTrue(manager.evaluate_permission("alice", permission_id, "document", context={"level": 5}))
+
+    def test_lookup_matches_linear_scan(self):
+        """Test that indexed evaluation matches a scan of all rules across registrations and removals."""
+        rng = random.Random(3)
+        rules = []
+        for step in range(300):
+            if rules and rng.random() < 0.3:
+                rule = rules.pop(rng.randrange(len(rules)))
+                self.manager.remove_dynamic_rule(rule.rule_id)
+            else:
+                rule = self.add_rule(
+                    rng.choice(self.permission_ids), rng.choice(RESOURCE_TYPES),
+                    rng.randint(0, 10), priority=rng.randint(0, 3)
+                )
+                rule.is_active = rng.random() < 0.9
+                rules.append(rule)
+
+            permission_id = rng.choice(self.permission_ids)
+            resource_type = rng.choice(RESOURCE_TYPES)
+            context = {"level": rng.randint(0, 10)}
+            expected = linear_scan(self.manager, permission_id, resource_type, context)
+
+            self.assertEqual(
+                self.manager._evaluate_rules(permission_id, resource_type, context), expected, f"step {step}"
+            )
+
+        indexed = sorted(rule.rule_id for rules_for_key in self.manager.rule_index.values() for rule in rules_for_key)
+        self.assertEqual(indexed, sorted(self.manager.dynamic_rules))
+
+
+if __name__ == "__main__":
+    unittest.main()
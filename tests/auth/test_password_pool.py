@@ -0,0 +1,168 @@
+"""
+Tests for the password hashing worker pool and session cleanup of the authentication manager.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.error_handling.errors import AuthenticationError
+from src.auth.authentication.auth_manager import AuthenticationManager, PasswordManager, Session
+
+
+class TestPasswordPool(unittest.TestCase):
+    """Test cases for PasswordManager's worker pool."""
+
+    def setUp(self):
+        """Set up a password manager with a small pool."""
+        self.password_manager = PasswordManager(max_workers=2, max_pending=4)
+        self.addCleanup(self.password_manager.shutdown)
+
+    def test_hash_and_verify_on_pool(self):
+        """Test that pooled hashing and verification agree with the synchronous calls."""
+        password_hash = self.password_manager.submit_hash_password("correct horse").result(timeout=30)
+
+        self.assertTrue(self.password_manager.verify_password("correct horse", password_hash))
+        self.assertTrue(self.password_manager.submit_verify_password("correct horse", password_hash).result(timeout=30))
+        self.assertFalse(self.password_manager.submit_verify_password("wrong", password_hash).result(timeout=30))
+
+        stats = self.password_manager.get_pool_stats()
+        self.assertEqual(stats["submitted"], 3)
+        self.assertEqual(stats["completed"], 3)
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["executor"], "thread")
+        self.assertGreater(stats["average_seconds"], 0)
+
+    def test_async_variants(self):
+        """Test that the async variants hash and verify without blocking the event loop."""
+        async def run():
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.001)
+                    ticks += 1
+
+            ticker = asyncio.ensure_future(tick())
+            password_hash = await self.password_manager.hash_password_async("secret")
+            verified = await self.password_manager.verify_password_async("secret", password_hash)
+            ticker.cancel()
+            return verified, ticks
+
+        verified, ticks = asyncio.run(run())
+
+        self.assertTrue(verified)
+        self.assertGreater(ticks, 0)
+
+    def test_queue_is_bounded(self):
+        """Test that submissions beyond max_pending are rejected and counted."""
+        gate = threading.Event()
+        self.addCleanup(gate.set)
+        futures = [self.password_manager._submit(gate.wait, 5) for _ in range(4)]
+
+        stats = self.password_manager.get_pool_stats()
+        self.assertEqual(stats["in_flight"], 2)
+        self.assertEqual(stats["queue_depth"], 2)
+        with self.assertRaises(AuthenticationError):
+            self.password_manager.submit_hash_password("secret")
+
+        gate.set()
+        for future in futures:
+            future.result(timeout=5)
+
+        stats = self.password_manager.get_pool_stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["max_pending"], 4)
+        self.assertEqual(stats["pending"], 0)
+
+    def test_failures_are_counted(self):
+        """Test that operations raising in the pool are counted as failed."""
+        def fail():
+            raise ValueError("boom")
+
+        future = self.password_manager._submit(fail)
+
+        with self.assertRaises(ValueError):
+            future.result(timeout=5)
+        self.assertEqual(self.password_manager.get_pool_stats()["failed"], 1)
+
+
+class TestAuthenticationManager(unittest.TestCase):
+    """Test cases for pooled authentication and expiry-indexed session cleanup."""
+
+    def setUp(self):
+        """Set up an authentication manager with one user."""
+        self.password_manager = PasswordManager(max_workers=1)
+        self.addCleanup(self.password_manager.shutdown)
+        self.manager = AuthenticationManager(event_manager=MagicMock(), password_manager=self.password_manager)
+        self.user = self.manager.register_user("alice", "alice@example.com", "secret")
+
+    def test_authenticate_async(self):
+        """Test that async authentication verifies on the pool and rate limits failures."""
+        self.manager.max_login_attempts = 2
+
+        success, user, error = asyncio.run(self.manager.authenticate_user_async("alice", "secret"))
+        self.assertTrue(success, error)
+        self.assertIs(user, self.user)
+
+        for _ in range(2):
+            success, _, error = asyncio.run(self.manager.authenticate_user_async("alice", "wrong"))
+            self.assertFalse(success)
+            self.assertEqual(error, "Invalid username or password")
+
+        success, _, error = asyncio.run(self.manager.authenticate_user_async("alice", "secret"))
+        self.assertFalse(success)
+        self.assertIn("Too many failed login attempts", error)
+        self.assertGreaterEqual(self.password_manager.get_pool_stats()["completed"], 3)
+
+    def add_session(self, expires_in):
+        """Store a session for the test user."""
+        session = Session(user_id=self.user.user_id, expires_at=datetime.now() + expires_in)
+        self.manager.session_store.add(session)
+        return session
+
+    def test_cleanup_expired_sessions(self):
+        """Test that cleanup deactivates only expired sessions, within its budget."""
+        expired = [self.add_session(timedelta(minutes=-i - 1)) for i in range(5)]
+        live = self.manager.create_session(self.user)
+
+        self.assertEqual(self.manager.cleanup_expired_sessions(max_sessions=3, purge=False), 3)
+        self.assertEqual(self.manager.cleanup_expired_sessions(purge=False), 2)
+        self.assertEqual(self.manager.cleanup_expired_sessions(purge=False), 0)
+
+        self.assertTrue(all(not session.is_active for session in expired))
+        self.assertTrue(live.is_active)
+        self.assertTrue(self.manager.validate_session(live.session_id)[0])
+        self.assertEqual(len(self.manager.get_user_sessions(self.user.user_id)), 6)
+
+    def test_cleanup_purges_sessions(self):
+        """Test that purging cleanup removes expired sessions from the manager's indexes."""
+        expired = self.add_session(timedelta(seconds=-1))
+        live = self.add_session(timedelta(hours=1))
+
+        self.assertEqual(self.manager.cleanup_expired_sessions(), 1)
+
+        self.assertNotIn(expired.session_id, self.manager.sessions)
+        self.assertEqual(self.manager.user_sessions[self.user.user_id], [live.session_id])
+
+    def test_cleanup_prunes_login_attempts(self):
+        """Test that cleanup drops rate limiting state for keys with no recent failures."""
+        self.manager.login_attempts.record_failure("mallory:unknown", now=time.time() - 600)
+
+        self.manager.cleanup_expired_sessions()
+
+        self.assertEqual(len(self.manager.login_attempts), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Tests for the effective permission cache of the authorization manager.
+"""
+
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.auth.authorization.auth_rbac import AuthorizationManager, Permission, Role
+from src.auth.authorization.enhanced_rbac import EnhancedRBACManager
+
+
+class TestPermissionCache(unittest.TestCase):
+    """Test cases for effective permission cache invalidation."""
+
+    def setUp(self):
+        """Set up a role hierarchy of viewer <- editor <- publisher."""
+        self.event_manager = MagicMock()
+        self.manager = AuthorizationManager(event_manager=self.event_manager)
+
+        self.read = self.add_permission("doc.read")
+        self.write = self.add_permission("doc.write")
+        self.publish = self.add_permission("doc.publish")
+        self.delete = self.add_permission("doc.delete")
+
+        self.viewer = self.manager.register_role(
+            Role(name="viewer", description="Viewer", permissions=[self.read.permission_id])
+        )
+        self.editor = self.manager.register_role(Role(
+            name="editor", description="Editor",
+            permissions=[self.write.permission_id], parent_roles=[self.viewer.role_id]
+        ))
+        self.publisher = self.manager.register_role(Role(
+            name="publisher", description="Publisher",
+            permissions=[self.publish.permission_id], parent_roles=[self.editor.role_id]
+        ))
+
+    def add_permission(self, name):
+        """Register a permission."""
+        return self.manager.register_permission(Permission(name=name, description=name))
+
+    def test_repeated_checks_hit_cache(self):
+        """Test that repeated checks are served from the cache, including inherited permissions."""
+        self.manager.assign_role_to_user("alice", self.publisher.role_id)
+
+        self.assertTrue(self.manager.has_permission("alice", "doc.read"))
+        self.assertTrue(self.manager.has_permission("alice", "doc.publish"))
+        self.assertTrue(self.manager.has_role("alice", "publisher"))
+        self.assertFalse(self.manager.has_role("alice", "viewer"))
+
+        stats = self.manager.get_permission_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 3)
+        self.assertEqual(stats["cached_users"], 1)
+
+    def test_assignment_invalidates_only_that_user(self):
+        """Test that assigning and revoking a role invalidate only the affected user."""
+        self.manager.assign_role_to_user("alice", self.viewer.role_id)
+        self.manager.assign_role_to_user("bob", self.viewer.role_id)
+        self.assertFalse(self.manager.has_permission("alice", "doc.write"))
+        self.assertFalse(self.manager.has_permission("bob", "doc.write"))
+
+        self.manager.assign_role_to_user("alice", self.editor.role_id)
+        misses = self.manager.get_permission_cache_stats()["misses"]
+
+        self.assertTrue(self.manager.has_permission("alice", "doc.write"))
+        self.assertFalse(self.manager.has_permission("bob", "doc.write"))
+        self.assertEqual(self.manager.get_permission_cache_stats()["misses"], misses + 1)
+
+        self.assertTrue(self.manager.revoke_role_from_user("alice", self.editor.role_id))
+        self.assertFalse(self.manager.has_permission("alice", "doc.write"))
+        self.assertTrue(self.manager.has_permission("alice", "doc.read"))
+
+    def test_role_permission_change(self):
+        """Test that changing a role's permissions updates users of that role and its descendants."""
+        self.manager.assign_role_to_user("alice", self.publisher.role_id)
+        self.manager.assign_role_to_user("bob", self.viewer.role_id)
+        self.assertFalse(self.manager.has_permission("alice", "doc.delete"))
+        self.assertFalse(self.manager.has_permission("bob", "doc.delete"))
+
+        success, _, error = self.manager.update_role(
+            self.viewer.role_id, permissions=[self.read.permission_id, self.delete.permission_id]
+        )
+
+        self.assertTrue(success, error)
+        self.assertTrue(self.manager.has_permission("alice", "doc.delete"))
+        self.assertTrue(self.manager.has_permission("bob", "doc.delete"))
+
+    def test_hierarchy_change(self):
+        """Test that changing a role's parents updates inherited permissions."""
+        self.manager.assign_role_to_user("alice", self.publisher.role_id)
+        self.assertTrue(self.manager.has_permission("alice", "doc.read"))
+
+        success, _, error = self.manager.update_role(self.editor.role_id, parent_roles=[])
+
+        self.assertTrue(success, error)
+        self.assertFalse(self.manager.has_permission("alice", "doc.read"))
+        self.assertTrue(self.manager.has_permission("alice", "doc.write"))
+
+        auditor = self.manager.register_role(
+            Role(name="auditor", description="Auditor", permissions=[self.delete.permission_id])
+        )
+        self.manager.update_role(self.editor.role_id, parent_roles=[auditor.role_id])
+        self.assertTrue(self.manager.has_permission("alice", "doc.delete"))
+
+    def test_role_deletion(self):
+        """Test that deleting a role removes its permissions from assigned users."""
+        temporary = self.manager.register_role(
+            Role(name="temporary", description="Temporary", permissions=[self.delete.permission_id])
+        )
+        self.manager.assign_role_to_user("alice", temporary.role_id)
+        self.assertTrue(self.manager.has_permission("alice", "doc.delete"))
+
+        self.assertTrue(self.manager.delete_role(temporary.role_id))
+
+        self.assertFalse(self.manager.has_permission("alice", "doc.delete"))
+        self.assertFalse(self.manager.has_role("alice", "temporary"))
+
+    def test_expiring_assignment(self):
+        """Test that a cached entry is recomputed once an assignment expires."""
+        self.manager.assign_role_to_user("alice", self.viewer.role_id)
+        self.manager.assign_role_to_user(
+            "alice", self.editor.role_id, expires_at=datetime.now() + timedelta(seconds=0.05)
+        )
+        self.assertTrue(self.manager.has_permission("alice", "doc.write"))
+
+        time.sleep(0.1)
+
+        self.assertFalse(self.manager.has_permission("alice", "doc.write"))
+        self.assertTrue(self.manager.has_permission("alice", "doc.read"))
+
+    def test_direct_role_edits_need_invalidation(self):
+        """Test that invalidate_permission_cache picks up direct edits to Role objects."""
+        self.manager.assign_role_to_user("alice", self.viewer.role_id)
+        self.assertFalse(self.manager.has_permission("alice", "doc.delete"))
+
+        self.viewer.permissions.append(self.delete.permission_id)
+        self.assertFalse(self.manager.has_permission("alice", "doc.delete"))
+
+        self.manager.invalidate_permission_cache()
+        self.assertTrue(self.manager.has_permission("alice", "doc.delete"))
+
+    def test_events_are_emitted(self):
+        """Test that mutations still emit their events after invalidating the cache."""
+        self.manager.assign_role_to_user("alice", self.viewer.role_id)
+
+        event_types = [call.args[0] for call in self.event_manager.emit_event.call_args_list]
+        self.assertIn("permission.registered", event_types)
+        self.assertEqual(event_types[-1], "role.assigned")
+
+    def test_enhanced_manager_sees_changes(self):
+        """Test that the enhanced manager's permission checks follow base role changes."""
+        enhanced = EnhancedRBACManager(base_rbac_manager=self.manager, event_manager=self.event_manager)
+        self.manager.assign_role_to_user("alice", self.viewer.role_id)
+        self.assertFalse(enhanced.evaluate_permission("alice", self.write.permission_id, "document"))
+
+        self.manager.assign_role_to_user("alice", self.editor.role_id)
+
+        self.assertTrue(enhanced.evaluate_permission("alice", self.write.permission_id, "document"))
+        self.assertIn(self.write.permission_id, enhanced.get_user_permissions_for_resource("alice", "document"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Tests for the expiry-indexed session store and the login attempt limiter.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.auth.authentication.session_store import LoginAttemptLimiter, SessionStore
+
+NOW = datetime(2026, 5, 1, 12, 0, 0)
+
+
+def make_session(session_id, user_id="alice", expires_in=timedelta(hours=1)):
+    """Build a minimal session object."""
+    return SimpleNamespace(
+        session_id=session_id, user_id=user_id, expires_at=NOW + expires_in, is_active=True
+    )
+
+
+class TestSessionStore(unittest.TestCase):
+    """Test cases for SessionStore."""
+
+    def setUp(self):
+        """Set up a store with five expired and five live sessions."""
+        self.store = SessionStore()
+        for i in range(10):
+            user_id = "alice" if i % 2 else "bob"
+            expires_in = timedelta(minutes=i - 5) if i < 5 else timedelta(hours=i)
+            self.store.add(make_session(f"s{i}", user_id, expires_in))
+
+    def test_expires_only_expired_sessions(self):
+        """Test that expiry deactivates past sessions, earliest first, and keeps the rest."""
+        expired = self.store.expire_sessions(now=NOW, purge=False)
+
+        self.assertEqual([s.session_id for s in expired], ["s0", "s1", "s2", "s3", "s4"])
+        self.assertTrue(all(not s.is_active for s in expired))
+        self.assertTrue(self.store.get("s5").is_active)
+        self.assertEqual(len(self.store), 10)
+        self.assertEqual(self.store.next_expiration(), (NOW + timedelta(hours=5)).timestamp())
+        self.assertEqual(self.store.expire_sessions(now=NOW), [])
+
+    def test_store_does_not_grow_with_expired_sessions(self):
+        """Test that expiry removes sessions by default, so churn leaves the store bounded."""
+        self.store.expire_sessions(now=NOW)
+        self.assertEqual(len(self.store), 5)
+
+        for i in range(100):
+            self.store.add(make_session(f"churn{i}", f"user{i}", timedelta(minutes=-1)))
+            self.store.expire_sessions(now=NOW)
+
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(len(self.store.user_sessions), 2)
+
+    def test_budget_spreads_work(self):
+        """Test that max_sessions bounds each call and later calls continue where it stopped."""
+        first = self.store.expire_sessions(now=NOW, max_sessions=2)
+        second = self.store.expire_sessions(now=NOW, max_sessions=2)
+        third = self.store.expire_sessions(now=NOW, max_sessions=2)
+
+        self.assertEqual([s.session_id for s in first + second + third], ["s0", "s1", "s2", "s3", "s4"])
+        self.assertEqual(len(third), 1)
+
+    def test_purge_removes_sessions(self):
+        """Test that expiry removes expired sessions from both indexes."""
+        self.store.expire_sessions(now=NOW)
+
+        self.assertEqual(len(self.store), 5)
+        self.assertNotIn("s0", self.store)
+        self.assertEqual(self.store.get_user_session_ids("bob"), ["s6", "s8"])
+        self.assertEqual(self.store.get_user_session_ids("alice"), ["s5", "s7", "s9"])
+
+    def test_removed_sessions_are_skipped(self):
+        """Test that heap entries of removed sessions are dropped lazily."""
+        removed = self.store.remove("s1")
+
+        self.assertEqual(removed.session_id, "s1")
+        self.assertIsNone(self.store.remove("s1"))
+        self.assertNotIn("s1", [s.session_id for s in self.store.expire_sessions(now=NOW)])
+
+    def test_rescheduled_sessions_use_new_expiry(self):
+        """Test that a rescheduled session expires at its new time only."""
+        session = self.store.get("s0")
+        session.expires_at = NOW + timedelta(minutes=30)
+        self.store.reschedule(session)
+
+        self.assertNotIn(session, self.store.expire_sessions(now=NOW))
+        self.assertTrue(session.is_active)
+        self.assertEqual(self.store.expire_sessions(now=NOW + timedelta(minutes=31)), [session])
+
+
+class TestLoginAttemptLimiter(unittest.TestCase):
+    """Test cases for LoginAttemptLimiter."""
+
+    def test_limits_within_window(self):
+        """Test that max_attempts failures within the window limit a key until they age out."""
+        limiter = LoginAttemptLimiter(window_seconds=60, max_attempts=3)
+        for t in (0, 10, 20):
+            self.assertFalse(limiter.is_limited("alice", now=t))
+            limiter.record_failure("alice", now=t)
+
+        self.assertTrue(limiter.is_limited("alice", now=30))
+        self.assertEqual(limiter.get_count("alice", now=30), 3)
+        self.assertFalse(limiter.is_limited("alice", now=61))
+        self.assertEqual(limiter.get_count("alice", now=75), 1)
+        self.assertFalse(limiter.is_limited("bob", now=30))
+
+    def test_keeps_only_recent_failures(self):
+        """Test that only the last max_attempts failures are kept per key."""
+        limiter = LoginAttemptLimiter(window_seconds=60, max_attempts=2)
+        for t in range(100):
+            limiter.record_failure("alice", now=t)
+
+        self.assertEqual(limiter.get_count("alice", now=100), 2)
+        self.assertTrue(limiter.is_limited("alice", now=100))
+
+        limiter.reset("alice")
+        self.assertFalse(limiter.is_limited("alice", now=100))
+        self.assertNotIn("alice", limiter)
+
+    def test_prune_removes_idle_keys(self):
+        """Test that pruning removes keys in order of last failure, up to the first recent one."""
+        limiter = LoginAttemptLimiter(window_seconds=60, max_attempts=3)
+        for key, t in (("a", 0), ("b", 5), ("c", 10), ("d", 50), ("a", 55)):
+            limiter.record_failure(key, now=t)
+
+        self.assertEqual(limiter.prune(now=75), 2)
+        self.assertEqual(len(limiter), 2)
+        self.assertNotIn("b", limiter)
+        self.assertIn("a", limiter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Tests for async plugin action execution in PluginManager.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+# Add project root to path for imports; plugin modules import from core
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+sys.path.append(os.path.join(project_root, 'src'))
+
+from core.plugin_manager import PluginManager
+from core.plugin_execution import PluginExecutionConfig
+from core.async_utils import CancellationToken, PluginActionTimeoutError
+
+PLUGIN_CODE = '''
+import time
+import asyncio
+import threading
+from core.async_utils import ProgressUpdate
+
+
+class ExecutionTestPlugin:
+    def __init__(self, plugin_id, plugin_name, version, description, config=None):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.tokens = []
+
+    def add(self, a, b):
+        return a + b
+
+    def block(self, seconds, cancellation_token=None):
+        self.tokens.append(cancellation_token)
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                if cancellation_token.is_cancelled:
+                    return "cancelled"
+                time.sleep(0.01)
+            return "done"
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    async def hang(self):
+        await asyncio.sleep(10)
+
+    async def steps(self, count, progress_callback=None):
+        for i in range(count):
+            await asyncio.sleep(0.01)
+            progress_callback(ProgressUpdate((i + 1) * 100.0 / count, f"Step {i + 1}", "running"))
+        return count
+
+    def report(self, count, progress_callback=None):
+        for i in range(count):
+            progress_callback(ProgressUpdate((i + 1) * 100.0 / count, f"Step {i + 1}", "running"))
+        progress_callback("not an update")
+        return "reported"
+'''
+
+
+class TestPluginExecution(unittest.TestCase):
+    """Test cases for PluginManager async action execution."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.plugin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.plugin_dir)
+        path = os.path.join(self.plugin_dir, "execution_test")
+        os.makedirs(path)
+        with open(os.path.join(path, "execution_test_plugin.py"), "w") as f:
+            f.write(PLUGIN_CODE)
+        with open(os.path.join(path, "plugin.json"), "w") as f:
+            json.dump({
+                "id": "execution_test",
+                "name": "Execution Test",
+                "version": "1.0.0",
+                "description": "Plugin for execution tests",
+                "main_file": "execution_test_plugin.py",
+                "main_class": "ExecutionTestPlugin",
+                "max_concurrent_actions": 2,
+                "actions": {"hang": {"timeout": 0.2}}
+            }, f)
+
+        self.manager = PluginManager(self.plugin_dir, execution_config=PluginExecutionConfig(max_workers=4))
+        self.addCleanup(self.manager.shutdown)
+        self.manager.schema = None
+        self.manager.discover_plugins()
+        self.plugin = self.manager.load_plugin("execution_test")
+
+    def test_sync_actions_run_off_loop(self):
+        """Test that sync actions run on threads, limited per plugin, with cached lookups."""
+        async def run():
+            ticks = 0
+
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            beat = asyncio.ensure_future(heartbeat())
+            start = time.monotonic()
+            results = await asyncio.gather(*(
+                self.manager.execute_action_async("execution_test", "block", 0.2) for _ in range(4)
+            ))
+            beat.cancel()
+            return results, time.monotonic() - start, ticks
+
+        results, elapsed, ticks = asyncio.run(run())
+
+        self.assertEqual(results, ["done"] * 4)
+        self.assertEqual(self.plugin.max_active, 2)
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertGreater(ticks, 10)
+        self.assertEqual(self.manager.execute_action("execution_test", "add", 1, 2), 3)
+
+        stats = self.manager.get_execution_stats()
+        self.assertEqual(stats["cache_misses"], 2)
+        self.assertEqual(stats["cache_hits"], 3)
+        self.assertEqual(stats["executed"], 4)
+
+    def test_timeouts(self):
+        """Test that timeouts raise PluginActionTimeoutError and cancel the action's token."""
+        token = CancellationToken()
+
+        with self.assertRaises(PluginActionTimeoutError) as context:
+            asyncio.run(self.manager.execute_action_async(
+                "execution_test", "block", 5, timeout=0.2, cancellation_token=token
+            ))
+        self.assertEqual(context.exception.timeout_seconds, 0.2)
+        self.assertTrue(token.is_cancelled)
+
+        # The timeout from the action's metadata applies when none is given
+        start = time.monotonic()
+        with self.assertRaises(PluginActionTimeoutError):
+            asyncio.run(self.manager.execute_action_async("execution_test", "hang"))
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(self.manager.get_execution_stats()["timed_out"], 2)
+
+    def test_cancellation_propagates(self):
+        """Test that cancelling the caller cancels the action's token."""
+        async def run():
+            task = asyncio.ensure_future(self.manager.execute_action_async("execution_test", "block", 5))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        start = time.monotonic()
+        asyncio.run(run())
+
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertTrue(self.plugin.tokens[0].is_cancelled)
+        self.assertEqual(self.manager.get_execution_stats()["cancelled"], 1)
+
+    def test_progress_streaming(self):
+        """Test that progress updates from async and sync actions are streamed in order."""
+        async def collect(action):
+            return [update async for update in self.manager.stream_action_progress("execution_test", action, 3)]
+
+        for action, result in (("steps", 3), ("report", "reported")):
+            updates = asyncio.run(collect(action))
+
+            self.assertEqual([update.message for update in updates], ["Step 1", "Step 2", "Step 3", "Completed"])
+            self.assertEqual(updates[-1].status, "completed")
+            self.assertEqual(updates[-1].details["result"], result)
+
+    def test_unload_invalidates_cached_actions(self):
+        """Test that a reloaded plugin's actions are resolved again."""
+        self.manager.execute_action("execution_test", "add", 1, 2)
+        self.manager.unload_plugin("execution_test")
+        self.assertEqual(self.manager.get_execution_stats()["cached_actions"], 0)
+
+        self.assertEqual(self.manager.execute_action("execution_test", "add", 2, 2), 4)
+        with self.assertRaises(AttributeError):
+            self.manager.execute_action("execution_test", "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+"""
+Tests for parallel plugin startup, lazy plugins, and the startup timeline.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.plugin_system import PluginSystem
+from src.core.plugin_lifecycle import PluginState
+
+PLUGIN_CODE = '''
+import time
+
+
+class StartupTestPlugin:
+    def __init__(self, plugin_id, config=None):
+        self.plugin_id = plugin_id
+        self.config = config or {}
+        self.started_at = None
+        self.start_count = 0
+
+    def initialize(self):
+        time.sleep(self.config.get("init_delay", 0))
+
+    def start(self):
+        self.start_count += 1
+        begin = time.monotonic()
+        time.sleep(self.config.get("start_delay", 0))
+        if self.config.get("fail"):
+            raise RuntimeError("start failed")
+        self.started_at = (begin, time.monotonic())
+
+    def get_metadata(self):
+        return {"id": self.plugin_id}
+
+    def get_actions(self):
+        return ["ping"]
+
+    def execute_action(self, action, *args, **kwargs):
+        return "pong"
+
+    def shutdown(self):
+        pass
+'''
+
+
+class TestPluginStartup(unittest.TestCase):
+    """Test cases for parallel plugin startup."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.plugin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.plugin_dir)
+
+    def create_plugin(self, plugin_id, dependencies=(), lazy=False, import_delay=0, **config):
+        """Write a test plugin with the given dependencies, module import time, and plugin config."""
+        path = os.path.join(self.plugin_dir, plugin_id)
+        os.makedirs(path)
+        module = f"startup_test_{plugin_id}"
+        manifest = {
+            "id": plugin_id,
+            "name": plugin_id,
+            "version": "1.0.0",
+            "description": "Plugin for startup tests",
+            "main_module": module,
+            "class_name": "StartupTestPlugin",
+            "config": config,
+            "dependencies": {"plugins": {dep: ">=1.0.0" for dep in dependencies}}
+        }
+        if lazy:
+            manifest["lazy"] = True
+        with open(os.path.join(path, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+        with open(os.path.join(path, f"{module}.py"), "w") as f:
+            f.write(PLUGIN_CODE.replace("import time\n", f"import time\n\ntime.sleep({import_delay})\n", 1))
+
+    def create_system(self):
+        """Create a plugin system over the test plugin directory."""
+        system = PluginSystem([self.plugin_dir])
+        self.addCleanup(system.shutdown)
+        system.discover_plugins()
+        return system
+
+    def test_independent_plugins_start_concurrently(self):
+        """Test that plugins without dependencies on each other start at the same time."""
+        for i in range(4):
+            self.create_plugin(f"independent_{i}", start_delay=0.2)
+        system = self.create_system()
+
+        start = time.monotonic()
+        result = system.start_all_plugins(max_concurrency=4)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(result["success"]), [f"independent_{i}" for i in range(4)])
+        self.assertEqual(result["failed"], {})
+        self.assertLess(elapsed, 0.6)
+        self.assertGreater(system.startup_timeline.get_summary()["parallelism"], 2)
+
+    def test_plugin_modules_import_concurrently(self):
+        """Test that plugin modules import at the same time, and only the sys.path update is serialized."""
+        for i in range(4):
+            self.create_plugin(f"import_heavy_{i}", import_delay=0.2)
+        system = self.create_system()
+        path_before = list(sys.path)
+
+        start = time.monotonic()
+        result = system.start_all_plugins(max_concurrency=4)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(len(result["success"]), 4)
+        self.assertLess(elapsed, 0.6)
+        phases = system.startup_timeline.get_summary()["phases"]
+        self.assertGreaterEqual(phases["import"], 0.8)
+        self.assertLess(phases["import_wait"], 0.1)
+        self.assertEqual(sys.path, path_before)
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency plugins start at once."""
+        for i in range(4):
+            self.create_plugin(f"bounded_{i}", start_delay=0.1)
+        system = self.create_system()
+
+        start = time.monotonic()
+        system.start_all_plugins(max_concurrency=2)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_dependencies_start_first(self):
+        """Test that a plugin starts only after its dependencies, in parallel with unrelated plugins."""
+        self.create_plugin("base", start_delay=0.1)
+        self.create_plugin("middle", dependencies=["base"], start_delay=0.1)
+        self.create_plugin("top", dependencies=["middle", "base"])
+        self.create_plugin("other", start_delay=0.1)
+        system = self.create_system()
+
+        result = system.start_all_plugins()
+
+        self.assertEqual(result["failed"], {})
+        plugins = system.get_all_plugins()
+        self.assertGreaterEqual(plugins["middle"].started_at[0], plugins["base"].started_at[1])
+        self.assertGreaterEqual(plugins["top"].started_at[0], plugins["middle"].started_at[1])
+        self.assertLess(plugins["other"].started_at[0], plugins["base"].started_at[1])
+
+        order = system.lifecycle.get_plugin_startup_order()
+        self.assertLess(order.index("base"), order.index("middle"))
+        self.assertLess(order.index("middle"), order.index("top"))
+
+    def test_failures_skip_dependents(self):
+        """Test that dependents of failed plugins and plugins on a cycle are not started."""
+        self.create_plugin("broken", fail=True)
+        self.create_plugin("needs_broken", dependencies=["broken"])
+        self.create_plugin("needs_needs_broken", dependencies=["needs_broken"])
+        self.create_plugin("cycle_a", dependencies=["cycle_b"])
+        self.create_plugin("cycle_b", dependencies=["cycle_a"])
+        self.create_plugin("healthy")
+        system = self.create_system()
+
+        result = system.start_all_plugins(ignore_failures=True)
+
+        self.assertEqual(result["success"], ["healthy"])
+        self.assertEqual(
+            sorted(result["failed"]),
+            ["broken", "cycle_a", "cycle_b", "needs_broken", "needs_needs_broken"]
+        )
+        self.assertIn("dependency broken failed", result["failed"]["needs_broken"])
+        self.assertIn("circular dependency", result["failed"]["cycle_a"])
+        self.assertEqual(system.lifecycle.get_plugin_state("broken"), PluginState.FAILED)
+        self.assertNotIn("needs_broken", system.get_all_plugins())
+
+    def test_lazy_plugins_load_on_first_use(self):
+        """Test that lazy plugins are imported on first use unless an eager plugin needs them."""
+        self.create_plugin("lazy_dependency", lazy=True)
+        self.create_plugin("eager", dependencies=["lazy_dependency"])
+        self.create_plugin("lazy_tool", lazy=True)
+        system = self.create_system()
+
+        result = system.start_all_plugins()
+
+        self.assertEqual(sorted(result["success"]), ["eager", "lazy_dependency"])
+        self.assertNotIn("lazy_tool", system.get_all_plugins())
+        self.assertNotIn("startup_test_lazy_tool", sys.modules)
+
+        self.assertEqual(system.execute_plugin_action("lazy_tool", "execute_action", "ping"), "pong")
+        plugin = system.get_plugin("lazy_tool")
+        self.assertEqual(plugin.start_count, 1)
+        self.assertEqual(system.lifecycle.get_plugin_state("lazy_tool"), PluginState.ACTIVE)
+        self.assertIn("lazy_tool", system.startup_timeline.get_timeline())
+
+    def test_timeline_records_phases(self):
+        """Test that the timeline records the import, init, and start phases of each plugin."""
+        self.create_plugin("timed", init_delay=0.05, start_delay=0.1)
+        system = self.create_system()
+
+        result = system.start_all_plugins()
+
+        record = result["timeline"]["timed"]
+        self.assertEqual(list(record["phases"]), ["import_wait", "import", "init", "start"])
+        self.assertGreaterEqual(record["phases"]["init"]["duration"], 0.05)
+        self.assertGreaterEqual(record["phases"]["start"]["duration"], 0.1)
+        self.assertLessEqual(record["phases"]["import"]["end"], record["phases"]["start"]["start"])
+        self.assertIn("timed:", system.startup_timeline.format())
+        self.assertGreaterEqual(system.startup_timeline.get_summary()["phases"]["start"], 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
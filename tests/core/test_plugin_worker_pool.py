@@ -0,0 +1,290 @@
+"""
+Tests for the plugin worker pool.
+"""
+
+import gc
+import os
+import sys
+import time
+import pickle
+import asyncio
+import tempfile
+import unittest
+import importlib
+from multiprocessing.connection import Connection
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.plugin_worker_pool import PluginWorkerPool, PluginWorkerPoolConfig, SharedPayload
+from src.core.plugin_security import PluginSecurityManager, PluginIsolationManager, PluginPermission
+from src.core.plugin_exceptions import PluginError, PluginResourceError, PluginSecurityError
+
+
+# Actions run in worker processes, so they must be importable module-level functions
+def get_pid():
+    return os.getpid()
+
+
+def burn_cpu():
+    while True:
+        pass
+
+
+def allocate(size):
+    return len(bytearray(size))
+
+
+def sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def reverse_bytes(data):
+    return bytes(reversed(data))
+
+
+def fill_payload(payload, value):
+    payload.buf[:] = bytes([value]) * len(payload)
+    return sum(payload.buf[:16])
+
+
+def queue_module_file():
+    return importlib.import_module("queue").__file__
+
+
+_captured = []
+
+
+def plant_json_hook():
+    # Module-level state a plugin leaves behind in its worker
+    import json
+    original = json.dumps
+
+    def dumps(obj, *args, **kwargs):
+        _captured.append(obj)
+        return original(obj, *args, **kwargs)
+
+    json.dumps = dumps
+    return os.getpid()
+
+
+def serialize_secret(secret):
+    import json
+    json.dumps({"secret": secret})
+    return os.getpid()
+
+
+def collect_captured():
+    return list(_captured)
+
+
+class Opaque:
+    pass
+
+
+class CustomError(Exception):
+    pass
+
+
+def return_opaque():
+    return Opaque()
+
+
+def raise_custom():
+    raise CustomError("custom failure")
+
+
+class _CreateFile:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (open, (self.path, "w"))
+
+
+def send_hostile_response(marker):
+    # A compromised action can reach the worker's pipe and write its own response
+    conn = next(obj for obj in gc.get_objects() if isinstance(obj, Connection) and not obj.closed)
+    conn.send_bytes(pickle.dumps(("ok", _CreateFile(marker), 0)))
+    time.sleep(1)
+
+
+class TestPluginWorkerPool(unittest.TestCase):
+    """Test cases for the PluginWorkerPool class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.pool = PluginWorkerPool(PluginWorkerPoolConfig(workers=2, shm_threshold=1024))
+        self.addCleanup(self.pool.shutdown)
+
+    def test_warm_reuse(self):
+        """Test that actions reuse the pre-started workers."""
+        self.pool.start()
+        worker_pids = {detail["pid"] for detail in self.pool.get_stats()["worker_details"]}
+
+        pids = {self.pool.run("plugin", get_pid) for _ in range(20)}
+
+        self.assertTrue(pids <= worker_pids)
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(self.pool.get_stats()["tasks"], 20)
+        self.assertEqual(self.pool.get_stats()["recycled"], 0)
+
+    def test_workers_are_pinned_to_one_plugin(self):
+        """Test that module-level state left by one plugin is never seen by another."""
+        pool = PluginWorkerPool(PluginWorkerPoolConfig(workers=1))
+        self.addCleanup(pool.shutdown)
+
+        planted = pool.run("plugin_a", plant_json_hook)
+        victim = pool.run("plugin_b", serialize_secret, "hunter2")
+        stolen = pool.run("plugin_a", collect_captured)
+
+        self.assertNotEqual(victim, planted)
+        self.assertEqual(stolen, [])
+        stats = pool.get_stats()
+        self.assertEqual(stats["reassigned"], 2)
+        self.assertEqual(stats["workers"], 1)
+
+        # A plugin keeps reusing its own warm worker
+        self.assertEqual(pool.run("plugin_a", get_pid), pool.run("plugin_a", get_pid))
+        self.assertEqual(pool.get_stats()["worker_details"][0]["plugin_id"], "plugin_a")
+
+    def test_errors_are_raised_in_host(self):
+        """Test that exceptions from actions reach the caller without losing the worker."""
+        with self.assertRaises(ValueError) as context:
+            self.pool.run("plugin", fail, "broken")
+
+        self.assertEqual(str(context.exception), "broken")
+        self.assertEqual(self.pool.run("plugin", sleep_for, 0), 0)
+        self.assertEqual(self.pool.get_stats()["recycled"], 0)
+
+    def test_cpu_limit(self):
+        """Test that an action over its CPU time limit is stopped and its worker replaced."""
+        with self.assertRaises(PluginResourceError) as context:
+            self.pool.run("plugin", burn_cpu, limits={"cpu_time": 1, "wall_time": 10})
+
+        self.assertIn("CPU time", str(context.exception))
+        self.assertEqual(self.pool.get_stats()["limit_violations"], 1)
+        self.assertEqual(self.pool.get_stats()["recycled"], 1)
+        self.assertIsInstance(self.pool.run("plugin", get_pid), int)
+
+    def test_memory_limit(self):
+        """Test that an action cannot grow its worker past the memory limit."""
+        limits = {"memory": 64 * 1024 * 1024}
+
+        self.assertEqual(self.pool.run("plugin", allocate, 16 * 1024 * 1024, limits=limits), 16 * 1024 * 1024)
+        with self.assertRaises(PluginResourceError) as context:
+            self.pool.run("plugin", allocate, 256 * 1024 * 1024, limits=limits)
+
+        self.assertIn("memory", str(context.exception))
+
+    def test_wall_time_limit(self):
+        """Test that a stuck action is killed after its wall-clock limit."""
+        start = time.monotonic()
+        with self.assertRaises(PluginResourceError):
+            self.pool.run("plugin", sleep_for, 30, limits={"wall_time": 0.5})
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(self.pool.get_stats()["timeouts"], 1)
+        self.assertEqual(self.pool.get_stats()["workers"], 2)
+        self.assertEqual(self.pool.run("plugin", sleep_for, 0), 0)
+
+    def test_results_are_data_only(self):
+        """Test that the host refuses anything but plain data from workers."""
+        with self.assertRaises(PluginError) as context:
+            self.pool.run("plugin", return_opaque)
+        self.assertIn("Cannot return Opaque", str(context.exception))
+
+        with self.assertRaises(PluginError) as context:
+            self.pool.run("plugin", raise_custom)
+        self.assertIn("CustomError: custom failure", str(context.exception))
+        self.assertIn("raise_custom", context.exception.remote_traceback)
+
+        marker = os.path.join(tempfile.mkdtemp(), "marker")
+        with self.assertRaises(PluginError) as context:
+            self.pool.run("plugin", send_hostile_response, marker)
+        self.assertIn("Invalid response", str(context.exception))
+        self.assertFalse(os.path.exists(marker))
+        self.assertEqual(self.pool.get_stats()["recycled"], 1)
+
+    def test_workers_do_not_see_shadowing_modules(self):
+        """Test that src/ first on the host's sys.path does not shadow the standard library in workers."""
+        src_dir = os.path.join(project_root, "src")
+        sys.path.insert(0, src_dir)
+        try:
+            pool = PluginWorkerPool(PluginWorkerPoolConfig(workers=1))
+            self.addCleanup(pool.shutdown)
+            pool.start()
+        finally:
+            sys.path.remove(src_dir)
+
+        self.assertFalse(pool.run("plugin", queue_module_file).startswith(src_dir))
+
+    def test_shared_memory_payloads(self):
+        """Test that large payloads travel through shared memory."""
+        data = os.urandom(1024 * 1024)
+
+        self.assertEqual(self.pool.run("plugin", reverse_bytes, data), data[::-1])
+        self.assertEqual(self.pool.get_stats()["shared_payloads"], 2)
+
+        payload = SharedPayload.create(4096)
+        self.addCleanup(payload.release)
+        self.assertEqual(self.pool.run("plugin", fill_payload, payload, 7), 7 * 16)
+        self.assertEqual(payload.tobytes(), bytes([7]) * 4096)
+
+    def test_run_async(self):
+        """Test that actions can be awaited from an event loop."""
+        async def run():
+            return await asyncio.gather(*(self.pool.run_async("plugin", sleep_for, 0.2) for _ in range(4)))
+
+        start = time.monotonic()
+        self.assertEqual(asyncio.run(run()), [0.2] * 4)
+        self.assertLess(time.monotonic() - start, 0.8)
+
+    def test_security_manager_uses_pool(self):
+        """Test that untrusted plugins run in pooled workers under their resource limits."""
+        manager = PluginSecurityManager({
+            "worker_pool": {"workers": 1},
+            "plugin_resource_limits": {"untrusted": {"wall_time": 0.5}}
+        })
+        self.addCleanup(manager.shutdown)
+        manager.register_plugin("untrusted", {"name": "Untrusted"})
+
+        first = manager.execute_in_sandbox("untrusted", get_pid)
+        self.assertNotEqual(first, os.getpid())
+        self.assertEqual(manager.execute_in_sandbox("untrusted", get_pid), first)
+
+        with self.assertRaises(PluginResourceError):
+            manager.execute_in_sandbox("untrusted", sleep_for, 30)
+        with self.assertRaises(PluginSecurityError):
+            manager.execute_in_sandbox("untrusted", fail, "broken")
+        with self.assertRaises(PluginSecurityError):
+            manager.execute_in_sandbox("untrusted", lambda: None)
+
+        self.assertEqual(manager.get_worker_pool_stats()["timeouts"], 1)
+
+    def test_isolated_namespace_runs_in_pool(self):
+        """Test that code for an untrusted plugin's isolated namespace runs in a pooled worker."""
+        manager = PluginSecurityManager({"worker_pool": {"workers": 1}, "sandbox_root": tempfile.mkdtemp()})
+        self.addCleanup(manager.shutdown)
+        manager.register_plugin("untrusted", {"name": "Untrusted"})
+        manager.grant_permission("untrusted", PluginPermission.SYSTEM_EXECUTE)
+        isolation = PluginIsolationManager(manager)
+
+        result = isolation.execute_in_isolated_namespace(
+            "untrusted", "x = a + 1\ndef f():\n    pass\nname = __name__", {"a": 1}
+        )
+
+        self.assertEqual(result, {"a": 1, "x": 2, "name": "plugin_untrusted"})
+        self.assertEqual(manager.get_worker_pool_stats()["tasks"], 1)
+        with self.assertRaises(PluginSecurityError):
+            isolation.execute_in_isolated_namespace("untrusted", "open('/etc/passwd')")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Tests for the stream transform pipeline.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import tempfile
+import unittest
+
+# Add project root to path for imports; plugin modules import from core
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+sys.path.append(os.path.join(project_root, 'src'))
+
+from core.plugin_manager import PluginManager
+from core.stream_pipeline import StreamPipeline, StreamTransform
+from core.async_utils import CancellationToken
+from core.plugin_exceptions import StreamTransformationError
+
+PLUGIN_CODE = '''
+class PipelineTestPlugin:
+    def __init__(self, plugin_id, plugin_name, version, description, config=None):
+        pass
+
+    def get_transform_lookahead(self, transform_type, transform_params=None):
+        return 0
+
+    async def transform_stream(self, stream, transform_type, transform_params=None,
+                               progress_callback=None, cancellation_token=None):
+        async for chunk in stream:
+            yield chunk * transform_params["factor"]
+'''
+
+
+async def paced(items, interval=0.0, produced=None):
+    for item in items:
+        await asyncio.sleep(interval)
+        if produced is not None:
+            produced.append(item)
+        yield item
+
+
+async def pairwise_sums(stream):
+    previous = None
+    async for chunk in stream:
+        if previous is not None:
+            yield previous + chunk
+        previous = chunk
+
+
+class TestStreamPipeline(unittest.TestCase):
+    """Test cases for StreamPipeline."""
+
+    def test_transforms_are_chained_and_fused(self):
+        """Test that chunk-local transforms share a stage and lookahead transforms start a new one."""
+        pipeline = StreamPipeline([
+            StreamTransform.map(lambda chunk: chunk + 1),
+            StreamTransform.filter(lambda chunk: chunk % 2 == 0),
+            StreamTransform(pairwise_sums, lookahead=1),
+            StreamTransform.map(lambda chunk: chunk * 10),
+            StreamTransform.batch(2)
+        ])
+
+        async def run():
+            return [chunk async for chunk in pipeline.run(range(10))]
+
+        self.assertEqual([len(stage) for stage in pipeline.stages], [2, 2, 1])
+        self.assertEqual(asyncio.run(run()), [[60, 100], [140, 180]])
+
+    def test_first_chunk_is_not_delayed_by_the_stream(self):
+        """Test that output starts with the first input chunk, not after the whole stream."""
+        pipeline = StreamPipeline([StreamTransform.map(str.upper) for _ in range(5)])
+
+        async def run():
+            start = time.monotonic()
+            first = None
+            chunks = []
+            async for chunk in pipeline.run(paced(["a", "b", "c", "d", "e"], 0.1)):
+                if first is None:
+                    first = time.monotonic() - start
+                chunks.append(chunk)
+            return first, time.monotonic() - start, chunks
+
+        first, total, chunks = asyncio.run(run())
+
+        self.assertEqual(chunks, ["A", "B", "C", "D", "E"])
+        self.assertLess(first, 0.25)
+        self.assertGreater(total, 0.45)
+
+    def test_backpressure(self):
+        """Test that a slow consumer stops the source from running ahead of the queues."""
+        produced = []
+        pipeline = StreamPipeline([StreamTransform(pairwise_sums, lookahead=1)], queue_size=4)
+
+        async def run():
+            consumed = 0
+            async for _ in pipeline.run(paced(range(1000), produced=produced)):
+                consumed += 1
+                await asyncio.sleep(0.001)
+                if consumed == 20:
+                    break
+            await asyncio.sleep(0.05)
+            return consumed
+
+        consumed = asyncio.run(run())
+
+        self.assertEqual(consumed, 20)
+        self.assertLess(len(produced), 40)
+
+    def test_errors(self):
+        """Test that transform errors are wrapped and source errors are re-raised unchanged."""
+        def fail_on_three(chunk):
+            if chunk == 3:
+                raise ValueError("bad chunk")
+            return chunk
+
+        async def broken_source():
+            yield 1
+            raise KeyError("source")
+
+        async def run(pipeline, source):
+            return [chunk async for chunk in pipeline.run(source)]
+
+        with self.assertRaises(StreamTransformationError) as context:
+            asyncio.run(run(StreamPipeline([StreamTransform.map(fail_on_three, name="checker")]), range(5)))
+        self.assertIn("checker", str(context.exception))
+
+        with self.assertRaises(KeyError):
+            asyncio.run(run(StreamPipeline([StreamTransform(pairwise_sums, lookahead=1)]), broken_source()))
+
+    def test_plugin_manager_transform_stream(self):
+        """Test that PluginManager chains plugin transforms and functions into a pipeline."""
+        plugin_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, plugin_dir)
+        path = os.path.join(plugin_dir, "pipeline_test")
+        os.makedirs(path)
+        with open(os.path.join(path, "pipeline_test_plugin.py"), "w") as f:
+            f.write(PLUGIN_CODE)
+        with open(os.path.join(path, "plugin.json"), "w") as f:
+            json.dump({
+                "id": "pipeline_test",
+                "name": "Pipeline Test",
+                "version": "1.0.0",
+                "description": "Plugin for pipeline tests",
+                "main_file": "pipeline_test_plugin.py",
+                "main_class": "PipelineTestPlugin"
+            }, f)
+        manager = PluginManager(plugin_dir)
+        self.addCleanup(manager.shutdown)
+        manager.schema = None
+        manager.discover_plugins()
+
+        token = CancellationToken()
+
+        async def run():
+            chunks = []
+            stream = manager.transform_stream(
+                paced(range(100)),
+                [
+                    {"plugin_id": "pipeline_test", "transform_type": "scale", "params": {"factor": 3}},
+                    lambda chunk: chunk + 1
+                ],
+                cancellation_token=token
+            )
+            async for chunk in stream:
+                chunks.append(chunk)
+                if len(chunks) == 3:
+                    token.cancel()
+            return chunks
+
+        chunks = asyncio.run(run())
+
+        self.assertEqual(chunks[:3], [1, 4, 7])
+        self.assertLess(len(chunks), 100)
+        with self.assertRaises(StreamTransformationError):
+            manager.transform_stream([], [42])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+Tests for the streaming statistics shared by the anomaly detectors.
+"""
+
+import os
+import sys
+import json
+import random
+import statistics
+import unittest
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.core.streaming_stats import (
+    CountMinSketch, DecayedCounter, DecayedHistogram, DecayedTopK, RunningMoments, decay_factor
+)
+
+
+class TestRunningMoments(unittest.TestCase):
+    """Test cases for RunningMoments."""
+
+    def test_matches_batch_statistics(self):
+        """Test that the running mean and deviation match the batch ones."""
+        values = [random.Random(7).gauss(50, 10) for _ in range(500)]
+        moments = RunningMoments()
+        for value in values:
+            moments.update(value)
+
+        self.assertEqual(moments.count, 500)
+        self.assertAlmostEqual(moments.mean, statistics.mean(values))
+        self.assertAlmostEqual(moments.stdev, statistics.stdev(values))
+
+    def test_ewma_follows_recent_values(self):
+        """Test that the EWMA moves to a new level while the all-time mean lags."""
+        moments = RunningMoments(alpha=0.2)
+        for value in [10.0] * 50 + [20.0] * 50:
+            moments.update(value)
+
+        self.assertAlmostEqual(moments.ewma_mean, 20.0, places=3)
+        self.assertAlmostEqual(moments.mean, 15.0)
+        self.assertLess(moments.ewma_stdev, moments.stdev)
+
+    def test_round_trip(self):
+        """Test that serialized moments restore with and without an EWMA."""
+        for alpha in (None, 0.1):
+            moments = RunningMoments(alpha=alpha)
+            for value in (1.0, 4.0, 9.0):
+                moments.update(value)
+
+            restored = RunningMoments.from_list(json.loads(json.dumps(moments.to_list())))
+
+            self.assertEqual(restored.to_list(), moments.to_list())
+            self.assertEqual(restored.alpha, alpha)
+            self.assertEqual(len(moments.to_list()), 3 if alpha is None else 6)
+
+
+class TestDecay(unittest.TestCase):
+    """Test cases for decayed counters and histograms."""
+
+    def test_decay_factor(self):
+        """Test that weight halves every half-life and does not decay without one."""
+        self.assertEqual(decay_factor(100.0, None), 1.0)
+        self.assertEqual(decay_factor(-5.0, 10.0), 1.0)
+        self.assertAlmostEqual(decay_factor(20.0, 10.0), 0.25)
+
+    def test_counter(self):
+        """Test that a counter decays between additions."""
+        counter = DecayedCounter()
+        counter.add(8.0, now=0.0, half_life_seconds=10.0)
+        counter.add(1.0, now=10.0, half_life_seconds=10.0)
+
+        self.assertAlmostEqual(counter.get(10.0, 10.0), 5.0)
+        self.assertAlmostEqual(counter.get(20.0, 10.0), 2.5)
+
+    def test_histogram_frequency(self):
+        """Test that older bins lose share to recent ones and the histogram round-trips."""
+        histogram = DecayedHistogram(24)
+        for _ in range(3):
+            histogram.add(9, now=0.0, half_life_seconds=3600.0)
+        histogram.add(10, now=3600.0, half_life_seconds=3600.0)
+
+        self.assertAlmostEqual(histogram.frequency(9), 1.5 / 2.5)
+        self.assertAlmostEqual(histogram.frequency(9 + 24), histogram.frequency(9))
+        self.assertAlmostEqual(histogram.total(), 2.5)
+        self.assertEqual(DecayedHistogram(24).frequency(0), 0.0)
+
+        restored = DecayedHistogram.from_list(histogram.to_list())
+        self.assertEqual(len(restored.counts), 24)
+        self.assertAlmostEqual(restored.frequency(9), histogram.frequency(9))
+
+
+class TestDecayedTopK(unittest.TestCase):
+    """Test cases for DecayedTopK."""
+
+    def test_frequencies_and_eviction(self):
+        """Test that heavy items keep their share and new items replace the lightest one."""
+        values = DecayedTopK(capacity=3)
+        for item, count in [("office", 6), ("home", 3), ("cafe", 1)]:
+            for _ in range(count):
+                values.add(item, now=0.0, half_life_seconds=None)
+
+        self.assertAlmostEqual(values.frequency("office"), 0.6)
+        self.assertEqual(values.frequency("airport"), 0.0)
+
+        values.add("airport", now=0.0, half_life_seconds=None)
+        self.assertEqual(set(values.counts), {"office", "home", "airport"})
+        self.assertAlmostEqual(values.counts["airport"], 2.0)
+        self.assertAlmostEqual(sum(values.counts.values()), 11.0)
+
+    def test_decay_and_round_trip(self):
+        """Test that older items lose share to recent ones and the map round-trips through JSON."""
+        values = DecayedTopK()
+        for _ in range(3):
+            values.add("office", now=0.0, half_life_seconds=3600.0)
+        values.add("home", now=3600.0, half_life_seconds=3600.0)
+
+        self.assertAlmostEqual(values.frequency("office"), 1.5 / 2.5)
+
+        restored = DecayedTopK.from_list(json.loads(json.dumps(values.to_list())))
+        self.assertEqual(restored.capacity, DecayedTopK.DEFAULT_CAPACITY)
+        self.assertAlmostEqual(restored.frequency("office"), values.frequency("office"))
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """Test cases for CountMinSketch."""
+
+    def add_zipf(self, sketch, items=2000, total=20000):
+        """Add weights with a long tail and return the true counts."""
+        rng = random.Random(11)
+        counts = {}
+        for _ in range(total):
+            item = f"item-{min(int(rng.paretovariate(1.0)), items)}"
+            counts[item] = counts.get(item, 0) + 1
+            sketch.add(item)
+        return counts
+
+    def test_default_size(self):
+        """Test that the default sketch is small and meets its error bound."""
+        sketch = CountMinSketch()
+        self.assertLessEqual(len(sketch.counts) * sketch.counts.itemsize, 128 * 1024)
+
+        counts = self.add_zipf(sketch)
+        total = sum(counts.values())
+        for item, count in counts.items():
+            estimate = sketch.estimate(item)
+            self.assertGreaterEqual(estimate, count)
+            self.assertLessEqual(estimate - count, 2.72 / sketch.width * total)
+        self.assertEqual(sketch.estimate("never-added"), 0.0)
+
+    def test_for_error(self):
+        """Test that sketches are sized from an error bound."""
+        sketch = CountMinSketch.for_error(epsilon=0.01, delta=0.01, half_life_seconds=60.0)
+
+        self.assertEqual(sketch.width, 512)
+        self.assertEqual(sketch.depth, 5)
+        self.assertEqual(sketch.half_life_seconds, 60.0)
+
+    def test_decay(self):
+        """Test that estimates decay by half-life, including across a rescale."""
+        sketch = CountMinSketch(width=64, depth=2, half_life_seconds=10.0)
+        sketch.add("a", now=0.0, weight=4.0)
+
+        self.assertAlmostEqual(sketch.estimate("a", now=20.0), 1.0)
+
+        later = 10.0 * (CountMinSketch.MAX_SCALE_EXPONENT + 1)
+        sketch.add("b", now=later, weight=1.0)
+        self.assertEqual(sketch.origin, later)
+        self.assertAlmostEqual(sketch.estimate("b", now=later), 1.0)
+        self.assertAlmostEqual(sketch.estimate("b", now=later + 10.0), 0.5)
+
+    def test_sparse_serialization(self):
+        """Test that a mostly empty sketch serializes only its non-zero cells."""
+        sketch = CountMinSketch(half_life_seconds=60.0)
+        for i in range(10):
+            sketch.add(f"user\x1flocation\x1f{i}", now=5.0, weight=i + 1)
+
+        sketch_dict = json.loads(json.dumps(sketch.to_dict()))
+        restored = CountMinSketch.from_dict(sketch_dict)
+
+        self.assertNotIn("counts", sketch_dict)
+        self.assertLess(len(json.dumps(sketch_dict)), 2000)
+        self.assertEqual(restored.counts, sketch.counts)
+        self.assertEqual(restored.origin, sketch.origin)
+        self.assertAlmostEqual(restored.estimate("user\x1flocation\x1f9", now=5.0), 10.0)
+
+    def test_dense_serialization(self):
+        """Test that a mostly full sketch serializes all counts and round-trips."""
+        sketch = CountMinSketch(width=32, depth=2)
+        self.add_zipf(sketch, total=500)
+
+        sketch_dict = sketch.to_dict()
+        restored = CountMinSketch.from_dict(sketch_dict)
+
+        self.assertIn("counts", sketch_dict)
+        self.assertEqual(restored.counts, sketch.counts)
+        self.assertEqual((restored.width, restored.depth), (32, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
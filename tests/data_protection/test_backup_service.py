@@ -0,0 +1,201 @@
+"""
+Tests for chunked, deduplicating backups in BackupService.
+"""
+
+import hashlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.data_protection.core.backup import (
+    BackupService, BackupStatus, BackupType, ContentDefinedChunker, RecoveryStatus
+)
+from src.data_protection.core.encryption import EncryptionService
+from src.data_protection.core.key_management import KeyManagementService
+from src.data_protection.core.storage import StorageManager, StorageType
+
+
+class TestContentDefinedChunker(unittest.TestCase):
+    """Test cases for ContentDefinedChunker."""
+
+    def test_boundaries_survive_insertion(self):
+        """Test that an insertion only changes the chunks around it."""
+        chunker = ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384)
+        data = random.Random(1).randbytes(256 * 1024)
+        edited = data[:100000] + b"inserted" + data[100000:]
+
+        chunks = list(chunker.split(io.BytesIO(data)))
+        edited_chunks = list(chunker.split(io.BytesIO(edited), read_size=1000))
+
+        self.assertEqual(b"".join(chunks), data)
+        self.assertEqual(b"".join(edited_chunks), edited)
+        self.assertTrue(all(len(chunk) <= 16384 for chunk in chunks))
+        self.assertLessEqual(len(set(edited_chunks) - set(chunks)), 2)
+
+
+class TestBackupService(unittest.TestCase):
+    """Test cases for BackupService."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        key_manager = KeyManagementService()
+        self.storage_manager = StorageManager(
+            os.path.join(self.temp_dir, "storage"),
+            key_manager=key_manager
+        )
+        self.service = BackupService(
+            self.storage_manager,
+            os.path.join(self.temp_dir, "backups"),
+            encryption_service=EncryptionService(key_manager=key_manager),
+            key_manager=key_manager,
+            chunker=ContentDefinedChunker(min_size=1024, avg_size=4096, max_size=16384),
+            list_page_size=3
+        )
+
+        rng = random.Random(2)
+        shared = rng.randbytes(20000)
+        self.objects = {}
+        for i in range(10):
+            data = rng.randbytes(5000) + shared if i % 2 else b"text " * 2000 + bytes([i])
+            object_id = f"obj-{i:02d}"
+            self.storage_manager.store_object(
+                StorageType.OBJECT, data, "application/octet-stream", "alice",
+                object_id=object_id, encrypt=False, verify_integrity=False
+            )
+            self.objects[object_id] = data
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.service._executor.shutdown(wait=True)
+        shutil.rmtree(self.temp_dir)
+
+    def _backup(self, encrypt=False, backup_type=BackupType.FULL, parent_backup_id=None):
+        return self.service.create_backup(
+            backup_type, StorageType.OBJECT, "alice",
+            encrypt=encrypt, parent_backup_id=parent_backup_id, async_operation=False
+        )
+
+    def _recover(self, backup_id):
+        destination = os.path.join(self.temp_dir, "restore", backup_id)
+        recovery = self.service.create_recovery(
+            backup_id, "alice", destination_path=destination, async_operation=False
+        )
+        self.assertEqual(recovery.status, RecoveryStatus.COMPLETED)
+        restored = {}
+        for name in os.listdir(destination):
+            with open(os.path.join(destination, name), "rb") as f:
+                restored[name] = f.read()
+        return restored
+
+    def test_backup_all_pages_and_recover(self):
+        """Test that every listing page is backed up and restored intact."""
+        backup = self._backup()
+
+        self.assertEqual(backup.status, BackupStatus.COMPLETED)
+        self.assertEqual(backup.object_count, 10)
+        self.assertEqual(backup.size, sum(len(data) for data in self.objects.values()))
+        self.assertEqual(self._recover(backup.backup_id), self.objects)
+
+        metrics = self.service.get_backup_progress(backup.backup_id)
+        self.assertEqual(metrics["objects_completed"], 10)
+        self.assertEqual(metrics["bytes_read"], backup.size)
+        self.assertGreater(metrics["dedup_ratio"], 0)
+        self.assertLess(metrics["bytes_written"], metrics["bytes_read"])
+
+    def test_deduplication_across_backups(self):
+        """Test that a second backup of unchanged data stores no new chunks."""
+        first = self._backup(encrypt=True)
+        second = self._backup(encrypt=True)
+
+        self.assertEqual(second.metrics["chunks_new"], 0)
+        self.assertEqual(second.metrics["bytes_written"], 0)
+        self.assertEqual(second.metrics["duplicate_bytes"], second.metrics["bytes_read"])
+
+        # Chunks shared with the remaining backup survive deletion
+        self.service.delete_backup(first.backup_id, "alice")
+        self.assertEqual(self._recover(second.backup_id), self.objects)
+
+        self.service.delete_backup(second.backup_id, "alice")
+        chunk_files = [
+            name for _, _, files in os.walk(os.path.join(self.temp_dir, "backups", "chunks"))
+            for name in files
+        ]
+        self.assertEqual(chunk_files, [])
+
+    def test_incremental_backup_skips_unchanged(self):
+        """Test that an incremental backup only includes changed objects."""
+        full = self._backup()
+        incremental = self._backup(backup_type=BackupType.INCREMENTAL, parent_backup_id=full.backup_id)
+
+        self.assertEqual(incremental.status, BackupStatus.COMPLETED)
+        self.assertEqual(incremental.object_count, 0)
+        self.assertEqual(incremental.metrics["objects_skipped"], 10)
+
+    def test_recover_into_storage_streams(self):
+        """Test that objects restored into the storage service are streamed and verified."""
+        backup = self._backup(encrypt=True)
+        for object_id in self.objects:
+            self.storage_manager.store_object(
+                StorageType.OBJECT, b"overwritten", "application/octet-stream", "alice",
+                object_id=object_id, encrypt=False, verify_integrity=False
+            )
+
+        storage = self.storage_manager.get_storage(StorageType.OBJECT)
+        with patch.object(storage, "store_object", wraps=storage.store_object) as store_object:
+            recovery = self.service.create_recovery(backup.backup_id, "alice", async_operation=False)
+
+        self.assertEqual(recovery.status, RecoveryStatus.COMPLETED)
+        self.assertEqual(store_object.call_count, len(self.objects))
+        self.assertTrue(all(hasattr(call.kwargs["data"], "read") for call in store_object.call_args_list))
+        for object_id, data in self.objects.items():
+            stream, metadata = self.storage_manager.retrieve_object(StorageType.OBJECT, object_id, "alice")
+            self.assertEqual(stream.read(), data)
+            self.assertIn("hash", metadata.integrity_info)
+
+    def test_encrypted_chunk_names_hide_content(self):
+        """Test that encrypted chunks are not named after the hash of their content."""
+        plain = self._backup()
+        encrypted = self._backup(encrypt=True)
+
+        def chunk_names(backup):
+            namespace = self.service._read_manifest(backup)["chunk_namespace"]
+            namespace_path = os.path.join(self.temp_dir, "backups", "chunks", namespace)
+            return {name for _, _, files in os.walk(namespace_path) for name in files}
+
+        chunker = self.service._chunker
+        content_hashes = {
+            hashlib.sha256(chunk).hexdigest()
+            for data in self.objects.values()
+            for chunk in chunker.split(io.BytesIO(data))
+        }
+        self.assertEqual(chunk_names(plain), content_hashes)
+        self.assertEqual(len(chunk_names(encrypted)), len(content_hashes))
+        self.assertFalse(chunk_names(encrypted) & content_hashes)
+        self.assertEqual(self._recover(encrypted.backup_id), self.objects)
+
+    def test_tampered_chunk_fails_recovery(self):
+        """Test that a modified chunk is not restored."""
+        backup = self._backup(encrypt=True)
+        chunk_root = os.path.join(self.temp_dir, "backups", "chunks")
+        root, _, files = next((entry for entry in os.walk(chunk_root) if entry[2]))
+        with open(os.path.join(root, files[0]), "r+b") as f:
+            f.seek(40)
+            f.write(b"\x00\x00\x00\x00")
+
+        restored = self._recover(backup.backup_id)
+        self.assertLess(len(restored), len(self.objects))
+        for object_id, data in restored.items():
+            self.assertEqual(data, self.objects[object_id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests for chunked file encryption in RestEncryptionService.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.data_protection.core.encryption.encryption_service import (
+    EncryptionError, EncryptionService, RestEncryptionService
+)
+from src.data_protection.core.encryption.chunked_encryption import ChunkedFileHeader, TAG_SIZE
+from src.data_protection.core.key_management import KeyManagementService
+
+
+class TestChunkedFileEncryption(unittest.TestCase):
+    """Test cases for chunked file encryption."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.key_manager = KeyManagementService()
+        self.service = RestEncryptionService(EncryptionService(key_manager=self.key_manager))
+        self.data = os.urandom(10 * 1024 + 123)
+        self.plain_path = self._path("plain.bin")
+        with open(self.plain_path, "wb") as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def _path(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def _encrypt(self, data=None, chunk_size=1024, max_workers=4):
+        if data is not None:
+            with open(self.plain_path, "wb") as f:
+                f.write(data)
+        encrypted_path = self._path("encrypted.bin")
+        self.service.encrypt_file(
+            self.plain_path, encrypted_path, "file-1", "document",
+            user_id="alice", chunk_size=chunk_size, max_workers=max_workers
+        )
+        return encrypted_path
+
+    def _decrypt(self, encrypted_path, max_workers=4):
+        output_path = self._path("decrypted.bin")
+        self.service.decrypt_file(encrypted_path, output_path, user_id="alice", max_workers=max_workers)
+        with open(output_path, "rb") as f:
+            return f.read()
+
+    def _header(self, encrypted_path):
+        with open(encrypted_path, "rb") as f:
+            return ChunkedFileHeader.read(f)
+
+    def _modify(self, encrypted_path, position, data):
+        with open(encrypted_path, "r+b") as f:
+            f.seek(position)
+            f.write(data)
+
+    def test_round_trip(self):
+        """Test parallel and sequential round trips of a multi-chunk file."""
+        encrypted_path = self._encrypt()
+        header = self._header(encrypted_path)
+
+        self.assertEqual(header.chunk_count, 11)
+        self.assertEqual(os.path.getsize(encrypted_path), header.encrypted_size)
+        self.assertEqual(self._decrypt(encrypted_path), self.data)
+        self.assertEqual(self._decrypt(encrypted_path, max_workers=1), self.data)
+
+    def test_empty_and_exact_multiple(self):
+        """Test files that are empty or end on a chunk boundary."""
+        self.assertEqual(self._decrypt(self._encrypt(b"")), b"")
+
+        data = os.urandom(4096)
+        encrypted_path = self._encrypt(data)
+        self.assertEqual(self._header(encrypted_path).chunk_count, 4)
+        self.assertEqual(self._decrypt(encrypted_path), data)
+
+    def test_decrypt_range(self):
+        """Test random-access decryption across chunk boundaries."""
+        encrypted_path = self._encrypt()
+
+        for offset, length in [(0, 10), (1000, 100), (1024, 1024), (2000, 5000), (10000, 1000), (20000, 5)]:
+            self.assertEqual(
+                self.service.decrypt_file_range(encrypted_path, offset, length, user_id="alice"),
+                self.data[offset:offset + length]
+            )
+
+    def test_tampered_chunk_detected(self):
+        """Test that a modified chunk fails authentication."""
+        encrypted_path = self._encrypt()
+        header = self._header(encrypted_path)
+        self._modify(encrypted_path, header.chunk_offset(3) + 5, b"\x00\x01")
+
+        with self.assertRaises(EncryptionError):
+            self._decrypt(encrypted_path)
+
+        # Ranges outside the modified chunk are still readable
+        self.assertEqual(
+            self.service.decrypt_file_range(encrypted_path, 0, 1024, user_id="alice"),
+            self.data[:1024]
+        )
+
+    def test_failed_decryption_leaves_no_plaintext(self):
+        """Test that a failed decryption neither creates nor overwrites the output file."""
+        encrypted_path = self._encrypt()
+        header = self._header(encrypted_path)
+        self._modify(encrypted_path, header.chunk_offset(header.chunk_count - 1) + 5, b"\x00\x01")
+
+        output_path = self._path("decrypted.bin")
+        with self.assertRaises(EncryptionError):
+            self.service.decrypt_file(encrypted_path, output_path, user_id="alice", max_workers=1)
+        self.assertFalse(os.path.exists(output_path))
+
+        with open(output_path, "wb") as f:
+            f.write(b"previous contents")
+        with self.assertRaises(EncryptionError):
+            self.service.decrypt_file(encrypted_path, output_path, user_id="alice")
+        with open(output_path, "rb") as f:
+            self.assertEqual(f.read(), b"previous contents")
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ["decrypted.bin", "encrypted.bin", "plain.bin"])
+
+    def test_reordered_chunks_detected(self):
+        """Test that swapping two chunks fails authentication."""
+        encrypted_path = self._encrypt()
+        header = self._header(encrypted_path)
+        size = header.chunk_size + TAG_SIZE
+
+        with open(encrypted_path, "rb") as f:
+            f.seek(header.chunk_offset(1))
+            first, second = f.read(size), f.read(size)
+        self._modify(encrypted_path, header.chunk_offset(1), second + first)
+
+        with self.assertRaises(EncryptionError):
+            self._decrypt(encrypted_path)
+
+    def test_truncation_detected(self):
+        """Test that dropping the final chunk or trailing bytes is detected."""
+        encrypted_path = self._encrypt()
+        header = self._header(encrypted_path)
+
+        with open(encrypted_path, "r+b") as f:
+            f.truncate(header.chunk_offset(header.chunk_count - 1))
+
+        with self.assertRaises(EncryptionError):
+            self._decrypt(encrypted_path)
+
+    def test_header_modification_detected(self):
+        """Test that chunks are bound to the header they were written with."""
+        encrypted_path = self._encrypt()
+        with open(encrypted_path, "rb") as f:
+            contents = f.read()
+
+        # Declare a smaller file so an earlier chunk looks like the final one
+        header = self._header(encrypted_path)
+        data_offset = header.data_offset
+        header.plaintext_size -= 1024
+        header._encoded = None
+        with open(encrypted_path, "wb") as f:
+            header.write(f)
+            f.write(contents[data_offset:])
+
+        with self.assertRaises(EncryptionError):
+            self._decrypt(encrypted_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
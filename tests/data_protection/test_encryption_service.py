@@ -0,0 +1,174 @@
+"""
+Tests for envelope encryption, the data key cache and batch encryption in EncryptionService.
+"""
+
+import hashlib
+import os
+import sys
+import time
+import unittest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.data_protection.core.encryption.encryption_service import (
+    EncryptedData, EncryptionContext, EncryptionError, EncryptionService
+)
+from src.data_protection.core.encryption.key_cache import DataKeyCache
+from src.data_protection.core.key_management import KeyManagementService, KeyType, KeyUsage
+from src.data_protection.core.crypto import CryptoCore, EncryptionAlgorithm
+
+
+class CountingKeyManager(KeyManagementService):
+    """Key manager that counts key creation and retrieval."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created = 0
+        self.fetched = 0
+
+    def create_key(self, *args, **kwargs):
+        self.created += 1
+        return super().create_key(*args, **kwargs)
+
+    def get_key(self, *args, **kwargs):
+        self.fetched += 1
+        return super().get_key(*args, **kwargs)
+
+
+class TestDataKeyCache(unittest.TestCase):
+    """Test cases for DataKeyCache."""
+
+    def test_eviction_zeroizes_and_returns_copies(self):
+        """Test LRU eviction and that lookups are detached from the cached buffer."""
+        cache = DataKeyCache(max_entries=2)
+        cache.put("a", b"\x01" * 32)
+        cache.put("b", b"\x02" * 32)
+        copy = cache.get("a")
+        cache.put("c", b"\x03" * 32)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+        # Evicting "a" must not clear a copy that is still in use
+        cache.invalidate("a")
+        self.assertEqual(bytes(copy.key), b"\x01" * 32)
+
+    def test_ttl(self):
+        """Test that entries are not served after their TTL."""
+        cache = DataKeyCache(ttl_seconds=0.05)
+        cache.put("a", b"\x01" * 32)
+        self.assertIsNotNone(cache.get("a"))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+
+class TestEnvelopeEncryption(unittest.TestCase):
+    """Test cases for envelope encryption in EncryptionService."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.key_manager = CountingKeyManager()
+        self.service = EncryptionService(key_manager=self.key_manager)
+
+    def test_data_key_reused_per_scope(self):
+        """Test that repeated encryption does not create or fetch a managed key per call."""
+        items = [
+            self.service.encrypt(f"record {i}".encode(), self.service.create_encryption_context(
+                user_id="alice", resource_type="record"
+            ), user_id="alice")
+            for i in range(50)
+        ]
+
+        self.assertEqual(self.key_manager.created, 1)
+        self.assertEqual(self.key_manager.fetched, 1)
+        self.assertEqual(len({item.wrapped_key for item in items}), 1)
+        self.assertEqual(items[0].version, 2)
+
+        # A different resource type gets its own data key under the same key encryption key
+        other = self.service.encrypt(b"x", self.service.create_encryption_context(
+            user_id="alice", resource_type="file"
+        ), user_id="alice")
+        self.assertNotEqual(other.wrapped_key, items[0].wrapped_key)
+        self.assertEqual(other.key_id, items[0].key_id)
+        self.assertEqual(self.key_manager.created, 1)
+
+        for i, item in enumerate(items):
+            restored = EncryptedData.deserialize(item.serialize())
+            self.assertEqual(self.service.decrypt(restored, user_id="alice"), f"record {i}".encode())
+
+    def test_data_key_replaced_after_use_limit(self):
+        """Test that a data key is replaced once it reaches its use limit."""
+        service = EncryptionService(key_manager=self.key_manager, max_data_key_uses=3)
+        wrapped = {service.encrypt(b"x", user_id="bob").wrapped_key for _ in range(10)}
+        self.assertGreater(len(wrapped), 1)
+
+    def test_decrypt_with_new_service(self):
+        """Test that data can be decrypted after the key cache is gone."""
+        encrypted = self.service.encrypt(b"secret", user_id="alice")
+        service = EncryptionService(key_manager=self.key_manager)
+        self.assertEqual(service.decrypt(encrypted, user_id="alice"), b"secret")
+
+    def test_tampered_wrapped_key_fails(self):
+        """Test that a modified wrapped key is rejected."""
+        encrypted = self.service.encrypt(b"secret", user_id="alice")
+        encrypted.wrapped_key = bytes([encrypted.wrapped_key[0] ^ 1]) + encrypted.wrapped_key[1:]
+        with self.assertRaises(EncryptionError):
+            EncryptionService(key_manager=self.key_manager).decrypt(encrypted, user_id="alice")
+
+    def test_wrapped_key_layout(self):
+        """Test that wrapped keys use CryptoCore's IV and tag sizes and truncation is rejected."""
+        encrypted = self.service.encrypt(b"secret", user_id="alice")
+        overhead = CryptoCore.IV_SIZE + CryptoCore.TAG_SIZE
+        self.assertEqual(len(encrypted.wrapped_key), overhead + 32)
+
+        encrypted.wrapped_key = encrypted.wrapped_key[:overhead]
+        with self.assertRaises(EncryptionError):
+            EncryptionService(key_manager=self.key_manager).decrypt(encrypted, user_id="alice")
+
+    def test_content_digest_keyed_per_owner(self):
+        """Test that content digests are stable per owner and hide the content hash."""
+        digest = self.service.content_digest(b"chunk", "alice")
+
+        self.assertEqual(self.service.content_digest(b"chunk", "alice"), digest)
+        self.assertEqual(EncryptionService(key_manager=self.key_manager).content_digest(b"chunk", "alice"), digest)
+        self.assertNotEqual(self.service.content_digest(b"chunk", "bob"), digest)
+        self.assertNotEqual(hashlib.sha256(b"chunk").hexdigest(), digest)
+        self.assertEqual(self.key_manager.created, 2)
+
+    def test_explicit_key_still_supported(self):
+        """Test encryption with a caller-supplied managed key."""
+        key_id = self.key_manager.create_key(
+            key_type=KeyType.DATA_ENCRYPTION,
+            algorithm=EncryptionAlgorithm.AES_256_GCM,
+            usage=[KeyUsage.ENCRYPT, KeyUsage.DECRYPT]
+        )
+        encrypted = [self.service.encrypt(b"data", key_id=key_id) for _ in range(5)]
+        self.assertIsNone(encrypted[0].wrapped_key)
+        self.assertEqual(encrypted[0].version, 1)
+        self.assertEqual(self.service.decrypt(encrypted[0]), b"data")
+        self.assertEqual(self.key_manager.fetched, 2)
+
+    def test_encrypt_many_and_decrypt_many(self):
+        """Test batch encryption round trips and resolves keys once."""
+        plaintexts = [f"item {i}".encode() for i in range(100)]
+        contexts = [
+            EncryptionContext(user_id="alice", resource_type="a" if i % 2 else "b")
+            for i in range(100)
+        ]
+
+        encrypted = self.service.encrypt_many(plaintexts, contexts, user_id="alice")
+        self.assertEqual(len({item.wrapped_key for item in encrypted}), 2)
+
+        service = EncryptionService(key_manager=self.key_manager)
+        fetched = self.key_manager.fetched
+        self.assertEqual(service.decrypt_many(encrypted, user_id="alice"), plaintexts)
+        self.assertEqual(self.key_manager.fetched - fetched, 1)
+
+        with self.assertRaises(EncryptionError):
+            self.service.encrypt_many(plaintexts, contexts[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+"""
+Tests for the pooled HTTP transport used by the Azure OpenAI provider.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.llm_providers.azure_openai import AzureAuthType, AzureCredentials, AzureOpenAIProvider
+from src.llm_providers.azure_openai.benchmark import FakeAzureOpenAIServer
+from src.llm_providers.core import (
+    AsyncHTTPTransport, ChatGenerationOptions, ChatMessage, FinishReason, HTTPTransport, LLMError, LLMErrorType,
+    RetryPolicy, TransportConfig
+)
+from src.llm_providers.core.http_transport import parse_retry_after
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for RetryPolicy."""
+
+    def test_delay_is_jittered_and_capped(self):
+        """Test that backoff stays within the exponential cap."""
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=2.0)
+        for attempt in range(6):
+            delay = policy.get_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(2.0, 0.5 * 2 ** attempt))
+
+    def test_retry_after(self):
+        """Test that Retry-After takes precedence and is capped."""
+        policy = RetryPolicy(backoff_max=10.0)
+        self.assertEqual(policy.get_delay(0, "3"), 3.0)
+        self.assertEqual(policy.get_delay(0, "120"), 10.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestAzureOpenAITransport(unittest.TestCase):
+    """Test cases for AzureOpenAIProvider over a local fake server."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.server = FakeAzureOpenAIServer(latency=0.05).start()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.server.stop()
+
+    def _provider(self, **config):
+        credentials = AzureCredentials(
+            auth_type=AzureAuthType.API_KEY,
+            api_key="test",
+            endpoint=self.server.endpoint
+        )
+        return AzureOpenAIProvider(credentials, transport_config=TransportConfig(**config))
+
+    def _chat(self, provider):
+        return provider.generate_chat(
+            [ChatMessage(role="user", content="Hello")],
+            ChatGenerationOptions(model="gpt-4")
+        )
+
+    def test_sync_reuses_connections(self):
+        """Test that sequential requests share one keep-alive connection."""
+        provider = self._provider()
+        for _ in range(5):
+            result = self._chat(provider)
+        provider.close()
+
+        self.assertEqual(result.message.content, "Hello from the fake server.")
+        self.assertEqual(result.finish_reason, FinishReason.STOP)
+        self.assertEqual(self.server.connection_count, 1)
+
+    def test_throttled_request_is_retried(self):
+        """Test that 429 responses are retried until the server accepts."""
+        self.server.throttle_count = 2
+        provider = self._provider(retry=RetryPolicy(backoff_base=0.01))
+        self._chat(provider)
+        provider.close()
+        self.assertEqual(self.server.request_count, 3)
+
+        self.server.throttle_count = 5
+        provider = self._provider(retry=RetryPolicy(max_retries=1, backoff_base=0.01))
+        with self.assertRaises(LLMError) as context:
+            self._chat(provider)
+        provider.close()
+        self.assertEqual(context.exception.type, LLMErrorType.RATE_LIMIT_ERROR)
+        self.assertTrue(context.exception.retryable)
+
+    def test_read_timeout(self):
+        """Test that a slow response maps to a timeout error."""
+        provider = self._provider(read_timeout=0.01, retry=RetryPolicy(max_retries=0))
+        with self.assertRaises(LLMError) as context:
+            self._chat(provider)
+        provider.close()
+        self.assertEqual(context.exception.type, LLMErrorType.TIMEOUT_ERROR)
+
+    def test_keep_alive_requests_do_not_stall(self):
+        """Test that requests on a kept-alive connection are not delayed by Nagle's algorithm."""
+        self.server.latency = 0
+        provider = self._provider()
+        self._chat(provider)
+
+        start = time.perf_counter()
+        for _ in range(10):
+            self._chat(provider)
+        provider.close()
+
+        # A delayed-ACK stall costs about 40ms per request
+        self.assertLess((time.perf_counter() - start) / 10, 0.02)
+
+    def test_timed_out_completion_is_not_retried(self):
+        """Test that a completion POST that timed out waiting for its response is not sent again."""
+        provider = self._provider(read_timeout=0.01, retry=RetryPolicy(backoff_base=0.01))
+        with self.assertRaises(LLMError):
+            self._chat(provider)
+        provider.close()
+        self.assertEqual(self.server.request_count, 1)
+
+        async def run():
+            try:
+                await provider.generate_chat_async(
+                    [ChatMessage(role="user", content="Hello")], ChatGenerationOptions(model="gpt-4")
+                )
+            finally:
+                await provider.aclose()
+
+        provider = self._provider(read_timeout=0.01, retry=RetryPolicy(backoff_base=0.01))
+        with self.assertRaises(LLMError):
+            asyncio.run(run())
+        self.assertEqual(self.server.request_count, 2)
+
+        # Idempotent requests are still retried
+        self.assertTrue(RetryPolicy().should_retry_error("GET", True, 0))
+        self.assertTrue(RetryPolicy().should_retry_error("POST", False, 0))
+        self.assertFalse(RetryPolicy().should_retry_error("POST", True, 0))
+
+    def test_timeouts_without_connection_timeout_error(self):
+        """Test that the async retry path works on aiohttp versions without ConnectionTimeoutError."""
+        provider = self._provider(read_timeout=0.01, retry=RetryPolicy(backoff_base=0.01))
+
+        async def run():
+            try:
+                await provider.generate_chat_async(
+                    [ChatMessage(role="user", content="Hello")], ChatGenerationOptions(model="gpt-4")
+                )
+            finally:
+                await provider.aclose()
+
+        with mock.patch("src.llm_providers.core.http_transport._CONNECT_TIMEOUT_ERRORS", ()):
+            with self.assertRaises(LLMError):
+                asyncio.run(run())
+        # A timeout that cannot be told apart from a read timeout is not retried for a POST
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_exhausted_pool_times_out(self):
+        """Test that a request waiting for a pooled connection gives up after the pool timeout."""
+        transport = HTTPTransport(TransportConfig(pool_maxsize=1, pool_timeout=0.1))
+        self.addCleanup(transport.close)
+        held = transport.request("POST", self.server.endpoint, json={}, stream=True)
+        self.addCleanup(held.close)
+
+        start = time.perf_counter()
+        with self.assertRaises(requests.ConnectionError):
+            transport.request("POST", self.server.endpoint, json={})
+        self.assertLess(time.perf_counter() - start, 1)
+
+        held.close()
+        self.assertEqual(transport.request("POST", self.server.endpoint, json={}).status_code, 200)
+
+    def test_session_of_previous_loop_is_closed(self):
+        """Test that using the async transport from a new event loop closes the old session."""
+        transport = AsyncHTTPTransport()
+        first_loop = asyncio.new_event_loop()
+        self.addCleanup(first_loop.close)
+        first_loop.run_until_complete(transport.request("POST", self.server.endpoint, json={}))
+        first_session = transport._session
+
+        async def run():
+            try:
+                return await transport.request("POST", self.server.endpoint, json={})
+            finally:
+                await transport.close()
+
+        self.assertEqual(asyncio.run(run()).status_code, 200)
+        first_loop.run_until_complete(asyncio.sleep(0.01))
+        self.assertTrue(first_session.closed)
+
+    def test_async_requests_share_pool(self):
+        """Test that concurrent async requests overlap on a bounded pool."""
+        provider = self._provider(pool_maxsize=10)
+        messages = [ChatMessage(role="user", content="Hello")]
+        options = ChatGenerationOptions(model="gpt-4")
+
+        async def run():
+            try:
+                start = asyncio.get_running_loop().time()
+                results = await asyncio.gather(*(
+                    provider.generate_chat_async(messages, options) for _ in range(20)
+                ))
+                return results, asyncio.get_running_loop().time() - start
+            finally:
+                await provider.aclose()
+
+        results, elapsed = asyncio.run(run())
+
+        self.assertEqual(len(results), 20)
+        self.assertLessEqual(self.server.connection_count, 10)
+        # Twenty requests over ten connections take about two round trips, not twenty
+        self.assertLess(elapsed, 20 * 0.05 / 2)
+
+    def test_chat_stream(self):
+        """Test that server-sent events are streamed as chunks."""
+        provider = self._provider()
+
+        async def run():
+            try:
+                return [
+                    chunk async for chunk in provider.generate_chat_stream(
+                        [ChatMessage(role="user", content="Hello")],
+                        ChatGenerationOptions(model="gpt-4")
+                    )
+                ]
+            finally:
+                await provider.aclose()
+
+        chunks = asyncio.run(run())
+
+        self.assertEqual("".join(chunk.delta.get("content", "") for chunk in chunks), "Hello from the fake server.")
+        self.assertTrue(chunks[-1].is_final)
+        self.assertEqual(chunks[-1].finish_reason, FinishReason.STOP)
+
+
+if __name__ == "__main__":
+    unittest.main()
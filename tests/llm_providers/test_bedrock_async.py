@@ -0,0 +1,282 @@
+"""
+Tests for the non-blocking async path of the AWS Bedrock provider.
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.llm_providers.aws_bedrock import AWSBedrockProvider
+from src.llm_providers.core import (
+    AsyncWorkerPool, ChatGenerationOptions, ChatMessage, LLMError, LLMErrorType, TextGenerationOptions,
+    WorkerPoolConfig, WorkerPoolOverloadedError
+)
+
+LATENCY = 0.2
+
+
+class StubRuntimeClient:
+    """Bedrock runtime client stub that blocks like the real SDK."""
+
+    def __init__(self):
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke_model(self, modelId, body):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(LATENCY)
+        finally:
+            with self._lock:
+                self.active -= 1
+        payload = {"content": [{"type": "text", "text": "stubbed"}], "stop_reason": "end_turn"}
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+    def invoke_model_with_response_stream(self, modelId, body):
+        events = [
+            {"chunk": {"bytes": json.dumps({"delta": {"text": word}}).encode("utf-8")}}
+            for word in ["Hello ", "world"]
+        ]
+        events.append({"chunk": {"bytes": json.dumps({"stop_reason": "end_turn"}).encode("utf-8")}})
+        return {"body": iter(events)}
+
+
+class TestBedrockAsync(unittest.TestCase):
+    """Test cases for AWSBedrockProvider async methods."""
+
+    def _provider(self, **config):
+        self.runtime = StubRuntimeClient()
+        auth_manager = MagicMock()
+        auth_manager.get_bedrock_runtime_client.return_value = self.runtime
+        provider = AWSBedrockProvider(auth_manager=auth_manager, worker_pool_config=WorkerPoolConfig(**config))
+        self.addCleanup(provider.close)
+        return provider
+
+    def _options(self, model="claude-3-haiku", timeout=None):
+        return TextGenerationOptions(model=model, timeout=timeout)
+
+    def test_concurrent_calls_overlap(self):
+        """Test that 100 concurrent calls take about one call's latency."""
+        provider = self._provider(max_workers=100, max_concurrency_per_key=100)
+
+        async def run():
+            ticks = 0
+
+            async def heartbeat():
+                # Counts loop iterations to prove the event loop stays responsive
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            monitor = asyncio.create_task(heartbeat())
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                provider.generate_text_async("Hi", self._options()) for _ in range(100)
+            ))
+            elapsed = time.perf_counter() - start
+            monitor.cancel()
+            return results, elapsed, ticks
+
+        results, elapsed, ticks = asyncio.run(run())
+
+        self.assertEqual(len(results), 100)
+        self.assertEqual(results[0].text, "stubbed")
+        self.assertLess(elapsed, LATENCY * 5)
+        self.assertGreater(ticks, 5)
+
+    def test_per_model_limit(self):
+        """Test that calls for one model never exceed its concurrency limit."""
+        provider = self._provider(max_workers=32, max_concurrency_per_key=4)
+
+        async def run():
+            await asyncio.gather(*(
+                provider.generate_text_async("Hi", self._options()) for _ in range(12)
+            ))
+
+        start = time.perf_counter()
+        asyncio.run(run())
+
+        self.assertEqual(self.runtime.max_active, 4)
+        self.assertGreaterEqual(time.perf_counter() - start, LATENCY * 3)
+
+    def test_backlog_rejects_excess_calls(self):
+        """Test that calls past the queue depth are rejected."""
+        provider = self._provider(max_concurrency_per_key=2, max_queue_depth=3)
+
+        async def run():
+            return await asyncio.gather(*(
+                provider.generate_text_async("Hi", self._options()) for _ in range(10)
+            ), return_exceptions=True)
+
+        results = asyncio.run(run())
+        errors = [result for result in results if isinstance(result, LLMError)]
+
+        self.assertEqual(len(errors), 5)
+        self.assertTrue(all(error.type == LLMErrorType.SERVICE_UNAVAILABLE_ERROR for error in errors))
+        self.assertEqual(self.runtime.calls, 5)
+        self.assertEqual(provider.get_worker_pool_stats()["rejected"], 5)
+
+    def test_cancel_and_timeout(self):
+        """Test that cancelled and timed-out calls waiting for a slot never run."""
+        provider = self._provider(max_concurrency_per_key=1)
+
+        async def run():
+            first = asyncio.create_task(provider.generate_text_async("Hi", self._options()))
+            queued = asyncio.create_task(provider.generate_text_async("Hi", self._options()))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+
+            with self.assertRaises(LLMError) as context:
+                await provider.generate_text_async("Hi", self._options(timeout=0.05))
+            self.assertEqual(context.exception.type, LLMErrorType.TIMEOUT_ERROR)
+
+            await first
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+
+        asyncio.run(run())
+
+        self.assertEqual(self.runtime.calls, 1)
+        self.assertEqual(provider.get_worker_pool_stats()["waiting"], 0)
+
+    def test_chat_stream(self):
+        """Test that streaming reads events off the event loop."""
+        provider = self._provider()
+
+        async def run():
+            return [
+                chunk async for chunk in provider.generate_chat_stream(
+                    [ChatMessage(role="user", content="Hi")],
+                    ChatGenerationOptions(model="claude-3-haiku")
+                )
+            ]
+
+        chunks = asyncio.run(run())
+
+        self.assertEqual("".join(chunk.delta.get("content", "") for chunk in chunks), "Hello world")
+        self.assertTrue(chunks[-1].is_final)
+
+
+
+class TestAsyncWorkerPool(unittest.TestCase):
+    """Test cases for AsyncWorkerPool slot accounting."""
+
+    def _pool(self, **config):
+        pool = AsyncWorkerPool(WorkerPoolConfig(**config))
+        self.addCleanup(pool.shutdown)
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        return pool
+
+    def _blocking(self, delay):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(delay)
+        with self.lock:
+            self.active -= 1
+
+    def test_timed_out_call_keeps_slot_until_it_returns(self):
+        """Test that a call still running after its timeout holds its slot."""
+        pool = self._pool(max_concurrency_per_key=1)
+
+        async def run():
+            with self.assertRaises(asyncio.TimeoutError):
+                await pool.run("model", self._blocking, LATENCY, timeout=0.05)
+            self.assertEqual(pool.get_stats()["running"], 1)
+            await pool.run("model", self._blocking, 0.01)
+
+        start = time.perf_counter()
+        asyncio.run(run())
+
+        self.assertEqual(self.max_active, 1)
+        self.assertGreaterEqual(time.perf_counter() - start, LATENCY)
+        self.assertEqual(pool.get_stats()["running"], 0)
+
+    def test_streams_count_against_limits(self):
+        """Test that a stream holds a slot under its key and waits in the backlog."""
+        pool = self._pool(max_concurrency_per_key=1, max_queue_depth=1)
+        order = []
+
+        def events(name):
+            for i in range(3):
+                time.sleep(0.02)
+                yield f"{name}{i}"
+
+        async def consume(name):
+            async for event in pool.iterate("model", events(name)):
+                order.append(event)
+
+        async def run():
+            first = asyncio.create_task(consume("a"))
+            second = asyncio.create_task(consume("b"))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(WorkerPoolOverloadedError):
+                await consume("c")
+            await asyncio.gather(first, second)
+
+        asyncio.run(run())
+
+        self.assertEqual(order, ["a0", "a1", "a2", "b0", "b1", "b2"])
+        self.assertEqual(pool.get_stats()["rejected"], 1)
+
+    def test_early_exit_closes_stream(self):
+        """Test that leaving a stream early closes it and then releases the slot."""
+        pool = self._pool(max_concurrency_per_key=1)
+        closed = threading.Event()
+
+        class Stream:
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                time.sleep(0.05)
+                return "event"
+
+            def close(self):
+                closed.set()
+
+        async def run():
+            async for _ in pool.iterate("model", Stream()):
+                break
+            # The next call for the key gets the slot only after the stream is closed
+            self.assertTrue(await asyncio.wait_for(pool.run("model", closed.is_set), 1))
+
+            closed.clear()
+            consumer = asyncio.create_task(self._consume_all(pool, Stream()))
+            await asyncio.sleep(0.02)
+            consumer.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await consumer
+
+            # The fetch in flight finishes before the stream is closed and the slot released
+            await asyncio.wait_for(pool.run("model", closed.is_set), 1)
+            return closed.is_set()
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(pool.get_stats()["running"], 0)
+
+    @staticmethod
+    async def _consume_all(pool, stream):
+        async for _ in pool.iterate("model", stream):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
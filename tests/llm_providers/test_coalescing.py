@@ -0,0 +1,205 @@
+"""
+Tests for request coalescing and micro-batching in ProviderManager.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.llm_providers import (
+    AzureAuthType, AzureCredentials, AzureOpenAIProvider, CoalescingConfig, EmbeddingOptions, EmbeddingResult,
+    LLMError, LLMErrorType, ProviderCapabilities, ProviderManager, ResponseCache, ResponseCacheConfig,
+    TextGenerationOptions, UsageInfo
+)
+from src.llm_providers.routing_simulation import SimulatedProvider
+
+
+class BatchingProvider(SimulatedProvider):
+    """Simulated provider with a batch embeddings API."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_sizes = []
+        self._batch_lock = threading.Lock()
+
+    def get_capabilities(self):
+        return ProviderCapabilities(supports_embeddings=True, supports_batch_embeddings=True)
+
+    def _embed(self, texts, options):
+        with self._batch_lock:
+            self.batch_sizes.append(len(texts))
+        return [
+            EmbeddingResult([float(len(text))], options.model, self.name, UsageInfo(prompt_tokens=1))
+            for text in texts
+        ]
+
+    def generate_embeddings(self, texts, options):
+        time.sleep(self.median_latency)
+        return self._embed(texts, options)
+
+    async def generate_embeddings_async(self, texts, options):
+        await asyncio.sleep(self.median_latency)
+        return self._embed(texts, options)
+
+
+class TestCoalescing(unittest.TestCase):
+    """Test cases for ProviderManager request coalescing."""
+
+    def _manager(self, provider, **config):
+        manager = ProviderManager(coalescing_config=CoalescingConfig(**config))
+        self.addCleanup(manager.shutdown)
+        manager.register_provider("sim", provider)
+        return manager
+
+    def test_single_flight(self):
+        """Test that concurrent identical requests share one upstream call."""
+        provider = SimulatedProvider("sim", median_latency=0.2, sigma=0.0)
+        manager = self._manager(provider)
+        options = TextGenerationOptions(model="sim-model", temperature=0)
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            results = list(executor.map(lambda _: manager.generate_text("Classify: spam?", options), range(10)))
+
+        self.assertEqual(provider.calls, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertIsNot(results[0], results[1])
+
+        stats = manager.get_coalescing_stats()
+        self.assertEqual(stats["shared"], 9)
+        self.assertAlmostEqual(stats["upstream_reduction"], 0.9)
+
+        # A different tenant, or a request that opts out, gets its own call
+        manager.generate_text("Classify: spam?", options, tenant_id="other")
+        manager.generate_text("Classify: spam?", options, use_cache=False)
+        self.assertEqual(provider.calls, 3)
+
+    def test_sampled_requests_are_not_shared(self):
+        """Test that requests with non-deterministic sampling each get their own call."""
+        provider = SimulatedProvider("sim", median_latency=0.1, sigma=0.0)
+        manager = self._manager(provider)
+
+        sampled = [TextGenerationOptions(model="sim-model"), TextGenerationOptions(model="sim-model", temperature=0.7)]
+        for options in sampled:
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                list(executor.map(lambda _: manager.generate_text("Write a poem", options), range(5)))
+        self.assertEqual(provider.calls, 10)
+        self.assertEqual(manager.get_coalescing_stats()["shared"], 0)
+
+        # With a response cache, sharing follows what the cache accepts
+        cached = ProviderManager(response_cache=ResponseCache(ResponseCacheConfig(max_temperature=0.5)))
+        self.addCleanup(cached.shutdown)
+        provider = SimulatedProvider("sim", median_latency=0.1, sigma=0.0)
+        cached.register_provider("sim", provider)
+        options = TextGenerationOptions(model="sim-model", temperature=0.7)
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            list(executor.map(lambda _: cached.generate_text("Write a poem", options), range(5)))
+        self.assertEqual(provider.calls, 5)
+
+    def test_single_flight_async_errors(self):
+        """Test that async followers share the leader's call and its error."""
+        provider = SimulatedProvider("sim", median_latency=0.1, sigma=0.0, failure_rate=1.0)
+        manager = self._manager(provider)
+        options = TextGenerationOptions(model="sim-model", temperature=0)
+
+        async def run():
+            return await asyncio.gather(*(
+                manager.generate_text_async("Classify: spam?", options) for _ in range(5)
+            ), return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(provider.calls, 1)
+        self.assertTrue(all(
+            isinstance(result, LLMError) and result.type == LLMErrorType.SERVICE_UNAVAILABLE_ERROR
+            for result in results
+        ))
+
+    def test_embedding_micro_batching(self):
+        """Test that concurrent small embedding requests are merged into batch calls."""
+        provider = BatchingProvider("sim", median_latency=0.05, sigma=0.0)
+        manager = self._manager(provider, batch_window=0.05, max_batch_size=8)
+        options = EmbeddingOptions(model="sim-model")
+        texts = [f"document {'x' * i}" for i in range(20)]
+
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            results = list(executor.map(lambda text: manager.generate_embedding(text, options), texts))
+
+        self.assertEqual([result.embedding[0] for result in results], [float(len(text)) for text in texts])
+        self.assertEqual(sum(provider.batch_sizes), 20)
+        self.assertLessEqual(max(provider.batch_sizes), 8)
+        self.assertLess(len(provider.batch_sizes), 10)
+        self.assertEqual(provider.calls, 0)
+
+        stats = manager.get_coalescing_stats()
+        self.assertEqual(stats["batched_requests"], 20)
+        self.assertGreater(stats["upstream_reduction"], 0.5)
+
+    def test_embedding_micro_batching_async(self):
+        """Test that async embedding requests fill batches up to the maximum size."""
+        provider = BatchingProvider("sim", median_latency=0.01, sigma=0.0)
+        manager = self._manager(provider, batch_window=0.05, max_batch_size=8)
+        options = EmbeddingOptions(model="sim-model")
+        texts = [f"query {i}" for i in range(20)] + ["query 0"]
+
+        async def run():
+            return await asyncio.gather(*(manager.generate_embedding_async(text, options) for text in texts))
+
+        results = asyncio.run(run())
+
+        self.assertEqual(len(results), 21)
+        self.assertEqual(provider.batch_sizes, [8, 8, 4])
+        stats = manager.get_coalescing_stats()
+        self.assertEqual(stats["shared"], 1)
+        self.assertEqual(stats["upstream_calls"], 3)
+
+    def test_cancelled_batch_cancels_waiting_requests(self):
+        """Test that cancelling an in-flight batch cancels the requests waiting on it."""
+        provider = BatchingProvider("sim", median_latency=60, sigma=0.0)
+        manager = self._manager(provider, batch_window=0.01, max_batch_size=8)
+        options = EmbeddingOptions(model="sim-model")
+
+        async def run():
+            requests = [
+                asyncio.ensure_future(manager.generate_embedding_async(f"query {i}", options))
+                for i in range(3)
+            ]
+            while not manager.coalescer._batch_tasks:
+                await asyncio.sleep(0.01)
+            for task in list(manager.coalescer._batch_tasks):
+                task.cancel()
+            return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), 5)
+
+        results = asyncio.run(run())
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(isinstance(result, asyncio.CancelledError) for result in results))
+
+    def test_azure_batch_embeddings(self):
+        """Test that Azure OpenAI sends a batch as one embeddings request."""
+        provider = AzureOpenAIProvider(AzureCredentials(
+            auth_type=AzureAuthType.API_KEY, api_key="test", endpoint="https://example.openai.azure.com"
+        ))
+        self.addCleanup(provider.close)
+        response = {
+            "data": [{"index": 1, "embedding": [0.2]}, {"index": 0, "embedding": [0.1]}],
+            "usage": {"prompt_tokens": 10, "total_tokens": 10}
+        }
+
+        with patch.object(provider, "_make_request", return_value=response) as make_request:
+            results = provider.generate_embeddings(["a", "b"], EmbeddingOptions(model="ada"))
+
+        self.assertEqual(make_request.call_args.kwargs["data"], {"input": ["a", "b"]})
+        self.assertEqual([result.embedding for result in results], [[0.1], [0.2]])
+        self.assertEqual(sum(result.usage.prompt_tokens for result in results), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for the response cache in ProviderManager.
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.llm_providers import (
+    ChatGenerationOptions, ChatGenerationResult, ChatMessage, FinishReason, HealthStatus, ModelInfo,
+    ProviderManager, ResponseCache, ResponseCacheConfig, UsageInfo
+)
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ProviderManager response caching."""
+
+    def _manager(self, **config):
+        self.provider = MagicMock()
+        self.provider.get_models.return_value = [
+            ModelInfo("gpt-4", "gpt-4", "stub", ["chat"], 8192, 0.0, 0.0)
+        ]
+        self.provider.get_health.return_value = HealthStatus(available=True, latency=1.0, error_rate=0.0)
+
+        def generate_chat(messages, options):
+            time.sleep(0.01)
+            return ChatGenerationResult(
+                message=ChatMessage(role="assistant", content=f"reply {self.provider.generate_chat.call_count}"),
+                model=options.model,
+                provider="stub",
+                usage=UsageInfo(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+                finish_reason=FinishReason.STOP
+            )
+
+        self.provider.generate_chat.side_effect = generate_chat
+        manager = ProviderManager(response_cache=ResponseCache(ResponseCacheConfig(**config)))
+        manager.register_provider("stub", self.provider)
+        return manager
+
+    def _chat(self, manager, content, tenant_id="acme", temperature=0.0, system="You are a helpful assistant."):
+        messages = [ChatMessage(role="system", content=system), ChatMessage(role="user", content=content)]
+        return manager.generate_chat(
+            messages, ChatGenerationOptions(model="gpt-4", temperature=temperature), tenant_id=tenant_id
+        )
+
+    def test_exact_hits_and_counters(self):
+        """Test that repeated requests are served from the cache."""
+        manager = self._manager()
+
+        first = self._chat(manager, "What is the capital of France?")
+        second = self._chat(manager, "What is the capital of France?  ")
+        self._chat(manager, "What is the capital of France?", temperature=0.5)
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.provider.generate_chat.call_count, 2)
+
+        stats = manager.get_cache_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["tokens_saved"], 15)
+        self.assertGreater(stats["latency_saved"], 0)
+
+    def test_tenant_isolation(self):
+        """Test that tenants never share cached responses."""
+        manager = self._manager()
+
+        self._chat(manager, "Summarize my account", tenant_id="acme")
+        self._chat(manager, "Summarize my account", tenant_id="globex")
+        self._chat(manager, "Summarize my account", tenant_id="acme")
+
+        self.assertEqual(self.provider.generate_chat.call_count, 2)
+        self.assertEqual(set(manager.get_cache_stats()["tenant_bytes"]), {"acme", "globex"})
+
+    def test_requests_without_tenant_bypass_cache(self):
+        """Test that requests without a tenant are neither served from nor stored in the cache."""
+        manager = self._manager()
+
+        self._chat(manager, "Summarize my account", tenant_id=None)
+        self._chat(manager, "Summarize my account", tenant_id=None)
+        self._chat(manager, "Summarize my account", tenant_id="acme")
+
+        self.assertEqual(self.provider.generate_chat.call_count, 3)
+        stats = manager.get_cache_stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hits"], 0)
+        self.assertEqual(set(stats["tenant_bytes"]), {"acme"})
+
+        cache = manager.response_cache
+        self.assertFalse(cache.put(None, "key", "partition", "result", 0.1))
+        self.assertIsNone(cache.get(None, "key", "partition"))
+
+    def test_semantic_hits(self):
+        """Test that near-duplicate prompts are served above the threshold only."""
+        manager = self._manager(semantic_enabled=True, similarity_threshold=0.85)
+        system = "You are a support agent for a cloud storage product. Answer briefly. " * 5
+
+        self._chat(manager, "How do I reset my password?", system=system)
+        self._chat(manager, "How do I reset my password, please?", system=system)
+        # A different question under the same long system prompt is not a near-duplicate
+        self._chat(manager, "How do I delete my account?", system=system)
+        # The same question in a different conversation is not served either
+        self._chat(manager, "How do I reset my password?", system="Be terse.")
+
+        self.assertEqual(self.provider.generate_chat.call_count, 3)
+        self.assertEqual(manager.get_cache_stats()["semantic_hits"], 1)
+
+    def test_ttl_and_size_bounds(self):
+        """Test that entries expire and the cache stays within its byte bounds."""
+        manager = self._manager(ttl=0.05, max_bytes=4096)
+
+        self._chat(manager, "Hello")
+        time.sleep(0.1)
+        self._chat(manager, "Hello")
+        self.assertEqual(self.provider.generate_chat.call_count, 2)
+        self.assertEqual(manager.get_cache_stats()["expirations"], 1)
+
+        for i in range(20):
+            self._chat(manager, f"Question {i}")
+
+        stats = manager.get_cache_stats()
+        self.assertLessEqual(stats["bytes"], 4096)
+        self.assertGreater(stats["evictions"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Tests for latency-aware hedged routing in ProviderManager.
+"""
+
+import asyncio
+import os
+import sys
+import time
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.llm_providers import ProviderManager, RoutingConfig, TextGenerationOptions
+from src.llm_providers.routing import ProviderRouter
+from src.llm_providers.routing_simulation import RoutingSimulation, SimulatedProvider
+
+
+class TestRouting(unittest.TestCase):
+    """Test cases for ProviderManager routing."""
+
+    def _manager(self, slow=None, fast=None, **config):
+        config.setdefault("initial_hedge_delay", 0.05)
+        manager = ProviderManager(routing_config=RoutingConfig(**config))
+        self.addCleanup(manager.shutdown)
+        self.slow = SimulatedProvider("slow", **(slow or {"stall_rate": 1.0, "stall_latency": 1.0}))
+        self.fast = SimulatedProvider("fast", **(fast or {"median_latency": 0.01}))
+        manager.register_provider("slow", self.slow)
+        manager.register_provider("fast", self.fast)
+        return manager
+
+    def _options(self):
+        return TextGenerationOptions(model="sim-model", provider="slow")
+
+    def test_hedge_cuts_tail_latency(self):
+        """Test that a stalled request is hedged to the next provider."""
+        manager = self._manager()
+
+        start = time.perf_counter()
+        result = manager.generate_text("Hello", self._options())
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(result.provider, "fast")
+        stats = manager.get_routing_stats()
+        self.assertEqual(stats["hedges"], 1)
+        self.assertEqual(stats["hedge_wins"], 1)
+
+    def test_async_hedge_cancels_loser(self):
+        """Test that the losing request of an async hedge race is cancelled."""
+        manager = self._manager()
+
+        async def run():
+            start = time.perf_counter()
+            result = await manager.generate_text_async("Hello", self._options())
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            return result, time.perf_counter() - start, pending
+
+        result, elapsed, pending = asyncio.run(run())
+
+        self.assertEqual(result.provider, "fast")
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(pending, [])
+
+    def test_failover_and_circuit_breaker(self):
+        """Test that failing providers are failed over and then taken out of rotation."""
+        manager = self._manager(slow={"failure_rate": 1.0}, hedging_enabled=False, failure_threshold=2)
+
+        for _ in range(3):
+            result = manager.generate_text("Hello", self._options())
+            self.assertEqual(result.provider, "fast")
+
+        stats = manager.get_routing_stats()
+        self.assertEqual(stats["failovers"], 2)
+        self.assertEqual(stats["circuits"]["slow"], "open")
+        self.assertEqual(self.slow.calls, 2)
+
+    def test_health_checked_off_request_path(self):
+        """Test that requests use background health results without checking health."""
+        manager = self._manager(slow={"median_latency": 0.01}, hedging_enabled=False)
+        self.slow.available = False
+
+        with patch.object(self.slow, "get_health", wraps=self.slow.get_health) as get_health:
+            manager.generate_text("Hello", self._options())
+            self.assertEqual(get_health.call_count, 0)
+
+            manager.start_health_monitor(interval=60)
+            manager.stop_health_monitor()
+            self.assertEqual(get_health.call_count, 1)
+
+        result = manager.generate_text("Hello", self._options())
+        self.assertEqual(result.provider, "fast")
+        self.assertEqual(self.slow.calls, 1)
+
+    def test_simulation_routes_every_request(self):
+        """Test that simulated requests are routed rather than shared."""
+        simulation = RoutingSimulation(requests_count=40, concurrency=8, median_latency=0.01, stall_rate=0.0)
+
+        summary = simulation.run_mode("no_hedging", hedging_enabled=False)
+
+        self.assertEqual(summary["routed"], 40)
+        self.assertEqual(summary["errors"], 0)
+
+
+class TestProviderRouter(unittest.TestCase):
+    """Test cases for ProviderRouter.execute."""
+
+    def _run_concurrently(self, router, callers, hedge):
+        threads = []
+
+        def call(provider_id):
+            threads.append(threading.current_thread())
+            time.sleep(0.2)
+            return provider_id
+
+        def request(_):
+            return router.execute("model", ["a", "b"], call, hedge=hedge), threading.current_thread()
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=callers) as callers_pool:
+            results = list(callers_pool.map(request, range(callers)))
+        return results, threads, time.monotonic() - start
+
+    def test_unhedged_requests_run_on_caller_thread(self):
+        """Test that requests that cannot be hedged do not wait for router threads."""
+        router = ProviderRouter(RoutingConfig(max_workers=4))
+        self.addCleanup(router.shutdown)
+
+        results, threads, elapsed = self._run_concurrently(router, 32, hedge=False)
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual({result for result, _ in results}, {"a"})
+        self.assertEqual(set(threads), {caller for _, caller in results})
+
+    def test_saturated_pool_does_not_queue_or_hedge(self):
+        """Test that hedgeable requests beyond the pool run inline and do not count queueing as latency."""
+        router = ProviderRouter(RoutingConfig(max_workers=4, initial_hedge_delay=0.5))
+        self.addCleanup(router.shutdown)
+
+        results, _, elapsed = self._run_concurrently(router, 32, hedge=True)
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(len(results), 32)
+        self.assertEqual(router.get_routing_stats()["hedges"], 0)
+        self.assertLess(router.get_stats("a", "model").quantile(0.95), 0.35)
+
+
+if __name__ == "__main__":
+    unittest.main()
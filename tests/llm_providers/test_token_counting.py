@@ -0,0 +1,132 @@
+"""
+Tests for the token counting service.
+"""
+
+import base64
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.llm_providers import ChatMessage, TokenCounter, TokenCounterConfig, get_token_counter
+from src.llm_providers.core.tokenization import BPEEncoder, TiktokenEncoder, load_tiktoken_ranks
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MERGES = [b"he", b"ll", b"hell", b"hello", b" w", b"or", b" wor", b"ld", b" world"]
+
+
+class TestTokenCounting(unittest.TestCase):
+    """Test cases for TokenCounter."""
+
+    def setUp(self):
+        self.vocab_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.vocab_dir)
+
+        tokens = [bytes([i]) for i in range(256)] + MERGES
+        with open(os.path.join(self.vocab_dir, "tiny.tiktoken"), "wb") as f:
+            for rank, token in enumerate(tokens):
+                f.write(base64.b64encode(token) + b" " + str(rank).encode() + b"\n")
+
+        self.counter = TokenCounter(TokenCounterConfig(
+            vocab_dir=self.vocab_dir, model_encodings={"tiny-model": "tiny"}, min_cached_length=8
+        ))
+
+    def test_bpe_encoding(self):
+        """Test that the vocabulary file is loaded and merges are applied by rank."""
+        ranks = load_tiktoken_ranks(os.path.join(self.vocab_dir, "tiny.tiktoken"))
+        encoder = BPEEncoder("tiny", ranks, use_tiktoken=False)
+
+        self.assertEqual(encoder.encode("hello world"), [259, 264])
+        self.assertEqual(encoder.encode("hello, help"), [259, 44, 32, 256, 108, 112])
+        self.assertEqual(self.counter.count("hello world hello", "tiny-model"), 4)
+        self.assertTrue(self.counter.is_exact("tiny-model"))
+
+    def test_conversation_counting_is_memoized(self):
+        """Test that conversations are counted in one pass with repeated prompts memoized."""
+        system = "hello world " * 10
+        messages = [ChatMessage(role="system", content=system), ChatMessage(role="user", content="hello")]
+
+        first = self.counter.count_messages(messages, "tiny-model")
+        second = self.counter.count_messages(messages, "tiny-model")
+
+        expected = 3 + 2 * 3 + self.counter.count(system, "tiny-model") + 1 + sum(
+            self.counter.count(role, "tiny-model") for role in ("system", "user")
+        )
+        self.assertEqual(first, expected)
+        self.assertEqual(second, first)
+        self.assertEqual(self.counter.get_stats()["cache_misses"], 1)
+        self.assertGreaterEqual(self.counter.get_stats()["cache_hits"], 2)
+        self.assertEqual(self.counter.count_batch(["hello", "", "hello world"], "tiny-model"), [1, 0, 2])
+
+    def test_memo_is_keyed_by_digest(self):
+        """Test that memoized counts do not keep the counted texts alive."""
+        system = "hello world " * 1000
+        count = self.counter.count(system, "tiny-model")
+
+        (key,) = self.counter._cache
+        self.assertEqual(key[0], "tiny")
+        self.assertLessEqual(len(key[1]), 32)
+        self.assertNotIn(system, key)
+        self.assertEqual(self.counter.count(system, "tiny-model"), count)
+        self.assertEqual(self.counter.get_stats()["cache_hits"], 1)
+
+    def test_memoization_can_be_disabled(self):
+        """Test that a zero cache size counts every text with the encoder."""
+        counter = TokenCounter(TokenCounterConfig(
+            vocab_dir=self.vocab_dir, model_encodings={"tiny-model": "tiny"}, min_cached_length=8, cache_size=0
+        ))
+        encoder = counter.get_encoder("tiny-model")
+        with mock.patch.object(encoder, "count", wraps=encoder.count) as count:
+            for _ in range(3):
+                counter.count("hello world " * 10, "tiny-model")
+
+        self.assertEqual(count.call_count, 3)
+        self.assertEqual(counter.get_stats()["cache_entries"], 0)
+
+    def test_tiktoken_fallback_without_vocabulary(self):
+        """Test that OpenAI encodings without a local file are loaded through tiktoken."""
+        with mock.patch("src.llm_providers.core.tokenization.TiktokenEncoder") as encoder_class:
+            encoder_class.return_value.exact = True
+            self.assertIs(self.counter.get_encoder("gpt-4"), encoder_class.return_value)
+            encoder_class.assert_called_once_with("cl100k_base")
+
+            counter = TokenCounter(TokenCounterConfig(vocab_dir=self.vocab_dir, use_tiktoken=False))
+            self.assertFalse(counter.is_exact("gpt-4"))
+
+    @unittest.skipIf(tiktoken is None, "tiktoken is not installed")
+    def test_tiktoken_encoder(self):
+        """Test counts from the encodings published with tiktoken."""
+        encoder = TiktokenEncoder("cl100k_base")
+        self.assertEqual(encoder.count("Hello world, this is a test."), 8)
+
+    def test_heuristic_fallback(self):
+        """Test that models without a vocabulary get estimates closer than four characters per token."""
+        counter = TokenCounter(TokenCounterConfig(vocab_dir=self.vocab_dir, use_tiktoken=False))
+        self.assertFalse(counter.is_exact("gpt-4"))
+
+        chinese = "今天天气很好，我们一起去公园散步吧。"
+        code = "def f(x):\n    return {'a': [1, 2, 3]}\n"
+        self.assertGreaterEqual(counter.count(chinese, "gpt-4"), len(chinese) - 2)
+        self.assertGreater(counter.count(code, "gpt-4"), len(code) // 4)
+        self.assertEqual(counter.count("Hello world, this is a test.", "gpt-4"), 8)
+
+    def test_shared_counter(self):
+        """Test that providers share one token counter."""
+        self.assertIs(get_token_counter(), get_token_counter())
+        self.assertEqual(
+            get_token_counter().get_encoding_name("anthropic.claude-3-haiku-20240307-v1:0"), "claude"
+        )
+        self.assertEqual(get_token_counter().get_encoding_name("gpt-35-turbo"), "cl100k_base")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Tests for the in-memory quota counters and QuotaEnforcer.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+
+from subscription.core.usage_tracking import (
+    QuotaAction, QuotaDefinition, QuotaEnforcer, QuotaType, ResourceType,
+    UsageCounters, UsageTracker
+)
+
+
+class TestUsageCounters(unittest.TestCase):
+    """Test cases for UsageCounters."""
+
+    def test_window_keys(self):
+        """Test window keys for each quota type."""
+        timestamp = datetime(2025, 3, 6, 15, 0)  # Thursday
+        self.assertEqual(UsageCounters.window_key(QuotaType.DAILY, timestamp), "2025-03-06")
+        self.assertEqual(UsageCounters.window_key(QuotaType.WEEKLY, timestamp), "2025-03-03")
+        self.assertEqual(UsageCounters.window_key(QuotaType.MONTHLY, timestamp), "2025-03")
+        self.assertEqual(UsageCounters.window_key(QuotaType.ANNUAL, timestamp), "2025")
+        self.assertEqual(UsageCounters.window_key(QuotaType.TOTAL, timestamp), "total")
+
+    def test_add_and_rollover(self):
+        """Test that usage from past windows only counts toward wider windows."""
+        counters = UsageCounters()
+        now = datetime.now()
+        counters.add("c1", ResourceType.API_CALLS, 5)
+        counters.add("c1", ResourceType.API_CALLS, 7, now - timedelta(days=400))
+
+        self.assertEqual(counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 5)
+        self.assertEqual(counters.get("c1", ResourceType.API_CALLS, QuotaType.TOTAL), 12)
+        self.assertEqual(counters.get("c2", ResourceType.API_CALLS, QuotaType.DAILY), 0)
+
+    def test_check_and_increment_blocks_at_limit(self):
+        """Test that concurrent requests cannot exceed a blocking quota."""
+        counters = UsageCounters()
+        quota = QuotaDefinition(ResourceType.API_CALLS, QuotaType.DAILY, 100, QuotaAction.BLOCK, "free")
+        allowed = []
+
+        def worker():
+            for _ in range(50):
+                counted, _ = counters.check_and_increment("c1", ResourceType.API_CALLS, 1, quota)
+                allowed.append(counted)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(allowed.count(True), 100)
+        self.assertEqual(counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 100)
+
+    def test_release_after_rollover_keeps_new_window(self):
+        """Test that a late rollback does not take usage from a newer window."""
+        counters = UsageCounters()
+        charged_at = datetime(2025, 3, 6, 23, 59)
+
+        class Clock(datetime):
+            current = charged_at
+
+            @classmethod
+            def now(cls, tz=None):
+                return cls.current
+
+        with mock.patch("subscription.core.usage_tracking.datetime", Clock):
+            counters.add("c1", ResourceType.API_CALLS, 8, charged_at)
+            Clock.current = datetime(2025, 3, 7, 0, 1)
+            counters.add("c1", ResourceType.API_CALLS, 3)
+            counters.release("c1", ResourceType.API_CALLS, 8, charged_at)
+
+            self.assertEqual(counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 3)
+            self.assertEqual(counters.get("c1", ResourceType.API_CALLS, QuotaType.MONTHLY), 3)
+
+    def test_release_never_goes_negative(self):
+        """Test that releasing uncounted usage leaves the total at zero."""
+        counters = UsageCounters()
+        counters.add("c1", ResourceType.API_CALLS, 2)
+        counters.release("c1", ResourceType.API_CALLS, 5, datetime.now())
+        counters.release("c2", ResourceType.API_CALLS, 5, datetime.now())
+
+        self.assertEqual(counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 0)
+
+
+class TestQuotaEnforcerCounters(unittest.TestCase):
+    """Test cases for QuotaEnforcer backed by the counters."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker = UsageTracker(self.temp_dir)
+        self.quota = QuotaDefinition(ResourceType.API_CALLS, QuotaType.DAILY, 10, QuotaAction.BLOCK, "free")
+        self.enforcer = QuotaEnforcer(None, self.tracker, None)
+        self.enforcer._get_applicable_quota = lambda customer_id, resource_type: self.quota
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.tracker.ledger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_track_and_enforce(self):
+        """Test that blocked usage is neither counted nor recorded."""
+        allowed, record, message = self.enforcer.track_and_enforce("c1", ResourceType.API_CALLS, 8)
+        self.assertTrue(allowed)
+        self.assertIsNotNone(record)
+        self.assertIsNone(message)
+
+        allowed, record, message = self.enforcer.track_and_enforce("c1", ResourceType.API_CALLS, 5)
+        self.assertFalse(allowed)
+        self.assertIsNone(record)
+        self.assertIn("Current usage: 8", message)
+
+        self.assertEqual(self.tracker.ledger.records_written, 1)
+        self.assertEqual(self.enforcer.get_quota_status("c1", ResourceType.API_CALLS)["current_usage"], 8)
+
+    def test_warn_action_allows_with_message(self):
+        """Test that non-blocking quotas count usage over the limit."""
+        self.quota.action = QuotaAction.NOTIFY
+        self.enforcer.track_and_enforce("c1", ResourceType.API_CALLS, 8)
+        allowed, record, message = self.enforcer.track_and_enforce("c1", ResourceType.API_CALLS, 5)
+
+        self.assertTrue(allowed)
+        self.assertIsNotNone(record)
+        self.assertIn("Quota exceeded", message)
+        self.assertEqual(self.tracker.counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 13)
+
+    def test_failed_record_releases_reservation(self):
+        """Test that usage is uncounted when recording it fails."""
+        with mock.patch.object(self.tracker, "record_usage", side_effect=IOError("disk full")):
+            with self.assertRaises(IOError):
+                self.enforcer.track_and_enforce("c1", ResourceType.API_CALLS, 8)
+
+        self.assertEqual(self.tracker.counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 0)
+        allowed, _, _ = self.enforcer.track_and_enforce("c1", ResourceType.API_CALLS, 10)
+        self.assertTrue(allowed)
+
+    def test_counters_rebuilt_from_ledger(self):
+        """Test that a new tracker restores counters from the ledger."""
+        self.tracker.track_usage("c1", ResourceType.API_CALLS, 4)
+        self.tracker.track_usage("c1", ResourceType.API_CALLS, 3)
+        self.tracker.ledger.close()
+
+        tracker = UsageTracker(self.temp_dir)
+        try:
+            self.assertEqual(tracker.counters.get("c1", ResourceType.API_CALLS, QuotaType.DAILY), 7)
+        finally:
+            tracker.ledger.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
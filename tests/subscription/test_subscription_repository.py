@@ -0,0 +1,102 @@
+"""
+Tests for the indexed SubscriptionRepository.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+
+from subscription.core.subscription_manager import (
+    Subscription, SubscriptionRepository, SubscriptionStatus
+)
+
+
+class TestSubscriptionRepository(unittest.TestCase):
+    """Test cases for SubscriptionRepository."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.repository = SubscriptionRepository(self.temp_dir)
+        self.now = datetime.now()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def _subscription(self, subscription_id, customer_id, status=SubscriptionStatus.ACTIVE, end_in_days=None):
+        return Subscription(
+            subscription_id=subscription_id,
+            customer_id=customer_id,
+            tier_id="basic",
+            status=status,
+            start_date=self.now - timedelta(days=10),
+            end_date=self.now + timedelta(days=end_in_days) if end_in_days is not None else None
+        )
+
+    def test_secondary_indexes_follow_saves(self):
+        """Test that customer and status indexes track updates and deletes."""
+        self.repository.save(self._subscription("s1", "c1"))
+        self.repository.save(self._subscription("s2", "c1", status=SubscriptionStatus.PENDING))
+        self.repository.save(self._subscription("s3", "c2"))
+
+        self.assertEqual([s.subscription_id for s in self.repository.get_by_customer("c1")], ["s1", "s2"])
+        self.assertEqual(
+            [s.subscription_id for s in self.repository.get_by_status(SubscriptionStatus.ACTIVE)],
+            ["s1", "s3"]
+        )
+
+        # Status change moves the subscription between status indexes
+        self.repository.save(self._subscription("s2", "c1", status=SubscriptionStatus.ACTIVE))
+        self.assertEqual(len(self.repository.get_by_status(SubscriptionStatus.ACTIVE)), 3)
+        self.assertEqual(self.repository.get_by_status(SubscriptionStatus.PENDING), [])
+
+        self.assertTrue(self.repository.delete("s1"))
+        self.assertFalse(self.repository.delete("s1"))
+        self.assertIsNone(self.repository.get("s1"))
+        self.assertEqual([s.subscription_id for s in self.repository.get_by_customer("c1")], ["s2"])
+        self.assertEqual(len(self.repository.get_all()), 2)
+
+    def test_get_expiring_soon(self):
+        """Test the end date range scan."""
+        self.repository.save(self._subscription("soon", "c1", end_in_days=5))
+        self.repository.save(self._subscription("later", "c1", end_in_days=90))
+        self.repository.save(self._subscription("expired", "c1", end_in_days=-1))
+        self.repository.save(self._subscription("lifetime", "c1"))
+
+        self.assertEqual([s.subscription_id for s in self.repository.get_expiring_soon(30)], ["soon"])
+
+        # Moving the end date updates the index
+        self.repository.save(self._subscription("later", "c1", end_in_days=3))
+        self.assertEqual(
+            [s.subscription_id for s in self.repository.get_expiring_soon(30)],
+            ["later", "soon"]
+        )
+
+    def test_index_hydrated_from_files(self):
+        """Test that a new repository rebuilds its index from disk."""
+        self.repository.save(self._subscription("s1", "c1", end_in_days=2))
+        self.repository.save(self._subscription("s2", "c2"))
+
+        repository = SubscriptionRepository(self.temp_dir)
+        self.assertEqual([s.subscription_id for s in repository.get_by_customer("c1")], ["s1"])
+        self.assertEqual(len(repository.get_all()), 2)
+        self.assertEqual([s.subscription_id for s in repository.get_expiring_soon(7)], ["s1"])
+
+    def test_returned_subscriptions_are_copies(self):
+        """Test that mutating a returned subscription does not change the index."""
+        self.repository.save(self._subscription("s1", "c1"))
+        subscription = self.repository.get("s1")
+        subscription.status = SubscriptionStatus.CANCELLED
+
+        self.assertEqual(self.repository.get("s1").status, SubscriptionStatus.ACTIVE)
+
+
+if __name__ == "__main__":
+    unittest.main()
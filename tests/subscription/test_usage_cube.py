@@ -0,0 +1,144 @@
+"""
+Tests for the usage cube and the UsageAnalytics queries served from it.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+
+from subscription.core.license_generator import LicenseFeature
+from subscription.core.usage_cube import UsageCube
+from subscription.core.usage_tracking import ResourceType, UsageAnalytics, UsageTracker
+
+
+class TestUsageCube(unittest.TestCase):
+    """Test cases for UsageCube."""
+
+    def _record(self, customer_id, day, quantity, resource_type="api_calls", feature=None):
+        record = {
+            "customer_id": customer_id,
+            "resource_type": resource_type,
+            "quantity": quantity,
+            "timestamp": f"{day}T12:00:00"
+        }
+        if feature:
+            record["feature"] = feature
+        return record
+
+    def test_cells_and_customer_totals(self):
+        """Test that records aggregate into cells and per-customer totals."""
+        cube = UsageCube()
+        cube.add(self._record("c1", "2025-03-01", 2, feature="core"))
+        cube.add(self._record("c1", "2025-03-01", 3, feature="core"))
+        cube.add(self._record("c2", "2025-03-02", 4))
+        cube.add(self._record("c2", "2025-03-03", 1, resource_type="storage"))
+
+        self.assertEqual(
+            cube.get_cells("2025-03-01", "2025-03-01"),
+            [("2025-03-01", "c1", "api_calls", "core", None, 5)]
+        )
+        self.assertEqual(cube.get_customer_totals("api_calls"), {"c1": 5, "c2": 4})
+        self.assertEqual(cube.get_customer_totals("api_calls", "2025-03-02", "2025-03-03"), {"c2": 4})
+        self.assertEqual(cube.get_stats()["cells"], 3)
+
+    def test_top_k(self):
+        """Test top-K selection."""
+        totals = {f"c{i}": i for i in range(100)}
+        self.assertEqual(UsageCube.top_k(totals, 3), [("c99", 99), ("c98", 98), ("c97", 97)])
+
+
+class TestUsageAnalyticsCube(unittest.TestCase):
+    """Test that cube-backed analytics match aggregation of raw records."""
+
+    def setUp(self):
+        """Set up test environment with usage spread over several days."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker = UsageTracker(self.temp_dir)
+        self.analytics = UsageAnalytics(self.tracker)
+
+        rng = random.Random(7)
+        self.base = datetime(2025, 3, 1)
+        features = [None, LicenseFeature.CORE, LicenseFeature.MULTI_USER]
+        for _ in range(300):
+            record = self.tracker.create_record(
+                customer_id=f"c{rng.randrange(5)}",
+                resource_type=rng.choice([ResourceType.API_CALLS, ResourceType.STORAGE]),
+                quantity=rng.randrange(1, 50),
+                subscription_id=rng.choice([None, "s1", "s2"]),
+                feature=rng.choice(features)
+            )
+            record.timestamp = self.base + timedelta(minutes=rng.randrange(6 * 24 * 60))
+            self.tracker.record_usage(record)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.tracker.ledger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _expected_report(self, customer_id, start_date, end_date):
+        records = self.tracker.get_customer_usage(customer_id, start_date, end_date)
+        resource_usage, feature_usage, daily_usage = {}, {}, {}
+        for record in records:
+            resource_key = record.resource_type.value
+            feature_key = record.feature.value if record.feature else "unknown"
+            date_key = record.timestamp.strftime("%Y-%m-%d")
+            resource_usage[resource_key] = resource_usage.get(resource_key, 0) + record.quantity
+            feature_usage[feature_key] = feature_usage.get(feature_key, 0) + record.quantity
+            daily_usage[date_key] = daily_usage.get(date_key, 0) + record.quantity
+        return {
+            "total_usage": sum(record.quantity for record in records),
+            "resource_usage": resource_usage,
+            "feature_usage": feature_usage,
+            "daily_usage": daily_usage,
+            "period_start": start_date.isoformat(),
+            "period_end": end_date.isoformat()
+        }
+
+    def test_reports_match_raw_records(self):
+        """Test reports over whole and partial days."""
+        periods = [
+            (self.base, self.base + timedelta(days=6) - timedelta(microseconds=1)),
+            (self.base + timedelta(hours=7, minutes=13), self.base + timedelta(days=4, hours=2)),
+            (self.base + timedelta(days=2, hours=3), self.base + timedelta(days=2, hours=20)),
+            (self.base + timedelta(days=1), self.base + timedelta(days=3))
+        ]
+        for start_date, end_date in periods:
+            for customer_id in ("c0", "c3"):
+                self.assertEqual(
+                    self.analytics.get_usage_report(customer_id, start_date, end_date),
+                    self._expected_report(customer_id, start_date, end_date)
+                )
+
+    def test_top_customers_match_raw_records(self):
+        """Test top customers against a full scan."""
+        start_date = self.base + timedelta(hours=5)
+        end_date = self.base + timedelta(days=3, hours=9)
+        totals = {}
+        for data in self.tracker.ledger.iter_records(start_date, end_date, resource_type="storage"):
+            totals[data["customer_id"]] = totals.get(data["customer_id"], 0) + data["quantity"]
+        expected = dict(sorted(totals.items(), key=lambda x: x[1], reverse=True)[:3])
+
+        self.assertEqual(
+            self.analytics.get_top_customers(ResourceType.STORAGE, start_date, end_date, limit=3),
+            expected
+        )
+
+    def test_cube_rebuilt_from_ledger(self):
+        """Test that a new tracker rebuilds the cube from the ledger."""
+        self.tracker.ledger.close()
+        tracker = UsageTracker(self.temp_dir)
+        try:
+            self.assertEqual(tracker.cube.get_stats(), self.tracker.cube.get_stats())
+        finally:
+            tracker.ledger.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+"""
+Tests for the append-only usage ledger and the UsageTracker built on it.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+
+from subscription.core.usage_ledger import UsageLedger
+from subscription.core.usage_tracking import ResourceType, UsageTracker
+
+
+class TestUsageLedger(unittest.TestCase):
+    """Test cases for UsageLedger."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.ledger = UsageLedger(os.path.join(self.temp_dir, "ledger"))
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.ledger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _record(self, customer_id, timestamp, quantity=1, resource_type="api_calls"):
+        return {
+            "record_id": f"{customer_id}-{timestamp.isoformat()}-{quantity}",
+            "customer_id": customer_id,
+            "resource_type": resource_type,
+            "quantity": quantity,
+            "timestamp": timestamp.isoformat(),
+            "metadata": {}
+        }
+
+    def test_append_partitions_by_day(self):
+        """Test that records land in the segment for their day."""
+        day1 = datetime(2025, 3, 1, 12, 0)
+        day2 = datetime(2025, 3, 2, 9, 30)
+        self.ledger.append(self._record("c1", day1))
+        self.ledger.append(self._record("c1", day2))
+        self.ledger.append(self._record("c2", day2))
+
+        self.assertEqual(self.ledger.get_segment_dates(), ["2025-03-01", "2025-03-02"])
+        self.assertEqual(len(list(self.ledger.read_segment("2025-03-02"))), 2)
+
+    def test_iter_records_filters(self):
+        """Test customer, resource and time range filtering."""
+        base = datetime(2025, 3, 1, 12, 0)
+        for offset in range(5):
+            self.ledger.append(self._record("c1", base + timedelta(days=offset), quantity=offset))
+        self.ledger.append(self._record("c2", base, resource_type="storage"))
+
+        records = list(self.ledger.iter_records(
+            start_date=base + timedelta(days=1),
+            end_date=base + timedelta(days=3),
+            customer_id="c1"
+        ))
+        self.assertEqual([r["quantity"] for r in records], [1, 2, 3])
+
+        records = list(self.ledger.iter_records(resource_type="storage"))
+        self.assertEqual([r["customer_id"] for r in records], ["c2"])
+
+    def test_torn_trailing_line_is_skipped(self):
+        """Test that a partially written record does not break reads."""
+        day = datetime(2025, 3, 1, 12, 0)
+        self.ledger.append(self._record("c1", day))
+        with open(self.ledger._get_segment_file("2025-03-01"), "a") as f:
+            f.write('{"record_id": "partial"')
+
+        self.assertEqual(len(list(self.ledger.read_segment("2025-03-01"))), 1)
+
+    def test_concurrent_appends_group_commit(self):
+        """Test that concurrent appends are all written with fewer commits."""
+        day = datetime(2025, 3, 1, 12, 0)
+
+        def worker(worker_id):
+            for i in range(200):
+                self.ledger.append(self._record(f"c{worker_id}", day, quantity=i))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(list(self.ledger.read_segment("2025-03-01"))), 1600)
+        self.assertEqual(self.ledger.records_written, 1600)
+        self.assertLessEqual(self.ledger.commits, 1600)
+
+    def test_failed_write_fails_only_unwritten_records(self):
+        """Test that records written before an error are not reported as failed."""
+        day1 = datetime(2025, 3, 1, 12, 0)
+        day2 = datetime(2025, 3, 2, 12, 0)
+        records = [self._record("c1", day1, quantity=q) for q in range(2)]
+        records += [self._record("c2", day2, quantity=q) for q in range(2)]
+        batch = [
+            (sequence, record["timestamp"][:10], record, json.dumps(record, separators=(",", ":")) + "\n")
+            for sequence, record in enumerate(records)
+        ]
+        day2_fd = self.ledger._get_segment_fd("2025-03-02")
+        real_write = os.write
+
+        def failing_write(fd, data):
+            if fd == day2_fd:
+                if len(data) > len(batch[3][3]):
+                    # A short write: the first record and part of the second reach the disk
+                    return real_write(fd, data[:len(batch[2][3]) + 5])
+                raise OSError(28, "No space left on device")
+            return real_write(fd, data)
+
+        with mock.patch("os.write", side_effect=failing_write):
+            failures = self.ledger._write_batch(batch)
+
+        self.assertEqual(list(failures), [3])
+        self.assertEqual(self.ledger.records_written, 3)
+
+        # Retrying the failed record adds it once, on a line of its own
+        self.ledger.append(records[3])
+        self.assertEqual([r["quantity"] for r in self.ledger.read_segment("2025-03-01")], [0, 1])
+        self.assertEqual([r["quantity"] for r in self.ledger.read_segment("2025-03-02")], [0, 1])
+
+    def test_append_raises_for_its_own_failed_record(self):
+        """Test that a caller is told about a failure only when its record was not written."""
+        day = datetime(2025, 3, 1, 12, 0)
+        with mock.patch("os.write", side_effect=OSError(5, "I/O error")):
+            with self.assertRaises(IOError):
+                self.ledger.append(self._record("c1", day))
+        self.ledger.append(self._record("c1", day, quantity=2))
+
+        self.assertEqual([r["quantity"] for r in self.ledger.read_segment("2025-03-01")], [2])
+        self.assertEqual(self.ledger._failed, {})
+
+    def test_migrate_json_segments(self):
+        """Test migration of legacy per-day JSON array files."""
+        legacy_dir = os.path.join(self.temp_dir, "daily")
+        os.makedirs(legacy_dir)
+        legacy = [self._record("c1", datetime(2024, 12, 31, 8, 0), quantity=7)]
+        with open(os.path.join(legacy_dir, "usage_2024-12-31.json"), "w") as f:
+            json.dump(legacy, f)
+
+        self.assertEqual(self.ledger.migrate_json_segments(legacy_dir), 1)
+        self.assertEqual(os.listdir(legacy_dir), [])
+        self.assertEqual(list(self.ledger.read_segment("2024-12-31"))[0]["quantity"], 7)
+
+    def test_migration_rerun_after_crash_does_not_duplicate(self):
+        """Test that rerunning a migration interrupted before cleanup adds nothing twice."""
+        legacy_dir = os.path.join(self.temp_dir, "daily")
+        os.makedirs(legacy_dir)
+        day = datetime(2024, 12, 31, 8, 0)
+        legacy = [self._record("c1", day, quantity=q) for q in range(3)]
+        with open(os.path.join(legacy_dir, "usage_2024-12-31.json"), "w") as f:
+            json.dump(legacy, f)
+
+        # A crash after the segment was written but before the legacy file was removed
+        self.ledger.append(legacy[0])
+        self.ledger.append(legacy[1])
+        stale = self.ledger._get_segment_file("2024-12-31") + UsageLedger.MIGRATION_SUFFIX
+        with open(stale, "w") as f:
+            f.write('{"record_id": "half-written"')
+
+        self.assertEqual(self.ledger.migrate_json_segments(legacy_dir), 1)
+        self.assertFalse(os.path.exists(stale))
+        quantities = [r["quantity"] for r in self.ledger.read_segment("2024-12-31")]
+        self.assertEqual(quantities, [0, 1, 2])
+
+        # Appends after the rewrite go to the new segment file
+        self.ledger.append(self._record("c2", day, quantity=9))
+        self.assertEqual(len(list(self.ledger.read_segment("2024-12-31"))), 4)
+
+    def test_close_waits_for_inflight_commit(self):
+        """Test that close does not close descriptors under a commit leader."""
+        day = datetime(2025, 3, 1, 12, 0)
+        entered = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        write_batch = self.ledger._write_batch
+
+        def slow_write_batch(batch):
+            entered.set()
+            release.wait(5)
+            return write_batch(batch)
+
+        self.ledger._write_batch = slow_write_batch
+        errors = []
+
+        def writer():
+            try:
+                self.ledger.append(self._record("c1", day))
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        self.assertTrue(entered.wait(5))
+
+        closer = threading.Thread(target=self.ledger.close)
+        closer.start()
+        closer.join(0.2)
+        self.assertTrue(closer.is_alive())
+
+        release.set()
+        thread.join(5)
+        closer.join(5)
+        self.assertFalse(closer.is_alive())
+        self.assertEqual(errors, [])
+        self.assertEqual(self.ledger._segment_fds, {})
+        self.assertEqual(len(list(self.ledger.read_segment("2025-03-01"))), 1)
+
+
+class TestUsageTrackerLedger(unittest.TestCase):
+    """Test cases for UsageTracker backed by the ledger."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tracker = UsageTracker(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.tracker.ledger.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_track_usage_single_write_and_queries(self):
+        """Test that tracked usage is visible through every query API."""
+        self.tracker.track_usage("c1", ResourceType.API_CALLS, 5)
+        self.tracker.track_usage("c1", ResourceType.STORAGE, 100)
+        self.tracker.track_usage("c2", ResourceType.API_CALLS, 3)
+        now = datetime.now()
+
+        self.assertEqual(self.tracker.ledger.records_written, 3)
+        self.assertEqual(len(self.tracker.get_daily_usage(now)), 3)
+        self.assertEqual(len(self.tracker.get_daily_usage(now, customer_id="c1")), 2)
+        self.assertEqual(len(self.tracker.get_monthly_usage(now.year, now.month, resource_type=ResourceType.API_CALLS)), 2)
+        self.assertEqual(len(self.tracker.get_customer_usage("c2")), 1)
+        self.assertEqual(
+            self.tracker.get_usage_summary("c1", ResourceType.STORAGE, now - timedelta(days=1), now + timedelta(days=1)),
+            100
+        )
+        self.assertEqual(
+            self.tracker.get_resource_usage_by_customer(ResourceType.API_CALLS, now - timedelta(days=1), now + timedelta(days=1)),
+            {"c1": 5, "c2": 3}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Tests for the license ValidationCache and batch validation.
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+# Add src directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'src')))
+
+from subscription.core.license_generator import (
+    LicenseFeature, LicenseMetadata, LicenseMetadataEncoder, LicenseStatus, LicenseType
+)
+from subscription.core.license_validator import LicenseValidator, ValidationCache, ValidationResult
+
+
+class CountingSignatureHandler:
+    """Signature handler that accepts the signature "good" and counts verifications."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def verify(self, data, signature):
+        self.calls += 1
+        return signature == "good"
+
+
+def make_license_key(license_id, signature="good", expiration_date=None):
+    """Build a license key with a valid checksum."""
+    metadata = LicenseMetadata(
+        license_id=license_id,
+        customer_id="customer",
+        license_type=LicenseType.SUBSCRIPTION,
+        features=[LicenseFeature.CORE],
+        issue_date=datetime.now(),
+        expiration_date=expiration_date
+    )
+    data = f"APX-SUB.{LicenseMetadataEncoder.encode(metadata)}.{signature}"
+    return f"{data}.{hashlib.sha256(data.encode('utf-8')).hexdigest()[:8]}"
+
+
+class TestValidationCache(unittest.TestCase):
+    """Test cases for ValidationCache."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = ValidationCache(max_entries=2, lock_stripes=1)
+        cache.set("a", ValidationResult(is_valid=True))
+        cache.set("b", ValidationResult(is_valid=True))
+        cache.get("a")
+        cache.set("c", ValidationResult(is_valid=True))
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_negative_entries_use_their_own_ttl(self):
+        """Test that failed validations expire after the negative TTL."""
+        cache = ValidationCache(cache_duration_seconds=3600, negative_cache_duration_seconds=0.05)
+        cache.set("bad", ValidationResult(is_valid=False, error_message="Invalid license signature"))
+        cache.set("good", ValidationResult(is_valid=True))
+
+        self.assertFalse(cache.get("bad").is_valid)
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("bad"))
+        self.assertIsNotNone(cache.get("good"))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["negative_hits"], 1)
+        self.assertEqual(stats["expirations"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_valid_result_expires_with_license(self):
+        """Test that a cached valid result is not served after the license expires."""
+        cache = ValidationCache()
+        cache.set("key", ValidationResult(is_valid=True, expiration_date=datetime.now() - timedelta(seconds=1)))
+        self.assertIsNone(cache.get("key"))
+
+    def test_concurrent_access(self):
+        """Test that concurrent readers and writers keep the cache bounded."""
+        cache = ValidationCache(max_entries=64)
+
+        def worker(worker_id):
+            for i in range(500):
+                key = f"{worker_id}-{i % 100}"
+                if cache.get(key) is None:
+                    cache.set(key, ValidationResult(is_valid=True))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(len(cache), 64)
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"] + stats["misses"], 4000)
+
+
+class TestLicenseValidatorCache(unittest.TestCase):
+    """Test cases for LicenseValidator caching."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.signature_handler = CountingSignatureHandler()
+        self.validator = LicenseValidator(self.signature_handler)
+
+    def test_forged_keys_are_negatively_cached(self):
+        """Test that a forged key is only verified once."""
+        forged = make_license_key("lic-1", signature="forged")
+        for _ in range(5):
+            self.assertFalse(self.validator.validate_license_key(forged).is_valid)
+
+        self.assertEqual(self.signature_handler.calls, 1)
+        self.assertEqual(self.validator.get_cache_stats()["negative_hits"], 4)
+
+    def test_online_revocation_is_not_cached(self):
+        """Test that a license reinstated on the server is accepted on the next lookup."""
+        revoked = {"lic-1"}
+
+        class OnlineValidator(LicenseValidator):
+            def _check_online_status(self, license_id):
+                if license_id in revoked:
+                    return False, "License has been revoked"
+                return True, None
+
+        validator = OnlineValidator(self.signature_handler)
+        key = make_license_key("lic-1")
+
+        result = validator.validate_license_key(key)
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.status, LicenseStatus.REVOKED)
+
+        revoked.clear()
+        self.assertTrue(validator.validate_license_key(key).is_valid)
+        self.assertTrue(validator.validate_license_key(key).is_valid)
+        self.assertEqual(validator.get_cache_stats()["negative_hits"], 0)
+        self.assertEqual(validator.get_cache_stats()["hits"], 1)
+
+    def test_validate_many(self):
+        """Test batch validation with duplicates and cache hits."""
+        good = make_license_key("lic-1")
+        bad = make_license_key("lic-2", signature="forged")
+        self.validator.validate_license_key(good)
+
+        results = self.validator.validate_many([good, bad, good, bad])
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(results[good].is_valid)
+        self.assertFalse(results[bad].is_valid)
+        self.assertEqual(self.signature_handler.calls, 2)
+
+    def test_feature_and_status_lookups_share_cache(self):
+        """Test that lookup helpers reuse a single validation."""
+        key = make_license_key("lic-1", expiration_date=datetime.now() + timedelta(days=30))
+        self.assertTrue(self.validator.has_feature(key, LicenseFeature.CORE))
+        self.validator.get_license_status(key)
+        self.validator.get_expiration_date(key)
+
+        self.assertEqual(self.signature_handler.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()